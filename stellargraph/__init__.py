@@ -15,6 +15,15 @@
 # limitations under the License.
 
 
+"""
+StellarGraph: machine learning on graphs.
+
+Importing this package only loads the core graph classes. The other subpackages (such as
+:mod:`stellargraph.layer` and :mod:`stellargraph.mapper`, which require TensorFlow) are imported
+on first access, so ``from stellargraph import StellarGraph`` and ``stellargraph.data`` can be used
+without paying for the slow TensorFlow import.
+"""
+
 __all__ = [
     "data",
     "datasets",
@@ -24,6 +33,7 @@ __all__ = [
     "losses",
     "layer",
     "mapper",
+    "profiling",
     "utils",
     "custom_keras_layers",
     "StellarDiGraph",
@@ -32,84 +42,96 @@ __all__ = [
     "__version__",
 ]
 
+import importlib
+import warnings
+
 # Version
 from .version import __version__
 
-# Import modules
-from stellargraph import (
-    data,
-    calibration,
-    datasets,
-    ensemble,
-    interpretability,
-    losses,
-    layer,
-    mapper,
-    utils,
-)
-
 # Top-level imports
+from stellargraph import profiling
 from stellargraph.core.graph import StellarGraph, StellarDiGraph
-from stellargraph.core.indexed_array import IndexedArray
+from stellargraph.core.indexed_array import IndexedArray, QuantizedIndexedArray
 from stellargraph.core.schema import GraphSchema
-import warnings
 
-# Custom layers for keras deserialization (this is computed from a manual list to make it clear
-# what's included)
-
-# the `link_inference` module is shadowed in `sg.layer` by the `link_inference` function, so these
-# layers need to be manually imported
-from .layer.link_inference import (
-    LinkEmbedding as _LinkEmbedding,
-    LeakyClippedLinear as _LeakyClippedLinear,
-)
-
-custom_keras_layers = {
-    class_.__name__: class_
-    for class_ in [
-        layer.GraphConvolution,
-        layer.ClusterGraphConvolution,
-        layer.GraphAttention,
-        layer.GraphAttentionSparse,
-        layer.SqueezedSparseConversion,
-        layer.graphsage.MeanAggregator,
-        layer.graphsage.MaxPoolingAggregator,
-        layer.graphsage.MeanPoolingAggregator,
-        layer.graphsage.AttentionalAggregator,
-        layer.hinsage.MeanHinAggregator,
-        layer.rgcn.RelationalGraphConvolution,
-        layer.ppnp.PPNPPropagationLayer,
-        layer.appnp.APPNPPropagationLayer,
-        layer.misc.GatherIndices,
-        layer.deep_graph_infomax.DGIDiscriminator,
-        layer.deep_graph_infomax.DGIReadout,
-        layer.graphsage.GraphSAGEAggregator,
-        layer.knowledge_graph.ComplExScore,
-        layer.knowledge_graph.DistMultScore,
-        layer.knowledge_graph.RotatEScore,
-        layer.knowledge_graph.RotHEScore,
-        layer.preprocessing_layer.GraphPreProcessingLayer,
-        layer.preprocessing_layer.SymmetricGraphPreProcessingLayer,
-        layer.watch_your_step.AttentiveWalk,
-        layer.sort_pooling.SortPooling,
-        layer.gcn_lstm.FixedAdjacencyGraphConvolution,
-        _LinkEmbedding,
-        _LeakyClippedLinear,
-    ]
+# Modules that are imported on first access, via __getattr__ (PEP 562)
+_LAZY_SUBMODULES = {
+    "data",
+    "calibration",
+    "datasets",
+    "ensemble",
+    "interpretability",
+    "losses",
+    "layer",
+    "mapper",
+    "utils",
 }
-"""
-A dictionary of the ``tensorflow.keras`` layers defined by StellarGraph.
 
-When Keras models using StellarGraph layers are saved, they can be loaded by passing this value to
-the ``custom_objects`` parameter to model loading functions like
-``tensorflow.keras.models.load_model``.
 
-Example::
+def _custom_keras_layers():
+    # Custom layers for keras deserialization (this is computed from a manual list to make it clear
+    # what's included)
+    from stellargraph import layer
 
-    import stellargraph as sg
-    from tensorflow import keras
-    keras.models.load_model("/path/to/model", custom_objects=sg.custom_keras_layers)
-"""
+    # the `link_inference` module is shadowed in `sg.layer` by the `link_inference` function, so
+    # these layers need to be manually imported
+    from .layer.link_inference import (
+        LinkEmbedding as _LinkEmbedding,
+        LeakyClippedLinear as _LeakyClippedLinear,
+    )
+
+    return {
+        class_.__name__: class_
+        for class_ in [
+            layer.GraphConvolution,
+            layer.ClusterGraphConvolution,
+            layer.GraphAttention,
+            layer.GraphAttentionSparse,
+            layer.SqueezedSparseConversion,
+            layer.graphsage.MeanAggregator,
+            layer.graphsage.MaxPoolingAggregator,
+            layer.graphsage.MeanPoolingAggregator,
+            layer.graphsage.AttentionalAggregator,
+            layer.hinsage.MeanHinAggregator,
+            layer.rgcn.RelationalGraphConvolution,
+            layer.ppnp.PPNPPropagationLayer,
+            layer.appnp.APPNPPropagationLayer,
+            layer.misc.GatherIndices,
+            layer.deep_graph_infomax.DGIDiscriminator,
+            layer.deep_graph_infomax.DGIReadout,
+            layer.graphsage.GraphSAGEAggregator,
+            layer.knowledge_graph.ComplExScore,
+            layer.knowledge_graph.DistMultScore,
+            layer.knowledge_graph.RotatEScore,
+            layer.knowledge_graph.RotHEScore,
+            layer.preprocessing_layer.GraphPreProcessingLayer,
+            layer.preprocessing_layer.SymmetricGraphPreProcessingLayer,
+            layer.watch_your_step.AttentiveWalk,
+            layer.sort_pooling.SortPooling,
+            layer.sort_pooling.SegmentAveragePooling,
+            layer.gcn_lstm.FixedAdjacencyGraphConvolution,
+            _LinkEmbedding,
+            _LeakyClippedLinear,
+        ]
+    }
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        # importing a submodule also sets it as an attribute of this module, so this is only
+        # called on the first access
+        return importlib.import_module(f"{__name__}.{name}")
+
+    if name == "custom_keras_layers":
+        # see docs/api.rst for the documentation of this value
+        value = globals()[name] = _custom_keras_layers()
+        return value
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | _LAZY_SUBMODULES | {"custom_keras_layers"})
 
 
 def _top_level_deprecation_warning(name, path):
@@ -123,29 +145,29 @@ def _top_level_deprecation_warning(name, path):
 
 def expected_calibration_error(*args, **kwargs):
     _top_level_deprecation_warning("expected_calibration_error", "calibration")
-    return calibration.expected_calibration_error(*args, **kwargs)
+    return __getattr__("calibration").expected_calibration_error(*args, **kwargs)
 
 
 def plot_reliability_diagram(*args, **kwargs):
     _top_level_deprecation_warning("plot_reliability_diagram", "calibration")
-    return calibration.plot_reliability_diagram(*args, **kwargs)
+    return __getattr__("calibration").plot_reliability_diagram(*args, **kwargs)
 
 
 def Ensemble(*args, **kwargs):
     _top_level_deprecation_warning("Ensemble", "ensemble")
-    return ensemble.Ensemble(*args, **kwargs)
+    return __getattr__("ensemble").Ensemble(*args, **kwargs)
 
 
 def BaggingEnsemble(*args, **kwargs):
     _top_level_deprecation_warning("BaggingEnsemble", "ensemble")
-    return ensemble.BaggingEnsemble(*args, **kwargs)
+    return __getattr__("ensemble").BaggingEnsemble(*args, **kwargs)
 
 
 def TemperatureCalibration(*args, **kwargs):
     _top_level_deprecation_warning("TemperatureCalibration", "calibration")
-    return calibration.TemperatureCalibration(*args, **kwargs)
+    return __getattr__("calibration").TemperatureCalibration(*args, **kwargs)
 
 
 def IsotonicCalibration(*args, **kwargs):
     _top_level_deprecation_warning("IsotonicCalibration", "calibration")
-    return calibration.IsotonicCalibration(*args, **kwargs)
+    return __getattr__("calibration").IsotonicCalibration(*args, **kwargs)
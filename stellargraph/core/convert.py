@@ -21,10 +21,11 @@ import warnings
 
 import numpy as np
 import pandas as pd
+import scipy.sparse as sps
 
 from ..globalvar import SOURCE, TARGET, WEIGHT, TYPE_ATTR_NAME
-from .element_data import NodeData, EdgeData
-from .indexed_array import IndexedArray
+from .element_data import NodeData, EdgeData, ExternalIdIndex
+from .indexed_array import IndexedArray, QuantizedIndexedArray
 from .validation import comma_sep, require_dataframe_has_columns
 from .utils import (
     is_real_iterable,
@@ -80,7 +81,7 @@ class ColumnarConverter:
     def _convert_single(self, type_name, data):
         if isinstance(data, pd.DataFrame):
             return self._convert_pandas(type_name, data)
-        elif isinstance(data, (IndexedArray, np.ndarray)):
+        elif isinstance(data, (IndexedArray, np.ndarray)) or sps.issparse(data):
             return self._convert_rowframe(type_name, data)
         else:
             raise TypeError(
@@ -137,20 +138,25 @@ class ColumnarConverter:
         return ids, columns, features
 
     def _convert_rowframe(self, type_name, data):
-        assert isinstance(data, (IndexedArray, np.ndarray))
+        assert isinstance(data, (IndexedArray, np.ndarray)) or sps.issparse(data)
         if self.selected_columns:
             raise ValueError(
                 f"{self.name(type_name)}: expected a Pandas DataFrame when selecting columns {comma_sep(self.selected_columns)}, found {type(data).__name__}"
             )
 
-        if isinstance(data, np.ndarray):
+        if isinstance(data, np.ndarray) or sps.issparse(data):
+            kind = "NumPy array" if isinstance(data, np.ndarray) else "sparse matrix"
             try:
                 data = IndexedArray(data)
             except Exception as e:
                 raise ValueError(
-                    f"{self.name(type_name)}: could not convert NumPy array to a IndexedArray, see other error"
+                    f"{self.name(type_name)}: could not convert {kind} to a IndexedArray, see other error"
                 )
 
+        if isinstance(data, QuantizedIndexedArray):
+            # keep the compact values and how to decode them together, for the ElementData
+            return data.index, {}, data
+
         return data.index, {}, data.values
 
     def _ids_columns_and_type_info_from_singles(self, singles):
@@ -224,7 +230,9 @@ class ColumnarConverter:
         if self.type_column is not None:
             return self._convert_with_type_column(elements)
 
-        if isinstance(elements, (pd.DataFrame, IndexedArray, np.ndarray)):
+        if isinstance(
+            elements, (pd.DataFrame, IndexedArray, np.ndarray)
+        ) or sps.issparse(elements):
             elements = {self.default_type: elements}
 
         if not isinstance(elements, dict):
@@ -319,6 +327,186 @@ def convert_edges(
     )
 
 
+def _array_column(name, values):
+    # NumPy arrays are used as is, and Arrow arrays and pandas series are converted without copying
+    # where possible
+    column = np.asarray(values)
+    if len(column.shape) != 1:
+        raise ValueError(f"{name}: expected rank-1 array, found shape {column.shape}")
+    return column
+
+
+def _node_ilocs_column(name, values):
+    column = _array_column(name, values)
+    if column.dtype.kind not in "iu":
+        raise TypeError(
+            f"{name}: expected integer node IDs, found dtype '{column.dtype}'"
+        )
+    return column
+
+
+def _type_codes(name, values):
+    """
+    Compute the (sorted) names of the types in ``values``, along with an array of small integer
+    codes, where ``codes[i]`` is the position of the type of element ``i`` in the names.
+    """
+    if isinstance(values, (pd.Series, pd.Index)):
+        values = values.array
+
+    if isinstance(values, pd.Categorical):
+        codes = values.codes
+        names = list(values.categories)
+    elif hasattr(values, "indices") and hasattr(values, "dictionary"):
+        # a pyarrow.DictionaryArray, which, like a categorical, has already done the hashing
+        codes = _array_column(name, values.indices)
+        names = values.dictionary.to_pylist()
+    else:
+        # this sorts every value, so categoricals or dictionary arrays are faster
+        names, codes = np.unique(_array_column(name, values), return_inverse=True)
+        return list(names), codes.astype(np.min_scalar_type(len(names)))
+
+    if len(codes) > 0 and codes.min() < 0:
+        raise ValueError(f"{name}: expected every element to have a type, found nulls")
+
+    # only include the types that are used, in sorted order, to match the other constructors
+    used = np.flatnonzero(np.bincount(codes, minlength=len(names)))
+    order = sorted(used, key=lambda code: names[code])
+
+    small_dtype = np.min_scalar_type(len(order))
+    if len(order) != len(names) or any(code != i for i, code in enumerate(order)):
+        remap = np.zeros(len(names), dtype=small_dtype)
+        remap[order] = np.arange(len(order))
+        codes = remap[codes]
+    else:
+        codes = codes.astype(small_dtype, copy=False)
+
+    return [names[code] for code in order], codes
+
+
+def from_arrays(
+    sources,
+    targets,
+    *,
+    weights,
+    edge_types,
+    number_of_nodes,
+    node_features,
+    node_type_default,
+    edge_type_default,
+    dtype,
+):
+    """
+    Convert edges as columns of integer node IDs in ``[0, number_of_nodes)`` directly into
+    ``NodeData`` and ``EdgeData``.
+
+    The node IDs are their own ilocs, so no hashing is required, and the edges are grouped by type
+    with a single stable sort, which is skipped if they're already grouped.
+    """
+    sources = _node_ilocs_column("sources", sources)
+    targets = _node_ilocs_column("targets", targets)
+
+    num_edges = len(sources)
+    if len(targets) != num_edges:
+        raise ValueError(
+            f"targets: expected the same length as sources ({num_edges}), found length {len(targets)}"
+        )
+
+    if node_features is not None and number_of_nodes is None:
+        number_of_nodes = node_features.shape[0]
+
+    if num_edges > 0:
+        smallest = min(sources.min(), targets.min())
+        largest = max(sources.max(), targets.max())
+        if number_of_nodes is None:
+            number_of_nodes = int(largest) + 1
+
+        if smallest < 0 or largest >= number_of_nodes:
+            raise ValueError(
+                f"sources, targets: expected node IDs in the range [0, {number_of_nodes}), found IDs from {smallest} to {largest}"
+            )
+    elif number_of_nodes is None:
+        number_of_nodes = 0
+
+    if node_features is None:
+        node_features = zero_sized_array((number_of_nodes, 0), dtype)
+
+    nodes = NodeData(
+        ExternalIdIndex(pd.RangeIndex(number_of_nodes)),
+        [(node_type_default, node_features)],
+    )
+
+    edges = edge_data_from_ilocs(
+        sources,
+        targets,
+        weights=weights,
+        edge_types=edge_types,
+        nodes=nodes,
+        edge_type_default=edge_type_default,
+        dtype=dtype,
+    )
+    return nodes, edges
+
+
+def edge_data_from_ilocs(
+    sources, targets, *, weights, edge_types, nodes, edge_type_default, dtype
+) -> EdgeData:
+    """
+    Create ``EdgeData`` from arrays of valid node ilocs in ``nodes``, grouping the edges by type
+    with a single stable sort (skipped if they're already grouped). The ID of each edge is its
+    position in the arrays.
+    """
+    num_edges = len(sources)
+
+    if weights is None:
+        weights = np.broadcast_to(DEFAULT_WEIGHT, num_edges)
+    else:
+        weights = _array_column("weights", weights)
+        if not pd.api.types.is_numeric_dtype(weights):
+            raise TypeError(
+                f"weights: expected a numeric array, found dtype '{weights.dtype}'"
+            )
+        if len(weights) != num_edges:
+            raise ValueError(
+                f"weights: expected the same length as sources ({num_edges}), found length {len(weights)}"
+            )
+
+    # store the ilocs compactly, as the other constructors do
+    sources = sources.astype(nodes.ids.dtype, copy=False)
+    targets = targets.astype(nodes.ids.dtype, copy=False)
+
+    if edge_types is None:
+        type_names = [edge_type_default]
+        type_sizes = [num_edges]
+        ids = ExternalIdIndex(pd.RangeIndex(num_edges))
+    else:
+        type_names, codes = _type_codes("edge_types", edge_types)
+        if len(codes) != num_edges:
+            raise ValueError(
+                f"edge_types: expected the same length as sources ({num_edges}), found length {len(codes)}"
+            )
+
+        type_sizes = np.bincount(codes, minlength=len(type_names))
+
+        if (codes[1:] >= codes[:-1]).all():
+            # already grouped by type
+            ids = ExternalIdIndex(pd.RangeIndex(num_edges))
+        else:
+            # the codes are small integers, so this stable sort is a (linear time) radix sort
+            sorting = np.argsort(codes, kind="stable")
+            # each edge's ID is its position in the input; a permutation is unique by construction
+            ids = ExternalIdIndex(sorting, verify_unique=False)
+            sources = sources[sorting]
+            targets = targets[sorting]
+            weights = smart_array_index(weights, sorting)
+
+    type_info = [
+        (type_name, zero_sized_array((size, 0), dtype))
+        for type_name, size in zip(type_names, type_sizes)
+    ]
+
+    return EdgeData(ids, sources, targets, weights, type_info, len(nodes))
+
+
 SingleTypeNodeIdsAndFeatures = namedtuple(
     "SingleTypeNodeIdsAndFeatures", ["ids", "features"]
 )
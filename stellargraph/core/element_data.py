@@ -21,6 +21,7 @@ import pandas as pd
 import scipy.sparse as sps
 
 from ..globalvar import SOURCE, TARGET, WEIGHT, TYPE_ATTR_NAME
+from .indexed_array import QuantizedIndexedArray
 from .validation import require_dataframe_has_columns, comma_sep
 
 
@@ -31,14 +32,27 @@ class ExternalIdIndex:
 
     It is designed to allow handling only efficient integers internally, but easily convert between
     them and the user-facing IDs.
+
+    IDs that are exactly ``0, 1, ..., n - 1`` in order (such as a ``pandas.RangeIndex``) are their
+    own ilocs, and so are converted with arithmetic, without hashing or a lookup table.
+
+    Args:
+        ids (sequence): the IDs of each element
+        verify_unique (bool): if True, check that every ID appears once; this requires hashing
+            every ID, so can be skipped when the IDs are known to be unique by construction.
     """
 
-    def __init__(self, ids):
+    def __init__(self, ids, verify_unique=True):
         self._index = pd.Index(ids)
         # reserve 2 ^ (n-bits) - 1 for sentinel
         self.dtype = np.min_scalar_type(len(self._index))
 
-        if not self._index.is_unique:
+        index = self._index
+        self._is_identity = (
+            isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+        )
+
+        if verify_unique and not self._index.is_unique:
             # had some duplicated IDs, which is an error
             duplicated = self._index[self._index.duplicated()].unique()
             raise ValueError(
@@ -92,7 +106,11 @@ class ExternalIdIndex:
             represented by either the largest value of the dtype (if smaller_type is True) or -1 (if
             smaller_type is False)
         """
-        internal_ids = self._index.get_indexer(ids)
+        if self._is_identity:
+            internal_ids = self._identity_to_iloc(ids)
+        else:
+            internal_ids = self._index.get_indexer(ids)
+
         if strict:
             self.require_valid(ids, internal_ids)
 
@@ -102,13 +120,61 @@ class ExternalIdIndex:
             return internal_ids.astype(self.dtype)
         return internal_ids
 
+    def _identity_to_iloc(self, ids):
+        ids = np.asarray(ids)
+        if ids.dtype.kind not in "iu":
+            # something other than integers (e.g. strings, or integral floats), so use the general
+            # pandas path to match its equality semantics
+            return self._index.get_indexer(ids)
+
+        ids = ids.astype(np.int64, copy=False)
+        return np.where((ids >= 0) & (ids < len(self)), ids, -1)
+
     def from_iloc(self, internal_ids) -> np.ndarray:
         """
         Convert integer locations to their corresponding external ID.
         """
+        if self._is_identity and not isinstance(internal_ids, tuple):
+            # avoid materialising the whole index, while matching the behaviour of indexing it
+            # (a tuple is a multi-dimensional selector, e.g. from `np.where`)
+            selector = np.asarray(internal_ids)
+            if selector.dtype == bool and selector.shape == (len(self),):
+                return np.flatnonzero(selector)
+
+            if selector.dtype.kind in "iu":
+                ilocs = selector.astype(np.int64)
+                ilocs = np.where(ilocs < 0, ilocs + len(self), ilocs)
+                if ilocs.size > 0 and (ilocs.min() < 0 or ilocs.max() >= len(self)):
+                    raise IndexError(
+                        f"internal_ids: expected ilocs in the range [0, {len(self)}), found {selector[(ilocs < 0) | (ilocs >= len(self))]}"
+                    )
+                # `[()]` turns a 0-d array into a scalar, like indexing with a single iloc
+                return ilocs[()]
+
         return self._index.to_numpy()[internal_ids]
 
 
+def _gather_rows(array, ilocs, sparse=False):
+    """
+    Select the rows ``ilocs`` of ``array``, returning an in-memory NumPy array.
+
+    Arrays backed by a file (``numpy.memmap``) are read in increasing row order, with each row read
+    at most once, so that a gather touches the file as sequentially as possible, rather than
+    seeking back and forth for each requested row. Rows of a sparse matrix are densified, unless
+    ``sparse`` is True, in which case they're returned as a CSR matrix.
+    """
+    if sps.issparse(array):
+        rows = array[ilocs]
+        return rows if sparse else rows.toarray()
+
+    if isinstance(array, np.memmap):
+        unique_ilocs, inverse = np.unique(ilocs, return_inverse=True)
+        rows = np.asarray(array[unique_ilocs, ...])
+        return rows[inverse.reshape(np.shape(ilocs))]
+
+    return array[ilocs, ...]
+
+
 class ElementData:
     """
     An ``ElementData`` stores "shared" information about a set of a graph elements (nodes or
@@ -119,9 +185,15 @@ class ElementData:
     of raw numpy arrays, because indexing such arrays is significantly (orders of magnitude) faster
     than indexing pandas dataframes, series or indices.
 
+    The feature arrays may be memory-mapped (``numpy.memmap``), in which case they stay on disk and
+    only the rows requested through :meth:`features` are read into memory. They may also be stored
+    compactly in a :class:`.QuantizedIndexedArray`, in which case only the rows requested through
+    :meth:`features` are decoded. Or, they may be a SciPy sparse matrix in CSR format, in which
+    case only the rows requested through :meth:`features` are densified.
+
     Args:
-        ids (sequence): the IDs of each element
-        type_info (list of tuple of type name, numpy array): the associated feature vectors of each type, where the size of the first dimension defines the elements of that type
+        ids (sequence or ExternalIdIndex): the IDs of each element
+        type_info (list of tuple of type name, numpy array, sparse matrix or QuantizedIndexedArray): the associated feature vectors of each type, where the size of the first dimension defines the elements of that type
     """
 
     def __init__(self, ids, type_info):
@@ -132,6 +204,7 @@ class ElementData:
 
         type_ranges = {}
         features = {}
+        decoders = {}
         all_types = []
         type_sizes = []
 
@@ -139,7 +212,13 @@ class ElementData:
 
         # validation
         for type_name, data in type_info:
-            if not isinstance(data, np.ndarray):
+            if isinstance(data, QuantizedIndexedArray):
+                decoders[type_name] = data
+                data = data.values
+
+            if sps.issparse(data):
+                data = data.tocsr()
+            elif not isinstance(data, np.ndarray):
                 raise TypeError(
                     f"type_info (for {type_name!r}): expected numpy array, found {type(data).__name__}"
                 )
@@ -165,7 +244,10 @@ class ElementData:
                 f"type_info: expected features for each of the {len(ids)} IDs, found a total of {rows_so_far} features"
             )
 
-        self._id_index = ExternalIdIndex(ids)
+        if isinstance(ids, ExternalIdIndex):
+            self._id_index = ids
+        else:
+            self._id_index = ExternalIdIndex(ids)
 
         # there's typically a small number of types, so we can map them down to a small integer type
         # (usually uint8) for minimum storage requirements
@@ -174,6 +256,7 @@ class ElementData:
         self._type_element_ilocs = type_ranges
 
         self._features = features
+        self._decoders = decoders
 
     def __len__(self) -> int:
         return len(self._id_index)
@@ -225,22 +308,37 @@ class ElementData:
         type_codes = self._type_column[id_ilocs]
         return self._type_index.from_iloc(type_codes)
 
-    def features_of_type(self, type_name) -> np.ndarray:
+    def _decode(self, type_name, features):
+        decoder = self._decoders.get(type_name)
+        if decoder is None:
+            return features
+        return decoder.decode(features)
+
+    def features_of_type(self, type_name, sparse=False) -> np.ndarray:
         """
         Returns all features for a given type.
 
+        This does not copy, so a memory-mapped feature array is returned as is, without reading it
+        into memory. Compactly stored features are the exception, and are decoded in full, as are
+        sparse features, unless ``sparse`` is True.
+
         Args:
             type_name (hashable): the name of the type
+            sparse (bool): if True, sparse features are returned as a SciPy CSR matrix
         """
-        return self._features[type_name]
+        features = self._features[type_name]
+        if sps.issparse(features) and not sparse:
+            return features.toarray()
+        return self._decode(type_name, features)
 
-    def features(self, type_name, id_ilocs) -> np.ndarray:
+    def features(self, type_name, id_ilocs, sparse=False) -> np.ndarray:
         """
         Return features for a set of IDs within a given type.
 
         Args:
             type_name (hashable): the name of the type for all of the IDs
             ids (iterable of IDs): a sequence of IDs of elements of type type_name
+            sparse (bool): if True, sparse features are returned as a SciPy CSR matrix
 
         Returns:
             A 2D numpy array, where the rows correspond to the ids
@@ -254,19 +352,26 @@ class ElementData:
             raise ValueError("unknown IDs")
 
         try:
-            return self._features[type_name][feature_ilocs, :]
+            rows = _gather_rows(self._features[type_name], feature_ilocs, sparse)
         except IndexError:
             # some of the indices were too large (from a later type)
             raise ValueError("unknown IDs")
 
+        return self._decode(type_name, rows)
+
     def feature_info(self):
         """
         Returns:
              A dictionary of type_name to a tuple of an integer representing the size of the
              features of that type, and the dtype of the features.
         """
+
+        def dtype(type_name, type_features):
+            decoder = self._decoders.get(type_name)
+            return type_features.dtype if decoder is None else decoder.dtype
+
         return {
-            type_name: (type_features.shape[1:], type_features.dtype)
+            type_name: (type_features.shape[1:], dtype(type_name, type_features))
             for type_name, type_features in self._features.items()
         }
 
@@ -301,7 +406,7 @@ class FlatAdjacencyList:
 class EdgeData(ElementData):
     """
     Args:
-        ids (sequence): the IDs of each element
+        ids (sequence or ExternalIdIndex): the IDs of each element
         sources (numpy.ndarray): the ilocs of the source of each edge
         targets (numpy.ndarray): the ilocs of the target of each edge
         weight (numpy.ndarray): the weight of each edge
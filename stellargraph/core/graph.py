@@ -27,26 +27,29 @@ import numpy as np
 import scipy.sparse as sps
 import warnings
 
-from .. import globalvar
+from .. import globalvar, profiling
 from .schema import GraphSchema, EdgeType
 from .experimental import experimental, ExperimentalWarning
 from .element_data import NodeData, EdgeData, ExternalIdIndex
 from .utils import is_real_iterable
 from .validation import comma_sep, separated
-from . import convert
+from . import convert, streaming
 
 
 NeighbourWithWeight = namedtuple("NeighbourWithWeight", ["node", "weight"])
 
 
-def extract_element_features(element_data, unique, name, ids, type, use_ilocs):
+@profiling.instrument(count_bytes=True)
+def extract_element_features(
+    element_data, unique, name, ids, type, use_ilocs, sparse=False
+):
     if ids is None:
         if type is None:
             type = unique(
                 f"{name}_type: in a non-homogeneous graph, expected a {name} type and/or '{name}s' to be passed; found neither '{name}_type' nor '{name}s', and the graph has {name} types: %(found)s"
             )
 
-        return element_data.features_of_type(type)
+        return element_data.features_of_type(type, sparse)
 
     ids = np.asarray(ids)
 
@@ -82,7 +85,7 @@ def extract_element_features(element_data, unique, name, ids, type, use_ilocs):
             type = types[0]
 
     if all_valid:
-        return element_data.features(type, valid_ilocs)
+        return element_data.features(type, valid_ilocs, sparse)
 
     # If there's some invalid values, they get replaced by zeros; this is designed to allow
     # models that build fixed-size structures (e.g. GraphSAGE) based on neighbours to fill out
@@ -96,7 +99,18 @@ def extract_element_features(element_data, unique, name, ids, type, use_ilocs):
         non_nones = ids != None
         element_data.ids.require_valid(ids[non_nones], ilocs[non_nones])
 
-    sampled = element_data.features(type, valid_ilocs)
+    sampled = element_data.features(type, valid_ilocs, sparse)
+    if sps.issparse(sampled):
+        # spread the rows out to the positions of the valid IDs, leaving the others empty
+        placement = sps.csr_matrix(
+            (
+                np.ones(len(valid_ilocs)),
+                (np.flatnonzero(valid), np.arange(len(valid_ilocs))),
+            ),
+            shape=(len(ids), len(valid_ilocs)),
+        )
+        return placement @ sampled
+
     features = np.zeros((len(ids), sampled.shape[1]))
     features[valid] = sampled
 
@@ -291,7 +305,12 @@ class StellarGraph:
             types.  For nodes with no features, an appropriate value can be created with
             ``IndexedArray(index=node_ids)``, where ``node_ids`` is a list of the node
             IDs. If this is not passed, the nodes will be inferred from ``edges`` with no features
-            for each node.
+            for each node. Features that don't fit in memory can be stored in a memory-mapped NumPy
+            array (``numpy.memmap``) inside an :class:`.IndexedArray`, and will be read from disk
+            lazily, as they are used. Features can be stored compactly (for instance, as
+            ``float16`` or quantized 8-bit integers) with a :class:`.QuantizedIndexedArray`, and
+            will be decoded as they are used. Sparse features (for instance, bag-of-words vectors)
+            can be passed as a SciPy sparse matrix, directly or inside an :class:`.IndexedArray`.
 
         edges (DataFrame or dict of hashable to Pandas DataFrame, optional):
             An edge list for each type of edges as a Pandas DataFrame containing a source, target
@@ -590,6 +609,229 @@ class StellarGraph:
             nodes=nodes, edges=edges, edge_weight_column=edge_weight_attr, dtype=dtype
         )
 
+    @staticmethod
+    def from_arrays(
+        sources,
+        targets,
+        *,
+        weights=None,
+        edge_types=None,
+        number_of_nodes=None,
+        node_features=None,
+        is_directed=False,
+        node_type_default=globalvar.NODE_TYPE_DEFAULT,
+        edge_type_default=globalvar.EDGE_TYPE_DEFAULT,
+        dtype="float32",
+    ):
+        """
+        Construct a ``StellarGraph`` from columns of edges, where the nodes are the integers ``0,
+        1, ..., number_of_nodes - 1``.
+
+        This is a faster and more memory efficient path than the constructor for large edge
+        lists, because the node IDs are their own integer locations: there's no hashing of IDs, no
+        intermediate pandas objects, and the edges are grouped by type with (at most) one sort. For
+        instance, with edges read from a Parquet file with ``pyarrow``::
+
+            table = pyarrow.parquet.read_table("edges.parquet")
+            graph = StellarGraph.from_arrays(
+                table["source"].to_numpy(),
+                table["target"].to_numpy(),
+                edge_types=table["label"].combine_chunks().dictionary_encode(),
+            )
+
+        The ID of each edge is its position in the input arrays.
+
+        Args:
+            sources (array of int): the node ID of the source of each edge, such as a NumPy or
+                Arrow array, or pandas Series
+            targets (array of int): the node ID of the target of each edge
+            weights (array of numbers, optional): the weight of each edge; if not specified, every
+                edge has weight 1
+            edge_types (array, optional): the type of each edge; if not specified, every edge has
+                type ``edge_type_default``. A pandas categorical or a ``pyarrow.DictionaryArray``
+                avoids sorting the types to find the unique values.
+            number_of_nodes (int, optional): the number of nodes; if not specified, this is the
+                number of rows of ``node_features`` or, if that's not specified, one more than the
+                largest node ID in ``sources`` and ``targets``
+            node_features (numpy array or scipy sparse matrix, optional): the features of each
+                node, with one row per node, in order of ID
+            is_directed (bool): if True, return a ``StellarDiGraph``, otherwise a ``StellarGraph``
+            node_type_default (str, optional): the type of every node
+            edge_type_default (str, optional): the type of edges when ``edge_types`` isn't specified
+            dtype (numpy data-type, optional): the data-type to use for empty feature arrays
+
+        Returns:
+            A ``StellarGraph`` (if ``is_directed`` is False) or ``StellarDiGraph`` (otherwise)
+            instance with the edges and nodes.
+        """
+        nodes, edges = convert.from_arrays(
+            sources,
+            targets,
+            weights=weights,
+            edge_types=edge_types,
+            number_of_nodes=number_of_nodes,
+            node_features=node_features,
+            node_type_default=node_type_default,
+            edge_type_default=edge_type_default,
+            dtype=dtype,
+        )
+
+        cls = StellarDiGraph if is_directed else StellarGraph
+        return cls(nodes, edges)
+
+    @staticmethod
+    def from_csv_chunks(
+        edges,
+        nodes=None,
+        *,
+        is_directed=False,
+        source_column=globalvar.SOURCE,
+        target_column=globalvar.TARGET,
+        edge_weight_column=globalvar.WEIGHT,
+        edge_type_column=None,
+        node_type_default=globalvar.NODE_TYPE_DEFAULT,
+        edge_type_default=globalvar.EDGE_TYPE_DEFAULT,
+        dtype="float32",
+    ):
+        """
+        Construct a ``StellarGraph`` from edges (and, optionally, nodes) that are read in chunks,
+        such as from ``pandas.read_csv`` with the ``chunksize`` parameter::
+
+            edges = pd.read_csv("edges.csv", chunksize=1000000)
+            graph = StellarGraph.from_csv_chunks(edges, edge_type_column="label")
+
+        Each chunk is converted to compact arrays as soon as it is read, with the node IDs mapped to
+        integers incrementally, so the peak memory use is close to the size of the final graph,
+        rather than needing all of the data in memory as DataFrames at once (which can be several
+        times larger). See :meth:`from_files` to read files directly.
+
+        Each chunk is in the same format as the ``edges`` and ``nodes`` DataFrames passed to the
+        :class:`.StellarGraph` constructor, except that edges don't support features: columns
+        of the edges other than the source, target, weight and type columns are ignored. The ID of
+        each edge is its position in the sequence of all edges.
+
+        Args:
+            edges (iterable of DataFrame): chunks of edges, with columns for the source and target,
+                and optionally the weight and type, of each edge
+            nodes (iterable of DataFrame, or dict of hashable to iterable of DataFrame, optional):
+                chunks of nodes, indexed by node ID, with the node features as columns; use a
+                dictionary with an iterable for each node type for a graph with multiple node types.
+                If not specified, the nodes are inferred from the edges, in order of first
+                appearance, and have no features.
+            is_directed (bool): if True, return a ``StellarDiGraph``, otherwise a ``StellarGraph``
+            source_column (hashable, optional): the name of the column that holds the source of
+                each edge
+            target_column (hashable, optional): the name of the column that holds the target of
+                each edge
+            edge_weight_column (hashable, optional): the name of the column that holds the weight of
+                each edge; if a chunk doesn't have this column, its edges have weight 1
+            edge_type_column (hashable, optional): the name of the column that holds the type of
+                each edge; if not specified, every edge has type ``edge_type_default``
+            node_type_default (hashable, optional): the type of the nodes, when ``nodes`` isn't a
+                dictionary
+            edge_type_default (hashable, optional): the type of the edges, when
+                ``edge_type_column`` isn't specified
+            dtype (numpy data-type, optional): the data-type to use for the node features
+
+        Returns:
+            A ``StellarGraph`` (if ``is_directed`` is False) or ``StellarDiGraph`` (otherwise)
+            instance with the edges and nodes.
+        """
+        internal_nodes, internal_edges = streaming.from_dataframe_chunks(
+            edges,
+            nodes,
+            source_column=source_column,
+            target_column=target_column,
+            weight_column=edge_weight_column,
+            type_column=edge_type_column,
+            node_type_default=node_type_default,
+            edge_type_default=edge_type_default,
+            dtype=dtype,
+        )
+
+        cls = StellarDiGraph if is_directed else StellarGraph
+        return cls(internal_nodes, internal_edges)
+
+    @staticmethod
+    def from_files(
+        edge_paths,
+        node_paths=None,
+        *,
+        is_directed=False,
+        node_id_column="id",
+        source_column=globalvar.SOURCE,
+        target_column=globalvar.TARGET,
+        edge_weight_column=globalvar.WEIGHT,
+        edge_type_column=None,
+        node_type_default=globalvar.NODE_TYPE_DEFAULT,
+        edge_type_default=globalvar.EDGE_TYPE_DEFAULT,
+        dtype="float32",
+        chunk_size=1000000,
+        processes=None,
+        read_kwargs=None,
+    ):
+        """
+        Construct a ``StellarGraph`` by streaming edges (and, optionally, nodes) from CSV or
+        Parquet files in chunks, so that the peak memory use is close to the size of the final
+        graph::
+
+            graph = StellarGraph.from_files(
+                ["edges-0.csv", "edges-1.csv"], "nodes.csv", edge_type_column="label"
+            )
+
+        Files with a ``.parquet`` or ``.pq`` extension are read as Parquet, which requires the
+        ``pyarrow`` module, and all others are read as CSV, with ``pandas.read_csv``. The
+        interpretation of each chunk is the same as :meth:`from_csv_chunks`.
+
+        Args:
+            edge_paths (str or list of str): the path(s) of the edge files, which have columns for
+                the source and target, and optionally the weight and type, of each edge
+            node_paths (str, list of str, or dict of hashable to str or list of str, optional): the
+                path(s) of the node files, which have a column ``node_id_column`` with the node ID,
+                and the other columns are node features; use a dictionary with the path(s) for each
+                node type for a graph with multiple node types. If not specified, the nodes are
+                inferred from the edges.
+            is_directed (bool): if True, return a ``StellarDiGraph``, otherwise a ``StellarGraph``
+            node_id_column (hashable, optional): the name of the column of the node files that holds
+                the ID of each node
+            source_column (hashable, optional): see :meth:`from_csv_chunks`
+            target_column (hashable, optional): see :meth:`from_csv_chunks`
+            edge_weight_column (hashable, optional): see :meth:`from_csv_chunks`
+            edge_type_column (hashable, optional): see :meth:`from_csv_chunks`
+            node_type_default (hashable, optional): see :meth:`from_csv_chunks`
+            edge_type_default (hashable, optional): see :meth:`from_csv_chunks`
+            dtype (numpy data-type, optional): the data-type to use for the node features
+            chunk_size (int): the number of rows to read from a file at a time
+            processes (int, optional): if specified, parse the files in a pool of this many
+                processes, with each file parsed by one process; this only helps when there are
+                several files. Only a few files are parsed ahead of the one being added to the
+                graph, to bound the memory used for parsed chunks.
+            read_kwargs (dict, optional): additional keyword arguments for ``pandas.read_csv`` (such
+                as ``sep``) or ``pyarrow.parquet.ParquetFile.iter_batches`` (such as ``columns``)
+
+        Returns:
+            A ``StellarGraph`` (if ``is_directed`` is False) or ``StellarDiGraph`` (otherwise)
+            instance with the edges and nodes.
+        """
+        internal_nodes, internal_edges = streaming.from_files(
+            edge_paths,
+            node_paths,
+            node_id_column=node_id_column,
+            source_column=source_column,
+            target_column=target_column,
+            weight_column=edge_weight_column,
+            type_column=edge_type_column,
+            node_type_default=node_type_default,
+            edge_type_default=edge_type_default,
+            dtype=dtype,
+            chunk_size=chunk_size,
+            processes=processes,
+            read_kwargs=read_kwargs,
+        )
+
+        cls = StellarDiGraph if is_directed else StellarGraph
+        return cls(internal_nodes, internal_edges)
+
     # customise how a missing attribute is handled to give better error messages for the NetworkX
     # -> no NetworkX transition.
     def __getattr__(self, item):
@@ -1200,6 +1442,7 @@ class StellarGraph:
 
         # TODO: check the feature node_ids against the graph node ids?
 
+    @profiling.instrument()
     def node_ids_to_ilocs(self, nodes):
         """
         Get the :ref:`node ilocs <iloc-explanation>` for the specified node or nodes.
@@ -1224,7 +1467,7 @@ class StellarGraph:
         """
         return self._nodes.ids.from_iloc(node_ilocs)
 
-    def node_features(self, nodes=None, node_type=None, use_ilocs=False):
+    def node_features(self, nodes=None, node_type=None, use_ilocs=False, sparse=False):
         """
         Get the numeric feature vectors for the specified nodes or node type.
 
@@ -1251,15 +1494,26 @@ class StellarGraph:
         Args:
             nodes (list or hashable, optional): Node ID or list of node IDs, all of the same type
             node_type (hashable, optional): the type of the nodes.
+            use_ilocs (bool): if True, ``nodes`` are treated as :ref:`node ilocs <iloc-explanation>`.
+            sparse (bool): if True and the features are stored sparsely, return them as a SciPy CSR
+                matrix, rather than densifying them. Features stored densely are always returned as a
+                NumPy array.
 
         Returns:
-            Numpy array containing the node features for the requested nodes or node type.
+            Numpy array (or SciPy CSR matrix, see ``sparse``) containing the node features for the
+            requested nodes or node type.
         """
         return extract_element_features(
-            self._nodes, self.unique_node_type, "node", nodes, node_type, use_ilocs
+            self._nodes,
+            self.unique_node_type,
+            "node",
+            nodes,
+            node_type,
+            use_ilocs,
+            sparse,
         )
 
-    def edge_features(self, edges=None, edge_type=None, use_ilocs=False):
+    def edge_features(self, edges=None, edge_type=None, use_ilocs=False, sparse=False):
         """
         Get the numeric feature vectors for the specified edges or edge type.
 
@@ -1286,12 +1540,23 @@ class StellarGraph:
         Args:
             edges (list or hashable, optional): Edge ID or list of edge IDs, all of the same type
             edge_type (hashable, optional): the type of the edges.
+            use_ilocs (bool): if True, ``edges`` are treated as :ref:`edge ilocs <iloc-explanation>`.
+            sparse (bool): if True and the features are stored sparsely, return them as a SciPy CSR
+                matrix, rather than densifying them. Features stored densely are always returned as a
+                NumPy array.
 
         Returns:
-            Numpy array containing the edge features for the requested edges or edge type.
+            Numpy array (or SciPy CSR matrix, see ``sparse``) containing the edge features for the
+            requested edges or edge type.
         """
         return extract_element_features(
-            self._edges, self.unique_edge_type, "edge", edges, edge_type, use_ilocs
+            self._edges,
+            self.unique_edge_type,
+            "edge",
+            edges,
+            edge_type,
+            use_ilocs,
+            sparse,
         )
 
     ##################################################################
@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import numpy as np
+import scipy.sparse as sps
 
 from .utils import zero_sized_array
 
@@ -37,9 +38,17 @@ class IndexedArray:
 
     - less overhead (but less API) than a Pandas DataFrame
 
+    - support for data that doesn't fit in memory, by using a memory-mapped array for ``values``
+      (for instance, ``numpy.load(path, mmap_mode="r")``); this is passed through to
+      :class:`.StellarGraph` without being read into memory, and only the rows that are used (for
+      instance, by a generator) are read from disk
+
+    - support for sparse data, by using a SciPy sparse matrix for ``values``, which is stored in
+      CSR format; this is useful for features that are mostly zero, like bag-of-words vectors
+
     Args:
         values (numpy.ndarray, optional): an array of rank at least 2 of data, where the first axis
-            is indexed.
+            is indexed. This may be a ``numpy.memmap``, or a SciPy sparse matrix.
 
         index (sequence, optional): a sequence of labels or IDs, one for each element of the first
             axis. If not specified, this defaults to sequential integers starting at 0
@@ -62,9 +71,12 @@ class IndexedArray:
             # uint8 is essentially maximally promotable
             values = zero_sized_array((index_len(), 0), dtype=np.uint8)
 
-        if not isinstance(values, np.ndarray):
+        if sps.issparse(values):
+            # rows are gathered much more efficiently from CSR than any other sparse format
+            values = values.tocsr()
+        elif not isinstance(values, np.ndarray):
             raise TypeError(
-                f"values: expected a NumPy array for the features, found {type(values).__name__}"
+                f"values: expected a NumPy array or SciPy sparse matrix for the features, found {type(values).__name__}"
             )
 
         if len(values.shape) < 2:
@@ -84,3 +96,143 @@ class IndexedArray:
 
         self.index = index
         self.values = values
+
+
+class QuantizedIndexedArray(IndexedArray):
+    """
+    An :class:`.IndexedArray` that stores its values compactly, and expands them to a wider type
+    (``dtype``) only when they're read.
+
+    The stored ``values`` are decoded as ``values.astype(dtype) * scale + offset``, where ``scale``
+    and ``offset`` are broadcast against the shape of each element (for instance, one per column
+    for feature vectors). This allows storing features as ``float16`` (with no scale or offset), or
+    as 8-bit integers with a per-column affine quantization, to reduce memory use and memory
+    bandwidth by a factor of 2 or 4 compared to ``float32``. When used as node or edge features in
+    a :class:`.StellarGraph`, only the rows gathered for a batch are decoded.
+
+    Use :meth:`quantize` to compute a quantization of a floating point array.
+
+    Args:
+        values (numpy.ndarray, optional): an array of rank at least 2 of (compact) data, where the
+            first axis is indexed.
+
+        index (sequence, optional): a sequence of labels or IDs, one for each element of the first
+            axis. If not specified, this defaults to sequential integers starting at 0
+
+        scale (numpy.ndarray or float, optional): the multiplier to apply to the decoded values,
+            broadcast to ``values.shape[1:]``. Defaults to no scaling.
+
+        offset (numpy.ndarray or float, optional): the value to add to the decoded values, broadcast
+            to ``values.shape[1:]``. Defaults to no offset.
+
+        dtype (numpy dtype, optional): the type of the decoded values.
+    """
+
+    def __init__(
+        self, values=None, index=None, scale=None, offset=None, dtype=np.float32
+    ):
+        if sps.issparse(values):
+            raise TypeError(
+                f"values: expected a NumPy array for the compact values, found {type(values).__name__}"
+            )
+
+        super().__init__(values, index)
+
+        self.dtype = np.dtype(dtype)
+        if not np.issubdtype(self.dtype, np.floating):
+            raise TypeError(
+                f"dtype: expected a floating point type, found {self.dtype.name}"
+            )
+
+        element_shape = self.values.shape[1:]
+
+        def broadcast(name, value):
+            if value is None:
+                return None
+            try:
+                return np.broadcast_to(
+                    np.asarray(value, dtype=self.dtype), element_shape
+                )
+            except ValueError:
+                raise ValueError(
+                    f"{name}: expected a value that can be broadcast to the shape of each element {element_shape}, found shape {np.shape(value)}"
+                )
+
+        self.scale = broadcast("scale", scale)
+        self.offset = broadcast("offset", offset)
+
+    @classmethod
+    def quantize(cls, values, index=None, storage_dtype=np.uint8, dtype=np.float32):
+        """
+        Quantize ``values`` into a compact integer array, with an affine transformation computed
+        for each position in an element (for instance, each column of feature vectors).
+
+        Each position ``values[:, i, ...]`` is mapped linearly from ``[min, max]`` (over the first
+        axis) to the full range of ``storage_dtype``, so the maximum absolute error is half of
+        ``(max - min) / (2 ** bits - 1)``. Positions with a single unique value are represented
+        exactly.
+
+        Args:
+            values (numpy.ndarray): an array of rank at least 2 of floating point data, where the
+                first axis is indexed.
+
+            index (sequence, optional): a sequence of labels or IDs, one for each element of the
+                first axis.
+
+            storage_dtype (numpy dtype, optional): the integer type to store the quantized values.
+
+            dtype (numpy dtype, optional): the type of the decoded values.
+
+        Returns:
+            A :class:`.QuantizedIndexedArray` approximating ``values``.
+        """
+        values = np.asarray(values)
+        if len(values.shape) < 2:
+            raise ValueError(
+                f"values: expected an array with shape length >= 2, found shape {values.shape} of length {len(values.shape)}"
+            )
+
+        storage_dtype = np.dtype(storage_dtype)
+        if not np.issubdtype(storage_dtype, np.integer):
+            raise TypeError(
+                f"storage_dtype: expected an integer type, found {storage_dtype.name}"
+            )
+
+        info = np.iinfo(storage_dtype)
+        levels = float(info.max) - float(info.min)
+
+        if values.shape[0] == 0:
+            lowest = highest = np.zeros(values.shape[1:])
+        else:
+            lowest = values.min(axis=0).astype(np.float64)
+            highest = values.max(axis=0).astype(np.float64)
+
+        scale = (highest - lowest) / levels
+        # constant positions are represented exactly by the offset, with any scale
+        scale[scale == 0] = 1
+
+        # the stored integer `q` represents `(q - info.min) * scale + lowest`
+        offset = lowest - info.min * scale
+
+        quantized = np.rint((values - lowest) / scale) + info.min
+        quantized = np.clip(quantized, info.min, info.max).astype(storage_dtype)
+
+        return cls(quantized, index=index, scale=scale, offset=offset, dtype=dtype)
+
+    def decode(self, values):
+        """
+        Expand some compact stored values (for instance, a subset of the rows of ``self.values``)
+        to the decoded type.
+
+        Args:
+            values (numpy.ndarray): an array with elements of the same shape as ``self.values``
+
+        Returns:
+            A NumPy array of type ``self.dtype``.
+        """
+        decoded = values.astype(self.dtype)
+        if self.scale is not None:
+            decoded *= self.scale
+        if self.offset is not None:
+            decoded += self.offset
+        return decoded
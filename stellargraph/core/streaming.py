@@ -0,0 +1,580 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Building ``NodeData`` and ``EdgeData`` from data that is read in chunks, such as large CSV or
+Parquet files, so that the whole input never needs to be in memory at once.
+
+Each chunk is reduced to compact NumPy arrays as soon as it is read: the node IDs in a chunk are
+factorized into small integer codes, and the columns are appended to growable arrays, so the peak
+memory is close to the size of the final graph, rather than the size of the input as pandas
+DataFrames.
+"""
+
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from .convert import DEFAULT_WEIGHT, edge_data_from_ilocs
+from .element_data import ExternalIdIndex, NodeData
+from .utils import is_real_iterable, zero_sized_array
+from .validation import comma_sep, require_integer_in_range
+
+
+class _GrowableArray:
+    """
+    An array that can be appended to in amortised constant time, like a ``list``, but stored
+    compactly. Every element has the same shape (``inner_shape``), and the dtype is promoted if an
+    appended array can't be cast to it safely (or is taken from the first array, if not specified).
+    """
+
+    def __init__(self, dtype=None, inner_shape=()):
+        self._dtype = dtype
+        self._inner_shape = inner_shape
+        self._data = None
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    def append(self, values):
+        values = np.asarray(values)
+        if self._data is None:
+            dtype = values.dtype if self._dtype is None else self._dtype
+            self._data = np.empty((0, *self._inner_shape), dtype=dtype)
+        elif not np.can_cast(values.dtype, self._data.dtype):
+            self._data = self._data.astype(
+                np.promote_types(self._data.dtype, values.dtype)
+            )
+
+        new_len = self._len + len(values)
+        if new_len > len(self._data):
+            # grow by 1.5x rather than doubling, to limit the spare capacity; resizing in place
+            # (rather than allocating a new array and copying) can often avoid having both the old
+            # and new arrays in memory at once
+            capacity = max(new_len, int(len(self._data) * 1.5), 1024)
+            self._data.resize((capacity, *self._inner_shape), refcheck=False)
+
+        self._data[self._len : new_len] = values
+        self._len = new_len
+
+    def tail(self, start):
+        """
+        Returns:
+            A view of the elements from ``start`` onwards, for updating in place, that is only valid
+            until the next ``append``.
+        """
+        if self._data is None:
+            return np.empty((0, *self._inner_shape), dtype=self._dtype)
+        return self._data[start : self._len]
+
+    def finish(self):
+        """
+        Returns:
+            The appended elements as a single array, releasing any spare capacity.
+        """
+        if self._data is None:
+            return np.empty((0, *self._inner_shape), dtype=self._dtype)
+
+        self._data.resize((self._len, *self._inner_shape), refcheck=False)
+        data = self._data
+        self._data = None
+        return data
+
+
+_EdgeChunk = namedtuple(
+    "_EdgeChunk",
+    ["endpoint_codes", "endpoint_ids", "weights", "type_codes", "type_names"],
+)
+
+_NodeChunk = namedtuple("_NodeChunk", ["ids", "features"])
+
+
+def _parse_edge_chunk(
+    data, *, source_column, target_column, weight_column, type_column
+):
+    required = [source_column, target_column]
+    if type_column is not None:
+        required.append(type_column)
+
+    if not all(column in data.columns for column in required):
+        raise ValueError(
+            f"edges: expected {comma_sep(required)} columns, found: {comma_sep(data.columns)}"
+        )
+
+    # factorize the node IDs of the chunk, so that the chunk's edges only need to store small
+    # integer codes, and each ID only needs to be looked up (or hashed) once per chunk
+    endpoints = np.concatenate(
+        [data[source_column].to_numpy(), data[target_column].to_numpy()]
+    )
+    codes, ids = pd.factorize(endpoints)
+    if len(codes) > 0 and codes.min() < 0:
+        raise ValueError(
+            "edges: expected every edge to have a source and a target, found missing values"
+        )
+
+    if weight_column in data.columns:
+        weights = data[weight_column].to_numpy()
+        if not pd.api.types.is_numeric_dtype(weights):
+            raise TypeError(
+                f"edges: expected weight column {weight_column!r} to be numeric, found dtype '{weights.dtype}'"
+            )
+    else:
+        weights = None
+
+    if type_column is not None:
+        type_codes, type_names = pd.factorize(data[type_column])
+        if len(type_codes) > 0 and type_codes.min() < 0:
+            raise ValueError(
+                f"edges: expected every edge to have a type in column {type_column!r}, found missing values"
+            )
+        type_codes = type_codes.astype(np.min_scalar_type(len(type_names)))
+    else:
+        type_codes = type_names = None
+
+    return _EdgeChunk(
+        codes.astype(np.min_scalar_type(len(ids))), ids, weights, type_codes, type_names
+    )
+
+
+def _parse_node_chunk(data, *, id_column, dtype):
+    if id_column is not None:
+        if id_column not in data.columns:
+            raise ValueError(
+                f"nodes: expected {id_column!r} column, found: {comma_sep(data.columns)}"
+            )
+        data = data.set_index(id_column)
+
+    # rows are contiguous (C order), like the other constructors
+    features = np.ascontiguousarray(data.to_numpy(dtype=dtype))
+    return _NodeChunk(data.index.to_numpy(), features)
+
+
+def _is_parquet(path):
+    return str(path).lower().endswith((".parquet", ".pq"))
+
+
+def _read_chunks(path, chunk_size, read_kwargs):
+    if _is_parquet(path):
+        try:
+            import pyarrow.parquet
+        except ModuleNotFoundError as e:
+            raise ModuleNotFoundError(
+                f"{e.msg}. StellarGraph can only read Parquet files using the 'pyarrow' module; please install it",
+                name=e.name,
+                path=e.path,
+            ) from None
+
+        parquet_file = pyarrow.parquet.ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, **read_kwargs):
+            yield batch.to_pandas()
+    else:
+        reader = pd.read_csv(path, chunksize=chunk_size, **read_kwargs)
+        try:
+            yield from reader
+        finally:
+            reader.close()
+
+
+def _parse_file(path, *, parse_chunk, chunk_size, read_kwargs):
+    return [parse_chunk(chunk) for chunk in _read_chunks(path, chunk_size, read_kwargs)]
+
+
+def _parsed_file_chunks(paths, parse_chunk, chunk_size, read_kwargs, processes):
+    if processes is None:
+        # parse lazily, so that only one chunk is in memory at a time
+        for path in paths:
+            for chunk in _read_chunks(path, chunk_size, read_kwargs):
+                yield parse_chunk(chunk)
+        return
+
+    parse_file = functools.partial(
+        _parse_file,
+        parse_chunk=parse_chunk,
+        chunk_size=chunk_size,
+        read_kwargs=read_kwargs,
+    )
+
+    paths = iter(paths)
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        # each worker parses a whole file, and only a few files are parsed ahead of the one being
+        # consumed, so that parsed chunks don't accumulate in memory
+        pending = deque(
+            executor.submit(parse_file, path)
+            for path in itertools.islice(paths, processes)
+        )
+        while pending:
+            chunks = pending.popleft().result()
+            # start on the next file (if there is one) while this one is consumed
+            for path in itertools.islice(paths, 1):
+                pending.append(executor.submit(parse_file, path))
+
+            yield from chunks
+
+
+class _IncrementalIdIndex:
+    """
+    Assign ilocs to IDs as they are seen, in order of first appearance.
+
+    IDs that haven't been seen before are given provisional ilocs, and are only hashed into the
+    index of known IDs when :meth:`consolidate` is called. Consolidating when there are more pending
+    IDs than known ones means the total hashing work is linear, and the memory used for the pending
+    IDs is bounded by the number of unique IDs (plus one chunk), not the number of edges.
+    """
+
+    # don't consolidate until there's at least this many pending IDs, to avoid frequent rehashing
+    # for small graphs
+    MIN_PENDING = 2 ** 14
+
+    def __init__(self):
+        self._known = None
+        self._pending = []
+        self._num_pending = 0
+
+    def __len__(self):
+        return 0 if self._known is None else len(self._known)
+
+    def provisional_ilocs(self, ids):
+        """
+        Compute an iloc for each of the (unique) ``ids``, which is provisional if the ID is new.
+        """
+        if self._known is None:
+            ilocs = np.full(len(ids), -1)
+        else:
+            ilocs = self._known.get_indexer(ids)
+
+        new = ilocs < 0
+        num_new = np.count_nonzero(new)
+        if num_new > 0:
+            ilocs[new] = len(self) + self._num_pending + np.arange(num_new)
+            self._pending.append(ids[new])
+            self._num_pending += num_new
+
+        return ilocs
+
+    def should_consolidate(self):
+        return self._num_pending > max(len(self), self.MIN_PENDING)
+
+    def consolidate(self, *provisional):
+        """
+        Add the pending IDs to the known ones, and replace the provisional ilocs in each of the
+        ``provisional`` arrays with the final ones, in place.
+        """
+        if not self._pending:
+            return
+
+        # the same ID may have been new in several chunks since the last consolidation
+        codes, new_ids = pd.factorize(np.concatenate(self._pending))
+        start = len(self)
+        for ilocs in provisional:
+            is_provisional = ilocs >= start
+            ilocs[is_provisional] = start + codes[ilocs[is_provisional] - start]
+
+        new_ids = pd.Index(new_ids)
+        self._known = new_ids if self._known is None else self._known.append(new_ids)
+        self._pending = []
+        self._num_pending = 0
+
+    def ids(self):
+        """
+        Returns:
+            The known IDs, in order of their ilocs.
+        """
+        assert not self._pending, "must consolidate first"
+        return pd.Index([]) if self._known is None else self._known
+
+
+class _EdgeAccumulator:
+    """
+    Collect the edges of parsed chunks into growable arrays. If ``nodes`` is specified, the node IDs
+    are converted to ilocs as each chunk is added. Otherwise, the nodes are inferred from the
+    edges, with an :class:`_IncrementalIdIndex`.
+    """
+
+    def __init__(self, nodes):
+        self._nodes = nodes
+        iloc_dtype = np.int64 if nodes is None else nodes.ids.dtype
+        self._sources = _GrowableArray(iloc_dtype)
+        self._targets = _GrowableArray(iloc_dtype)
+        self._weights = None
+        self._type_codes = None
+        self._type_names = {}
+        self._inferred_ids = _IncrementalIdIndex() if nodes is None else None
+        # the edges before this have their final ilocs
+        self._consolidated_edges = 0
+
+    def _consolidate(self):
+        start = self._consolidated_edges
+        self._inferred_ids.consolidate(
+            self._sources.tail(start), self._targets.tail(start)
+        )
+        self._consolidated_edges = len(self._sources)
+
+    def _endpoint_ilocs(self, chunk):
+        if self._nodes is None:
+            ids_ilocs = self._inferred_ids.provisional_ilocs(chunk.endpoint_ids)
+            return ids_ilocs[chunk.endpoint_codes]
+
+        try:
+            ids_ilocs = self._nodes.ids.to_iloc(chunk.endpoint_ids, strict=True)
+        except KeyError as e:
+            missing_values = e.args[0]
+            if not is_real_iterable(missing_values):
+                missing_values = [missing_values]
+            raise ValueError(
+                f"edges: expected all source and target node IDs to be contained in `nodes`, "
+                f"found some missing: {comma_sep(pd.unique(missing_values))}"
+            )
+
+        return ids_ilocs[chunk.endpoint_codes]
+
+    def add(self, chunk):
+        num_existing = len(self._sources)
+        num_new = len(chunk.endpoint_codes) // 2
+
+        ilocs = self._endpoint_ilocs(chunk)
+        self._sources.append(ilocs[:num_new])
+        self._targets.append(ilocs[num_new:])
+
+        if self._inferred_ids is not None and self._inferred_ids.should_consolidate():
+            self._consolidate()
+
+        if chunk.weights is not None:
+            if self._weights is None:
+                self._weights = _GrowableArray()
+                if num_existing > 0:
+                    # earlier chunks didn't have weights
+                    self._weights.append(np.broadcast_to(DEFAULT_WEIGHT, num_existing))
+            self._weights.append(chunk.weights)
+        elif self._weights is not None:
+            self._weights.append(np.broadcast_to(DEFAULT_WEIGHT, num_new))
+
+        if chunk.type_codes is not None:
+            if self._type_codes is None:
+                if num_existing > 0:
+                    raise ValueError(
+                        "edges: expected every chunk to have a type column, found some without"
+                    )
+                self._type_codes = _GrowableArray(np.int32)
+
+            # there's typically only a few types, so this loop is cheap
+            remap = np.array(
+                [
+                    self._type_names.setdefault(name, len(self._type_names))
+                    for name in chunk.type_names
+                ],
+                dtype=np.int32,
+            )
+            self._type_codes.append(remap[chunk.type_codes])
+        elif self._type_codes is not None:
+            raise ValueError(
+                "edges: expected every chunk to have a type column, found some without"
+            )
+
+    def finish(self, *, node_type_default, edge_type_default, dtype):
+        nodes = self._nodes
+        if nodes is None:
+            self._consolidate()
+            node_ids = self._inferred_ids.ids()
+            self._inferred_ids = None
+
+            nodes = NodeData(
+                ExternalIdIndex(node_ids, verify_unique=False),
+                [(node_type_default, zero_sized_array((len(node_ids), 0), dtype))],
+            )
+
+        # the inferred ilocs are stored in a large type until the number of nodes is known
+        sources = self._sources.finish().astype(nodes.ids.dtype, copy=False)
+        targets = self._targets.finish().astype(nodes.ids.dtype, copy=False)
+
+        weights = None if self._weights is None else self._weights.finish()
+
+        if self._type_codes is None:
+            edge_types = None
+        else:
+            edge_types = pd.Categorical.from_codes(
+                self._type_codes.finish(), categories=list(self._type_names)
+            )
+
+        edges = edge_data_from_ilocs(
+            sources,
+            targets,
+            weights=weights,
+            edge_types=edge_types,
+            nodes=nodes,
+            edge_type_default=edge_type_default,
+            dtype=dtype,
+        )
+        return nodes, edges
+
+
+def _node_data_from_chunks(node_chunks, dtype):
+    # node_chunks: dict of type name to iterable of _NodeChunk
+    type_info = []
+    type_ids = []
+
+    for type_name in sorted(node_chunks.keys()):
+        ids = []
+        features = feature_shape = None
+        for chunk in node_chunks[type_name]:
+            if features is None:
+                feature_shape = chunk.features.shape[1:]
+                features = _GrowableArray(dtype, feature_shape)
+            elif chunk.features.shape[1:] != feature_shape:
+                raise ValueError(
+                    f"nodes[{type_name!r}]: expected every chunk to have {feature_shape[0]} feature columns, found a chunk with {chunk.features.shape[1]}"
+                )
+
+            ids.append(chunk.ids)
+            features.append(chunk.features)
+
+        if features is None:
+            type_info.append((type_name, zero_sized_array((0, 0), dtype)))
+        else:
+            type_info.append((type_name, features.finish()))
+        type_ids.extend(ids)
+
+    all_ids = np.concatenate(type_ids) if type_ids else []
+    return NodeData(all_ids, type_info)
+
+
+def _build(edge_chunks, node_chunks, *, node_type_default, edge_type_default, dtype):
+    nodes = None if node_chunks is None else _node_data_from_chunks(node_chunks, dtype)
+
+    accumulator = _EdgeAccumulator(nodes)
+    for chunk in edge_chunks:
+        accumulator.add(chunk)
+
+    return accumulator.finish(
+        node_type_default=node_type_default,
+        edge_type_default=edge_type_default,
+        dtype=dtype,
+    )
+
+
+def _by_type(values, default_type):
+    if isinstance(values, dict):
+        return values
+    return {default_type: values}
+
+
+def from_dataframe_chunks(
+    edges,
+    nodes,
+    *,
+    source_column,
+    target_column,
+    weight_column,
+    type_column,
+    node_type_default,
+    edge_type_default,
+    dtype,
+):
+    if isinstance(edges, pd.DataFrame):
+        edges = [edges]
+
+    parse_edges = functools.partial(
+        _parse_edge_chunk,
+        source_column=source_column,
+        target_column=target_column,
+        weight_column=weight_column,
+        type_column=type_column,
+    )
+    edge_chunks = (parse_edges(chunk) for chunk in edges)
+
+    if nodes is None:
+        node_chunks = None
+    else:
+        node_chunks = {
+            type_name: (
+                _parse_node_chunk(chunk, id_column=None, dtype=dtype)
+                for chunk in ([data] if isinstance(data, pd.DataFrame) else data)
+            )
+            for type_name, data in _by_type(nodes, node_type_default).items()
+        }
+
+    return _build(
+        edge_chunks,
+        node_chunks,
+        node_type_default=node_type_default,
+        edge_type_default=edge_type_default,
+        dtype=dtype,
+    )
+
+
+def _paths(paths):
+    if isinstance(paths, (str, bytes)) or not is_real_iterable(paths):
+        return [paths]
+    return list(paths)
+
+
+def from_files(
+    edge_paths,
+    node_paths,
+    *,
+    node_id_column,
+    source_column,
+    target_column,
+    weight_column,
+    type_column,
+    node_type_default,
+    edge_type_default,
+    dtype,
+    chunk_size,
+    processes,
+    read_kwargs,
+):
+    require_integer_in_range(chunk_size, "chunk_size", min_val=1)
+    if processes is not None:
+        require_integer_in_range(processes, "processes", min_val=1)
+
+    read_kwargs = {} if read_kwargs is None else read_kwargs
+
+    def parsed(paths, parse_chunk):
+        return _parsed_file_chunks(
+            _paths(paths), parse_chunk, chunk_size, read_kwargs, processes
+        )
+
+    parse_edges = functools.partial(
+        _parse_edge_chunk,
+        source_column=source_column,
+        target_column=target_column,
+        weight_column=weight_column,
+        type_column=type_column,
+    )
+
+    if node_paths is None:
+        node_chunks = None
+    else:
+        parse_nodes = functools.partial(
+            _parse_node_chunk, id_column=node_id_column, dtype=dtype
+        )
+        node_chunks = {
+            type_name: parsed(paths, parse_nodes)
+            for type_name, paths in _by_type(node_paths, node_type_default).items()
+        }
+
+    return _build(
+        parsed(edge_paths, parse_edges),
+        node_chunks,
+        node_type_default=node_type_default,
+        edge_type_default=edge_type_default,
+        dtype=dtype,
+    )
@@ -186,16 +186,91 @@ def rescale_laplacian(laplacian):
     return scaled_laplacian
 
 
-def PPNP_Aadj_feats_op(features, A, teleport_probability=0.1):
+def _approximate_ppr(A, teleport_probability, epsilon, top_k, chunk_size=1024):
+    """
+    Approximate the symmetrically normalised personalized page rank matrix of the adjacency matrix
+    ``A`` (which must be symmetric and include self loops) with the push algorithm of [1].
+
+    Each row is computed by pushing the residual of the starting node to its neighbours until every
+    residual is below ``epsilon`` times the degree of its node; this is done synchronously for
+    ``chunk_size`` starting nodes at a time, as sparse matrix products, to bound the memory use.
+
+    [1] `Andersen et al., 2006 <https://doi.org/10.1109/FOCS.2006.44>`_.
+    """
+    n = A.shape[0]
+    degrees = np.asarray(A.sum(axis=1)).ravel()
+    transition = sp.diags(1 / degrees) @ A
+    inv_sqrt_degrees = sp.diags(1 / np.sqrt(degrees))
+
+    chunks = []
+    for start in range(0, n, chunk_size):
+        sources = np.arange(start, min(start + chunk_size, n))
+        residual = sp.csr_matrix(
+            (np.ones(len(sources)), (np.arange(len(sources)), sources)),
+            shape=(len(sources), n),
+        )
+        ppr = sp.csr_matrix(residual.shape)
+
+        while True:
+            active = residual.data >= epsilon * degrees[residual.indices]
+            if not active.any():
+                break
+
+            pushed = residual.copy()
+            pushed.data[~active] = 0
+            pushed.eliminate_zeros()
+            residual.data[active] = 0
+            residual.eliminate_zeros()
+
+            ppr += teleport_probability * pushed
+            residual += (1 - teleport_probability) * (pushed @ transition)
+
+        # convert from the random walk normalisation to the symmetric one:
+        # D^(1/2) PPR D^(-1/2)
+        ppr = sp.diags(np.sqrt(degrees[sources])) @ ppr @ inv_sqrt_degrees
+        chunks.append(_top_k_per_row(ppr.tocsr(), top_k))
+
+    return sp.vstack(chunks, format="csr")
+
+
+def _top_k_per_row(matrix, top_k):
+    """
+    Keep only the ``top_k`` largest elements of each row of a CSR ``matrix``.
+    """
+    if top_k is None:
+        return matrix
+
+    rows = np.repeat(np.arange(matrix.shape[0]), np.diff(matrix.indptr))
+    # sort each row in descending order, and then find the rank of each element within its row
+    order = np.lexsort((-matrix.data, rows))
+    rank = np.arange(len(order)) - matrix.indptr[rows[order]]
+    keep = order[rank < top_k]
+
+    return sp.csr_matrix(
+        (matrix.data[keep], (rows[keep], matrix.indices[keep])), shape=matrix.shape
+    )
+
+
+def PPNP_Aadj_feats_op(features, A, teleport_probability=0.1, epsilon=None, top_k=None):
     """
     This function calculates the personalized page rank matrix of Eq 2 in [1].
+
+    By default, this computes the exact matrix by inverting a dense N × N matrix. If ``epsilon`` is
+    specified, the matrix is instead approximated as a sparse matrix with the push algorithm of
+    [2], which scales to much larger graphs.
+
     Args:
         features: node features in the graph
         A: adjacency matrix
         teleport_probability (float): teleport probability between 0.0 and 1.0. "probability" of returning to the starting node in the
         propagation step as in [1].
+        epsilon (float, optional): if specified, the tolerance of the sparse approximation: smaller
+            values are more accurate, but have more non-zero elements.
+        top_k (int, optional): if specified with ``epsilon``, only the ``top_k`` largest elements of
+            each row of the sparse approximation are kept.
 
     [1] `Klicpera et al., 2018 <https://arxiv.org/abs/1810.05997>`_.
+    [2] `Andersen et al., 2006 <https://doi.org/10.1109/FOCS.2006.44>`_.
     """
 
     if (teleport_probability > 1.0) or (teleport_probability < 0.0):
@@ -203,8 +278,19 @@ def PPNP_Aadj_feats_op(features, A, teleport_probability=0.1):
             "teleport_probability should be between 0.0 and 1.0 (inclusive)"
         )
 
+    if epsilon is not None and epsilon <= 0:
+        raise ValueError(f"epsilon: expected a positive number, found {epsilon}")
+
+    if top_k is not None and (not isinstance(top_k, int) or top_k <= 0):
+        raise ValueError(f"top_k: expected a positive integer, found {top_k!r}")
+
     A = A + A.T.multiply(A.T > A) - A.multiply(A.T > A)
     A = A + sp.diags(np.ones(A.shape[0]) - A.diagonal())
+
+    if epsilon is not None:
+        A = _approximate_ppr(A.tocsr(), teleport_probability, epsilon, top_k)
+        return features, A
+
     A = normalize_adj(A, symmetric=True)
     A = A.toarray()
     A = teleport_probability * np.linalg.inv(
@@ -36,6 +36,7 @@ from ..core.graph import StellarGraph
 from ..core.utils import is_real_iterable
 from ..core.validation import require_integer_in_range, comma_sep
 from ..random import random_state
+from .. import profiling
 from abc import ABC, abstractmethod
 
 
@@ -287,6 +288,7 @@ class UniformRandomWalk(RandomWalk):
         self.n = n
         self.length = length
 
+    @profiling.instrument()
     def run(self, nodes, *, n=None, length=None, seed=None):
         """
         Perform a random walk starting from the root nodes. Optional parameters default to using the
@@ -420,6 +422,7 @@ class BiasedRandomWalk(RandomWalk):
 
         self._checked_weights = True
 
+    @profiling.instrument()
     def run(
         self, nodes, *, n=None, length=None, p=None, q=None, seed=None, weighted=None
     ):
@@ -571,6 +574,7 @@ class UniformRandomMetaPathWalk(RandomWalk):
         self.length = length
         self.metapaths = metapaths
 
+    @profiling.instrument()
     def run(self, nodes, *, n=None, length=None, metapaths=None, seed=None):
         """
         Performs metapath-driven uniform random walks on heterogeneous graphs.
@@ -687,6 +691,7 @@ class SampledBreadthFirstWalk(GraphWalk):
     It can be used to extract a random sub-graph starting from a set of initial nodes.
     """
 
+    @profiling.instrument()
     def run(self, nodes, n_size, n=1, seed=None, weighted=False):
         """
         Performs a sampled breadth-first walk starting from the root nodes.
@@ -753,6 +758,7 @@ class SampledHeterogeneousBreadthFirstWalk(GraphWalk):
     It can be used to extract a random sub-graph starting from a set of initial nodes.
     """
 
+    @profiling.instrument()
     def run(self, nodes, n_size, n=1, seed=None):
         """
         Performs a sampled breadth-first walk starting from the root nodes.
@@ -840,6 +846,7 @@ class DirectedBreadthFirstNeighbours(GraphWalk):
         if not graph.is_directed():
             self._raise_error("Graph must be directed")
 
+    @profiling.instrument()
     def run(self, nodes, in_size, out_size, n=1, seed=None, weighted=False):
         """
         Performs a sampled breadth-first walk starting from the root nodes.
@@ -1010,6 +1017,7 @@ class TemporalRandomWalk(GraphWalk):
         self.walk_bias = walk_bias
         self.p_walk_success_threshold = p_walk_success_threshold
 
+    @profiling.instrument()
     def run(
         self,
         num_cw,
@@ -237,6 +237,11 @@ class APPNP:
                 f"FullBatchLinkGenerator or ClusterNodeGenerator"
             )
 
+        if isinstance(generator, FullBatchGenerator) and generator.use_sparse_features:
+            raise ValueError(
+                "generator: expected a generator with 'sparse_features=False', found 'sparse_features=True'"
+            )
+
         if not len(layer_sizes) == len(activations):
             raise ValueError(
                 "The number of layers should equal the number of activations"
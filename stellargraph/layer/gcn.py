@@ -20,7 +20,7 @@ from tensorflow.keras import backend as K
 from tensorflow.keras import activations, initializers, constraints, regularizers
 from tensorflow.keras.layers import Input, Layer, Lambda, Dropout, Reshape
 
-from ..mapper import FullBatchGenerator, ClusterNodeGenerator
+from ..mapper import FullBatchGenerator, ClusterNodeGenerator, GraphSAINTNodeGenerator
 from .misc import SqueezedSparseConversion, deprecated_model_function, GatherIndices
 from .preprocessing_layer import GraphPreProcessingLayer
 
@@ -44,6 +44,10 @@ class GraphConvolution(Layer):
       - If the adjacency matrix is sparse, it should not have a batch axis, and the batch
         dimension of the features must be 1.
 
+      - If the features are sparse, they should not have a batch axis (that is, they should be a
+        rank 2 ``N x F`` sparse tensor), and are multiplied by the kernel before being propagated
+        along the edges, so they never need to be converted to a dense tensor.
+
       - There are two inputs required, the node features,
         and the normalized graph Laplacian matrix
 
@@ -138,8 +142,13 @@ class GraphConvolution(Layer):
         """
         feature_shape, *As_shapes = input_shapes
 
-        batch_dim = feature_shape[0]
-        out_dim = feature_shape[1]
+        if len(feature_shape) == 2:
+            # sparse features, without a batch dimension
+            batch_dim = 1
+            out_dim = feature_shape[0]
+        else:
+            batch_dim = feature_shape[0]
+            out_dim = feature_shape[1]
 
         return batch_dim, out_dim, self.units
 
@@ -180,7 +189,7 @@ class GraphConvolution(Layer):
 
         Args:
             inputs (list): a list of 3 input tensors that includes
-                node features (size 1 x N x F),
+                node features (size 1 x N x F, or a sparse tensor of size N x F),
                 graph adjacency matrix (size N x N),
                 where N is the number of nodes in the graph, and
                 F is the dimensionality of node features.
@@ -190,6 +199,16 @@ class GraphConvolution(Layer):
         """
         features, *As = inputs
 
+        transform_first = K.is_sparse(features)
+        if transform_first:
+            # Sparse features are transformed first, using A (X W) = (A X) W, so that the result of
+            # each multiplication is small and dense
+            if len(features.shape) != 2:
+                raise ValueError(
+                    f"features: expected a sparse tensor of rank 2 (without a batch dimension) when using sparse features in GraphConvolution, found sparse tensor of rank {len(features.shape)}"
+                )
+            features = K.expand_dims(K.dot(features, self.kernel), axis=0)
+
         # Calculate the layer operation of GCN
         A = As[0]
         if K.is_sparse(A):
@@ -210,7 +229,11 @@ class GraphConvolution(Layer):
             h_graph = K.expand_dims(h_graph, axis=0)
         else:
             h_graph = K.batch_dot(A, features)
-        output = K.dot(h_graph, self.kernel)
+
+        if transform_first:
+            output = h_graph
+        else:
+            output = K.dot(h_graph, self.kernel)
 
         # Add optional bias & apply activation
         if self.bias is not None:
@@ -234,6 +257,7 @@ class GCN:
 
     - the :class:`.FullBatchNodeGenerator` class for node inference
     - the :class:`.ClusterNodeGenerator` class for scalable/inductive node inference using the Cluster-GCN training procedure (https://arxiv.org/abs/1905.07953)
+    - the :class:`.GraphSAINTNodeGenerator` class for scalable node inference on sampled subgraphs, using the GraphSAINT training procedure (https://arxiv.org/abs/1907.04931)
     - the :class:`.FullBatchLinkGenerator` class for link inference
 
     To have the appropriate preprocessing the generator object should be instantiated
@@ -282,7 +306,7 @@ class GCN:
        - `ensemble model for node classification <https://stellargraph.readthedocs.io/en/stable/demos/ensembles/ensemble-node-classification-example.html>`__
        - `comparison of link prediction algorithms <https://stellargraph.readthedocs.io/en/stable/demos/link-prediction/homogeneous-comparison-link-prediction.html>`__
 
-       Appropriate data generators: :class:`.FullBatchNodeGenerator`, :class:`.FullBatchLinkGenerator`, :class:`.ClusterNodeGenerator`.
+       Appropriate data generators: :class:`.FullBatchNodeGenerator`, :class:`.FullBatchLinkGenerator`, :class:`.ClusterNodeGenerator`, :class:`.GraphSAINTNodeGenerator`.
 
        Related models:
 
@@ -325,10 +349,13 @@ class GCN:
         bias_constraint=None,
         squeeze_output_batch=True,
     ):
-        if not isinstance(generator, (FullBatchGenerator, ClusterNodeGenerator)):
+        if not isinstance(
+            generator,
+            (FullBatchGenerator, ClusterNodeGenerator, GraphSAINTNodeGenerator),
+        ):
             raise TypeError(
                 f"Generator should be a instance of FullBatchNodeGenerator, "
-                f"FullBatchLinkGenerator or ClusterNodeGenerator"
+                f"FullBatchLinkGenerator, ClusterNodeGenerator or GraphSAINTNodeGenerator"
             )
 
         n_layers = len(layer_sizes)
@@ -345,8 +372,10 @@ class GCN:
         self.use_sparse = generator.use_sparse
         if isinstance(generator, FullBatchGenerator):
             self.n_nodes = generator.features.shape[0]
+            self.use_sparse_features = generator.use_sparse_features
         else:
             self.n_nodes = None
+            self.use_sparse_features = False
 
         if self.method == "none":
             self.graph_norm_layer = GraphPreProcessingLayer(num_of_nodes=self.n_nodes)
@@ -391,20 +420,38 @@ class GCN:
         where N is the number of nodes, F the number of input features,
               E is the number of edges, O the number of output nodes.
 
+        If the generator uses sparse features, the node features are replaced by two tensors: their
+        indices (1, NNZ, 2) and their values (1, NNZ), where NNZ is the number of non-zero features.
+
         Args:
             x (Tensor): input tensors
 
         Returns:
             Output tensor
         """
-        x_in, out_indices, *As = x
+        layers = self._layers
+
+        if self.use_sparse_features:
+            x_indices, x_values, out_indices, *As = x
+            n_nodes = self.n_nodes
+
+            # the first layer is the dropout on the input features: applying it to the values of
+            # the sparse tensor is equivalent to applying it to the tensor itself, because all of
+            # the other elements are zero
+            input_dropout, *layers = layers
+            assert isinstance(input_dropout, Dropout)
+            x_in = SqueezedSparseConversion(
+                shape=(n_nodes, self.n_features), dtype=x_values.dtype
+            )([x_indices, input_dropout(x_values)])
+        else:
+            x_in, out_indices, *As = x
 
-        # Currently we require the batch dimension to be one for full-batch methods
-        batch_dim, n_nodes, _ = K.int_shape(x_in)
-        if batch_dim != 1:
-            raise ValueError(
-                "Currently full-batch methods only support a batch dimension of one"
-            )
+            # Currently we require the batch dimension to be one for full-batch methods
+            batch_dim, n_nodes, _ = K.int_shape(x_in)
+            if batch_dim != 1:
+                raise ValueError(
+                    "Currently full-batch methods only support a batch dimension of one"
+                )
 
         # Convert input indices & values to a sparse matrix
         if self.use_sparse:
@@ -427,7 +474,7 @@ class GCN:
         if self.method == "none":
             # For GCN, if no preprocessing has been done, we apply the preprocessing layer to perform that.
             Ainput = [self.graph_norm_layer(Ainput[0])]
-        for layer in self._layers:
+        for layer in layers:
             if isinstance(layer, GraphConvolution):
                 # For a GCN layer add the matrix
                 h_layer = layer([h_layer] + Ainput)
@@ -449,7 +496,13 @@ class GCN:
                 input tensors for the GCN model and ``x_out`` is a tensor of the GCN model output.
         """
         # Inputs for features
-        x_t = Input(batch_shape=(1, self.n_nodes, self.n_features))
+        if self.use_sparse_features:
+            # Placeholders for the sparse features
+            x_indices_t = Input(batch_shape=(1, None, 2), dtype="int64")
+            x_values_t = Input(batch_shape=(1, None))
+            x_placeholders = [x_indices_t, x_values_t]
+        else:
+            x_placeholders = [Input(batch_shape=(1, self.n_nodes, self.n_features))]
 
         # If not specified use multiplicity from instanciation
         if multiplicity is None:
@@ -475,7 +528,7 @@ class GCN:
 
         # TODO: Support multiple matrices
 
-        x_inp = [x_t, out_indices_t] + A_placeholders
+        x_inp = x_placeholders + [out_indices_t] + A_placeholders
         x_out = self(x_inp)
 
         # Flatten output by removing singleton batch dimension
@@ -25,10 +25,40 @@ from tensorflow.keras import backend as K
 from tensorflow.keras import activations, constraints, initializers, regularizers
 from tensorflow.keras.layers import Input, Layer, Dropout, LeakyReLU, Lambda, Reshape
 
-from ..mapper import FullBatchNodeGenerator, FullBatchGenerator, ClusterNodeGenerator
+from ..mapper import (
+    FullBatchNodeGenerator,
+    FullBatchGenerator,
+    ClusterNodeGenerator,
+    GraphSAINTNodeGenerator,
+)
 from .misc import SqueezedSparseConversion, deprecated_model_function, GatherIndices
 
 
+def _squeeze_features(X):
+    """
+    Remove the singleton batch dimension of dense node features, or validate sparse node features
+    (which have no batch dimension, and are only ever multiplied by the kernels).
+
+    Returns:
+        A tuple of the batch dimension, the number of nodes and the features without a batch
+        dimension.
+    """
+    if K.is_sparse(X):
+        if len(X.shape) != 2:
+            raise ValueError(
+                f"features: expected a sparse tensor of rank 2 (without a batch dimension), found sparse tensor of rank {len(X.shape)}"
+            )
+        return 1, X.shape[0], X
+
+    batch_dim, n_nodes, _ = K.int_shape(X)
+    if batch_dim != 1:
+        raise ValueError(
+            "Currently full-batch methods only support a batch dimension of one"
+        )
+
+    return batch_dim, n_nodes, K.squeeze(X, 0)
+
+
 class GraphAttention(Layer):
     """
     Graph Attention (GAT) layer. The base implementation is taken from
@@ -271,7 +301,7 @@ class GraphAttention(Layer):
 
         Args:
             inputs (list): list of inputs with 3 items:
-            node features (size 1 x N x F),
+            node features (size 1 x N x F, or a sparse tensor of size N x F),
             graph adjacency matrix (size N x N),
             where N is the number of nodes in the graph,
                   F is the dimensionality of node features
@@ -281,16 +311,9 @@ class GraphAttention(Layer):
         A = inputs[1]  # Adjacency matrix (1 X N x N)
         N = K.int_shape(A)[-1]
 
-        batch_dim, n_nodes, _ = K.int_shape(X)
-        if batch_dim != 1:
-            raise ValueError(
-                "Currently full-batch methods only support a batch dimension of one"
-            )
-
-        else:
-            # Remove singleton batch dimension
-            X = K.squeeze(X, 0)
-            A = K.squeeze(A, 0)
+        batch_dim, n_nodes, X = _squeeze_features(X)
+        # Remove singleton batch dimension
+        A = K.squeeze(A, 0)
 
         outputs = []
         for head in range(self.attn_heads):
@@ -422,7 +445,7 @@ class GraphAttentionSparse(GraphAttention):
 
         Args:
             inputs (list): list of inputs with 4 items:
-            node features (size b x N x F),
+            node features (size b x N x F, or a sparse tensor of size N x F),
             sparse graph adjacency matrix (size N x N),
             where N is the number of nodes in the graph,
                   F is the dimensionality of node features
@@ -437,14 +460,7 @@ class GraphAttentionSparse(GraphAttention):
         # Get undirected graph edges (E x 2)
         A_indices = A_sparse.indices
 
-        batch_dim, n_nodes, _ = K.int_shape(X)
-        if batch_dim != 1:
-            raise ValueError(
-                "Currently full-batch methods only support a batch dimension of one"
-            )
-        else:
-            # Remove singleton batch dimension
-            X = K.squeeze(X, 0)
+        batch_dim, n_nodes, X = _squeeze_features(X)
 
         outputs = []
         for head in range(self.attn_heads):
@@ -483,7 +499,7 @@ class GraphAttentionSparse(GraphAttention):
 
             # Convert to sparse matrix
             sparse_attn = tf.sparse.SparseTensor(
-                A_indices, values=dropout_attn, dense_shape=[n_nodes, n_nodes]
+                A_indices, values=dropout_attn, dense_shape=A_sparse.dense_shape
             )
 
             # Apply softmax to get attention coefficients
@@ -534,6 +550,7 @@ class GAT:
 
     - the :class:`.FullBatchNodeGenerator` class for node inference
     - the :class:`.ClusterNodeGenerator` class for scalable/inductive node inference using the Cluster-GCN training procedure (https://arxiv.org/abs/1905.07953)
+    - the :class:`.GraphSAINTNodeGenerator` class (with ``method='self_loops'``) for scalable node inference on sampled subgraphs, using the GraphSAINT training procedure (https://arxiv.org/abs/1907.04931)
     - the :class:`.FullBatchLinkGenerator` class for link inference
 
     To have the appropriate preprocessing the generator object should be instantiated
@@ -575,7 +592,7 @@ class GAT:
        - `interpreting GAT predictions <https://stellargraph.readthedocs.io/en/stable/demos/interpretability/gat-node-link-importance.html>`__
        - `ensemble model for node classification <https://stellargraph.readthedocs.io/en/stable/demos/ensembles/ensemble-node-classification-example.html>`__
 
-       Appropriate data generators: :class:`.FullBatchNodeGenerator`, :class:`.FullBatchLinkGenerator`, :class:`.ClusterNodeGenerator`.
+       Appropriate data generators: :class:`.FullBatchNodeGenerator`, :class:`.FullBatchLinkGenerator`, :class:`.ClusterNodeGenerator`, :class:`.GraphSAINTNodeGenerator`.
 
        Related models:
 
@@ -760,14 +777,18 @@ class GAT:
         # Check generator and configure sparse adjacency matrix
         if generator is None:
             self.use_sparse = False
+            self.use_sparse_features = False
             self.multiplicity = _require_without_generator(multiplicity, "multiplicity")
             self.n_nodes = _require_without_generator(num_nodes, "num_nodes")
             self.n_features = _require_without_generator(num_features, "num_features")
         else:
-            if not isinstance(generator, (FullBatchGenerator, ClusterNodeGenerator)):
+            if not isinstance(
+                generator,
+                (FullBatchGenerator, ClusterNodeGenerator, GraphSAINTNodeGenerator),
+            ):
                 raise TypeError(
                     f"Generator should be a instance of FullBatchNodeGenerator, "
-                    f"FullBatchLinkGenerator or ClusterNodeGenerator"
+                    f"FullBatchLinkGenerator, ClusterNodeGenerator or GraphSAINTNodeGenerator"
                 )
 
             # Copy required information from generator
@@ -776,8 +797,10 @@ class GAT:
             self.n_features = generator.features.shape[1]
             if isinstance(generator, FullBatchGenerator):
                 self.n_nodes = generator.features.shape[0]
+                self.use_sparse_features = generator.use_sparse_features
             else:
                 self.n_nodes = None
+                self.use_sparse_features = False
 
         # Set the normalization layer used in the model
         if normalize == "l2":
@@ -842,15 +865,30 @@ class GAT:
         if not isinstance(inputs, list):
             raise TypeError(f"inputs: expected list, found {type(inputs).__name__}")
 
-        x_in, out_indices, *As = inputs
+        layers = self._layers
 
-        # Currently we require the batch dimension to be one for full-batch methods
-        batch_dim, n_nodes, _ = K.int_shape(x_in)
+        if self.use_sparse_features:
+            x_indices, x_values, out_indices, *As = inputs
+            n_nodes = self.n_nodes
 
-        if batch_dim != 1:
-            raise ValueError(
-                "Currently full-batch methods only support a batch dimension of one"
+            # the first layer is the dropout on the input features: applying it to the values of
+            # the sparse tensor is equivalent to applying it to the tensor itself, because all of
+            # the other elements are zero
+            input_dropout, *layers = layers
+            assert isinstance(input_dropout, Dropout)
+            x_in = SqueezedSparseConversion(shape=(n_nodes, self.n_features))(
+                [x_indices, input_dropout(x_values)]
             )
+        else:
+            x_in, out_indices, *As = inputs
+
+            # Currently we require the batch dimension to be one for full-batch methods
+            batch_dim, n_nodes, _ = K.int_shape(x_in)
+
+            if batch_dim != 1:
+                raise ValueError(
+                    "Currently full-batch methods only support a batch dimension of one"
+                )
 
         # Convert input indices & values to a sparse matrix
         if self.use_sparse:
@@ -873,7 +911,7 @@ class GAT:
 
         # Remove singleton batch dimension
         h_layer = x_in
-        for layer in self._layers:
+        for layer in layers:
             if isinstance(layer, self._gat_layer):
                 # For a GAT layer add the matrix
                 h_layer = layer([h_layer] + Ainput)
@@ -899,7 +937,13 @@ class GAT:
         """
 
         # Inputs for features
-        x_t = Input(batch_shape=(1, self.n_nodes, self.n_features))
+        if self.use_sparse_features:
+            # Placeholders for the sparse features
+            x_indices_t = Input(batch_shape=(1, None, 2), dtype="int64")
+            x_values_t = Input(batch_shape=(1, None))
+            x_placeholders = [x_indices_t, x_values_t]
+        else:
+            x_placeholders = [Input(batch_shape=(1, self.n_nodes, self.n_features))]
 
         # If not specified use multiplicity from instanciation
         if multiplicity is None:
@@ -924,7 +968,7 @@ class GAT:
             A_placeholders = [A_m]
 
         # TODO: Support multiple matrices
-        x_inp = [x_t, out_indices_t] + A_placeholders
+        x_inp = x_placeholders + [out_indices_t] + A_placeholders
         x_out = self(x_inp)
 
         # Flatten output by removing singleton batch dimension
@@ -16,10 +16,10 @@
 
 import tensorflow as tf
 from tensorflow.keras import backend as K
-from .misc import deprecated_model_function
+from .misc import deprecated_model_function, SqueezedSparseConversion
 from ..mapper import PaddedGraphGenerator
 from .gcn import GraphConvolution
-from .sort_pooling import SortPooling
+from .sort_pooling import SortPooling, SegmentAveragePooling
 from tensorflow.keras.layers import Input, Dropout, GlobalAveragePooling1D
 
 
@@ -34,7 +34,9 @@ class GCNSupervisedGraphClassification:
     activation functions for each hidden layers, and a generator object.
 
     To use this class as a Keras model, the features and preprocessed adjacency matrix
-    should be supplied using the :class:`.PaddedGraphGenerator` class.
+    should be supplied using the :class:`.PaddedGraphGenerator` class. If the generator was created with
+    ``sparse=True``, each batch is a disjoint union of graphs with a sparse block-diagonal adjacency matrix,
+    so that memory is linear in the total number of nodes, rather than quadratic in the largest graph.
 
     Examples:
         Creating a graph classification model from a list of :class:`.StellarGraph`
@@ -90,6 +92,12 @@ class GCNSupervisedGraphClassification:
             they must not depend on the ``nodes`` dimension or on the number of ``True`` values in
             ``mask``. ``pooling`` defaults to mean pooling via ``GlobalAveragePooling1D``.
 
+            If the generator uses ``sparse=True``, the embeddings tensor argument instead has shape ``1 ×
+            total nodes × output size``, and the ``segment_ids`` named argument is passed instead of ``mask``:
+            a tensor of integers with shape ``1 × total nodes``, containing the index of the graph in the
+            batch for each node. ``pooling`` defaults to mean pooling via :class:`.SegmentAveragePooling`, and
+            :class:`.SortPooling` supports both layouts.
+
         pool_all_layers (bool, optional): which layers to pass to the pooling method: if ``True``,
             pass the concatenation of the output of every GCN layer, otherwise pass only the output
             of the last GCN layer.
@@ -140,8 +148,12 @@ class GCNSupervisedGraphClassification:
         self.dropout = dropout
         self.generator = generator
 
+        self.use_sparse = generator.use_sparse
+
         if pooling is not None:
             self.pooling = pooling
+        elif self.use_sparse:
+            self.pooling = SegmentAveragePooling()
         else:
             self.pooling = GlobalAveragePooling1D(data_format="channels_last")
 
@@ -179,13 +191,29 @@ class GCNSupervisedGraphClassification:
         ]
         where N is the number of nodes and F the number of input features
 
+        If the generator uses ``sparse=True``, the input tensors are instead:
+        [
+            Node features shape (1, total nodes, F),
+            Segment IDs (1, total nodes),
+            Adjacency matrix indices (1, E, 2),
+            Adjacency matrix values (1, E),
+        ]
+        where E is the number of non-zero elements in the block-diagonal adjacency matrix.
+
         Args:
             x (Tensor): input tensors
 
         Returns:
             Output tensor
         """
-        x_in, mask, As = x
+        if self.use_sparse:
+            x_in, segment_ids, A_indices, A_values = x
+            As = SqueezedSparseConversion(shape=(None, None), dtype=A_values.dtype)(
+                [A_indices, A_values]
+            )
+        else:
+            x_in, mask, As = x
+
         h_layer = x_in
 
         gcn_layers = []
@@ -201,8 +229,12 @@ class GCNSupervisedGraphClassification:
         if self.pool_all_layers:
             h_layer = tf.concat(gcn_layers, axis=-1)
 
-        # mask to ignore the padded values
-        h_layer = self.pooling(h_layer, mask=mask)
+        if self.use_sparse:
+            # pool the nodes of each graph separately
+            h_layer = self.pooling(h_layer, segment_ids=segment_ids)
+        else:
+            # mask to ignore the padded values
+            h_layer = self.pooling(h_layer, mask=mask)
 
         return h_layer
 
@@ -211,15 +243,23 @@ class GCNSupervisedGraphClassification:
         Builds a Graph Classification model.
 
         Returns:
-            tuple: ``(x_inp, x_out)``, where ``x_inp`` is a list of two input tensors for the
-                Graph Classification model (containing node features and normalized adjacency matrix),
-                and ``x_out`` is a tensor for the Graph Classification model output.
+            tuple: ``(x_inp, x_out)``, where ``x_inp`` is a list of input tensors for the
+                Graph Classification model (containing node features, a mask or segment IDs, and the normalized
+                adjacency matrix), and ``x_out`` is a tensor for the Graph Classification model output.
         """
-        x_t = Input(shape=(None, self.generator.node_features_size))
-        mask = Input(shape=(None,), dtype=tf.bool)
-        A_m = Input(shape=(None, None))
+        if self.use_sparse:
+            x_t = Input(batch_shape=(1, None, self.generator.node_features_size))
+            segment_ids = Input(batch_shape=(1, None), dtype="int32")
+            A_indices = Input(batch_shape=(1, None, 2), dtype="int64")
+            A_values = Input(batch_shape=(1, None))
+
+            x_inp = [x_t, segment_ids, A_indices, A_values]
+        else:
+            x_t = Input(shape=(None, self.generator.node_features_size))
+            mask = Input(shape=(None,), dtype=tf.bool)
+            A_m = Input(shape=(None, None))
 
-        x_inp = [x_t, mask, A_m]
+            x_inp = [x_t, mask, A_m]
         x_out = self(x_inp)
 
         return x_inp, x_out
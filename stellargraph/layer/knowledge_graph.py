@@ -15,6 +15,9 @@
 # limitations under the License.
 
 import abc
+import collections
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 import tensorflow as tf
@@ -27,6 +30,7 @@ from ..mapper.knowledge_graph import KGTripleGenerator, KGTripleSequence
 from ..core.experimental import experimental
 from ..core.validation import require_integer_in_range, comma_sep
 from ..utils.hyperbolic import *
+from ..utils.hyperbolic import PROJECTION_EPS, _atanh
 
 
 class KGModel:
@@ -52,6 +56,7 @@ class KGModel:
         require_integer_in_range(embedding_dimension, "embedding_dimension", min_val=1)
 
         graph = generator.G
+        self._graph = graph
         self.num_nodes = graph.number_of_nodes()
         self.num_edge_types = len(graph._edges.types)
 
@@ -164,7 +169,12 @@ class KGModel:
         return x_inp, x_out
 
     def rank_edges_against_all_nodes(
-        self, test_data, known_edges_graph, tie_breaking="random"
+        self,
+        test_data,
+        known_edges_graph,
+        tie_breaking="random",
+        chunk_size=4096,
+        num_threads=1,
     ):
         """
         Returns the ranks of the true edges in ``test_data``, when scored against all other similar
@@ -203,6 +213,14 @@ class KGModel:
                 `Sun et al. "A Re-evaluation of Knowledge Graph Completion Methods"
                 <http://arxiv.org/abs/1911.03903>`_
 
+            chunk_size (int): the number of candidate nodes to score at a time. The memory required
+                for each batch is proportional to ``chunk_size × batch size`` (rather than ``number
+                of nodes × batch size``), because the ranks are accumulated chunk by chunk.
+
+            num_threads (int): the number of batches of ``test_data`` to rank in parallel. The
+                scoring is mostly done in NumPy (or TensorFlow) operations that release the GIL, so
+                threads give a useful speed-up.
+
         Returns:
             A numpy array of integer raw ranks. It has shape ``N × 2``, where N is the number of
             test triples in ``test_data``; the first column (``array[:, 0]``) holds the
@@ -215,58 +233,212 @@ class KGModel:
                 "test_data: expected KGTripleSequence; found {type(test_data).__name__}"
             )
 
+        require_integer_in_range(chunk_size, "chunk_size", min_val=1)
+        require_integer_in_range(num_threads, "num_threads", min_val=1)
+
         num_nodes = known_edges_graph.number_of_nodes()
 
         node_embs, edge_type_embs = self.embedding_arrays()
         extra_data = self._scoring.bulk_scoring_data(node_embs, edge_type_embs)
 
-        raws = []
-        filtereds = []
+        # index the known edges once, rather than querying the graph for each test edge
+        known_objects = _KnownEdgesIndex(known_edges_graph, modified_object=True)
+        known_subjects = _KnownEdgesIndex(known_edges_graph, modified_object=False)
 
-        # run through the batches and compute the ranks for each one
-        num_tested = 0
-        for ((subjects, rels, objects),) in test_data:
-            num_tested += len(subjects)
+        def rank_batch(batch):
+            ((subjects, rels, objects),) = batch
 
             # batch_size x k
             ss = [e[subjects, :] for e in node_embs]
             rs = [e[rels, :] for e in edge_type_embs]
             os = [e[objects, :] for e in node_embs]
 
-            mod_o_pred, mod_s_pred = self._scoring.bulk_scoring(
-                node_embs, extra_data, ss, rs, os,
-            )
+            # the score of each true edge, which is the same for both modifications
+            true_scores = self._scoring.elementwise_scoring(extra_data, ss, rs, os)
 
-            mod_o_raw, mod_o_filt = _ranks_from_score_columns(
-                mod_o_pred,
-                true_modified_node_ilocs=objects,
-                unmodified_node_ilocs=subjects,
-                true_rel_ilocs=rels,
-                modified_object=True,
-                known_edges_graph=known_edges_graph,
-                tie_breaking=tie_breaking,
+            mod_o = _RankCounts(
+                true_scores, objects, *known_objects.pairs(subjects, rels),
             )
-            mod_s_raw, mod_s_filt = _ranks_from_score_columns(
-                mod_s_pred,
-                true_modified_node_ilocs=subjects,
-                true_rel_ilocs=rels,
-                modified_object=False,
-                unmodified_node_ilocs=objects,
-                known_edges_graph=known_edges_graph,
-                tie_breaking=tie_breaking,
+            mod_s = _RankCounts(
+                true_scores, subjects, *known_subjects.pairs(objects, rels),
             )
 
-            raws.append(np.column_stack((mod_o_raw, mod_s_raw)))
-            filtereds.append(np.column_stack((mod_o_filt, mod_s_filt)))
+            # score every node in chunks, accumulating the comparisons for each
+            for start in range(0, num_nodes, chunk_size):
+                chunk = [e[start : start + chunk_size, :] for e in node_embs]
+                mod_o_pred, mod_s_pred = self._scoring.bulk_scoring(
+                    chunk, extra_data, ss, rs, os,
+                )
+                mod_o.update(start, mod_o_pred)
+                mod_s.update(start, mod_s_pred)
+
+            mod_o_raw, mod_o_filt = mod_o.ranks(tie_breaking)
+            mod_s_raw, mod_s_filt = mod_s.ranks(tie_breaking)
+
+            return (
+                np.column_stack((mod_o_raw, mod_s_raw)),
+                np.column_stack((mod_o_filt, mod_s_filt)),
+            )
+
+        # the batches are loaded lazily, so that only a few are in memory at once
+        batches = (test_data[i] for i in range(len(test_data)))
+
+        # run through the batches and compute the ranks for each one
+        if num_threads == 1:
+            results = [rank_batch(batch) for batch in batches]
+        else:
+            with ThreadPoolExecutor(max_workers=num_threads) as executor:
+                results = list(_bounded_map(executor, rank_batch, batches, num_threads))
 
         # make one big array
-        raw = np.concatenate(raws)
-        filtered = np.concatenate(filtereds)
+        raw = np.concatenate([raw for raw, _ in results])
+        filtered = np.concatenate([filtered for _, filtered in results])
         # for each edge, there should be an pair of raw ranks
-        assert raw.shape == filtered.shape == (num_tested, 2)
+        assert raw.shape == filtered.shape == (len(test_data.indices), 2)
 
         return raw, filtered
 
+    def predict_top_k(
+        self,
+        subjects,
+        relations,
+        k,
+        exclude_known=None,
+        batch_size=256,
+        chunk_size=4096,
+        use_ilocs=False,
+        return_latency=False,
+    ):
+        """
+        Find the ``k`` highest-scoring objects for each query pair of subject and relation, that
+        is, the nodes ``n`` with the highest scores for the edges ``(s, r, n)``.
+
+        The queries are answered in batches of ``batch_size``, and each batch is scored against
+        ``chunk_size`` candidate nodes at a time (using the same bulk scoring as
+        :meth:`rank_edges_against_all_nodes`), keeping only the best ``k`` candidates so far via a
+        partial sort. The memory required is thus proportional to ``batch_size × (chunk_size +
+        k)``, independent of the number of nodes.
+
+        Args:
+            subjects: an iterable of the subject node of each query
+            relations: an iterable of the relation (edge type) of each query, of the same length as
+                ``subjects``
+            k (int): the number of objects to find for each query
+            exclude_known (StellarGraph, optional): if specified, edges ``(s, r, n)`` that are in
+                this graph are excluded from the results, so that only new edges are predicted. If
+                there are fewer than ``k`` other nodes, the remaining results have score ``-inf``.
+            batch_size (int): the number of queries to answer at once
+            chunk_size (int): the number of candidate nodes to score at once
+            use_ilocs (bool): if True, ``subjects`` and ``relations``, and the returned objects, are
+                :ref:`ilocs <iloc-explanation>` of nodes and edge types; otherwise they're node IDs and
+                edge type names.
+            return_latency (bool): if True, also return the time in seconds taken to answer each
+                query. (Each batch of queries is answered together, so this is the time taken by the
+                query's batch.)
+
+        Returns:
+            A tuple ``(objects, scores)`` of arrays of shape ``number of queries × k``, where row
+            ``i`` holds the objects for query ``i``, in descending order of score. If
+            ``return_latency``, the tuple also has an array of length ``number of queries`` with the
+            latency of each query.
+        """
+        require_integer_in_range(k, "k", min_val=1)
+        require_integer_in_range(batch_size, "batch_size", min_val=1)
+        require_integer_in_range(chunk_size, "chunk_size", min_val=1)
+
+        if use_ilocs:
+            subject_ilocs = np.asarray(subjects)
+            rel_ilocs = np.asarray(relations)
+        else:
+            subject_ilocs = self._graph.node_ids_to_ilocs(subjects)
+            rel_ilocs = self._graph.edge_type_names_to_ilocs(relations)
+
+        if subject_ilocs.shape != rel_ilocs.shape or subject_ilocs.ndim != 1:
+            raise ValueError(
+                f"subjects, relations: expected one-dimensional iterables of the same length, found shapes {subject_ilocs.shape} and {rel_ilocs.shape}"
+            )
+
+        k = min(k, self.num_nodes)
+        known = None
+        if exclude_known is not None:
+            known = _KnownEdgesIndex(exclude_known, modified_object=True)
+
+        node_embs, edge_type_embs = self.embedding_arrays()
+        extra_data = self._scoring.bulk_scoring_data(node_embs, edge_type_embs)
+
+        num_queries = len(subject_ilocs)
+        objects = np.empty((num_queries, k), dtype=int)
+        scores = None
+        latency = np.empty(num_queries)
+
+        for batch_start in range(0, num_queries, batch_size):
+            start_time = time.perf_counter()
+
+            batch = slice(batch_start, batch_start + batch_size)
+            subjects_batch = subject_ilocs[batch]
+            rels_batch = rel_ilocs[batch]
+
+            ss = [e[subjects_batch, :] for e in node_embs]
+            rs = [e[rels_batch, :] for e in edge_type_embs]
+
+            if known is not None:
+                known_nodes, known_columns = known.pairs(subjects_batch, rels_batch)
+                order = np.argsort(known_nodes, kind="stable")
+                known_nodes = known_nodes[order]
+                known_columns = known_columns[order]
+
+            best_ilocs = best_scores = None
+            for start in range(0, self.num_nodes, chunk_size):
+                chunk = [e[start : start + chunk_size, :] for e in node_embs]
+                mod_o_pred = self._scoring.bulk_object_scoring(
+                    chunk, extra_data, ss, rs
+                )
+                chunk_scores = np.array(mod_o_pred.T, dtype=np.float64)
+                chunk_ilocs = np.broadcast_to(
+                    np.arange(start, start + len(mod_o_pred)), chunk_scores.shape
+                )
+
+                if known is not None:
+                    lo, hi = np.searchsorted(known_nodes, [start, start + chunk_size])
+                    chunk_scores[
+                        known_columns[lo:hi], known_nodes[lo:hi] - start
+                    ] = -np.inf
+
+                if best_scores is None:
+                    best_scores, best_ilocs = chunk_scores, chunk_ilocs
+                else:
+                    best_scores = np.hstack([best_scores, chunk_scores])
+                    best_ilocs = np.hstack([best_ilocs, chunk_ilocs])
+
+                if best_scores.shape[1] > k:
+                    # partial sort to keep the best k so far
+                    top = np.argpartition(-best_scores, k - 1, axis=1)[:, :k]
+                    best_scores = np.take_along_axis(best_scores, top, axis=1)
+                    best_ilocs = np.take_along_axis(best_ilocs, top, axis=1)
+
+            order = np.argsort(-best_scores, axis=1, kind="stable")
+            best_scores = np.take_along_axis(best_scores, order, axis=1)
+            objects[batch] = np.take_along_axis(best_ilocs, order, axis=1)
+
+            if scores is None:
+                scores = np.empty((num_queries, k), dtype=mod_o_pred.dtype)
+            scores[batch] = best_scores
+
+            latency[batch] = time.perf_counter() - start_time
+
+        if scores is None:
+            scores = np.empty((0, k))
+
+        if not use_ilocs:
+            objects = self._graph.node_ilocs_to_ids(objects.ravel()).reshape(
+                objects.shape
+            )
+
+        if return_latency:
+            return objects, scores, latency
+
+        return objects, scores
+
 
 class KGScore(abc.ABC):
     @abc.abstractmethod
@@ -320,21 +492,68 @@ class KGScore(abc.ABC):
 
         Args:
             node_embs: ``num_nodes × k`` array of all node embeddings, where ``k`` is the size of
-                the embeddings returned by :meth:embeddings_to_numpy`.
+                the embeddings returned by :meth:embeddings_to_numpy`. This may also be the
+                embeddings of only a subset of the nodes (such as a chunk of them), so the scores
+                for each node should only depend on its own embeddings.
 
-            extra_data: the return value of :meth:`bulk_scoring_data`
+            extra_data: the return value of :meth:`bulk_scoring_data`, which is computed for all
+                nodes, and so shouldn't contain data for individual nodes
 
             s_embs: ``batch_size × k`` embeddings for the true source nodes
             r_embs: ``batch_size × k`` embeddings for the true edge types/relations
             o_embs: ``batch_size × k`` embeddings for the true object nodes
 
         Returns:
-            This should return a pair of NumPy arrays of shape ``num_nodes × batch_size``. The first
+            This should return a pair of NumPy arrays of shape ``len(node_embs) × batch_size``. The first
             array contains scores of the modified-object edges, and the second contains scores of
             the modified-subject edges.
         """
         ...
 
+    def bulk_object_scoring(self, node_embs, extra_data, s_embs, r_embs):
+        """
+        Compute a batch of modified-object scores, like the first array returned by
+        :meth:`bulk_scoring`, without computing the modified-subject ones.
+
+        The default implementation uses :meth:`bulk_scoring` and discards the modified-subject
+        scores; subclasses should override it to avoid computing them.
+
+        Args:
+            node_embs: ``num_nodes × k`` array of node embeddings (or a chunk of them), see
+                :meth:`bulk_scoring`
+            extra_data: the return value of :meth:`bulk_scoring_data`
+            s_embs: ``batch_size × k`` embeddings for the true source nodes
+            r_embs: ``batch_size × k`` embeddings for the true edge types/relations
+
+        Returns:
+            A NumPy array of shape ``len(node_embs) × batch_size`` of the scores of the
+            modified-object edges.
+        """
+        # the modified-subject scores aren't needed, so any object embeddings will do
+        mod_o_pred, _ = self.bulk_scoring(node_embs, extra_data, s_embs, r_embs, s_embs)
+        return mod_o_pred
+
+    def elementwise_scoring(self, extra_data, s_embs, r_embs, o_embs):
+        """
+        Compute the scores of a batch of edges, where each edge is scored with its own subject,
+        relation and object embeddings.
+
+        The default implementation uses :meth:`bulk_scoring`, which scores every pair of elements
+        in the batch and so takes time quadratic in the batch size; subclasses should override it
+        to score each edge directly.
+
+        Args:
+            extra_data: the return value of :meth:`bulk_scoring_data`
+            s_embs: ``batch_size × k`` embeddings for the source nodes
+            r_embs: ``batch_size × k`` embeddings for the edge types/relations
+            o_embs: ``batch_size × k`` embeddings for the object nodes
+
+        Returns:
+            A NumPy array of shape ``batch_size``, containing the score of each edge.
+        """
+        mod_o_pred, _ = self.bulk_scoring(o_embs, extra_data, s_embs, r_embs, o_embs)
+        return np.diag(mod_o_pred)
+
     # this isn't a subclass of Keras Layer, because a model or other combination of individual
     # layers is okay too, but this model will be applied by calling the instance
     @abc.abstractmethod
@@ -394,20 +613,22 @@ class ComplExScore(Layer, KGScore):
             [_numpy_complex(edge_type_embs)],
         )
 
-    def bulk_scoring_data(self, node_embs, edge_type_embs):
-        return node_embs[0].conj()
-
     def bulk_scoring(
-        self, node_embs, node_embs_conj, s_embs, r_embs, o_embs,
+        self, node_embs, extra_data, s_embs, r_embs, o_embs,
     ):
-        node_embs = node_embs[0]
+        mod_o_pred = self.bulk_object_scoring(node_embs, extra_data, s_embs, r_embs)
+        mod_s_pred = np.inner(node_embs[0], r_embs[0] * o_embs[0].conj()).real
+        return mod_o_pred, mod_s_pred
+
+    def bulk_object_scoring(self, node_embs, _extra_data, s_embs, r_embs):
+        return np.inner(node_embs[0].conj(), s_embs[0] * r_embs[0]).real
+
+    def elementwise_scoring(self, _extra_data, s_embs, r_embs, o_embs):
         s_embs = s_embs[0]
         r_embs = r_embs[0]
         o_embs = o_embs[0]
 
-        mod_o_pred = np.inner(node_embs_conj, s_embs * r_embs).real
-        mod_s_pred = np.inner(node_embs, r_embs * o_embs.conj()).real
-        return mod_o_pred, mod_s_pred
+        return (o_embs.conj() * (s_embs * r_embs)).sum(axis=1).real
 
     def build(self, input_shape):
         self.built = True
@@ -516,16 +737,21 @@ class DistMultScore(Layer, KGScore):
         return nodes, edge_types
 
     def bulk_scoring(
-        self, all_n_embs, _extra_data, s_embs, r_embs, o_embs,
+        self, all_n_embs, extra_data, s_embs, r_embs, o_embs,
     ):
-        all_n_embs = all_n_embs[0]
+        mod_o_pred = self.bulk_object_scoring(all_n_embs, extra_data, s_embs, r_embs)
+        mod_s_pred = np.inner(all_n_embs[0], r_embs[0] * o_embs[0])
+        return mod_o_pred, mod_s_pred
+
+    def bulk_object_scoring(self, all_n_embs, _extra_data, s_embs, r_embs):
+        return np.inner(all_n_embs[0], s_embs[0] * r_embs[0])
+
+    def elementwise_scoring(self, _extra_data, s_embs, r_embs, o_embs):
         s_embs = s_embs[0]
         r_embs = r_embs[0]
         o_embs = o_embs[0]
 
-        mod_o_pred = np.inner(all_n_embs, s_embs * r_embs)
-        mod_s_pred = np.inner(all_n_embs, r_embs * o_embs)
-        return mod_o_pred, mod_s_pred
+        return (o_embs * (s_embs * r_embs)).sum(axis=1)
 
     def build(self, input_shape):
         self.built = True
@@ -620,19 +846,14 @@ class RotatEScore(Layer, KGScore):
         return [nodes], [edge_types]
 
     def bulk_scoring(
-        self, all_n_embs, _extra_data, s_embs, r_embs, o_embs,
+        self, all_n_embs, extra_data, s_embs, r_embs, o_embs,
     ):
+        mod_o_pred = self.bulk_object_scoring(all_n_embs, extra_data, s_embs, r_embs)
+
         all_n_embs = all_n_embs[0]
-        s_embs = s_embs[0]
         r_embs = r_embs[0]
         o_embs = o_embs[0]
 
-        # (the margin is a fixed offset that doesn't affect relative ranks)
-        mod_o_pred = -np.linalg.norm(
-            (s_embs * r_embs)[None, :, :] - all_n_embs[:, None, :],
-            ord=self._norm_order,
-            axis=2,
-        )
         mod_s_pred = -np.linalg.norm(
             all_n_embs[:, None, :] * r_embs[None, :, :] - o_embs[None, :, :],
             ord=self._norm_order,
@@ -640,6 +861,26 @@ class RotatEScore(Layer, KGScore):
         )
         return mod_o_pred, mod_s_pred
 
+    def bulk_object_scoring(self, all_n_embs, _extra_data, s_embs, r_embs):
+        all_n_embs = all_n_embs[0]
+        s_embs = s_embs[0]
+        r_embs = r_embs[0]
+
+        # (the margin is a fixed offset that doesn't affect relative ranks)
+        return -np.linalg.norm(
+            (s_embs * r_embs)[None, :, :] - all_n_embs[:, None, :],
+            ord=self._norm_order,
+            axis=2,
+        )
+
+    def elementwise_scoring(self, _extra_data, s_embs, r_embs, o_embs):
+        s_embs = s_embs[0]
+        r_embs = r_embs[0]
+        o_embs = o_embs[0]
+
+        # (the margin is omitted, to match bulk_scoring)
+        return -np.linalg.norm(s_embs * r_embs - o_embs, ord=self._norm_order, axis=1)
+
     def get_config(self):
         return {
             **super().get_config(),
@@ -774,48 +1015,123 @@ class RotHEScore(Layer, KGScore):
 
         return -d + b_s + b_o
 
+    def _squared_distance_from_products(self, c, x_norm2, y_norm2, x_dot_y):
+        """
+        The squared distance between vectors ``x`` and ``y``, computed from only their squared
+        norms and dot product, so that the distances between many pairs of vectors can be computed
+        from a matrix product, without materialising any ``x - y`` (or ``-x ⊕ y``) vectors.
+        """
+        if not self._hyperbolic:
+            return tf.maximum(x_norm2 + y_norm2 - 2 * x_dot_y, 0)
+
+        # ||-x ⊕ y||, following poincare_ball_mobius_add and poincare_ball_distance
+        inner = 1 - 2 * c * x_dot_y
+        a = inner + c * y_norm2
+        b = 1 - c * x_norm2
+        numer_norm2 = a * a * x_norm2 - 2 * a * b * x_dot_y + b * b * y_norm2
+        denom = inner + c * c * x_norm2 * y_norm2
+        norm = self._project_norm(c, tf.sqrt(tf.maximum(numer_norm2, 0)) / denom)
+
+        sqrt_c = tf.sqrt(c)
+        return tf.square((2 / sqrt_c) * _atanh(sqrt_c * norm))
+
+    def _project_norm(self, c, norm):
+        # the norm of a vector after hyperbolic._project
+        return tf.minimum(norm, tf.math.rsqrt(c) * (1 - PROJECTION_EPS))
+
     def bulk_scoring(
         self, all_n_embs, _extra_data, s_embs, r_embs, o_embs,
     ):
+        # This computes the scores without broadcasting any vectors to num_nodes × batch × dimension
+        # (which is what applying the operations in `call` would do): distances only depend on norms
+        # and dot products, and dot products with all nodes are matrix multiplications. Rotations
+        # preserve norms, and rot(θ, x)·y = x·rot(-θ, y), so the rotation can always be applied to
+        # the batch side. Thus, the largest intermediate values are num_nodes × batch.
         curvature = self._curvature()
+        c = curvature[0]
 
-        e_all, b_all = all_n_embs
-        e_all = e_all[:, None, :]
-        b_all = b_all[:, None, 0]
-
-        e_s, b_s = s_embs
-        e_s = e_s[None, :, :]
-        b_s = b_s[None, :, 0]
-
+        nodes = self._bulk_nodes(curvature, all_n_embs)
+        eh_all, eh_all_norm2, b_all = nodes
         r_r, theta_r = r_embs
-        r_r = r_r[None, :, :]
-        theta_r = theta_r[None, :, :]
-
         e_o, b_o = o_embs
-        e_o = e_o[None, :, :]
-        b_o = b_o[None, :, 0]
 
-        eh_s = self._convert(curvature, e_s)
         rh_r = self._convert(curvature, r_r)
+        rh_r_norm2 = tf.reduce_sum(rh_r * rh_r, axis=-1)
 
-        rotated_s = self._rotate(theta_r, eh_s)
-        d_mod_o = self._squared_distance(
-            curvature, self._add(curvature, rotated_s, rh_r), e_all
+        mod_o_pred = self._bulk_object_scores(curvature, nodes, s_embs, rh_r, theta_r)
+
+        # modified subject: d(v_n, eh_o) where v_n = p_n ⊕ rh_r and p_n = rot(θ_r, eh_n), for
+        # every node n. The Möbius addition is expanded to give ||v_n||² and v_n·eh_o in terms of
+        # p_n·rh_r = eh_n·rot(-θ_r, rh_r) and p_n·eh_o = eh_n·rot(-θ_r, eh_o).
+        eh_o = self._convert(curvature, e_o)
+        eh_o_norm2 = tf.reduce_sum(eh_o * eh_o, axis=-1)
+        r_dot_o = tf.reduce_sum(rh_r * eh_o, axis=-1)
+
+        p_dot_r = tf.matmul(eh_all, self._rotate(-theta_r, rh_r), transpose_b=True)
+        p_dot_o = tf.matmul(eh_all, self._rotate(-theta_r, eh_o), transpose_b=True)
+
+        inner = 1 + 2 * c * p_dot_r
+        a = inner + c * rh_r_norm2
+        b = 1 - c * eh_all_norm2
+        denom = inner + c * c * eh_all_norm2 * rh_r_norm2
+
+        v_norm = (
+            tf.sqrt(
+                tf.maximum(
+                    a * a * eh_all_norm2 + 2 * a * b * p_dot_r + b * b * rh_r_norm2, 0
+                )
+            )
+            / denom
         )
-        mod_o_pred = -d_mod_o + b_s + b_all
+        v_dot_o = (a * p_dot_o + b * r_dot_o) / denom
 
-        del eh_s, d_mod_o, rotated_s
+        if self._hyperbolic:
+            # the Möbius addition projects its result onto the ball, scaling it down
+            projected_norm = self._project_norm(c, v_norm)
+            v_dot_o *= tf.math.divide_no_nan(projected_norm, v_norm)
+            v_norm = projected_norm
 
-        eh_o = self._convert(curvature, e_o)
+        d_mod_s = self._squared_distance_from_products(
+            c, tf.square(v_norm), eh_o_norm2, v_dot_o
+        )
+        mod_s_pred = -d_mod_s + b_all + b_o[None, :, 0]
+
+        return mod_o_pred.numpy(), mod_s_pred.numpy()
+
+    def bulk_object_scoring(self, all_n_embs, _extra_data, s_embs, r_embs):
+        curvature = self._curvature()
+        nodes = self._bulk_nodes(curvature, all_n_embs)
+        r_r, theta_r = r_embs
+        rh_r = self._convert(curvature, r_r)
+        return self._bulk_object_scores(curvature, nodes, s_embs, rh_r, theta_r).numpy()
+
+    def _bulk_nodes(self, curvature, all_n_embs):
+        # the per-node values used by bulk scoring: the embeddings in the scoring space, their
+        # squared norms and the biases, as column vectors
+        e_all, b_all = all_n_embs
         eh_all = self._convert(curvature, e_all)
+        eh_all_norm2 = tf.reduce_sum(eh_all * eh_all, axis=-1, keepdims=True)
+        return eh_all, eh_all_norm2, b_all[:, None, 0]
+
+    def _bulk_object_scores(self, curvature, nodes, s_embs, rh_r, theta_r):
+        # modified object: d(rot(θ_r, eh_s) ⊕ rh_r, eh_n) for every node n
+        c = curvature[0]
+        eh_all, eh_all_norm2, b_all = nodes
+        e_s, b_s = s_embs
+
+        eh_s = self._convert(curvature, e_s)
+        query = self._add(curvature, self._rotate(theta_r, eh_s), rh_r)
+        query_norm2 = tf.reduce_sum(query * query, axis=-1)
 
-        rotated_all = self._rotate(theta_r, eh_all)
-        d_mod_s = self._squared_distance(
-            curvature, self._add(curvature, rotated_all, rh_r), e_o
+        d_mod_o = self._squared_distance_from_products(
+            c, eh_all_norm2, query_norm2, tf.matmul(eh_all, query, transpose_b=True)
         )
-        mod_s_pred = -d_mod_s + b_all + b_o
+        return -d_mod_o + b_s[None, :, 0] + b_all
 
-        return mod_o_pred.numpy(), mod_s_pred.numpy()
+    def elementwise_scoring(self, _extra_data, s_embs, r_embs, o_embs):
+        # `call` scores each edge individually, from inputs of shape batch × 1 × k
+        inputs = [emb[:, None, :] for emb in [*s_embs, *r_embs, *o_embs]]
+        return self.call(inputs).numpy()[:, 0]
 
 
 @experimental(reason="demo is missing", issues=[1664])
@@ -906,10 +1222,25 @@ class RotE(KGModel):
         )
 
 
-def _ranks_from_comparisons(greater, greater_equal, tie_breaking):
-    strict = 1 + greater.sum(axis=0)
+def _bounded_map(executor, func, iterable, max_pending):
+    """
+    Like ``executor.map(func, iterable)``, except that the items of ``iterable`` are only consumed
+    as results are yielded, so that at most ``2 × max_pending`` items are in flight at once.
+    """
+    pending = collections.deque()
+    for item in iterable:
+        if len(pending) >= 2 * max_pending:
+            yield pending.popleft().result()
+        pending.append(executor.submit(func, item))
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def _ranks_from_counts(greater, greater_equal, tie_breaking):
+    strict = 1 + greater
     # with_ties - strict = the number of elements exactly equal (including the true edge itself)
-    with_ties = greater_equal.sum(axis=0)
+    with_ties = greater_equal
 
     if tie_breaking == "top":
         return strict
@@ -923,78 +1254,158 @@ def _ranks_from_comparisons(greater, greater_equal, tie_breaking):
         )
 
 
-def _ranks_from_score_columns(
-    pred,
-    *,
-    true_modified_node_ilocs,
-    unmodified_node_ilocs,
-    true_rel_ilocs,
-    modified_object,
-    known_edges_graph,
-    tie_breaking,
-):
+class _KnownEdgesIndex:
     """
-    Compute the raw and filtered ranks of a set of true edges ``E = (s, r, o)`` against all
-    mutations of one end of them, e.g. ``E' = (s, r, n)`` for "modified-object".
-
-    The raw rank is the total number of edges scored higher than the true edge ``E``, and the
-    filtered rank is the total number of unknown edges (not in ``known_edges_graph``).
+    An index of the known edges of a graph, for filtering ranks: for each pair of unmodified node
+    and relation, the (sorted, unique) known nodes at the modified end, stored like a CSR matrix
+    with sorted keys.
 
     Args:
+        known_edges_graph (StellarGraph): a graph containing all the known edges
+        modified_object (bool): whether the object is modified (so the index maps ``(s, r)`` to
+            known objects), or the subject (``(o, r)`` to known subjects)
+    """
+
+    def __init__(self, known_edges_graph, modified_object):
+        sources, targets, rels, _ = known_edges_graph.edge_arrays(
+            include_edge_type=True, use_ilocs=True
+        )
+        if modified_object:
+            unmodified, modified = sources, targets
+        else:
+            unmodified, modified = targets, sources
+
+        self._num_rels = max(len(known_edges_graph.edge_types), 1)
+        keys = self._keys(unmodified, rels)
+
+        order = np.lexsort((modified, keys))
+        keys = keys[order]
+        modified = np.asarray(modified)[order]
+
+        # remove duplicate edges
+        if len(keys) > 0:
+            distinct = np.ones(len(keys), dtype=bool)
+            distinct[1:] = (keys[1:] != keys[:-1]) | (modified[1:] != modified[:-1])
+            keys = keys[distinct]
+            modified = modified[distinct]
+
+        self._keys_sorted, starts = np.unique(keys, return_index=True)
+        self._indptr = np.append(starts, len(keys))
+        self._modified = modified
+
+    def _keys(self, unmodified, rels):
+        return np.asarray(unmodified, dtype=np.int64) * self._num_rels + rels
+
+    def pairs(self, unmodified_node_ilocs, rel_ilocs):
+        """
+        Find the known edges for each element of a batch of unmodified nodes and relations.
+
+        Returns:
+            A tuple of two arrays ``(nodes, columns)``, where ``nodes[i]`` is a known modified node
+            for the batch element at index ``columns[i]``.
+        """
+        keys = self._keys(unmodified_node_ilocs, rel_ilocs)
+        if len(self._keys_sorted) == 0:
+            empty = np.array([], dtype=int)
+            return empty, empty
+
+        positions = np.searchsorted(self._keys_sorted, keys)
+        positions[positions == len(self._keys_sorted)] = 0
+        found = self._keys_sorted[positions] == keys
+
+        starts = np.where(found, self._indptr[positions], 0)
+        lengths = np.where(found, self._indptr[positions + 1], 0) - starts
+
+        columns = np.repeat(np.arange(len(keys)), lengths)
+        # the offset of each element within its own run
+        offsets = np.arange(lengths.sum()) - np.repeat(
+            np.cumsum(lengths) - lengths, lengths
+        )
+        nodes = self._modified[np.repeat(starts, lengths) + offsets]
+        return nodes, columns
 
-        pred: a 2D array: each column represents the scores for a single true edge and its
-            mutations, where the row indicates the ``n`` in ``E'`` (e.g. row 0 corresponds to ``n``
-            = node with iloc 0)
+
+class _RankCounts:
+    """
+    Accumulate the comparisons needed to compute raw and filtered ranks of a batch of true edges
+    ``E = (s, r, o)`` against all mutations of one end of them, e.g. ``E' = (s, r, n)`` for
+    "modified-object", from chunks of scores for the mutated edges.
+
+    Args:
+        true_scores: the score of each true edge in the batch
         true_modified_node_ilocs: an array of ilocs of the actual node that was modified, that is,
-            ``o`` for modified-object and ``s`` for modified subject``, index ``i`` corresponds to
-            the iloc for column ``pred[:, i]``.
-        unmodified_node_ilocs: similar to ``true_modified_node_ilocs``, except for the other end of
-            the edge: the node that was not modified.
-        true_rel_ilocs: similar to ``true_modified_node_ilocs``, except for the relationship type of
-            the edge (``r``).
-        modified_object (bool): whether the object was modified (``True``), or the subject
-            (``False``)
-        known_edges_graph (StellarGraph): a graph containing all the known edges that should be
-            ignored when computing filtered ranks
-
-    Returns:
-        a tuple of raw ranks and filtered ranks, each is an array of integers >= 1 where index ``i``
-        corresponds to the rank of the true edge among all of the scores in column ``pred[:, i]``.
+            ``o`` for modified-object and ``s`` for modified subject``.
+        known_nodes, known_columns: the known edges, as pairs of modified node and batch element,
+            see :meth:`_KnownEdgesIndex.pairs`
     """
-    batch_size = len(true_modified_node_ilocs)
-    assert pred.shape == (known_edges_graph.number_of_nodes(), batch_size)
-    assert unmodified_node_ilocs.shape == true_rel_ilocs.shape == (batch_size,)
-
-    # the score of the true edge, for each edge in the batch (this indexes in lock-step,
-    # i.e. [pred[true_modified_node_ilocs[0], range(batch_size)[0]], ...])
-    true_scores = pred[true_modified_node_ilocs, range(batch_size)]
-
-    # for each column, compare all the scores against the score of the true edge
-    greater = pred > true_scores
-    greater_equal = pred >= true_scores
-
-    # the raw rank is the number of elements scored higher than the true edge
-    raw_rank = _ranks_from_comparisons(greater, greater_equal, tie_breaking)
-
-    # the filtered rank is the number of unknown elements scored higher, where an element is
-    # known if the edge (s, r, n) (for modified-object) or (n, r, o) (for modified-subject)
-    # exists in known_edges_graph.
-    if modified_object:
-        neigh_func = known_edges_graph.out_nodes
-    else:
-        neigh_func = known_edges_graph.in_nodes
 
-    for batch_column, (unmodified, r) in enumerate(
-        zip(unmodified_node_ilocs, true_rel_ilocs)
+    def __init__(
+        self, true_scores, true_modified_node_ilocs, known_nodes, known_columns
     ):
-        this_neighs = neigh_func(unmodified, edge_types=[r], use_ilocs=True)
-        greater[this_neighs, batch_column] = False
-        greater_equal[this_neighs, batch_column] = False
-
-    # the actual elements should be counted as equal, whether or not it was a known edge or not
-    greater_equal[true_modified_node_ilocs, range(batch_size)] = True
+        self._true_scores = true_scores
+        self._true_ilocs = np.asarray(true_modified_node_ilocs)
+
+        # the true edge itself is handled separately, and the known edges are sorted so that the
+        # ones for each chunk can be found quickly
+        not_true = known_nodes != self._true_ilocs[known_columns]
+        order = np.argsort(known_nodes[not_true], kind="stable")
+        self._known_nodes = known_nodes[not_true][order]
+        self._known_columns = known_columns[not_true][order]
+
+        batch_size = len(self._true_ilocs)
+        self._greater = np.zeros(batch_size, dtype=int)
+        self._greater_equal = np.zeros(batch_size, dtype=int)
+        self._known_greater = np.zeros(batch_size, dtype=int)
+        self._known_greater_equal = np.zeros(batch_size, dtype=int)
+
+    def update(self, start, pred):
+        """
+        Add the comparisons for a chunk of scores.
 
-    filtered_rank = _ranks_from_comparisons(greater, greater_equal, tie_breaking)
+        Args:
+            start (int): the iloc of the node corresponding to the first row of ``pred``
+            pred: a 2D array: each column represents the scores for a single true edge and its
+                mutations, where the row indicates the ``n`` in ``E'`` (e.g. row 0 corresponds to
+                ``n`` = node with iloc ``start``)
+        """
+        end = start + len(pred)
+
+        # for each column, compare all the scores against the score of the true edge
+        greater = pred > self._true_scores
+        greater_equal = pred >= self._true_scores
+        self._greater += greater.sum(axis=0)
+        self._greater_equal += greater_equal.sum(axis=0)
+
+        # the true edge itself isn't compared against itself, it's always counted as equal
+        columns = np.flatnonzero((self._true_ilocs >= start) & (self._true_ilocs < end))
+        rows = self._true_ilocs[columns] - start
+        self._greater[columns] -= greater[rows, columns]
+        self._greater_equal[columns] -= greater_equal[rows, columns]
+
+        # the known edges in this chunk, which are ignored for the filtered ranks
+        lo, hi = np.searchsorted(self._known_nodes, [start, end])
+        rows = self._known_nodes[lo:hi] - start
+        columns = self._known_columns[lo:hi]
+        np.add.at(self._known_greater, columns, greater[rows, columns])
+        np.add.at(self._known_greater_equal, columns, greater_equal[rows, columns])
+
+    def ranks(self, tie_breaking):
+        """
+        Compute the raw and filtered ranks from all of the chunks.
 
-    assert raw_rank.shape == filtered_rank.shape == (batch_size,)
-    return raw_rank, filtered_rank
+        Returns:
+            a tuple of raw ranks and filtered ranks, each is an array of integers >= 1 where index
+            ``i`` corresponds to the rank of the true edge ``i``.
+        """
+        # the raw rank is the number of elements scored higher than the true edge (+ 1 for the true
+        # edge itself, for ties)
+        raw_rank = _ranks_from_counts(
+            self._greater, self._greater_equal + 1, tie_breaking
+        )
+        # the filtered rank is the number of unknown elements scored higher
+        filtered_rank = _ranks_from_counts(
+            self._greater - self._known_greater,
+            self._greater_equal - self._known_greater_equal + 1,
+            tie_breaking,
+        )
+        return raw_rank, filtered_rank
@@ -36,7 +36,9 @@ class SqueezedSparseConversion(Layer):
         ```
 
     Args:
-        shape (list of int): The shape of the sparse matrix to create
+        shape (list of int): The shape of the sparse matrix to create. A dimension may be None, if
+            it varies between batches (such as the number of nodes in a sampled subgraph), in which
+            case it is inferred as one more than the largest index in that dimension.
         dtype (str or tf.dtypes.DType): Data type for the created sparse matrix
     """
 
@@ -90,9 +92,19 @@ class SqueezedSparseConversion(Layer):
         # tensorflow installed.
         import tensorflow as tf
 
+        dense_shape = self.matrix_shape
+        if any(dim is None for dim in dense_shape):
+            inferred = K.max(indices, axis=0) + 1
+            dense_shape = tf.stack(
+                [
+                    inferred[i] if dim is None else tf.constant(dim, dtype=tf.int64)
+                    for i, dim in enumerate(dense_shape)
+                ]
+            )
+
         # Build sparse tensor for the matrix
         output = tf.SparseTensor(
-            indices=indices, values=values, dense_shape=self.matrix_shape
+            indices=indices, values=values, dense_shape=dense_shape
         )
         return output
 
@@ -164,7 +164,8 @@ class PPNP:
         Keras methods. When using the :class:`.FullBatchNodeGenerator` specify the
         ``method='ppnp'`` argument to do this preprocessing.
 
-      - ``method='ppnp'`` requires that ``use_sparse=False`` and generates a dense personalized page rank matrix
+      - ``method='ppnp'`` generates a dense personalized page rank matrix, and requires that
+        ``sparse=False``, unless ``ppnp_epsilon`` is specified to approximate it as a sparse matrix
 
       - The nodes provided to the :meth:`FullBatchNodeGenerator.flow` method are
         used by the final layer to select the predictions for those nodes in order.
@@ -203,6 +204,11 @@ class PPNP:
         if not isinstance(generator, FullBatchNodeGenerator):
             raise TypeError("Generator should be a instance of FullBatchNodeGenerator")
 
+        if generator.use_sparse_features:
+            raise ValueError(
+                "generator: expected a generator with 'sparse_features=False', found 'sparse_features=True'"
+            )
+
         if not len(layer_sizes) == len(activations):
             raise ValueError(
                 "The number of layers should equal the number of activations"
@@ -32,6 +32,11 @@ class SortPooling(Layer):
 
     .. seealso:: The :class:`.DeepGraphCNN` model uses this class for graph classification.
 
+    This layer supports two layouts of a batch of graphs: padded, where ``embeddings`` is ``B × N × F`` and a
+    boolean ``mask`` indicates the valid rows, and disjoint union (as produced by a
+    :class:`.PaddedGraphGenerator` with ``sparse=True``), where ``embeddings`` is ``1 × total nodes × F``
+    and ``segment_ids`` gives the index of the graph containing each node.
+
     Args:
         k (int): The number of rows of output tensor.
         flatten_output (bool): If True then the output tensor is reshaped to vector for each element in the batch.
@@ -95,18 +100,68 @@ class SortPooling(Layer):
 
         return embeddings
 
-    def call(self, embeddings, mask):
+    def _sort_segments(self, embeddings, segment_ids):
+        # without the batch dimension: (total nodes, F) and (total nodes,)
+        embeddings = tf.squeeze(embeddings, axis=0)
+        segment_ids = tf.cast(tf.squeeze(segment_ids, axis=0), tf.int32)
+
+        # sort by the last column (descending) within each graph, via two stable sorts
+        by_value = tf.argsort(embeddings[:, -1], direction="DESCENDING", stable=True)
+        order = tf.gather(
+            by_value, tf.argsort(tf.gather(segment_ids, by_value), stable=True),
+        )
+        sorted_segments = tf.gather(segment_ids, order)
+
+        # the position of each sorted node within its graph
+        num_graphs = tf.reduce_max(segment_ids) + 1
+        counts = tf.math.unsorted_segment_sum(
+            tf.ones_like(segment_ids), segment_ids, num_graphs
+        )
+        starts = tf.cumsum(counts, exclusive=True)
+        ranks = tf.range(tf.shape(segment_ids)[0]) - tf.gather(starts, sorted_segments)
+
+        # keep the first k nodes of each graph, and fill in any missing rows with zeros
+        keep = ranks < self.k
+        indices = tf.stack(
+            [tf.boolean_mask(sorted_segments, keep), tf.boolean_mask(ranks, keep)],
+            axis=1,
+        )
+        updates = tf.gather(embeddings, tf.boolean_mask(order, keep))
+        outputs = tf.scatter_nd(
+            indices, updates, shape=[num_graphs, self.k, tf.shape(embeddings)[1]]
+        )
+
+        if self.flatten_output:
+            outputs = tf.reshape(
+                outputs, [num_graphs, embeddings.shape[-1] * self.k, 1]
+            )
+
+        return outputs
+
+    def call(self, embeddings, mask=None, segment_ids=None):
         """
         Applies the layer.
 
+        Exactly one of ``mask`` and ``segment_ids`` must be specified.
+
         Args:
             embeddings (tensor): the node features (size B x N x Sum F_i)
                 where B is the batch size, N is the number of nodes in the largest graph in the batch, and
-                F_i is the dimensionality of node features output from the i-th convolutional layer.
-            mask (tensor): a boolean mask (size B x N)
+                F_i is the dimensionality of node features output from the i-th convolutional layer. With
+                ``segment_ids``, the size is 1 x total number of nodes x Sum F_i.
+            mask (tensor, optional): a boolean mask (size B x N)
+            segment_ids (tensor, optional): the index of the graph containing each node (size 1 x total
+                number of nodes)
         Returns:
             Keras Tensor that represents the output of the layer.
         """
+        if (mask is None) == (segment_ids is None):
+            raise ValueError(
+                "expected exactly one of 'mask' and 'segment_ids' to be specified"
+            )
+
+        if segment_ids is not None:
+            return self._sort_segments(embeddings, segment_ids)
 
         outputs = tf.map_fn(
             self._sort_tensor_with_mask, (embeddings, mask), dtype=embeddings.dtype
@@ -129,3 +184,33 @@ class SortPooling(Layer):
             )
 
         return outputs
+
+
+class SegmentAveragePooling(Layer):
+    """
+    Mean pooling over the nodes of each graph in a disjoint union of graphs, as produced by a
+    :class:`.PaddedGraphGenerator` with ``sparse=True``. This is the equivalent of Keras'
+    ``GlobalAveragePooling1D`` with a mask for the padded layout.
+
+    .. seealso:: The :class:`.GCNSupervisedGraphClassification` model uses this class by default with a sparse generator.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.trainable = False
+
+    def call(self, embeddings, segment_ids):
+        """
+        Applies the layer.
+
+        Args:
+            embeddings (tensor): the node embeddings (size 1 x total number of nodes x F)
+            segment_ids (tensor): the index of the graph containing each node (size 1 x total number of nodes)
+        Returns:
+            Keras Tensor of the mean embedding of each graph (size number of graphs x F).
+        """
+        embeddings = tf.squeeze(embeddings, axis=0)
+        segment_ids = tf.cast(tf.squeeze(segment_ids, axis=0), tf.int32)
+        return tf.math.unsorted_segment_mean(
+            embeddings, segment_ids, tf.reduce_max(segment_ids) + 1
+        )
@@ -35,3 +35,4 @@ from .knowledge_graph import *
 from .padded_graph_generator import *
 from .corrupted import *
 from .sliding import *
+from .propagation import *
@@ -70,13 +70,25 @@ class AdjacencyPowerGenerator(Generator):
     def num_batch_dims(self):
         return 1
 
-    def flow(self, batch_size, num_parallel_calls=1):
+    def flow(self, batch_size, num_parallel_calls=1, cache_path=None):
         """
         Creates the `tensorflow.data.Dataset` object for training node embeddings from powers of the adjacency matrix.
 
+        The powers for each batch of rows are computed together, as one sparse-dense matrix
+        product per power.
+
         Args:
             batch_size (int): the number of rows of the adjacency powers to include in each batch.
             num_parallel_calls (int): the number of threads to use for preprocessing of batches.
+            cache_path (str, optional): if specified, the batches computed in the first epoch are
+                cached in files with this path prefix (see ``tf.data.Dataset.cache``), and read
+                from there in later epochs instead of being recomputed. The cache is specific to
+                the graph, ``num_powers`` and ``batch_size``, and so shouldn't be shared between
+                different ones. Only the non-zero elements of the powers are cached (and the
+                batches are densified when read), so the cache takes space proportional to the
+                total number of non-zero elements over all ``num_powers`` powers of the adjacency
+                matrix. This can approach ``num_powers × number of nodes²`` for graphs with a small
+                diameter, where the higher powers are close to dense.
 
         Returns:
             A `tensorflow.data.Dataset` object for training node embeddings from powers of the adjacency matrix.
@@ -85,79 +97,81 @@ class AdjacencyPowerGenerator(Generator):
         require_integer_in_range(batch_size, "batch_size", min_val=1)
         require_integer_in_range(num_parallel_calls, "num_parallel_calls", min_val=1)
 
-        row_dataset = tf.data.Dataset.from_tensor_slices(
-            tf.sparse.eye(int(self.Aadj_T.shape[0]))
-        )
+        num_nodes = int(self.Aadj_T.shape[0])
 
-        adj_powers_dataset = row_dataset.map(
-            lambda ohe_rows: _partial_powers(
-                ohe_rows, self.transition_matrix_T, num_powers=self.num_powers
-            ),
-            num_parallel_calls=num_parallel_calls,
+        def batch_powers(rows):
+            one_hot_rows = tf.one_hot(rows, depth=num_nodes)
+            adj_powers = _partial_powers(
+                one_hot_rows, self.transition_matrix_T, num_powers=self.num_powers
+            )
+            batch_adj = _select_row_from_sparse_tensor(one_hot_rows, self.Aadj_T)
+            return (rows, adj_powers), batch_adj
+
+        training_dataset = (
+            tf.data.Dataset.range(num_nodes)
+            .batch(batch_size)
+            .map(batch_powers, num_parallel_calls=num_parallel_calls)
         )
 
-        row_index_dataset = tf.data.Dataset.range(self.Aadj_T.shape[0])
+        if cache_path is not None:
+            # the dense powers would make an enormous cache, so only their non-zeros are stored
+            training_dataset = (
+                training_dataset.map(_sparsify_batch)
+                .cache(cache_path)
+                .map(_densify_batch, num_parallel_calls=num_parallel_calls)
+            )
+
+        return training_dataset.repeat()
 
-        row_index_adj_powers_dataset = tf.data.Dataset.zip(
-            (row_index_dataset, adj_powers_dataset)
-        )
 
-        batch_adj_dataset = row_dataset.map(
-            lambda ohe_rows: _select_row_from_sparse_tensor(ohe_rows, self.Aadj_T),
-            num_parallel_calls=num_parallel_calls,
-        )
+def _sparsify_batch(inputs, batch_adj):
+    rows, adj_powers = inputs
+    return (rows, tf.sparse.from_dense(adj_powers)), tf.sparse.from_dense(batch_adj)
 
-        training_dataset = tf.data.Dataset.zip(
-            (row_index_adj_powers_dataset, batch_adj_dataset)
-        ).batch(batch_size)
 
-        return training_dataset.repeat()
+def _densify_batch(inputs, batch_adj):
+    rows, adj_powers = inputs
+    return (rows, tf.sparse.to_dense(adj_powers)), tf.sparse.to_dense(batch_adj)
 
 
-def _partial_powers(one_hot_encoded_row, Aadj_T, num_powers):
+def _partial_powers(one_hot_encoded_rows, Aadj_T, num_powers):
     """
     This function computes the first num_powers powers of the adjacency matrix
-    for the row specified in one_hot_encoded_row
+    for the rows specified in one_hot_encoded_rows
 
     Args:
-        one_hot_encoded_row: one-hot-encoded row
+        one_hot_encoded_rows: one-hot-encoded rows, of shape (batch size, number of nodes)
         Aadj_T: the transpose of the adjacency matrix
         num_powers (int): the adjacency number of powers to compute
 
     returns:
-        A matrix of the shape (num_powers, Aadj_T.shape[1]) of
-        the specified row of the first num_powers of the adjacency matrix.
+        A matrix of the shape (batch size, num_powers, Aadj_T.shape[1]) of
+        the specified rows of the first num_powers of the adjacency matrix.
     """
 
     # make sure the transpose of the adjacency is used
     # tensorflow requires that the sparse matrix is the first operand
 
-    partial_power = tf.reshape(
-        tf.sparse.to_dense(one_hot_encoded_row), shape=(1, Aadj_T.shape[1])
-    )
+    partial_power_T = K.transpose(one_hot_encoded_rows)
     partial_powers_list = []
     for i in range(num_powers):
 
-        partial_power = K.transpose(K.dot(Aadj_T, K.transpose(partial_power)))
-        partial_powers_list.append(partial_power)
+        partial_power_T = K.dot(Aadj_T, partial_power_T)
+        partial_powers_list.append(K.transpose(partial_power_T))
 
-    return K.squeeze(tf.stack(partial_powers_list, axis=1), axis=0)
+    return tf.stack(partial_powers_list, axis=1)
 
 
-def _select_row_from_sparse_tensor(one_hot_encoded_row, sp_tensor_T):
+def _select_row_from_sparse_tensor(one_hot_encoded_rows, sp_tensor_T):
     """
-    This function gathers the row specified in one_hot_encoded_row from the input sparse matrix
+    This function gathers the rows specified in one_hot_encoded_rows from the input sparse matrix
 
     Args:
-        one_hot_encoded_row: one-hot-encoded row
+        one_hot_encoded_rows: one-hot-encoded rows, of shape (batch size, number of nodes)
         sp_tensor_T: the transpose of the sparse matrix
 
     returns:
-        The specified row from sp_tensor_T.
+        The specified rows from sp_tensor_T, of shape (batch size, 1, number of nodes).
     """
-    one_hot_encoded_row = tf.reshape(
-        tf.sparse.to_dense(one_hot_encoded_row), shape=(1, sp_tensor_T.shape[1])
-    )
-    row_T = K.dot(sp_tensor_T, K.transpose(one_hot_encoded_row))
-    row = K.transpose(row_T)
-    return row
+    rows_T = K.dot(sp_tensor_T, K.transpose(one_hot_encoded_rows))
+    return K.expand_dims(K.transpose(rows_T), axis=1)
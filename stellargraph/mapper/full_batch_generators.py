@@ -47,7 +47,8 @@ from . import (
 from ..core.graph import StellarGraph
 from ..core.utils import is_real_iterable
 from ..core.utils import GCN_Aadj_feats_op, PPNP_Aadj_feats_op
-from ..core.validation import comma_sep
+from .propagation import propagate_features
+from ..core.validation import comma_sep, require_integer_in_range
 
 
 class FullBatchGenerator(Generator):
@@ -63,6 +64,10 @@ class FullBatchGenerator(Generator):
         transform=None,
         teleport_probability=0.1,
         weighted=False,
+        sparse_features=False,
+        ppnp_epsilon=None,
+        ppnp_top_k=None,
+        sgc_cache_dir=None,
     ):
         if self.multiplicity is None:
             raise TypeError(
@@ -77,6 +82,8 @@ class FullBatchGenerator(Generator):
         self.name = name
         self.k = k
         self.teleport_probability = teleport_probability
+        self.ppnp_epsilon = ppnp_epsilon
+        self.ppnp_top_k = ppnp_top_k
         self.method = method
 
         # Check if the graph has features
@@ -105,8 +112,17 @@ class FullBatchGenerator(Generator):
         else:
             self.use_sparse = sparse
 
-        # Get the features for the nodes
-        self.features = G.node_features(node_type=node_type)
+        # Get the features for the nodes. Features stored sparsely in the graph are only kept sparse
+        # when requested, because only some models support them
+        self.use_sparse_features = sparse_features
+        self.features = G.node_features(node_type=node_type, sparse=sparse_features)
+        if sparse_features and not sps.issparse(self.features):
+            self.features = sps.csr_matrix(self.features)
+
+        if self.method == "sgc":
+            # checked here rather than only in GCN_Aadj_feats_op, so that the cached propagation
+            # validates it too
+            require_integer_in_range(self.k, "k", min_val=1)
 
         if transform is not None:
             if callable(transform):
@@ -116,6 +132,17 @@ class FullBatchGenerator(Generator):
             else:
                 raise ValueError("argument 'transform' must be a callable.")
 
+        elif self.method == "sgc" and sgc_cache_dir is not None:
+            # propagate (or load) the features, instead of computing the power of the adjacency
+            # matrix: Â^k X W = I (Â^k X) W
+            propagated = propagate_features(
+                G, self.k, weighted=weighted, cache_dir=sgc_cache_dir
+            )[self.k]
+            if self.use_sparse_features:
+                propagated = sps.csr_matrix(propagated)
+            self.features = propagated
+            self.Aadj = sps.identity(self.Aadj.shape[0], format="csr")
+
         elif self.method in ["gcn", "sgc"]:
             self.features, self.Aadj = GCN_Aadj_feats_op(
                 features=self.features, A=self.Aadj, k=self.k, method=self.method
@@ -127,15 +154,17 @@ class FullBatchGenerator(Generator):
             )
 
         elif self.method in ["ppnp"]:
-            if self.use_sparse:
+            if self.use_sparse and self.ppnp_epsilon is None:
                 raise ValueError(
-                    "sparse: method='ppnp' requires 'sparse=False', found 'sparse=True' "
+                    "sparse: method='ppnp' requires 'sparse=False' or 'ppnp_epsilon' to be set, found 'sparse=True' "
                     "(consider using the APPNP model for sparse support)"
                 )
             self.features, self.Aadj = PPNP_Aadj_feats_op(
                 features=self.features,
                 A=self.Aadj,
                 teleport_probability=self.teleport_probability,
+                epsilon=self.ppnp_epsilon,
+                top_k=self.ppnp_top_k,
             )
 
         elif self.method in [None, "none"]:
@@ -227,6 +256,7 @@ class FullBatchNodeGenerator(FullBatchGenerator):
     [2] `Wu et al. 2019 <https://arxiv.org/abs/1902.07153>`_.
     [3] `Veličković et al., 2018 <https://arxiv.org/abs/1710.10903>`_.
     [4] `Klicpera et al., 2018 <https://arxiv.org/abs/1810.05997>`_.
+    [5] `Andersen et al., 2006 <https://doi.org/10.1109/FOCS.2006.44>`_.
 
     Example::
 
@@ -268,8 +298,23 @@ class FullBatchNodeGenerator(FullBatchGenerator):
             if False a dense adjacency matrix is used.
         teleport_probability (float): teleport probability between 0.0 and 1.0.
             "probability" of returning to the starting node in the propagation step as in [4].
+        ppnp_epsilon (float, optional): if specified with ``method='ppnp'``, the personalized page
+            rank matrix is approximated as a sparse matrix with the push algorithm of [5], rather
+            than computed exactly as a dense one. Smaller values are more accurate but give more
+            non-zero elements. This allows ``sparse=True``, and scales to much larger graphs.
+        ppnp_top_k (int, optional): if specified with ``ppnp_epsilon``, only the ``top_k`` largest
+            elements of each row of the approximate personalized page rank matrix are kept.
+        sgc_cache_dir (str, optional): if specified with ``method='sgc'``, the features propagated
+            ``k`` times are computed with :func:`.propagate_features` and saved in (or loaded from)
+            this directory, and supplied with an identity adjacency matrix, rather than computing
+            the ``k``-th power of the adjacency matrix. This is equivalent for a model with a single
+            graph convolution layer, like SGC [2].
         weighted (bool, optional): if True, use the edge weights from ``G``; if False, treat the
             graph as unweighted.
+        sparse_features (bool, optional): if True, the node features are supplied to the model as a
+            sparse matrix, rather than a dense one. This is much more efficient for features that
+            are mostly zero, like bag-of-words vectors, especially when they're also stored sparsely
+            in ``G``. This is supported by :class:`.GCN` and :class:`.GAT`.
     """
 
     multiplicity = 1
@@ -296,6 +341,10 @@ class FullBatchNodeGenerator(FullBatchGenerator):
         return super().flow(node_ids, targets, use_ilocs)
 
     def default_corrupt_input_index_groups(self):
+        if self.use_sparse_features:
+            raise ValueError(
+                "sparse_features: corrupting the input features requires 'sparse_features=False', found 'sparse_features=True'"
+            )
         return [[0]]
 
 
@@ -330,6 +379,7 @@ class FullBatchLinkGenerator(FullBatchGenerator):
     [2] `Wu et al. 2019 <https://arxiv.org/abs/1902.07153>`_.
     [3] `Veličković et al., 2018 <https://arxiv.org/abs/1710.10903>`_.
     [4] `Klicpera et al., 2018 <https://arxiv.org/abs/1810.05997>`_.
+    [5] `Andersen et al., 2006 <https://doi.org/10.1109/FOCS.2006.44>`_.
 
     Example::
 
@@ -364,8 +414,23 @@ class FullBatchLinkGenerator(FullBatchGenerator):
             if False a dense adjacency matrix is used.
         teleport_probability (float): teleport probability between 0.0 and 1.0. "probability"
             of returning to the starting node in the propagation step as in [4].
+        ppnp_epsilon (float, optional): if specified with ``method='ppnp'``, the personalized page
+            rank matrix is approximated as a sparse matrix with the push algorithm of [5], rather
+            than computed exactly as a dense one. Smaller values are more accurate but give more
+            non-zero elements. This allows ``sparse=True``, and scales to much larger graphs.
+        ppnp_top_k (int, optional): if specified with ``ppnp_epsilon``, only the ``top_k`` largest
+            elements of each row of the approximate personalized page rank matrix are kept.
+        sgc_cache_dir (str, optional): if specified with ``method='sgc'``, the features propagated
+            ``k`` times are computed with :func:`.propagate_features` and saved in (or loaded from)
+            this directory, and supplied with an identity adjacency matrix, rather than computing
+            the ``k``-th power of the adjacency matrix. This is equivalent for a model with a single
+            graph convolution layer, like SGC [2].
         weighted (bool, optional): if True, use the edge weights from ``G``; if False, treat the
             graph as unweighted.
+        sparse_features (bool, optional): if True, the node features are supplied to the model as a
+            sparse matrix, rather than a dense one. This is much more efficient for features that
+            are mostly zero, like bag-of-words vectors, especially when they're also stored sparsely
+            in ``G``. This is supported by :class:`.GCN` and :class:`.GAT`.
     """
 
     multiplicity = 2
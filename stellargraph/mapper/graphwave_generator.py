@@ -19,7 +19,7 @@ import numpy as np
 from ..core import StellarGraph
 from ..core.validation import require_integer_in_range
 from .base import Generator
-from scipy.sparse.linalg import eigs
+from scipy.sparse.linalg import eigs, eigsh
 from scipy.sparse import diags
 
 
@@ -44,12 +44,17 @@ class GraphWaveGenerator(Generator):
         degree: the degree of the Chebyshev polynomial to use. Higher degrees yield more accurate results but at a
             higher computational cost. According to [1], the default value of 20 is accurate enough for most
             applications.
+        max_eig_method (str): how to find the largest eigenvalue of the Laplacian, which bounds the interval of
+            the Chebyshev approximation. ``"eigs"`` computes it exactly with ``scipy.sparse.linalg.eigs``;
+            ``"lanczos"`` uses a low-tolerance Lanczos iteration (``scipy.sparse.linalg.eigsh``), which is cheaper but
+            requires an undirected graph (it is rejected for a :class:`.StellarDiGraph`); ``"gershgorin"`` uses the bound of twice the maximum degree, which requires
+            no iteration at all, at the cost of a slightly less accurate approximation for a given ``degree``.
 
     [1] D. I. Shuman, P. Vandergheynst, and P. Frossard, “Chebyshev Polynomial Approximation for Distributed Signal
     Processing,” https://arxiv.org/abs/1105.1891
     """
 
-    def __init__(self, G, scales=(5, 10), degree=20):
+    def __init__(self, G, scales=(5, 10), degree=20, max_eig_method="eigs"):
 
         if not isinstance(G, StellarGraph):
             raise TypeError("G must be a StellarGraph object.")
@@ -61,6 +66,13 @@ class GraphWaveGenerator(Generator):
 
         require_integer_in_range(degree, "degree", min_val=1)
 
+        if max_eig_method == "lanczos" and G.is_directed():
+            # the Laplacian of a directed graph isn't symmetric, so eigsh would silently compute
+            # the wrong value
+            raise ValueError(
+                "max_eig_method: expected 'eigs' or 'gershgorin' for a directed graph, because 'lanczos' requires a symmetric Laplacian, found 'lanczos'"
+            )
+
         # Create sparse adjacency matrix:
         adj = G.to_adjacency_matrix().tocoo()
 
@@ -73,8 +85,7 @@ class GraphWaveGenerator(Generator):
 
         self.scales = np.array(scales).astype(np.float32)
 
-        max_eig = eigs(laplacian, k=1, return_eigenvectors=False)
-        self.max_eig = np.real(max_eig).astype(np.float32)[0]
+        self.max_eig = np.float32(_max_eigenvalue(laplacian, max_eig_method))
 
         coeffs = [
             np.polynomial.chebyshev.Chebyshev.interpolate(
@@ -104,6 +115,8 @@ class GraphWaveGenerator(Generator):
         seed=None,
         repeat=False,
         num_parallel_calls=1,
+        block_size=64,
+        cache_path=None,
     ):
         """
         Creates a TensorFlow DataSet object of GraphWave embeddings.
@@ -123,9 +136,18 @@ class GraphWaveGenerator(Generator):
             repeat (bool): indicates whether iterating through the DataSet will continue infinitely or stop after one
                 full pass.
             num_parallel_calls (int): number of threads to use.
+            block_size (int): the number of nodes for which to compute wavelets at the same time, as a single
+                sparse-dense matrix product per Chebyshev term. Larger blocks are faster, but need memory proportional
+                to ``block_size * len(scales) * G.number_of_nodes()``.
+            cache_path (str, optional): if specified, the embeddings are cached in files with this path prefix (see
+                ``tf.data.Dataset.cache``) rather than in memory, so that they can be computed for every node of a
+                large graph in one pass and reused by later epochs and datasets. The cache is specific to the graph,
+                generator parameters, ``node_ids``, ``sample_points`` and ``targets``, and so shouldn't be shared
+                between different ones.
         """
 
         require_integer_in_range(batch_size, "batch_size", min_val=1)
+        require_integer_in_range(block_size, "block_size", min_val=1)
 
         require_integer_in_range(num_parallel_calls, "num_parallel_calls", min_val=1)
 
@@ -137,31 +159,33 @@ class GraphWaveGenerator(Generator):
 
         ts = tf.convert_to_tensor(sample_points.astype(np.float32))
 
-        def _map_func(x):
+        num_nodes = self.laplacian.shape[0]
+
+        def _map_func(idxs):
+            cols = tf.transpose(tf.one_hot(idxs, depth=num_nodes))
             return _empirical_characteristic_function(
-                _chebyshev(x, self.laplacian, self.coeffs, self.max_eig), ts,
+                _chebyshev(cols, self.laplacian, self.coeffs, self.max_eig), ts,
             )
 
         node_idxs = self._node_lookup(node_ids)
 
-        # calculates the columns of U exp(-scale * eigenvalues) U^T on the fly
+        # calculates the columns of U exp(-scale * eigenvalues) U^T on the fly, a block at a time
         # empirically calculate the characteristic function for each column of U exp(-scale * eigenvalues) U^T
 
-        dataset = tf.data.Dataset.from_tensor_slices(
-            tf.sparse.SparseTensor(
-                indices=np.stack([np.arange(len(node_ids)), node_idxs], axis=1),
-                dense_shape=(len(node_ids), self.laplacian.shape[0]),
-                values=np.ones(len(node_ids), dtype=np.float32),
-            )
-        ).map(_map_func, num_parallel_calls=num_parallel_calls)
+        dataset = (
+            tf.data.Dataset.from_tensor_slices(node_idxs)
+            .batch(block_size)
+            .map(_map_func, num_parallel_calls=num_parallel_calls)
+            .unbatch()
+        )
 
         if targets is not None:
 
             target_dataset = tf.data.Dataset.from_tensor_slices(targets)
             dataset = tf.data.Dataset.zip((dataset, target_dataset))
 
-        # cache embeddings in memory for performance
-        dataset = dataset.cache()
+        # cache embeddings in memory (or on disk) for performance
+        dataset = dataset.cache("" if cache_path is None else cache_path)
 
         if shuffle:
             dataset = dataset.shuffle(buffer_size=len(node_ids), seed=seed)
@@ -172,73 +196,109 @@ class GraphWaveGenerator(Generator):
             return dataset.batch(batch_size)
 
 
+def _max_eigenvalue(laplacian, method):
+    """
+    Compute (an upper bound for) the largest eigenvalue of a graph Laplacian.
+    """
+    if method == "eigs":
+        max_eig = eigs(laplacian, k=1, return_eigenvectors=False)
+        return np.real(max_eig)[0]
+    elif method == "lanczos":
+        # a loose tolerance is enough, with a small margin to ensure the approximation
+        # interval covers the whole spectrum
+        max_eig = eigsh(
+            laplacian.astype(np.float64),
+            k=1,
+            which="LA",
+            tol=1e-3,
+            return_eigenvectors=False,
+        )
+        return max_eig[0] * (1 + 1e-2)
+    elif method == "gershgorin":
+        # every eigenvalue of D - A is at most max_i (d_i + sum_j |a_ij|) = 2 max_i d_i
+        return 2 * laplacian.diagonal().max()
+
+    raise ValueError(
+        f"max_eig_method: expected 'eigs', 'lanczos' or 'gershgorin', found {method!r}"
+    )
+
+
 def _empirical_characteristic_function(samples, ts):
     """
-    This function estimates the characteristic function for the wavelet spread of a single node.
+    This function estimates the characteristic function for the wavelet spread of a node, or of a batch of nodes.
 
     Args:
-        samples (Tensor): a tensor of samples drawn from a wavelet distribution at different scales.
+        samples (Tensor): a tensor of samples drawn from a wavelet distribution at different scales, of shape
+            (scales, ns), or (batch, scales, ns) for a batch of nodes.
         ts (Tensor): a tensor containing the "time" points to sample the characteristic function at.
     Returns:
-        embedding (Tensor): the node embedding for the GraphWave algorithm.
+        embedding (Tensor): the node embedding for the GraphWave algorithm, with shape (2 * nt * scales,), or
+        (batch, 2 * nt * scales) for a batch of nodes.
     """
-    # (scales, ns) -> (1, scales, ns)
-    samples = samples[tf.newaxis, :, :]
+    # (..., scales, ns) -> (..., 1, scales, ns)
+    samples = samples[..., tf.newaxis, :, :]
     # (nt,) -> (nt, 1, 1)
     ts = ts[:, tf.newaxis, tf.newaxis]
 
-    # (1, scales, ns) * (nt, 1, 1) -> (nt, scales, ns) via broadcasting rules
+    # (..., 1, scales, ns) * (nt, 1, 1) -> (..., nt, scales, ns) via broadcasting rules
     t_psi = samples * ts
 
-    # (nt, scales, ns) -> (nt, scales)
-    mean_cos_t_psi = tf.math.reduce_mean(tf.math.cos(t_psi), axis=2)
+    # (..., nt, scales, ns) -> (..., nt, scales)
+    mean_cos_t_psi = tf.math.reduce_mean(tf.math.cos(t_psi), axis=-1)
 
-    # (nt, scales, ns) -> (nt, scales)
-    mean_sin_t_psi = tf.math.reduce_mean(tf.math.sin(t_psi), axis=2)
+    # (..., nt, scales, ns) -> (..., nt, scales)
+    mean_sin_t_psi = tf.math.reduce_mean(tf.math.sin(t_psi), axis=-1)
 
-    # [(nt, scales), (nt, scales)] -> (2 * nt * scales,)
-    embedding = K.flatten(tf.concat([mean_cos_t_psi, mean_sin_t_psi], axis=0))
+    # [(..., nt, scales), (..., nt, scales)] -> (..., 2 * nt * scales)
+    embedding = tf.concat([mean_cos_t_psi, mean_sin_t_psi], axis=-2)
+    embedding = tf.reshape(
+        embedding, tf.concat([tf.shape(embedding)[:-2], [-1]], axis=0)
+    )
 
     return embedding
 
 
-def _chebyshev(one_hot_encoded_col, laplacian, coeffs, max_eig):
+def _chebyshev(one_hot_encoded_cols, laplacian, coeffs, max_eig):
     """
-    This function calculates one column of the Chebyshev approximation of exp(-scale * laplacian) for
+    This function calculates a block of columns of the Chebyshev approximation of exp(-scale * laplacian) for
     all scales using the approach from: https://arxiv.org/abs/1105.1891. See equations (7)-(11) for more info.
 
     Args:
-        one_hot_encoded_col (SparseTensor): a sparse tensor indicating which column (node) to calculate.
+        one_hot_encoded_cols (Tensor): a dense (num_nodes, block size) tensor indicating which columns (nodes)
+            to calculate.
         laplacian (SparseTensor): the unnormalized graph laplacian
         coeffs: the Chebyshev coefficients for exp(-scale * x) for each scale in the shape (num_scales, deg)
     Returns:
-        (num_scales, num_nodes) tensor of the wavelets for each scale for the specified node.
+        (block size, num_scales, num_nodes) tensor of the wavelets for each scale for the specified nodes.
     """
 
     # Chebyshev polynomials are in range [-1, 1] by default so we shift the coordinates here
-    # the laplacian in the new coordinates is y = (L / a) - I. But y is only accessed through matrix vector
-    # multiplications so we model it as a linear operator
-    def y(vector):
-        return K.dot(laplacian, vector) / a - vector
+    # the laplacian in the new coordinates is y = (L / a) - I. But y is only accessed through matrix
+    # products so we model it as a linear operator
+    def y(matrix):
+        return K.dot(laplacian, matrix) / a - matrix
 
     a = max_eig / 2
 
-    # f is a one-hot vector to select a column from the Laplacian
-    # this allows to compute the filtered laplacian (psi in the paper) one column at time
-    # using only matrix vector products
-    f = tf.reshape(
-        tf.sparse.to_dense(one_hot_encoded_col), shape=(laplacian.shape[0], 1)
-    )
+    # f selects a block of columns from the Laplacian
+    # this allows to compute the filtered laplacian (psi in the paper) a block of columns at a
+    # time using only sparse-dense matrix products
+    f = one_hot_encoded_cols
+
+    def term(i, cheby_poly):
+        # (num_scales, 1, 1) * (1, num_nodes, block size)
+        return coeffs[:, i, tf.newaxis, tf.newaxis] * cheby_poly[tf.newaxis, :, :]
 
     T_0 = f  # If = f
     T_1 = y(f)
 
-    cheby_polys = [T_0, T_1]
-    for i in range(coeffs.shape[1] - 2):
-        cheby_poly = 2 * y(cheby_polys[-1]) - cheby_polys[-2]
-        cheby_polys.append(cheby_poly)
-
     # note: difference to the paper. the 0th coefficient is not halved here because its
     # automatically halved by numpy
-    cheby_polys = K.squeeze(tf.stack(cheby_polys, axis=0), axis=-1)
-    return tf.matmul(coeffs, cheby_polys)
+    # the terms are accumulated as they are computed, so only the last two polynomials are kept
+    result = term(0, T_0) + term(1, T_1)
+    for i in range(2, coeffs.shape[1]):
+        T_0, T_1 = T_1, 2 * y(T_1) - T_0
+        result += term(i, T_1)
+
+    # (num_scales, num_nodes, block size) -> (block size, num_scales, num_nodes)
+    return tf.transpose(result, perm=[2, 0, 1])
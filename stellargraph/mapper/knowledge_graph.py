@@ -67,6 +67,8 @@ class KGTripleGenerator(Generator):
         sample_strategy="uniform",
         shuffle=False,
         seed=None,
+        filtered=False,
+        corruption="uniform",
     ):
         """
         Create a Keras Sequence yielding the edges/triples in ``edges``, potentially with some negative
@@ -100,6 +102,29 @@ class KGTripleGenerator(Generator):
 
                   [1] Z. Sun, Z.-H. Deng, J.-Y. Nie, and J. Tang, “RotatE: Knowledge Graph Embedding by Relational Rotation in Complex Space,” `arXiv:1902.10197 <http://arxiv.org/abs/1902.10197>`_, Feb. 2019.
 
+            shuffle (bool, optional): If True, the edges are shuffled at the end of each epoch.
+            seed (int, optional): Random seed to use for shuffling and negative sampling.
+            filtered (bool, optional): If True, a negative edge that is a known true triple (an edge of
+                the graph ``G``, or one of ``edges``) is resampled, so that all negative edges are
+                actually negative (up to a limited number of attempts). If False, negative edges are
+                not checked.
+            corruption (str, optional): how to choose whether to replace the source or the target of
+                an edge to create a negative edge. Supported values:
+
+                ``uniform``
+
+                  The source and target are each chosen with probability 1/2.
+
+                ``bernoulli``
+
+                  The "bern" strategy from [2]: for each relation, the source is chosen with
+                  probability ``tph / (tph + hpt)``, where ``tph`` is the average number of targets
+                  per source and ``hpt`` the average number of sources per target, computed over
+                  the known triples. This makes negative edges for one-to-many and many-to-one
+                  relations less likely to be false negatives.
+
+                  [2] Z. Wang, J. Zhang, J. Feng, and Z. Chen, “Knowledge Graph Embedding by Translating on Hyperplanes,” AAAI 2014.
+
         Returns:
             A Keras sequence that can be passed to the ``fit`` and ``predict`` method of knowledge-graph models.
         """
@@ -121,10 +146,40 @@ class KGTripleGenerator(Generator):
                 f"sample_strategy: expected one of {comma_sep(supported_strategies)}, found {sample_strategy!r}"
             )
 
+        supported_corruptions = ["uniform", "bernoulli"]
+        if corruption not in supported_corruptions:
+            raise ValueError(
+                f"corruption: expected one of {comma_sep(supported_corruptions)}, found {corruption!r}"
+            )
+
         source_ilocs = self.G.node_ids_to_ilocs(sources)
         rel_ilocs = self.G.edge_type_names_to_ilocs(rels)
         target_ilocs = self.G.node_ids_to_ilocs(targets)
 
+        known_triples = source_probabilities = None
+        if negative_samples is not None and (filtered or corruption == "bernoulli"):
+            num_nodes = self.G.number_of_nodes()
+            num_rels = len(self.G.edge_types)
+
+            graph_sources, graph_targets, graph_rels, _ = self.G.edge_arrays(
+                include_edge_type=True, use_ilocs=True
+            )
+            all_sources = np.concatenate([graph_sources, source_ilocs])
+            all_rels = np.concatenate([graph_rels, rel_ilocs])
+            all_targets = np.concatenate([graph_targets, target_ilocs])
+
+            if filtered:
+                known_triples = np.unique(
+                    _triple_keys(
+                        all_sources, all_rels, all_targets, num_nodes, num_rels
+                    )
+                )
+
+            if corruption == "bernoulli":
+                source_probabilities = _bernoulli_source_probabilities(
+                    all_sources, all_rels, all_targets, num_nodes, num_rels
+                )
+
         return KGTripleSequence(
             max_node_iloc=self.G.number_of_nodes(),
             source_ilocs=source_ilocs,
@@ -135,8 +190,56 @@ class KGTripleGenerator(Generator):
             negative_samples=negative_samples,
             sample_strategy=sample_strategy,
             seed=seed,
+            known_triples=known_triples,
+            source_probabilities=source_probabilities,
+            max_rel_iloc=len(self.G.edge_types),
+        )
+
+
+def _triple_keys(source_ilocs, rel_ilocs, target_ilocs, num_nodes, num_rels):
+    """
+    Compute a unique int64 for each (source, relation, target) triple of ilocs.
+    """
+    if num_nodes * num_nodes * max(num_rels, 1) >= 2 ** 63:
+        raise ValueError(
+            f"expected the number of nodes and relations to have at most 2**63 possible triples, found {num_nodes} nodes and {num_rels} relations"
         )
 
+    keys = np.asarray(source_ilocs, dtype=np.int64) * num_rels
+    keys += rel_ilocs
+    keys *= num_nodes
+    keys += target_ilocs
+    return keys
+
+
+def _bernoulli_source_probabilities(
+    source_ilocs, rel_ilocs, target_ilocs, num_nodes, num_rels
+):
+    """
+    Compute the probability of corrupting the source of an edge of each relation, as ``tph / (tph +
+    hpt)``, which simplifies to ``unique targets / (unique sources + unique targets)``.
+    """
+    rel_ilocs = np.asarray(rel_ilocs, dtype=np.int64)
+
+    def unique_per_relation(node_ilocs):
+        pairs = np.unique(rel_ilocs * num_nodes + node_ilocs)
+        return np.bincount(pairs // num_nodes, minlength=num_rels)
+
+    unique_sources = unique_per_relation(source_ilocs)
+    unique_targets = unique_per_relation(target_ilocs)
+    total = unique_sources + unique_targets
+
+    # relations without any edges use the uniform probability
+    probabilities = np.full(num_rels, 0.5)
+    has_edges = total > 0
+    probabilities[has_edges] = unique_targets[has_edges] / total[has_edges]
+    return probabilities
+
+
+# the number of attempts to replace negative edges that are known positive edges, to avoid looping
+# forever if all corruptions of an edge are known
+_MAX_FILTER_ROUNDS = 100
+
 
 class KGTripleSequence(Sequence):
     def __init__(
@@ -151,8 +254,12 @@ class KGTripleSequence(Sequence):
         negative_samples,
         sample_strategy,
         seed,
+        known_triples=None,
+        source_probabilities=None,
+        max_rel_iloc=None,
     ):
         self.max_node_iloc = max_node_iloc
+        self.max_rel_iloc = max_rel_iloc
 
         num_edges = len(source_ilocs)
         self.indices = np.arange(num_edges, dtype=np.min_scalar_type(num_edges))
@@ -169,6 +276,11 @@ class KGTripleSequence(Sequence):
 
         self.shuffle = shuffle
 
+        # sorted keys (see _triple_keys) of every known triple, for filtering
+        self.known_triples = known_triples
+        # per-relation probability of replacing the source, for Bernoulli corruption
+        self.source_probabilities = source_probabilities
+
         _, self._global_rs = random_state(seed)
         self._batch_sampler = SeededPerBatch(
             np.random.RandomState, self._global_rs.randint(2 ** 32, dtype=np.uint32)
@@ -199,8 +311,13 @@ class KGTripleSequence(Sequence):
 
             rng = self._batch_sampler[batch_num]
 
+            if self.source_probabilities is None:
+                source_probability = 0.5
+            else:
+                source_probability = self.source_probabilities[r_iloc[positive_count:]]
+
             # FIXME (#882): this sampling may be able to be optimised to a slice-write
-            change_source = rng.random(size=negative_count) < 0.5
+            change_source = rng.random(size=negative_count) < source_probability
             source_changes = change_source.sum()
 
             new_nodes = rng.randint(self.max_node_iloc, size=negative_count)
@@ -208,6 +325,15 @@ class KGTripleSequence(Sequence):
             s_iloc[positive_count:][change_source] = new_nodes[:source_changes]
             o_iloc[positive_count:][~change_source] = new_nodes[source_changes:]
 
+            if self.known_triples is not None:
+                self._filter_negatives(
+                    rng,
+                    s_iloc[positive_count:],
+                    r_iloc[positive_count:],
+                    o_iloc[positive_count:],
+                    change_source,
+                )
+
             if self.sample_strategy == "uniform":
                 targets = np.repeat(
                     np.array([1, 0], dtype=np.float32), [positive_count, negative_count]
@@ -232,6 +358,30 @@ class KGTripleSequence(Sequence):
 
         return (s_iloc, r_iloc, o_iloc), targets
 
+    def _is_known(self, s_iloc, r_iloc, o_iloc):
+        keys = _triple_keys(
+            s_iloc, r_iloc, o_iloc, self.max_node_iloc, self.max_rel_iloc
+        )
+        if len(self.known_triples) == 0:
+            return np.zeros(len(keys), dtype=bool)
+
+        # binary search for each key in the sorted array of known keys
+        positions = np.searchsorted(self.known_triples, keys)
+        positions[positions == len(self.known_triples)] = 0
+        return self.known_triples[positions] == keys
+
+    def _filter_negatives(self, rng, s_iloc, r_iloc, o_iloc, change_source):
+        # resample (in place) the replaced node of any negative edge that is a known triple
+        for _ in range(_MAX_FILTER_ROUNDS):
+            collisions = np.flatnonzero(self._is_known(s_iloc, r_iloc, o_iloc))
+            if len(collisions) == 0:
+                break
+
+            new_nodes = rng.randint(self.max_node_iloc, size=len(collisions))
+            sources = change_source[collisions]
+            s_iloc[collisions[sources]] = new_nodes[sources]
+            o_iloc[collisions[~sources]] = new_nodes[~sources]
+
     def on_epoch_end(self):
         if self.shuffle:
             self._global_rs.shuffle(self.indices)
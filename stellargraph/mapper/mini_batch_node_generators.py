@@ -18,21 +18,123 @@
 Mappers to provide input data for the graph models in layers.
 
 """
-__all__ = ["ClusterNodeGenerator", "ClusterNodeSequence"]
-
+__all__ = [
+    "ClusterNodeGenerator",
+    "ClusterNodeSequence",
+    "GraphSAINTNodeGenerator",
+    "GraphSAINTNodeSequence",
+]
+
+import heapq
 import random
-import copy
 import numpy as np
+import pandas as pd
 import networkx as nx
 from tensorflow.keras.utils import Sequence
 
 from scipy import sparse
+from scipy.sparse.csgraph import reverse_cuthill_mckee
 from ..core.graph import StellarGraph
 from ..core.utils import is_real_iterable, normalize_adj
+from ..core.validation import require_integer_in_range
 from ..connector.neo4j.graph import Neo4jStellarGraph
+from ..random import random_state, SeededPerBatch
 from .base import Generator
 
 
+def _partition_nodes(adj, k, passes=3):
+    """
+    Partition the nodes of a graph into ``k`` clusters of balanced size, trying to minimise the
+    number of edges between clusters.
+
+    The nodes are first split into contiguous blocks of a reverse Cuthill-McKee ordering (which
+    places nearby nodes close together), and then refined by restreaming linear deterministic
+    greedy (LDG) passes: each node in turn moves to the cluster holding most of its neighbours,
+    penalised by how full that cluster is. The assignment with the smallest edge cut is kept.
+
+    Args:
+        adj (scipy.sparse matrix): the adjacency matrix of the graph
+        k (int): the number of clusters
+        passes (int): the number of refinement passes
+
+    Returns:
+        A NumPy array of the cluster index of each node.
+    """
+    n = adj.shape[0]
+    adj = sparse.csr_matrix(adj, dtype=np.float64)
+    adj = adj + adj.T
+    adj = adj - sparse.diags(adj.diagonal())
+    adj.eliminate_zeros()
+    indptr, indices = adj.indptr, adj.indices
+
+    # exact capacities, so that every cluster is non-empty when there are at least k nodes
+    capacities = np.full(k, n // k)
+    capacities[: n % k] += 1
+
+    order = reverse_cuthill_mckee(adj, symmetric_mode=True)
+    assignment = np.empty(n, dtype=np.int64)
+    assignment[order] = np.repeat(np.arange(k), capacities)
+
+    def edge_cut(assign):
+        sources = np.repeat(np.arange(n), np.diff(indptr))
+        return np.count_nonzero(assign[sources] != assign[indices])
+
+    # the passes are inherently sequential, so they work with Python lists, which are much faster
+    # than NumPy for the handful of elements involved for each node
+    neighbour_lists = np.split(indices, indptr[1:-1])
+    neighbour_lists = [neighbours.tolist() for neighbours in neighbour_lists]
+    capacity_list = capacities.tolist()
+    order_list = order.tolist()
+
+    best, best_cut = assignment, edge_cut(assignment)
+    for _ in range(passes):
+        assign = assignment.tolist()
+        sizes = [0] * k
+        # (size, cluster) of the clusters with space, for finding the emptiest one; entries are
+        # only removed lazily, when they're found to be out of date
+        emptiest = [(0, cluster) for cluster in range(k)]
+
+        for node in order_list:
+            counts = {}
+            for neighbour in neighbour_lists[node]:
+                cluster = assign[neighbour]
+                counts[cluster] = counts.get(cluster, 0) + 1
+
+            # only the clusters of the neighbours have a positive score; break ties in favour of
+            # the emptiest cluster (and then the lowest index)
+            best_key = None
+            for cluster, count in counts.items():
+                size = sizes[cluster]
+                capacity = capacity_list[cluster]
+                if size < capacity:
+                    key = (count * (1 - size / capacity), -size, -cluster)
+                    if best_key is None or key > best_key:
+                        best_key = key
+
+            if best_key is not None:
+                chosen = -best_key[2]
+            else:
+                # no neighbours in clusters with space, so every cluster with space scores zero
+                while True:
+                    size, chosen = emptiest[0]
+                    if size == sizes[chosen] and size < capacity_list[chosen]:
+                        break
+                    heapq.heappop(emptiest)
+
+            assign[node] = chosen
+            sizes[chosen] += 1
+            if sizes[chosen] < capacity_list[chosen]:
+                heapq.heappush(emptiest, (sizes[chosen], chosen))
+
+        assignment = np.array(assign, dtype=np.int64)
+        cut = edge_cut(assignment)
+        if cut >= best_cut:
+            break
+        best, best_cut = assignment, cut
+
+    return best
+
+
 class ClusterNodeGenerator(Generator):
     """
     A data generator for use with GCN, GAT and APPNP models on homogeneous graphs, see [1].
@@ -69,9 +171,16 @@ class ClusterNodeGenerator(Generator):
         weighted (bool, optional): if True, use the edge weights from ``G``; if False, treat the
             graph as unweighted.
         name (str, optional): Name for the node generator.
+        method (str, optional): How to form the clusters when `clusters` is an int. With
+            ``"random"`` (the default), nodes are assigned to clusters uniformly at random. With
+            ``"partition"``, the graph is partitioned into clusters of balanced size that keep
+            most edges within a cluster (this requires ``G`` to be a :class:`.StellarGraph`).
+            This is ignored if `clusters` is a list.
     """
 
-    def __init__(self, G, clusters=1, q=1, lam=0.1, weighted=False, name=None):
+    def __init__(
+        self, G, clusters=1, q=1, lam=0.1, weighted=False, name=None, method="random"
+    ):
 
         if not isinstance(G, (StellarGraph, Neo4jStellarGraph)):
             raise TypeError("Graph must be a StellarGraph or StellarDiGraph object.")
@@ -113,6 +222,20 @@ class ClusterNodeGenerator(Generator):
         if not isinstance(q, int):
             raise TypeError("{}: q must be integer type.".format(type(self).__name__))
 
+        if method not in ("random", "partition"):
+            raise ValueError(
+                "{}: method must be 'random' or 'partition', found {!r}.".format(
+                    type(self).__name__, method
+                )
+            )
+
+        if method == "partition" and not isinstance(G, StellarGraph):
+            raise ValueError(
+                "{}: method 'partition' requires a StellarGraph.".format(
+                    type(self).__name__
+                )
+            )
+
         if q <= 0:
             raise ValueError(
                 "{}: q must be greater than 0.".format(type(self).__name__)
@@ -133,7 +256,15 @@ class ClusterNodeGenerator(Generator):
         _ = G.unique_node_type(
             "G: expected a graph with a single node type, found a graph with node types: %(found)s"
         )
-        if isinstance(clusters, int):
+        if isinstance(clusters, int) and method == "partition":
+            # Partition the graph into self.k clusters of well-connected nodes
+            assignment = _partition_nodes(G.to_adjacency_matrix(), self.k)
+            order = np.argsort(assignment, kind="stable")
+            splits = np.cumsum(np.bincount(assignment, minlength=self.k))[:-1]
+            self.clusters = [
+                list(G.node_ilocs_to_ids(ilocs)) for ilocs in np.split(order, splits)
+            ]
+        elif isinstance(clusters, int):
             # We are not given graph clusters.
             # We are going to split the graph into self.k random clusters
             all_nodes = list(G.nodes())
@@ -149,10 +280,6 @@ class ClusterNodeGenerator(Generator):
                 self.clusters[-2].extend(self.clusters[-1])
                 del self.clusters[-1]
 
-        print(f"Number of clusters {self.k}")
-        for i, c in enumerate(self.clusters):
-            print(f"{i} cluster has size {len(c)}")
-
         # Store the features of one node to allow graph ML models to peak at the feature dimension
         # FIXME 1621: store feature_dimension here instead of features. This must also update ClusterGCN, and all
         # fullbactch methods and generators
@@ -250,16 +377,13 @@ class ClusterNodeSequence(Sequence):
     ):
 
         self.name = name
-        self.clusters = list()
-        self.clusters_original = copy.deepcopy(clusters)
+        self.clusters_original = list(clusters)
         self.graph = graph
-        self.node_list = list(graph.nodes())
         self.normalize_adj = normalize_adj
         self.q = q
         self.lam = lam
         self.weighted = weighted
         self.node_order = list()
-        self._node_order_in_progress = list()
         self.__node_buffer = dict()
         self.target_ids = list()
 
@@ -285,12 +409,29 @@ class ClusterNodeSequence(Sequence):
                 )
 
             self.targets = np.asanyarray(targets)
-            self.target_node_lookup = dict(
-                zip(self.target_ids, range(len(self.target_ids)))
-            )
         else:
             self.targets = None
 
+        # A StellarGraph has its edges in memory, so the adjacency rows of each cluster can be
+        # sliced out once, and every batch is assembled from these with array operations on node
+        # ilocs. Other graphs (like Neo4j) compute the adjacency for each batch on demand.
+        self._use_ilocs = isinstance(graph, StellarGraph)
+        if self._use_ilocs:
+            self._cluster_nodes = [graph.node_ids_to_ilocs(c) for c in clusters]
+            adj = graph.to_adjacency_matrix(weighted=weighted).tocsr()
+            self._cluster_rows = [adj[ilocs] for ilocs in self._cluster_nodes]
+            target_keys = graph.node_ids_to_ilocs(self.target_ids)
+        else:
+            self._cluster_nodes = [np.asarray(list(c), dtype=object) for c in clusters]
+            target_keys = np.asarray(self.target_ids, dtype=object)
+
+        # map from target node (iloc or ID) to its row in targets, keeping the last occurrence of
+        # any repeated node
+        target_lookup = pd.Index(target_keys)
+        unique = ~target_lookup.duplicated(keep="last")
+        self._target_lookup = target_lookup[unique]
+        self._target_rows = np.arange(len(target_lookup))[unique]
+
         self.on_epoch_end()
 
     def __len__(self):
@@ -321,34 +462,56 @@ class ClusterNodeSequence(Sequence):
         np.fill_diagonal(norm_adj, diag + diag_addition)
         return norm_adj
 
+    def _cluster_adjacency(self, nodes, cluster_indices):
+        # the rows of the adjacency matrix for the batch, restricted to the columns of the nodes
+        # in the batch, renumbered to be positions within the batch
+        rows = sparse.vstack(
+            [self._cluster_rows[i] for i in cluster_indices], format="csr"
+        )
+        sorter = np.argsort(nodes)
+        sorted_nodes = nodes[sorter]
+        positions = np.searchsorted(sorted_nodes, rows.indices)
+        positions[positions == len(nodes)] = 0
+        in_batch = sorted_nodes[positions] == rows.indices
+
+        row_idx = np.repeat(np.arange(rows.shape[0]), np.diff(rows.indptr))
+        return sparse.csr_matrix(
+            (rows.data[in_batch], (row_idx[in_batch], sorter[positions[in_batch]]),),
+            shape=(len(nodes), len(nodes)),
+        )
+
     def __getitem__(self, index):
         # The next batch should be the adjacency matrix for the cluster and the corresponding feature vectors
         # and targets if available.
-        cluster = self.clusters[index]
-        adj_cluster = self.graph.to_adjacency_matrix(cluster, weighted=self.weighted)
+        cluster_indices = self._batch_clusters[index]
+        nodes = np.concatenate([self._cluster_nodes[i] for i in cluster_indices])
+
+        if self._use_ilocs:
+            adj_cluster = self._cluster_adjacency(nodes, cluster_indices)
+        else:
+            adj_cluster = self.graph.to_adjacency_matrix(
+                list(nodes), weighted=self.weighted
+            )
 
         if self.normalize_adj:
             adj_cluster = self._diagonal_enhanced_normalization(adj_cluster)
         else:
             adj_cluster = adj_cluster.toarray()
 
-        g_node_list = list(cluster)
+        # Determine the target nodes that exist in this cluster, and their positions in both the
+        # batch and the targets
+        lookup = self._target_lookup.get_indexer(nodes)
+        (target_node_indices,) = np.nonzero(lookup >= 0)
+        cluster_target_indices = self._target_rows[lookup[target_node_indices]]
 
-        # Determine the target nodes that exist in this cluster
-        target_nodes_in_cluster = np.asanyarray(
-            list(set(g_node_list).intersection(self.target_ids))
-        )
+        target_nodes_in_cluster = nodes[target_node_indices]
+        if self._use_ilocs:
+            target_nodes_in_cluster = self.graph.node_ilocs_to_ids(
+                target_nodes_in_cluster
+            )
 
         self.__node_buffer[index] = target_nodes_in_cluster
 
-        # Dictionary to store node indices for quicker node index lookups
-        node_lookup = dict(zip(g_node_list, range(len(g_node_list))))
-
-        # The list of indices of the target nodes in self.node_list
-        target_node_indices = np.array(
-            [node_lookup[n] for n in target_nodes_in_cluster]
-        )
-
         if index == (len(self.clusters_original) // self.q) - 1:
             # last batch
             self.__node_buffer_dict_to_list()
@@ -356,16 +519,13 @@ class ClusterNodeSequence(Sequence):
         cluster_targets = None
         #
         if self.targets is not None:
-            # Dictionary to store node indices for quicker node index lookups
-            # The list of indices of the target nodes in self.node_list
-            cluster_target_indices = np.array(
-                [self.target_node_lookup[n] for n in target_nodes_in_cluster],
-                dtype=np.int64,
-            )
             cluster_targets = self.targets[cluster_target_indices]
             cluster_targets = cluster_targets.reshape((1,) + cluster_targets.shape)
 
-        features = self.graph.node_features(g_node_list)
+        if self._use_ilocs:
+            features = self.graph.node_features(nodes, use_ilocs=True)
+        else:
+            features = self.graph.node_features(list(nodes))
 
         features = np.reshape(features, (1,) + features.shape)
         adj_cluster = adj_cluster.reshape((1,) + adj_cluster.shape)
@@ -382,21 +542,369 @@ class ClusterNodeSequence(Sequence):
         """
          Shuffle all nodes at the end of each epoch
         """
-        if self.q > 1:
-            # combine clusters
-            cluster_indices = list(range(len(self.clusters_original)))
-            random.shuffle(cluster_indices)
-            self.clusters = []
-
-            for i in range(0, len(cluster_indices) - 1, self.q):
-                cc = cluster_indices[i : i + self.q]
-                tmp = []
-                for l in cc:
-                    tmp.extend(list(self.clusters_original[l]))
-                self.clusters.append(tmp)
-        else:
-            self.clusters = copy.deepcopy(self.clusters_original)
+        # each batch is a random group of q clusters (or a single cluster, in a random order)
+        num_clusters = len(self.clusters_original)
+        self._batch_clusters = np.random.permutation(num_clusters).reshape(-1, self.q)
 
         self.__node_buffer = dict()
 
-        random.shuffle(self.clusters)
+
+def _whole_graph_normalized_adjacency(adj, method):
+    # the same preprocessing as the full-batch GCN or GAT: symmetric (for GCN), with self loops,
+    # normalised symmetrically (for GCN)
+    if method == "gcn":
+        adj = adj + adj.T.multiply(adj.T > adj) - adj.multiply(adj.T > adj)
+
+    adj = adj + sparse.diags(np.ones(adj.shape[0]) - adj.diagonal())
+
+    if method == "gcn":
+        adj = normalize_adj(adj, symmetric=True)
+
+    adj = adj.tocsr()
+    adj.sort_indices()
+    return adj
+
+
+def _induced_subgraph(adj, nodes):
+    """
+    Find the elements of the CSR matrix ``adj`` in the subgraph induced by ``nodes``.
+
+    Args:
+        adj (scipy.sparse.csr_matrix): an adjacency matrix, with sorted indices
+        nodes (np.ndarray): the sorted, unique ilocs of the nodes in the subgraph
+
+    Returns:
+        A tuple of the positions of the elements within ``adj.data``, and their rows and columns
+        within the subgraph (as positions in ``nodes``), in row-major order.
+    """
+    starts = adj.indptr[nodes]
+    lengths = adj.indptr[nodes + 1] - starts
+    # the positions of every element in the rows of the nodes
+    row_offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    positions = row_offsets + np.arange(lengths.sum())
+    rows = np.repeat(np.arange(len(nodes)), lengths)
+
+    # only keep the ones with a column in the subgraph too
+    columns = adj.indices[positions]
+    cols = np.searchsorted(nodes, columns)
+    in_subgraph = nodes[np.minimum(cols, len(nodes) - 1)] == columns
+    return positions[in_subgraph], rows[in_subgraph], cols[in_subgraph]
+
+
+class GraphSAINTNodeGenerator(Generator):
+    """
+    A data generator for mini-batch training of GCN and GAT models on large homogeneous graphs, by
+    sampling subgraphs with random walks, as in GraphSAINT [1].
+
+    Each batch contains ``batch_size`` of the target nodes, plus the nodes visited by random walks
+    of length ``walk_length`` starting from each of them. The generator supplies the features of
+    the nodes in this subgraph and its (sparse) adjacency matrix, so the memory required for each
+    training step depends only on the batch size and walk length, not the size of the graph.
+
+    With ``method="gcn"``, the adjacency matrix of each subgraph is normalised so that the
+    aggregation of each node's neighbours is an unbiased estimate of the aggregation in the whole
+    graph: each edge starts with its value in the normalised adjacency matrix of the whole graph
+    (that is, using the degrees in the whole graph), which is then scaled by the "aggregator
+    normalisation" of [1], :math:`C_v / C_{uv}`, where :math:`C_v` is the number of sampled
+    subgraphs containing the node :math:`v` and :math:`C_{uv}` the number containing the edge
+    between :math:`u` and :math:`v`. These counts are estimated by sampling ``presampling_epochs``
+    epochs of subgraphs when calling :meth:`flow`. The loss normalisation of [1] isn't required,
+    because each target node is in exactly one batch per epoch, so every target node contributes
+    equally to the loss.
+
+    Use the :meth:`flow` method supplying the nodes and (optionally) targets to get an object that
+    can be used as a Keras data generator.
+
+    [1] `H. Zeng, H. Zhou, A. Srivastava, R. Kannan, V. Prasanna, 2020 <https://arxiv.org/abs/1907.04931>`_.
+
+    .. seealso::
+
+       Models using this generator: :class:`.GCN`, :class:`.GAT`.
+
+       Related generators: :class:`.ClusterNodeGenerator`, :class:`.FullBatchNodeGenerator`.
+
+    Args:
+        G (StellarGraph): a machine-learning StellarGraph-type graph, with a single node type
+        batch_size (int): the number of target nodes in each batch
+        walk_length (int): the length of the random walks used to sample the subgraph, where 0
+            means that the subgraph consists only of the target nodes
+        num_walks (int): the number of random walks from each target node
+        method (str): how to normalise the adjacency matrix of each subgraph: ``gcn`` (default)
+            adds self loops and normalises symmetrically, as required by :class:`.GCN`;
+            ``self_loops`` only adds self loops, as required by :class:`.GAT` (the attention
+            normalises over the sampled neighbours of each node).
+        weighted (bool, optional): if True, use the edge weights from ``G``; if False, treat the
+            graph as unweighted.
+        presampling_epochs (int): the number of epochs of subgraphs to sample, to estimate the
+            normalisation of each edge with ``method="gcn"``, where 0 means that only the
+            normalisation of the whole graph is used
+        seed (int, optional): random seed for the random walks and shuffling
+        name (str, optional): an optional name of the generator
+    """
+
+    multiplicity = 1
+    use_sparse = True
+
+    def __init__(
+        self,
+        G,
+        batch_size,
+        walk_length=2,
+        num_walks=1,
+        method="gcn",
+        weighted=False,
+        presampling_epochs=10,
+        seed=None,
+        name=None,
+    ):
+        if not isinstance(G, StellarGraph):
+            raise TypeError(f"G: expected a StellarGraph, found {type(G).__name__}")
+
+        require_integer_in_range(batch_size, "batch_size", min_val=1)
+        require_integer_in_range(walk_length, "walk_length", min_val=0)
+        require_integer_in_range(num_walks, "num_walks", min_val=1)
+        require_integer_in_range(presampling_epochs, "presampling_epochs", min_val=0)
+
+        if method not in ("gcn", "self_loops"):
+            raise ValueError(
+                f"method: expected 'gcn' or 'self_loops', found {method!r}"
+            )
+
+        G.check_graph_for_ml(expensive_check=False)
+        G.unique_node_type(
+            "G: expected a graph with a single node type, found a graph with node types: %(found)s"
+        )
+
+        self.graph = G
+        self.batch_size = batch_size
+        self.walk_length = walk_length
+        self.num_walks = num_walks
+        self.method = method
+        self.presampling_epochs = presampling_epochs if method == "gcn" else 0
+        self.seed = seed
+        self.name = name
+
+        self._adj = G.to_adjacency_matrix(weighted=weighted).tocsr()
+        self._normalized_adj = _whole_graph_normalized_adjacency(self._adj, method)
+
+        # Store the features of one node to allow graph ML models to peak at the feature dimension
+        self.features = G.node_features(np.array([0]), use_ilocs=True)
+
+    def num_batch_dims(self):
+        return 2
+
+    def flow(self, node_ids, targets=None, shuffle=False, use_ilocs=False, name=None):
+        """
+        Creates a generator/sequence object for training, evaluation, or prediction
+        with the supplied node ids and numeric targets.
+
+        Args:
+            node_ids (iterable): an iterable of node ids for the nodes of interest
+                (e.g., training, validation, or test set nodes)
+            targets (2d array, optional): a 2D array of numeric node targets with shape ``(len(node_ids),
+                target_size)``
+            shuffle (bool): if True, the target nodes are shuffled at each epoch
+            use_ilocs (bool): if True, ``node_ids`` are treated as :ref:`node ilocs
+                <iloc-explanation>`, otherwise they are treated as node IDs.
+            name (str, optional): An optional name for the returned generator object.
+
+        Returns:
+            A :class:`GraphSAINTNodeSequence` object to use with :class:`.GCN` or :class:`.GAT` in
+            Keras methods :meth:`fit`, :meth:`evaluate`, and :meth:`predict`.
+        """
+        if use_ilocs:
+            node_ilocs = np.asarray(node_ids)
+        else:
+            node_ilocs = self.graph.node_ids_to_ilocs(node_ids)
+
+        if targets is not None:
+            # Check targets is an iterable
+            if not is_real_iterable(targets):
+                raise TypeError(
+                    "{}: Targets must be an iterable or None".format(
+                        type(self).__name__
+                    )
+                )
+
+            # Check targets correct shape
+            if len(targets) != len(node_ilocs):
+                raise ValueError(
+                    "{}: Targets must be the same length as node_ids".format(
+                        type(self).__name__
+                    )
+                )
+
+        return GraphSAINTNodeSequence(
+            self.graph,
+            self._adj,
+            self._normalized_adj,
+            node_ilocs,
+            targets=targets,
+            batch_size=self.batch_size,
+            walk_length=self.walk_length,
+            num_walks=self.num_walks,
+            presampling_epochs=self.presampling_epochs,
+            shuffle=shuffle,
+            seed=self.seed,
+            name=name,
+        )
+
+
+class GraphSAINTNodeSequence(Sequence):
+    """
+    A Keras-compatible data generator for node inference with GCN or GAT models on sampled
+    subgraphs. Use this class with the Keras methods :meth:`keras.Model.fit`,
+    :meth:`keras.Model.evaluate`, and :meth:`keras.Model.predict`.
+
+    This class should be created using the :meth:`flow` method of
+    :class:`.GraphSAINTNodeGenerator`.
+
+    Each batch is ``[features, target_indices, adjacency_indices, adjacency_values], targets``,
+    where the features and adjacency are for the sampled subgraph (with a batch dimension of 1),
+    and ``target_indices`` are the positions of the target nodes within it.
+
+    Args:
+        graph (StellarGraph): the graph
+        adj (scipy.sparse.csr_matrix): the adjacency matrix of the graph, for the random walks
+        normalized_adj (scipy.sparse.csr_matrix): the normalised adjacency matrix of the graph,
+            with sorted indices, from which the adjacency matrix of each subgraph is taken
+        node_ilocs (array): the ilocs of the target nodes
+        targets (np.ndarray, optional): An optional array of node targets of size (N x C),
+            where C is the target size (e.g., number of classes for one-hot class targets)
+        batch_size (int): the number of target nodes in each batch
+        walk_length (int): the length of the random walks used to sample the subgraph
+        num_walks (int): the number of random walks from each target node
+        presampling_epochs (int): the number of epochs of subgraphs to sample, to estimate the
+            normalisation of each edge, where 0 means that ``normalized_adj`` is used as is
+        shuffle (bool): if True, the target nodes are shuffled at each epoch
+        seed (int, optional): random seed
+        name (str, optional): An optional name for this generator object.
+    """
+
+    def __init__(
+        self,
+        graph,
+        adj,
+        normalized_adj,
+        node_ilocs,
+        targets=None,
+        batch_size=1,
+        walk_length=2,
+        num_walks=1,
+        presampling_epochs=0,
+        shuffle=False,
+        seed=None,
+        name=None,
+    ):
+        self.graph = graph
+        self._adj = adj
+        self._normalized_adj = normalized_adj
+        self.node_ilocs = np.asarray(node_ilocs)
+        self.targets = None if targets is None else np.asanyarray(targets)
+        self.batch_size = batch_size
+        self.walk_length = walk_length
+        self.num_walks = num_walks
+        self.shuffle = shuffle
+        self.name = name
+
+        _, self._np_rs = random_state(seed)
+        # the walks for each batch use their own random state, so that they're deterministic even
+        # when batches are computed in parallel
+        self._batch_rngs = SeededPerBatch(np.random.RandomState, seed=seed)
+
+        self._node_counts = self._edge_counts = None
+        if presampling_epochs > 0:
+            self._presample(presampling_epochs)
+
+        self.on_epoch_end()
+
+    def __len__(self):
+        return int(np.ceil(len(self.node_ilocs) / self.batch_size))
+
+    def _sample_nodes(self, roots, rng):
+        # uniform random walks, vectorised over all walks at once (nodes without neighbours stay
+        # where they are)
+        indptr, indices = self._adj.indptr, self._adj.indices
+        visited = [roots]
+        current = np.repeat(roots, self.num_walks)
+        for _ in range(self.walk_length):
+            degrees = indptr[current + 1] - indptr[current]
+            offsets = (rng.random_sample(len(current)) * degrees).astype(np.int64)
+            has_neighbours = degrees > 0
+            current = current.copy()
+            current[has_neighbours] = indices[
+                indptr[current[has_neighbours]] + offsets[has_neighbours]
+            ]
+            visited.append(current)
+
+        return np.unique(np.concatenate(visited))
+
+    def _presample(self, epochs):
+        # count the number of sampled subgraphs containing each node and each edge, sampling in the
+        # same way as training, but with a separate random state
+        rng = np.random.RandomState(self._np_rs.randint(2 ** 32, dtype=np.uint32))
+        self._node_counts = np.zeros(self._adj.shape[0], dtype=np.int32)
+        self._edge_counts = np.zeros(self._normalized_adj.nnz, dtype=np.int32)
+
+        for _ in range(epochs):
+            if self.shuffle:
+                roots = rng.permutation(self.node_ilocs)
+            else:
+                roots = self.node_ilocs
+
+            for start in range(0, len(roots), self.batch_size):
+                nodes = self._sample_nodes(roots[start : start + self.batch_size], rng)
+                positions, _, _ = _induced_subgraph(self._normalized_adj, nodes)
+                self._node_counts[nodes] += 1
+                self._edge_counts[positions] += 1
+
+    def _normalized_adjacency(self, nodes):
+        positions, rows, cols = _induced_subgraph(self._normalized_adj, nodes)
+        values = self._normalized_adj.data[positions]
+
+        if self._node_counts is not None:
+            # the aggregator normalisation C_v / C_uv, for the node v aggregating from u, which
+            # makes the aggregation an unbiased estimate of the one in the whole graph. Edges that
+            # were never sampled while presampling can't be estimated, and are left as is.
+            edge_counts = self._edge_counts[positions]
+            sampled = edge_counts > 0
+            node_counts = self._node_counts[nodes[rows[sampled]]]
+            values[sampled] *= node_counts / edge_counts[sampled]
+
+        indices = np.column_stack([rows, cols]).astype(np.int64)
+        return indices[np.newaxis, ...], values[np.newaxis, :]
+
+    def __getitem__(self, index):
+        batch_indices = self._indices[
+            index * self.batch_size : (index + 1) * self.batch_size
+        ]
+        roots = self.node_ilocs[batch_indices]
+
+        nodes = self._sample_nodes(roots, self._batch_rngs[index])
+        target_node_indices = np.searchsorted(nodes, roots)
+
+        features = self.graph.node_features(nodes, use_ilocs=True)
+        adj_indices, adj_values = self._normalized_adjacency(nodes)
+
+        batch_targets = None
+        if self.targets is not None:
+            batch_targets = self.targets[batch_indices]
+            batch_targets = batch_targets.reshape((1,) + batch_targets.shape)
+
+        return (
+            [
+                features[np.newaxis, ...],
+                target_node_indices[np.newaxis, :],
+                adj_indices,
+                adj_values,
+            ],
+            batch_targets,
+        )
+
+    def on_epoch_end(self):
+        """
+        Shuffle the target nodes at the end of each epoch, if requested
+        """
+        self._indices = np.arange(len(self.node_ilocs))
+        if self.shuffle:
+            self._np_rs.shuffle(self._indices)
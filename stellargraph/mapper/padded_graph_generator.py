@@ -17,6 +17,7 @@ from ..core.graph import StellarGraph
 from ..core.utils import is_real_iterable, normalize_adj
 from ..random import random_state
 import numpy as np
+import scipy.sparse as sps
 from tensorflow.keras.utils import Sequence
 from .base import Generator
 
@@ -34,6 +35,13 @@ class PaddedGraphGenerator(Generator):
     batch of features and adjacency matrices, and supplying a boolean mask indicating which are
     valid and which are padding.
 
+    Alternatively, with ``sparse=True``, each batch is the disjoint union of its graphs: the node
+    features are concatenated into a single ``1 × total nodes × F`` array, the adjacency matrices
+    form a single sparse block-diagonal matrix (supplied as indices and values, like
+    :class:`.FullBatchNodeGenerator`), and a ``1 × total nodes`` vector of segment IDs gives the
+    index of the graph in the batch containing each node. This uses memory linear in the total
+    number of nodes, rather than quadratic in the number of nodes of the largest graph.
+
     .. seealso::
 
        Models using this generator: :class:`.GCNSupervisedGraphClassification`, :class:`.DeepGraphCNN`.
@@ -47,15 +55,18 @@ class PaddedGraphGenerator(Generator):
     Args:
         graphs (list): a collection of StellarGraph objects
         name (str): an optional name of the generator
+        sparse (bool): if True, batches are disjoint unions of graphs with a sparse adjacency matrix,
+            instead of padded dense arrays.
     """
 
-    def __init__(self, graphs, name=None):
+    def __init__(self, graphs, name=None, sparse=False):
 
         self.node_features_size = None
         self._check_graphs(graphs)
 
         self.graphs = graphs
         self.name = name
+        self.use_sparse = sparse
 
     def _check_graphs(self, graphs):
         for graph in graphs:
@@ -101,6 +112,7 @@ class PaddedGraphGenerator(Generator):
         name=None,
         shuffle=False,
         seed=None,
+        bucket_by_size=False,
     ):
         """
         Creates a generator/sequence object for training, evaluation, or prediction
@@ -121,6 +133,10 @@ class PaddedGraphGenerator(Generator):
             name (str, optional): An optional name for the returned generator object.
             shuffle (bool, optional): If True the node IDs will be shuffled at the end of each epoch.
             seed (int, optional): Random seed to use in the sequence object.
+            bucket_by_size (bool, optional): If True, graphs of similar numbers of nodes are put in the same batch,
+                so that less padding is required. At the end of each epoch, the graphs are shuffled, sorted by size
+                and split into batches, and then the order of the batches is shuffled. This requires
+                ``shuffle=True``, because it changes the order of the graphs.
 
         Returns:
             A :class:`.PaddedGraphSequence` object to use with Keras methods :meth:`fit`, :meth:`evaluate`, and :meth:`predict`
@@ -178,6 +194,8 @@ class PaddedGraphGenerator(Generator):
             name=name,
             shuffle=shuffle,
             seed=seed,
+            bucket_by_size=bucket_by_size,
+            sparse=self.use_sparse,
         )
 
 
@@ -205,6 +223,10 @@ class PaddedGraphSequence(Sequence):
         name (str, optional): An optional name for this generator object.
         shuffle (bool, optional): If True the node IDs will be shuffled at the end of each epoch.
         seed (int, optional): Random seed.
+        bucket_by_size (bool, optional): If True, batches contain graphs of similar numbers of nodes, to
+            minimise the padding required. This requires ``shuffle=True``.
+        sparse (bool, optional): If True, each batch is the disjoint union of its graphs, with a sparse
+            adjacency matrix and segment IDs, instead of padded arrays.
     """
 
     def __init__(
@@ -219,8 +241,15 @@ class PaddedGraphSequence(Sequence):
         name=None,
         shuffle=False,
         seed=None,
+        bucket_by_size=False,
+        sparse=False,
     ):
 
+        if bucket_by_size and not shuffle:
+            raise ValueError(
+                "bucket_by_size: expected 'shuffle=True' when bucketing graphs by size, because it changes the order of the graphs, found 'shuffle=False'"
+            )
+
         self.name = name
         self.graphs = np.asanyarray(graphs)
 
@@ -261,11 +290,15 @@ class PaddedGraphSequence(Sequence):
                 for adj in adjacencies
             ]
         else:
-            self.normalize_adjs = adjacencies
+            self.normalized_adjs = adjacencies
 
         self.normalized_adjs = np.asanyarray(self.normalized_adjs)
+        self._num_nodes = np.array([graph.number_of_nodes() for graph in graphs])
+
         _, self._np_rs = random_state(seed)
         self.shuffle = shuffle
+        self.bucket_by_size = bucket_by_size
+        self.use_sparse = sparse
 
         self.on_epoch_end()
 
@@ -275,24 +308,30 @@ class PaddedGraphSequence(Sequence):
     def __len__(self):
         return int(np.ceil(self._epoch_size() / self.batch_size))
 
-    def _pad_graphs(self, graphs, adj_graphs, max_nodes):
-        # pad adjacency and feature matrices to equal the size of those from the largest graph
-        features = [
-            np.pad(
-                graph.node_features(),
-                pad_width=((0, max_nodes - graph.number_of_nodes()), (0, 0)),
-            )
-            for graph in graphs
+    def _pad_graphs(self, graph_ilocs, max_nodes):
+        # pad adjacency and feature matrices to equal the size of those from the largest graph, by
+        # copying each graph's features and (sparse) adjacency matrix into zero-filled batch arrays
+        all_features = [
+            self.graphs[graph_iloc].node_features() for graph_iloc in graph_ilocs
         ]
-        features = np.stack(features)
+        adjs = self.normalized_adjs[graph_ilocs]
 
-        for adj in adj_graphs:
-            adj.resize((max_nodes, max_nodes))
-        adj_graphs = np.stack([adj.toarray() for adj in adj_graphs])
+        features = np.zeros(
+            (len(graph_ilocs), max_nodes, all_features[0].shape[1]),
+            dtype=np.result_type(*all_features),
+        )
+        adj_graphs = np.zeros(
+            (len(graph_ilocs), max_nodes, max_nodes),
+            dtype=np.result_type(*(adj.dtype for adj in adjs)),
+        )
+        masks = np.zeros((len(graph_ilocs), max_nodes), dtype=bool)
 
-        masks = np.full((len(graphs), max_nodes), fill_value=False, dtype=np.bool)
-        for index, graph in enumerate(graphs):
-            masks[index, : graph.number_of_nodes()] = True
+        for index, (feats, adj) in enumerate(zip(all_features, adjs)):
+            num_nodes = len(feats)
+            features[index, :num_nodes] = feats
+            adj = adj.tocoo()
+            adj_graphs[index, adj.row, adj.col] = adj.data
+            masks[index, :num_nodes] = True
 
         # features is array of dimensionality
         #      batch size x N x F
@@ -306,35 +345,90 @@ class PaddedGraphSequence(Sequence):
         # the node feature dimensionality, and C is the number of target classes
         return [features, masks, adj_graphs]
 
+    def _union_graphs(self, graph_ilocs):
+        num_nodes = self._num_nodes[graph_ilocs]
+        total_nodes = num_nodes.sum()
+
+        features = np.concatenate(
+            [self.graphs[graph_iloc].node_features() for graph_iloc in graph_ilocs]
+        )
+        segment_ids = np.repeat(
+            np.arange(len(graph_ilocs), dtype=np.int32), repeats=num_nodes
+        )
+
+        adj = sps.block_diag(list(self.normalized_adjs[graph_ilocs]), format="coo")
+        rows, cols, values = adj.row, adj.col, adj.data
+        if not np.any((rows == total_nodes - 1) & (cols == total_nodes - 1)):
+            # the shape of the sparse matrix is inferred from the largest index, so make sure the
+            # last node appears (with an explicit zero) even if it has no edges or self loop
+            rows = np.append(rows, total_nodes - 1)
+            cols = np.append(cols, total_nodes - 1)
+            values = np.append(values, 0)
+
+        indices = np.column_stack((rows, cols)).astype(np.int64)
+
+        # features is array of dimensionality
+        #      1 x total nodes x F
+        # segment_ids is array of dimensionality
+        #      1 x total nodes
+        # indices is array of dimensionality
+        #      1 x E x 2
+        # values is array of dimensionality
+        #      1 x E
+        # where total nodes is the sum of the number of nodes of each graph in the batch, and E is
+        # the number of non-zero elements of the block-diagonal adjacency matrix
+        return [
+            features[np.newaxis],
+            segment_ids[np.newaxis],
+            indices[np.newaxis],
+            values[np.newaxis],
+        ]
+
     def __getitem__(self, index):
 
         batch_start, batch_end = index * self.batch_size, (index + 1) * self.batch_size
 
         batch_ilocs = self.selected_ilocs[:, batch_start:batch_end]
-        graphs = self.graphs[batch_ilocs]
-        adj_graphs = self.normalized_adjs[batch_ilocs]
 
         # The number of nodes for the largest graph in the batch. We are going to pad with 0 rows and columns
         # the adjacency and node feature matrices (only the rows in this case) to equal in size the adjacency and
         # feature matrices of the largest graph.
-        max_nodes = max(graph.number_of_nodes() for graph in graphs.ravel())
+        max_nodes = self._num_nodes[batch_ilocs].max()
 
         graph_targets = None
         if self.targets is not None:
             graph_targets = self.targets[batch_start:batch_end]
 
-        padded = [
-            self._pad_graphs(g, adj, max_nodes) for g, adj in zip(graphs, adj_graphs)
-        ]
+        if self.use_sparse:
+            padded = [self._union_graphs(ilocs) for ilocs in batch_ilocs]
+        else:
+            padded = [self._pad_graphs(ilocs, max_nodes) for ilocs in batch_ilocs]
 
         return [output for arrays in padded for output in arrays], graph_targets
 
     def on_epoch_end(self):
         """
-         Shuffle all graphs at the end of each epoch
+         Shuffle all graphs at the end of each epoch, and group them by size if ``bucket_by_size``
         """
         if self.shuffle:
             indexes = self._np_rs.permutation(self._epoch_size())
+        else:
+            indexes = np.arange(self._epoch_size())
+
+        if self.bucket_by_size:
+            # each example is as large as its largest graph; a stable sort keeps the shuffled order
+            # within each size
+            sizes = self._num_nodes[self.selected_ilocs[:, indexes]].max(axis=0)
+            indexes = indexes[np.argsort(sizes, kind="stable")]
+
+            batch_order = self._np_rs.permutation(len(self))
+            batches = [
+                indexes[i * self.batch_size : (i + 1) * self.batch_size]
+                for i in batch_order
+            ]
+            indexes = np.concatenate(batches)
+
+        if self.shuffle:
             self.selected_ilocs = self.selected_ilocs[:, indexes]
             if self.targets is not None:
                 self.targets = self.targets[indexes]
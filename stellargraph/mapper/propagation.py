@@ -0,0 +1,293 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Precomputation of node features propagated over the graph, for models like SGC and SIGN.
+
+"""
+__all__ = ["propagate_features", "PropagatedFeatureNodeGenerator"]
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sps
+
+from ..core.element_data import _gather_rows
+from ..core.graph import StellarGraph
+from ..core.utils import is_real_iterable, normalize_adj
+from ..core.validation import require_integer_in_range
+from .base import Generator
+from .sequences import NodeSequence
+
+# bump this when the computation changes, to invalidate existing caches
+_CACHE_VERSION = 1
+
+
+def _normalized_adjacency(G, weighted):
+    # the same normalisation as GCN: symmetric, with self loops, D^(-1/2) A D^(-1/2)
+    A = G.to_adjacency_matrix(weighted=weighted)
+    A = A + A.T.multiply(A.T > A) - A.multiply(A.T > A)
+    A = A + sps.diags(np.ones(A.shape[0]) - A.diagonal())
+    return normalize_adj(A, symmetric=True).tocsr()
+
+
+def _fingerprint(G, A, features, weighted):
+    """
+    A key that identifies the graph structure, node features and normalisation of a propagation.
+    """
+    digest = hashlib.sha256()
+    digest.update(f"v{_CACHE_VERSION};gcn;weighted={weighted};".encode())
+    digest.update(pd.util.hash_pandas_object(G.nodes(), index=False).values.tobytes())
+
+    for array in [A.indptr, A.indices, A.data]:
+        digest.update(np.ascontiguousarray(array).tobytes())
+
+    digest.update(f"{features.shape};{features.dtype};".encode())
+    if sps.issparse(features):
+        features = features.tocsr()
+        for array in [features.indptr, features.indices, features.data]:
+            digest.update(np.ascontiguousarray(array).tobytes())
+    else:
+        digest.update(np.ascontiguousarray(features).tobytes())
+
+    return digest.hexdigest()
+
+
+def propagate_features(G, k, weighted=False, cache_dir=None, block_size=64):
+    """
+    Compute the node features of ``G`` propagated over the graph ``0, 1, ..., k`` times: ``[X, ÂX,
+    Â²X, ..., Âᵏ X]``, where ``X`` is the node feature matrix and ``Â`` is the normalised adjacency
+    matrix with self loops used by GCN [1], as used by SGC [2] and SIGN [3].
+
+    The propagation is computed for ``block_size`` feature columns at a time, so the memory
+    required is bounded by that of the sparse adjacency matrix and two ``N × block_size`` blocks,
+    in addition to the output.
+
+    If ``cache_dir`` is specified, each propagated feature matrix is saved in that directory as a
+    ``.npy`` file, keyed by a fingerprint of the graph structure, the node features and the
+    normalisation, and returned memory-mapped. Calling this function again on the same graph loads
+    the saved matrices instantly, and only computes the powers that haven't been saved yet.
+
+    [1] `Kipf and Welling, 2017 <https://arxiv.org/abs/1609.02907>`_.
+    [2] `Wu et al. 2019 <https://arxiv.org/abs/1902.07153>`_.
+    [3] `Frasca et al., 2020 <https://arxiv.org/abs/2004.11198>`_.
+
+    Args:
+        G (StellarGraph): a graph with a single node type, with node features
+        k (int): the maximum number of propagation steps
+        weighted (bool, optional): if True, use the edge weights from ``G``; if False, treat the
+            graph as unweighted.
+        cache_dir (str, optional): a directory in which to save and load the propagated features
+        block_size (int): the number of feature columns to propagate at a time
+
+    Returns:
+        A list of ``k + 1`` NumPy arrays, each of shape ``N × F``, where element ``i`` is the node
+        features propagated ``i`` times, with rows in the order of ``G.nodes()``.
+    """
+    if not isinstance(G, StellarGraph):
+        raise TypeError(f"G: expected a StellarGraph, found {type(G).__name__}")
+
+    require_integer_in_range(k, "k", min_val=0)
+    require_integer_in_range(block_size, "block_size", min_val=1)
+
+    node_type = G.unique_node_type(
+        "G: expected a graph with a single node type, found a graph with node types: %(found)s"
+    )
+    features = G.node_features(node_type=node_type, sparse=True)
+    A = _normalized_adjacency(G, weighted)
+
+    num_nodes, num_features = features.shape
+    dtype = np.result_type(features.dtype, np.float32)
+
+    if cache_dir is None:
+        directory = None
+        hops = []
+    else:
+        directory = os.path.join(cache_dir, _fingerprint(G, A, features, weighted))
+        os.makedirs(directory, exist_ok=True)
+        hops = _load_hops(directory, k)
+
+    if not hops:
+        dense = features.toarray() if sps.issparse(features) else features
+        hops = [_save_hop(directory, 0, np.asarray(dense, dtype=dtype))]
+
+    start = len(hops)
+    if start > k:
+        return hops
+
+    if directory is None:
+        new_hops = [
+            np.empty((num_nodes, num_features), dtype=dtype)
+            for _ in range(start, k + 1)
+        ]
+    else:
+        new_hops = [
+            np.lib.format.open_memmap(
+                _hop_path(directory, i) + ".partial",
+                mode="w+",
+                dtype=dtype,
+                shape=(num_nodes, num_features),
+            )
+            for i in range(start, k + 1)
+        ]
+
+    for block_start in range(0, num_features, block_size):
+        columns = slice(block_start, block_start + block_size)
+        propagated = np.asarray(hops[-1][:, columns])
+        for new_hop in new_hops:
+            propagated = A @ propagated
+            new_hop[:, columns] = propagated
+
+    for i in range(start, k + 1):
+        hops.append(_save_hop(directory, i, new_hops.pop(0)))
+
+    return hops
+
+
+def _hop_path(directory, i):
+    return os.path.join(directory, f"hop_{i}.npy")
+
+
+def _load_hops(directory, k):
+    hops = []
+    for i in range(k + 1):
+        path = _hop_path(directory, i)
+        if not os.path.exists(path):
+            break
+        hops.append(np.load(path, mmap_mode="r"))
+    return hops
+
+
+def _save_hop(directory, i, array):
+    if directory is None:
+        return array
+
+    path = _hop_path(directory, i)
+    if isinstance(array, np.memmap):
+        # written in place: make sure it's on disk, then move it into place atomically
+        array.flush()
+        partial = array.filename
+        del array
+        os.replace(partial, path)
+    else:
+        np.save(path + ".partial.npy", array)
+        os.replace(path + ".partial.npy", path)
+
+    return np.load(path, mmap_mode="r")
+
+
+class PropagatedFeatureNodeGenerator(Generator):
+    """
+    A data generator for node prediction with models that use node features propagated over the
+    graph ahead of time, like SIGN [1] and SGC [2].
+
+    The features propagated ``0, 1, ..., k`` times are computed once with
+    :func:`.propagate_features`, and each batch is just the corresponding rows of these, so
+    training doesn't need access to the graph and works with any size of graph. Each batch is a
+    list of ``k + 1`` arrays of shape ``batch size × F``, which can be used with a Keras model with
+    one input per propagation step, for instance::
+
+        generator = PropagatedFeatureNodeGenerator(G, k=3, batch_size=256)
+        x_inp = [Input(shape=(F,)) for _ in range(generator.k + 1)]
+        hidden = Concatenate()([Dense(64, activation="relu")(x) for x in x_inp])
+        predictions = Dense(num_classes, activation="softmax")(hidden)
+
+        model = Model(inputs=x_inp, outputs=predictions)
+        model.fit(generator.flow(train_nodes, train_targets, shuffle=True), epochs=10)
+
+    [1] `Frasca et al., 2020 <https://arxiv.org/abs/2004.11198>`_.
+    [2] `Wu et al. 2019 <https://arxiv.org/abs/1902.07153>`_.
+
+    .. seealso::
+
+       Related functionality: :func:`.propagate_features`, :class:`.FullBatchNodeGenerator`
+       with ``method='sgc'``.
+
+    Args:
+        G (StellarGraph): a machine-learning StellarGraph-type graph, with a single node type
+        k (int): the maximum number of propagation steps
+        batch_size (int): the number of nodes in each batch
+        weighted (bool, optional): if True, use the edge weights from ``G``; if False, treat the
+            graph as unweighted.
+        cache_dir (str, optional): a directory in which to save and load the propagated features,
+            see :func:`.propagate_features`
+        name (str, optional): an optional name of the generator
+    """
+
+    def __init__(self, G, k, batch_size, weighted=False, cache_dir=None, name=None):
+        require_integer_in_range(batch_size, "batch_size", min_val=1)
+
+        self.graph = G
+        self.k = k
+        self.batch_size = batch_size
+        self.name = name
+        self.hops = propagate_features(G, k, weighted=weighted, cache_dir=cache_dir)
+
+    def num_batch_dims(self):
+        return 1
+
+    def sample_features(self, head_nodes, batch_num):
+        """
+        Gather the propagated features of the head nodes.
+
+        Args:
+            head_nodes: the node ilocs of the nodes in the batch
+            batch_num (int): Batch number
+
+        Returns:
+            A list of ``k + 1`` feature arrays, one for each number of propagation steps.
+        """
+        head_nodes = np.asarray(head_nodes)
+        return [_gather_rows(hop, head_nodes) for hop in self.hops]
+
+    def flow(self, node_ids, targets=None, shuffle=False, seed=None, use_ilocs=False):
+        """
+        Creates a generator/sequence object for training, evaluation or prediction with the
+        supplied node ids and numeric targets.
+
+        Args:
+            node_ids (iterable): an iterable of node IDs
+            targets (2d array, optional): a 2D array of numeric targets with shape
+                ``(len(node_ids), target_size)``
+            shuffle (bool): if True, the node IDs are shuffled at each epoch
+            seed (int, optional): random seed for the shuffling
+            use_ilocs (bool): if True, ``node_ids`` are treated as :ref:`node ilocs
+                <iloc-explanation>`, otherwise they are treated as node IDs.
+
+        Returns:
+            A :class:`.NodeSequence` object to use with Keras methods :meth:`fit`,
+            :meth:`evaluate` and :meth:`predict`.
+        """
+        if not is_real_iterable(node_ids):
+            raise TypeError(
+                f"node_ids: expected an iterable, found {type(node_ids).__name__}"
+            )
+
+        if use_ilocs:
+            node_ilocs = np.asarray(node_ids)
+        else:
+            node_ilocs = self.graph.node_ids_to_ilocs(node_ids)
+
+        return NodeSequence(
+            self.sample_features,
+            self.batch_size,
+            node_ilocs,
+            targets=targets,
+            shuffle=shuffle,
+            seed=seed,
+        )
@@ -43,6 +43,7 @@ from ..core.utils import is_real_iterable
 from ..random import random_state
 from scipy import sparse
 from ..core.experimental import experimental
+from .. import profiling
 
 
 class NodeSequence(Sequence):
@@ -107,6 +108,7 @@ class NodeSequence(Sequence):
         """Denotes the number of batches per epoch"""
         return int(np.ceil(self.data_size / self.batch_size))
 
+    @profiling.instrument()
     def __getitem__(self, batch_num):
         """
         Generate one batch of data
@@ -136,7 +138,9 @@ class NodeSequence(Sequence):
         batch_targets = None if self.targets is None else self.targets[batch_indices]
 
         # Get features for nodes
-        batch_feats = self._sample_function(head_ids, batch_num)
+        batch_feats = profiling.timed(
+            None, self._sample_function, head_ids, batch_num, count_bytes=True
+        )
 
         return batch_feats, batch_targets
 
@@ -211,6 +215,7 @@ class LinkSequence(Sequence):
         """Denotes the number of batches per epoch"""
         return int(np.ceil(self.data_size / self.batch_size))
 
+    @profiling.instrument()
     def __getitem__(self, batch_num):
         """
         Generate one batch of data
@@ -238,7 +243,9 @@ class LinkSequence(Sequence):
         batch_targets = None if self.targets is None else self.targets[batch_indices]
 
         # Get node features for batch of link ids
-        batch_feats = self._sample_features(head_ids, batch_num)
+        batch_feats = profiling.timed(
+            None, self._sample_features, head_ids, batch_num, count_bytes=True
+        )
 
         return batch_feats, batch_targets
 
@@ -349,6 +356,38 @@ def _full_batch_array_and_reshape(array, propagate_none=False):
     return np.reshape(as_np, (1,) + as_np.shape)
 
 
+def _sparse_matrix_indices_and_values(matrix):
+    """
+    Args:
+        matrix: a SciPy sparse matrix
+    Returns:
+        a list of the indices (``1 x nnz x 2``) and the values (``1 x nnz``) of the non-zero
+        elements of ``matrix``, each with an extra first dimension (batch dimension) equal to 1
+    """
+    matrix = matrix.tocoo()
+    indices = np.expand_dims(
+        np.hstack((matrix.row[:, None], matrix.col[:, None])), 0
+    ).astype("int64")
+    values = np.expand_dims(matrix.data, 0)
+    return [indices, values]
+
+
+def _full_batch_features(features):
+    """
+    Args:
+        features: a NumPy array or SciPy sparse matrix of node features
+    Returns:
+        a tuple of the features to store (with a batch dimension of 1, if dense), and a list of the
+        arrays to use as model inputs for them: either the dense features, or the indices and
+        values of sparse features
+    """
+    if sps.issparse(features):
+        return features, _sparse_matrix_indices_and_values(features)
+
+    features = _full_batch_array_and_reshape(features)
+    return features, [features]
+
+
 class FullBatchSequence(Sequence):
     """
     Keras-compatible data generator for for node inference models
@@ -361,8 +400,9 @@ class FullBatchSequence(Sequence):
     :class:`.FullBatchNodeGenerator`.
 
     Args:
-        features (np.ndarray): An array of node features of size (N x F),
-            where N is the number of nodes in the graph, F is the node feature size
+        features (np.ndarray or sparse matrix): An array of node features of size (N x F),
+            where N is the number of nodes in the graph, F is the node feature size. A sparse
+            matrix is supplied to the model as two inputs, its indices and values.
         A (np.ndarray or sparse matrix): An adjacency matrix of the graph of size (N x N).
         targets (np.ndarray, optional): An optional array of node targets of size (N x C),
             where C is the target size (e.g., number of classes for one-hot class targets)
@@ -379,10 +419,6 @@ class FullBatchSequence(Sequence):
                 "When passed together targets and indices should be the same length."
             )
 
-        # Store features and targets as np.ndarray
-        self.features = np.asanyarray(features)
-        self.target_indices = np.asanyarray(indices)
-
         # Convert sparse matrix to dense:
         if sps.issparse(A) and hasattr(A, "toarray"):
             self.A_dense = _full_batch_array_and_reshape(A.toarray())
@@ -394,9 +430,9 @@ class FullBatchSequence(Sequence):
             )
 
         # Reshape all inputs to have batch dimension of 1
-        self.features = _full_batch_array_and_reshape(features)
+        self.features, feature_inputs = _full_batch_features(features)
         self.target_indices = _full_batch_array_and_reshape(indices)
-        self.inputs = [self.features, self.target_indices, self.A_dense]
+        self.inputs = [*feature_inputs, self.target_indices, self.A_dense]
 
         self.targets = _full_batch_array_and_reshape(targets, propagate_none=True)
 
@@ -423,8 +459,9 @@ class SparseFullBatchSequence(Sequence):
     :class:`.FullBatchNodeGenerator`.
 
     Args:
-        features (np.ndarray): An array of node features of size (N x F),
-            where N is the number of nodes in the graph, F is the node feature size
+        features (np.ndarray or sparse matrix): An array of node features of size (N x F),
+            where N is the number of nodes in the graph, F is the node feature size. A sparse
+            matrix is supplied to the model as two inputs, its indices and values.
         A (sparse matrix): An adjacency matrix of the graph of size (N x N).
         targets (np.ndarray, optional): An optional array of node targets of size (N x C),
             where C is the target size (e.g., number of classes for one-hot class targets)
@@ -441,24 +478,17 @@ class SparseFullBatchSequence(Sequence):
                 "When passed together targets and indices should be the same length."
             )
 
-        # Ensure matrix is in COO format to extract indices
-        if sps.isspmatrix(A):
-            A = A.tocoo()
-
-        else:
+        if not sps.isspmatrix(A):
             raise ValueError("Adjacency matrix not in expected sparse format")
 
         # Convert matrices to list of indices & values
-        self.A_indices = np.expand_dims(
-            np.hstack((A.row[:, None], A.col[:, None])), 0
-        ).astype("int64")
-        self.A_values = np.expand_dims(A.data, 0)
+        self.A_indices, self.A_values = _sparse_matrix_indices_and_values(A)
 
         # Reshape all inputs to have batch dimension of 1
         self.target_indices = _full_batch_array_and_reshape(indices)
-        self.features = _full_batch_array_and_reshape(features)
+        self.features, feature_inputs = _full_batch_features(features)
         self.inputs = [
-            self.features,
+            *feature_inputs,
             self.target_indices,
             self.A_indices,
             self.A_values,
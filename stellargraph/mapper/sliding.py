@@ -168,6 +168,29 @@ class SlidingFeaturesNodeSequence(Sequence):
                 f"expected at least one sliding window of features, found a total window of size {query_length} (window_size={window_size}{target_str}) which is larger than the {self._num_sequence_samples} selected feature sample(s) (sequence_iloc_slice selected from {start} to {stop} in the sequence axis of length {total_sequence_samples})"
             )
 
+        # views of every window and target, without copying the features: the window starting at
+        # sequence index i is self._windows[i], of shape nodes × window_size × variates (and
+        # similarly for self._targets[i], of shape nodes × variates), so a batch is a single slice
+        # of these
+        node_stride, sequence_stride, *variate_strides = self._features.strides
+        self._windows = np.lib.stride_tricks.as_strided(
+            self._features,
+            shape=(self._num_windows, self._num_nodes, window_size)
+            + self._num_sequence_variates,
+            strides=(sequence_stride, node_stride, sequence_stride, *variate_strides),
+            writeable=False,
+        )
+
+        if target_distance is not None:
+            first_target = window_size + target_distance - 1
+            self._targets = np.swapaxes(
+                self._features[:, first_target : first_target + self._num_windows],
+                0,
+                1,
+            )
+        else:
+            self._targets = None
+
     def __len__(self):
         return int(np.ceil(self._num_windows / self._batch_size))
 
@@ -175,28 +198,18 @@ class SlidingFeaturesNodeSequence(Sequence):
         first_start = batch_num * self._batch_size
         last_start = min((batch_num + 1) * self._batch_size, self._num_windows)
 
-        has_targets = self._target_distance is not None
-
-        arrays = []
-        targets = [] if has_targets else None
-        for start in range(first_start, last_start):
-            end = start + self._window_size
-            arrays.append(self._features[:, start:end, ...])
-            if has_targets:
-                target_idx = end + self._target_distance - 1
-                targets.append(self._features[:, target_idx, ...])
-
         this_batch_size = last_start - first_start
 
-        batch_feats = np.stack(arrays)
+        # the only copy of the data: gathering the windows into a contiguous array for this batch
+        batch_feats = np.ascontiguousarray(self._windows[first_start:last_start])
         assert (
             batch_feats.shape
             == (this_batch_size, self._num_nodes, self._window_size)
             + self._num_sequence_variates
         )
 
-        if has_targets:
-            batch_targets = np.stack(targets)
+        if self._targets is not None:
+            batch_targets = np.ascontiguousarray(self._targets[first_start:last_start])
             assert (
                 batch_targets.shape
                 == (this_batch_size, self._num_nodes) + self._num_sequence_variates
@@ -0,0 +1,305 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Optional instrumentation of the hot paths of StellarGraph, to find where time is spent.
+
+When profiling is enabled, the time taken by each call to an instrumented function is recorded
+against a named "stage", along with the number of bytes of feature data it returned, for stages
+that gather features. Instrumented stages include:
+
+- ``NodeSequence.__getitem__`` and ``LinkSequence.__getitem__`` (a whole batch)
+- the ``sample_features`` method of each generator, such as
+  ``GraphSAGENodeGenerator.sample_features`` (sampling and feature gathering for a batch)
+- the ``run`` method of each walker, such as ``UniformRandomWalk.run``
+- ``extract_element_features`` (feature gathering, used by :meth:`.StellarGraph.node_features`)
+- ``StellarGraph.node_ids_to_ilocs`` (ID conversion)
+
+Stages nest, so the time for a batch includes the time of the sampling and feature gathering done
+for it. Any time not covered by the batch stages is spent in Keras.
+
+Profiling is disabled by default, and the overhead of each instrumented call is then just one extra
+function call. For instance::
+
+    with stellargraph.profiling.profile():
+        model.fit(generator.flow(train_nodes, train_targets), epochs=1)
+
+    print(stellargraph.profiling.summary())
+
+or, per epoch, with the :class:`ProfilingCallback` Keras callback::
+
+    callback = stellargraph.profiling.ProfilingCallback()
+    model.fit(..., callbacks=[callback])
+    callback.history  # a summary for each epoch
+"""
+
+__all__ = [
+    "enable",
+    "disable",
+    "is_enabled",
+    "profile",
+    "reset",
+    "summary",
+    "instrument",
+    "timed",
+    "ProfilingCallback",
+]
+
+import contextlib
+import functools
+import random
+import threading
+import time
+
+import numpy as np
+
+# the number of durations kept for each stage, for computing quantiles
+_RESERVOIR_SIZE = 10000
+
+_enabled = False
+_lock = threading.Lock()
+_stages = {}
+
+
+class _Stage:
+    __slots__ = ("calls", "total_seconds", "max_seconds", "bytes", "durations", "_rng")
+
+    def __init__(self):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes = 0
+        self.durations = []
+        self._rng = random.Random(0)
+
+    def record(self, seconds, num_bytes):
+        self.calls += 1
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes += num_bytes
+
+        # reservoir sampling, so that the quantiles are estimated from a uniform sample of every
+        # call, with bounded memory
+        if len(self.durations) < _RESERVOIR_SIZE:
+            self.durations.append(seconds)
+        else:
+            idx = self._rng.randrange(self.calls)
+            if idx < _RESERVOIR_SIZE:
+                self.durations[idx] = seconds
+
+    def summary(self):
+        p50, p99 = np.percentile(self.durations, [50, 99])
+        return {
+            "calls": self.calls,
+            "total_seconds": self.total_seconds,
+            "mean_seconds": self.total_seconds / self.calls,
+            "p50_seconds": p50,
+            "p99_seconds": p99,
+            "max_seconds": self.max_seconds,
+            "bytes": self.bytes,
+        }
+
+
+def enable():
+    """
+    Enable profiling, so that calls to instrumented functions are recorded.
+    """
+    global _enabled
+    _enabled = True
+
+
+def disable():
+    """
+    Disable profiling. The statistics recorded so far are kept, see :func:`reset`.
+    """
+    global _enabled
+    _enabled = False
+
+
+def is_enabled():
+    """
+    Returns:
+        True if profiling is enabled, False otherwise.
+    """
+    return _enabled
+
+
+def reset():
+    """
+    Discard all recorded statistics.
+    """
+    with _lock:
+        _stages.clear()
+
+
+@contextlib.contextmanager
+def profile(reset_stats=True):
+    """
+    A context manager that enables profiling within its body, and then restores the previous
+    state.
+
+    Args:
+        reset_stats (bool): if True, discard any previously recorded statistics when entering
+    """
+    was_enabled = _enabled
+    if reset_stats:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def summary():
+    """
+    Summarise the recorded statistics for each stage.
+
+    Returns:
+        A dict mapping each stage name to a dict with the number of ``calls``, the
+        ``total_seconds``, ``mean_seconds``, ``p50_seconds`` (median), ``p99_seconds`` and
+        ``max_seconds`` taken by a call, and the total ``bytes`` of feature data returned (0 for
+        stages that don't gather features). The quantiles are estimated from a random sample of
+        up to 10000 calls.
+    """
+    with _lock:
+        return {name: stage.summary() for name, stage in _stages.items()}
+
+
+def _nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (list, tuple)):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def _record(stage, seconds, result, count_bytes):
+    num_bytes = _nbytes(result) if count_bytes else 0
+    with _lock:
+        stats = _stages.get(stage)
+        if stats is None:
+            stats = _stages[stage] = _Stage()
+        stats.record(seconds, num_bytes)
+
+
+def timed(stage, f, *args, count_bytes=False):
+    """
+    Call ``f(*args)``, recording the time it takes against ``stage`` if profiling is enabled.
+
+    Args:
+        stage (str, optional): the name of the stage; if None, the qualified name of ``f`` is used
+        f (callable): the function to call
+        args: the arguments to pass to ``f``
+        count_bytes (bool): if True, also record the total size of the NumPy arrays returned by
+            ``f`` (directly, or in nested lists or tuples)
+
+    Returns:
+        The return value of ``f(*args)``.
+    """
+    if not _enabled:
+        return f(*args)
+
+    start = time.perf_counter()
+    result = f(*args)
+    seconds = time.perf_counter() - start
+
+    if stage is None:
+        stage = getattr(f, "__qualname__", type(f).__name__)
+    _record(stage, seconds, result, count_bytes)
+    return result
+
+
+def instrument(stage=None, count_bytes=False):
+    """
+    A decorator that records the time taken by each call to the decorated function, if profiling
+    is enabled.
+
+    Args:
+        stage (str, optional): the name of the stage; if None, the qualified name of the function
+            is used
+        count_bytes (bool): if True, also record the total size of the NumPy arrays returned by
+            the function (directly, or in nested lists or tuples)
+    """
+
+    def decorator(f):
+        name = f.__qualname__ if stage is None else stage
+
+        @functools.wraps(f)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return f(*args, **kwargs)
+
+            start = time.perf_counter()
+            result = f(*args, **kwargs)
+            _record(name, time.perf_counter() - start, result, count_bytes)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def _profiling_callback_class():
+    # importing TensorFlow is slow, and the rest of this module (which is used by the core graph
+    # code) doesn't need it, so the callback class is only created on first use
+    from tensorflow.keras.callbacks import Callback
+
+    class ProfilingCallback(Callback):
+        """
+        A Keras callback that enables profiling while training, and records a :func:`summary` of
+        each epoch in ``history``. The statistics are reset at the start of training.
+
+        Args:
+            reset_each_epoch (bool): if True, the statistics are also reset at the start of each
+                epoch, so each summary covers only one epoch; if False, they accumulate over the
+                epochs.
+        """
+
+        def __init__(self, reset_each_epoch=True):
+            super().__init__()
+            self.reset_each_epoch = reset_each_epoch
+            self.history = []
+            self._was_enabled = False
+
+        def on_train_begin(self, logs=None):
+            self._was_enabled = is_enabled()
+            reset()
+            enable()
+
+        def on_train_end(self, logs=None):
+            if not self._was_enabled:
+                disable()
+
+        def on_epoch_begin(self, epoch, logs=None):
+            if self.reset_each_epoch:
+                reset()
+
+        def on_epoch_end(self, epoch, logs=None):
+            self.history.append(summary())
+
+    ProfilingCallback.__module__ = __name__
+    return ProfilingCallback
+
+
+def __getattr__(name):
+    if name == "ProfilingCallback":
+        cls = _profiling_callback_class()
+        globals()[name] = cls
+        return cls
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -19,6 +19,8 @@ This contains the utility objects used by the StellarGraph library.
 
 """
 
+from .ann import *
+from .export import *
 from .history import *
 from .version_validation import *
 from . import hyperbolic
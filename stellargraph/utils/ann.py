@@ -0,0 +1,435 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Approximate nearest-neighbour search over node embeddings, using only NumPy and SciPy.
+
+"""
+
+__all__ = ["IVFIndex"]
+
+import numpy as np
+import scipy.sparse as sps
+
+from ..core.validation import require_integer_in_range
+from ..random import random_state
+
+_METRICS = {"euclidean", "inner_product", "cosine"}
+
+
+def _squared_distances(x, centroids, centroid_norms):
+    # ||x - c||² = ||x||² - 2 x·c + ||c||², but the ||x||² is constant for each row of x, and so
+    # doesn't change the nearest centroid
+    return centroid_norms - 2 * x @ centroids.T
+
+
+def _nearest(x, centroids, chunk_size=65536):
+    centroid_norms = (centroids ** 2).sum(axis=1)
+    labels = np.empty(len(x), dtype=np.int64)
+    for start in range(0, len(x), chunk_size):
+        chunk = x[start : start + chunk_size]
+        labels[start : start + chunk_size] = _squared_distances(
+            chunk, centroids, centroid_norms
+        ).argmin(axis=1)
+    return labels
+
+
+def _kmeans(x, num_clusters, num_iterations, np_rs):
+    """
+    Lloyd's algorithm for k-means, initialised with a random sample of the points. Clusters that
+    become empty keep their previous centroid.
+    """
+    centroids = x[np_rs.choice(len(x), size=num_clusters, replace=False)].copy()
+    point_ids = np.arange(len(x))
+
+    for _ in range(num_iterations):
+        labels = _nearest(x, centroids)
+        # a sparse indicator matrix computes all the per-cluster sums in one (fast) product
+        membership = sps.csr_matrix(
+            (np.ones(len(x)), (labels, point_ids)), shape=(num_clusters, len(x))
+        )
+        counts = np.bincount(labels, minlength=num_clusters)
+        non_empty = counts > 0
+        sums = membership @ x
+        new_centroids = centroids.copy()
+        new_centroids[non_empty] = sums[non_empty] / counts[non_empty, None]
+
+        if np.allclose(new_centroids, centroids):
+            centroids = new_centroids
+            break
+        centroids = new_centroids
+
+    return centroids
+
+
+class IVFIndex:
+    """
+    An approximate nearest-neighbour index over vectors such as node embeddings, using an inverted
+    file (IVF) with k-means coarse quantisation, and optional product quantisation (PQ) [1].
+
+    The vectors are clustered with k-means into ``num_lists`` lists, and a query only looks at the
+    vectors in the ``num_probes`` lists with the closest centroids, instead of every vector. With
+    product quantisation, each vector is further compressed by splitting its difference from its
+    list's centroid into ``num_subquantizers`` pieces and replacing each piece with the index of
+    the nearest of ``num_codes`` learned codewords, so that a vector takes ``num_subquantizers``
+    bytes instead of ``4 × dimension`` or ``8 × dimension`` bytes. Distances to compressed vectors
+    are computed with a lookup table for each query, without decompressing them.
+
+    The index is built from a 2D array of vectors, typically the output of ``predict`` on the
+    embedding model of an algorithm like :class:`.GraphSAGE`, :class:`.Node2Vec`,
+    :class:`.Attri2Vec`, :class:`.DeepGraphInfomax` or :class:`.WatchYourStep`::
+
+        embedding_model = Model(inputs=x_inp, outputs=x_out)
+        embeddings = embedding_model.predict(generator.flow(G.nodes()))
+
+        index = IVFIndex(embeddings, ids=G.nodes(), num_lists=1024, num_subquantizers=16)
+        neighbours, distances = index.search(embeddings[:10], k=5)
+
+    [1] H. Jégou, M. Douze, and C. Schmid, “Product Quantization for Nearest Neighbor Search,” IEEE
+    TPAMI, 2011.
+
+    Args:
+        embeddings (array): a 2D array of shape ``number of vectors × dimension``
+        ids (iterable, optional): an identifier for each vector (such as node IDs), returned by
+            :meth:`search`. If not specified, the row number of each vector is used.
+        num_lists (int, optional): the number of k-means clusters (inverted lists). Defaults to
+            the square root of the number of vectors.
+        num_subquantizers (int, optional): if specified, vectors are stored with product
+            quantisation, split into this many pieces, which must divide the dimension evenly. If
+            not specified, vectors are stored exactly.
+        num_codes (int): the number of codewords for each piece with product quantisation
+        metric (str): the similarity to search by: ``"euclidean"`` (nearest by Euclidean distance),
+            ``"inner_product"`` (largest dot product) or ``"cosine"`` (largest cosine similarity).
+        num_iterations (int): the maximum number of k-means iterations used for each quantiser
+        training_size (int, optional): the number of vectors, chosen at random, used to train the
+            quantisers. Defaults to ``256`` times the number of clusters of the largest quantiser,
+            which is enough for good clusters without spending time on every vector when there are
+            many.
+        seed (int, optional): a random seed for choosing the training vectors and initial centroids
+    """
+
+    def __init__(
+        self,
+        embeddings,
+        ids=None,
+        num_lists=None,
+        num_subquantizers=None,
+        num_codes=256,
+        metric="euclidean",
+        num_iterations=20,
+        training_size=None,
+        seed=None,
+    ):
+        embeddings = np.asarray(embeddings)
+        if embeddings.ndim != 2:
+            raise ValueError(
+                f"embeddings: expected a 2D array, found array with shape {embeddings.shape}"
+            )
+
+        num_vectors, dimension = embeddings.shape
+        if num_vectors == 0:
+            raise ValueError("embeddings: expected at least one vector, found none")
+
+        if metric not in _METRICS:
+            raise ValueError(
+                f"metric: expected one of {sorted(_METRICS)}, found {metric!r}"
+            )
+
+        if num_lists is None:
+            num_lists = max(1, int(np.sqrt(num_vectors)))
+        require_integer_in_range(num_lists, "num_lists", min_val=1, max_val=num_vectors)
+        require_integer_in_range(num_codes, "num_codes", min_val=1, max_val=2 ** 16)
+        require_integer_in_range(num_iterations, "num_iterations", min_val=1)
+
+        if num_subquantizers is not None:
+            require_integer_in_range(
+                num_subquantizers, "num_subquantizers", min_val=1, max_val=dimension
+            )
+            if dimension % num_subquantizers != 0:
+                raise ValueError(
+                    f"num_subquantizers: expected a divisor of the embedding dimension ({dimension}), found {num_subquantizers}"
+                )
+
+        if ids is None:
+            ids = np.arange(num_vectors)
+        else:
+            ids = np.asarray(ids)
+            if ids.shape != (num_vectors,):
+                raise ValueError(
+                    f"ids: expected one ID for each of the {num_vectors} vectors, found shape {ids.shape}"
+                )
+
+        self.metric = metric
+        self.num_lists = num_lists
+        self.num_subquantizers = num_subquantizers
+        self.num_codes = num_codes
+
+        dtype = np.result_type(embeddings.dtype, np.float32)
+        embeddings = embeddings.astype(dtype, copy=False)
+        if metric == "cosine":
+            embeddings = self._normalize(embeddings)
+
+        largest_quantizer = (
+            num_lists if num_subquantizers is None else max(num_lists, num_codes)
+        )
+        if training_size is None:
+            training_size = 256 * largest_quantizer
+        require_integer_in_range(training_size, "training_size", min_val=num_lists)
+
+        _, np_rs = random_state(seed)
+        if training_size < num_vectors:
+            training = embeddings[
+                np.sort(np_rs.choice(num_vectors, size=training_size, replace=False))
+            ]
+        else:
+            training = embeddings
+
+        self.centroids = _kmeans(training, num_lists, num_iterations, np_rs)
+
+        # store the vectors grouped by list, with offsets[i]:offsets[i + 1] being list i
+        labels = _nearest(embeddings, self.centroids)
+        order = np.argsort(labels, kind="stable")
+        self._offsets = np.concatenate(
+            [[0], np.cumsum(np.bincount(labels, minlength=num_lists))]
+        )
+        self._ids = ids[order]
+        vectors = embeddings[order]
+
+        if num_subquantizers is None:
+            self._vectors = vectors
+            self._codebooks = self._codes = None
+        else:
+            self._vectors = None
+            residuals = vectors - self.centroids[labels[order]]
+            training_residuals = (
+                training - self.centroids[_nearest(training, self.centroids)]
+            )
+            self._train_product_quantizer(
+                training_residuals, residuals, num_iterations, np_rs
+            )
+
+    def __len__(self):
+        return len(self._ids)
+
+    @staticmethod
+    def _normalize(x):
+        norms = np.linalg.norm(x, axis=-1, keepdims=True)
+        return x / np.where(norms == 0, 1, norms)
+
+    def _train_product_quantizer(self, training, residuals, num_iterations, np_rs):
+        num_sub = self.num_subquantizers
+        sub_dim = residuals.shape[1] // num_sub
+        num_codes = min(self.num_codes, len(training))
+
+        # (num_sub, num_codes, sub_dim)
+        self._codebooks = np.stack(
+            [
+                _kmeans(
+                    np.ascontiguousarray(training[:, m * sub_dim : (m + 1) * sub_dim]),
+                    num_codes,
+                    num_iterations,
+                    np_rs,
+                )
+                for m in range(num_sub)
+            ]
+        )
+
+        code_dtype = np.uint8 if num_codes <= 2 ** 8 else np.uint16
+        self._codes = np.empty((len(residuals), num_sub), dtype=code_dtype)
+        for m in range(num_sub):
+            self._codes[:, m] = _nearest(
+                residuals[:, m * sub_dim : (m + 1) * sub_dim], self._codebooks[m]
+            )
+
+    def _list_costs(self, queries, list_idx):
+        """
+        The cost (smaller is better) of each of the vectors in the list ``list_idx`` for each of
+        the queries, as an array of shape ``number of queries × list size``.
+        """
+        start, end = self._offsets[list_idx], self._offsets[list_idx + 1]
+        centroid = self.centroids[list_idx]
+        euclidean = self.metric == "euclidean"
+
+        if self._codes is None:
+            vectors = self._vectors[start:end]
+            products = queries @ vectors.T
+            if euclidean:
+                return (vectors ** 2).sum(axis=1) - 2 * products
+            return -products
+
+        # asymmetric distance computation: the query is compared exactly to the codewords, via a
+        # table of shape (number of queries, num_subquantizers, num_codes)
+        num_sub, _, sub_dim = self._codebooks.shape
+        if euclidean:
+            # ||q - c - r||² = ||q - c||² - 2 (q - c)·r + ||r||², where the last two terms come from
+            # the table, and the first is the same for every vector in the list (the ||q||² is
+            # removed, to match the exact costs)
+            residual_queries = (queries - centroid).reshape(
+                len(queries), num_sub, sub_dim
+            )
+            tables = (self._codebooks ** 2).sum(axis=2) - 2 * np.einsum(
+                "qmd,mcd->qmc", residual_queries, self._codebooks
+            )
+            base = ((queries - centroid) ** 2).sum(axis=1) - (queries ** 2).sum(axis=1)
+        else:
+            split_queries = queries.reshape(len(queries), num_sub, sub_dim)
+            tables = -np.einsum("qmd,mcd->qmc", split_queries, self._codebooks)
+            base = -(queries @ centroid)
+
+        codes = self._codes[start:end]
+        costs = tables[:, np.arange(num_sub), codes].sum(axis=2)
+        return costs + base[:, None]
+
+    def search(self, queries, k, num_probes=8, batch_size=1024):
+        """
+        Find the approximate ``k`` nearest neighbours of each query vector.
+
+        The queries are processed ``batch_size`` at a time: each batch is compared to the list
+        centroids, and then, for each list probed by any query in the batch, all the queries
+        probing it are compared to its vectors at once.
+
+        Args:
+            queries (array): a 2D array of query vectors, of shape ``number of queries ×
+                dimension``, or a single 1D query vector
+            k (int): the number of neighbours to find for each query
+            num_probes (int): the number of lists to search for each query; higher values are
+                slower, but more accurate. If this is the number of lists and there's no product
+                quantisation, the search is exact.
+            batch_size (int): the number of queries to process at once
+
+        Returns:
+            A tuple ``(ids, scores)`` of arrays of shape ``number of queries × k`` (or just ``k``,
+            for a 1D query), where row ``i`` holds the IDs of the neighbours of query ``i``, from
+            most to least similar, and their squared Euclidean distance (for ``"euclidean"``) or
+            similarity (for ``"inner_product"`` and ``"cosine"``) to the query. If fewer than ``k``
+            vectors are found, the remaining IDs are ``-1`` (or ``None``, for non-integer IDs) and
+            the scores are ``inf`` (for ``"euclidean"``) or ``-inf``.
+        """
+        require_integer_in_range(k, "k", min_val=1)
+        require_integer_in_range(num_probes, "num_probes", min_val=1)
+        require_integer_in_range(batch_size, "batch_size", min_val=1)
+
+        queries = np.asarray(queries)
+        single = queries.ndim == 1
+        queries = np.atleast_2d(queries)
+        if queries.ndim != 2 or queries.shape[1] != self.centroids.shape[1]:
+            raise ValueError(
+                f"queries: expected an array with shape (number of queries, {self.centroids.shape[1]}), found {queries.shape}"
+            )
+
+        queries = queries.astype(self.centroids.dtype, copy=False)
+        if self.metric == "cosine":
+            queries = self._normalize(queries)
+
+        num_probes = min(num_probes, self.num_lists)
+        positions = np.full((len(queries), k), -1, dtype=np.int64)
+        costs = np.full((len(queries), k), np.inf)
+
+        for batch_start in range(0, len(queries), batch_size):
+            batch = queries[batch_start : batch_start + batch_size]
+            batch_positions, batch_costs = self._search_batch(batch, k, num_probes)
+            positions[batch_start : batch_start + batch_size] = batch_positions
+            costs[batch_start : batch_start + batch_size] = batch_costs
+
+        missing = positions < 0
+        ids = self._ids[np.maximum(positions, 0)]
+        if missing.any():
+            if np.issubdtype(ids.dtype, np.integer):
+                ids[missing] = -1
+            else:
+                ids = ids.astype(object)
+                ids[missing] = None
+
+        if self.metric == "euclidean":
+            # the costs don't include the ||q||² term that's constant for each query
+            scores = costs + (queries ** 2).sum(axis=1)[:, None]
+            scores = np.maximum(scores, 0)
+        else:
+            scores = -costs
+
+        if single:
+            return ids[0], scores[0]
+        return ids, scores
+
+    def _search_batch(self, queries, k, num_probes):
+        # the coarse quantiser chooses the lists to probe; ordering them doesn't matter
+        if self.metric == "euclidean":
+            coarse = _squared_distances(
+                queries, self.centroids, (self.centroids ** 2).sum(axis=1)
+            )
+        else:
+            coarse = -(queries @ self.centroids.T)
+
+        if num_probes < self.num_lists:
+            probes = np.argpartition(coarse, num_probes - 1, axis=1)[:, :num_probes]
+        else:
+            probes = np.broadcast_to(np.arange(self.num_lists), coarse.shape)
+
+        # invert the probes, to find the queries that look at each list
+        query_idx = np.repeat(np.arange(len(queries)), num_probes)
+        list_idx = probes.ravel()
+        order = np.argsort(list_idx, kind="stable")
+        query_idx = query_idx[order]
+        list_idx = list_idx[order]
+        boundaries = np.flatnonzero(np.diff(list_idx)) + 1
+        starts = np.concatenate([[0], boundaries])
+        ends = np.concatenate([boundaries, [len(list_idx)]])
+
+        all_queries = []
+        all_positions = []
+        all_costs = []
+        for start, end in zip(starts, ends):
+            list_i = list_idx[start]
+            list_start, list_end = self._offsets[list_i], self._offsets[list_i + 1]
+            if list_start == list_end:
+                continue
+
+            qs = query_idx[start:end]
+            list_costs = self._list_costs(queries[qs], list_i)
+
+            if list_costs.shape[1] > k:
+                # only the best k of each list could make it into the final results
+                top = np.argpartition(list_costs, k - 1, axis=1)[:, :k]
+                list_costs = np.take_along_axis(list_costs, top, axis=1)
+                list_positions = top + list_start
+            else:
+                list_positions = np.broadcast_to(
+                    np.arange(list_start, list_end), list_costs.shape
+                )
+
+            all_queries.append(np.repeat(qs, list_costs.shape[1]))
+            all_positions.append(list_positions.ravel())
+            all_costs.append(list_costs.ravel())
+
+        positions = np.full((len(queries), k), -1, dtype=np.int64)
+        costs = np.full((len(queries), k), np.inf)
+        if not all_queries:
+            return positions, costs
+
+        cand_queries = np.concatenate(all_queries)
+        cand_positions = np.concatenate(all_positions)
+        cand_costs = np.concatenate(all_costs)
+
+        # sort the candidates by query, then by cost, and keep the first k of each query
+        order = np.lexsort((cand_costs, cand_queries))
+        cand_queries = cand_queries[order]
+        first = np.searchsorted(cand_queries, np.arange(len(queries)))
+        rank = np.arange(len(cand_queries)) - first[cand_queries]
+        keep = rank < k
+
+        positions[cand_queries[keep], rank[keep]] = cand_positions[order][keep]
+        costs[cand_queries[keep], rank[keep]] = cand_costs[order][keep]
+        return positions, costs
@@ -0,0 +1,261 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Computing embeddings for many nodes in chunks, writing them to disk as they're computed.
+
+"""
+
+__all__ = ["export_embeddings", "load_exported_embeddings"]
+
+import hashlib
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from ..core.validation import require_integer_in_range
+
+# bump this when the layout of an export changes
+_EXPORT_VERSION = 1
+
+_MANIFEST = "manifest.json"
+_FORMATS = {"npy", "shards"}
+
+
+def _nodes_fingerprint(node_ids):
+    digest = hashlib.sha256()
+    digest.update(
+        pd.util.hash_pandas_object(pd.Index(node_ids), index=False).values.tobytes()
+    )
+    return digest.hexdigest()
+
+
+def _embeddings_path(directory):
+    return os.path.join(directory, "embeddings.npy")
+
+
+def _shard_path(directory, chunk):
+    return os.path.join(directory, f"embeddings_{chunk:06d}.npy")
+
+
+def _read_manifest(directory):
+    path = os.path.join(directory, _MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_manifest(directory, manifest):
+    # write to the side and move into place atomically, so a crash never leaves a corrupt manifest
+    path = os.path.join(directory, _MANIFEST)
+    with open(path + ".partial", "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".partial", path)
+
+
+def _predict_chunk(model, sequence):
+    # Model.predict_on_batch on each batch keeps only a single batch of model outputs in memory at
+    # once (beyond the chunk being assembled)
+    outputs = []
+    for i in range(len(sequence)):
+        batch = sequence[i]
+        inputs = batch[0] if isinstance(batch, tuple) else batch
+        output = np.asarray(model.predict_on_batch(inputs))
+        # full-batch models have a leading batch dimension of 1
+        outputs.append(output.reshape(-1, output.shape[-1]))
+    return np.concatenate(outputs)
+
+
+def export_embeddings(
+    model,
+    generator,
+    node_ids,
+    directory,
+    chunk_size=100000,
+    format="npy",
+    resume=True,
+    flow_kwargs=None,
+):
+    """
+    Compute the embeddings of ``node_ids`` with ``model`` in chunks, writing each chunk to disk in
+    ``directory`` as it is computed, so that the memory required depends only on ``chunk_size``
+    and not the number of nodes.
+
+    Each chunk of ``chunk_size`` nodes is passed through ``generator.flow`` and the batches of the
+    resulting sequence are run through ``model`` one at a time. The ``directory`` contains a
+    ``manifest.json`` checkpoint that records which chunks have been written, along with the time
+    taken for each, so an export that fails part way through (for instance, by running out of time
+    on a cluster) can be restarted by calling this function again with the same arguments, and
+    only the missing chunks will be computed.
+
+    For instance, with a GraphSAGE embedding model::
+
+        generator = GraphSAGENodeGenerator(G, batch_size=1024, num_samples=[10, 5])
+        embedding_model = Model(inputs=x_inp, outputs=x_out)
+        manifest = export_embeddings(embedding_model, generator, G.nodes(), "embeddings/")
+        embeddings = load_exported_embeddings("embeddings/")
+
+    Args:
+        model: a Keras model that computes the embeddings of the nodes in a batch from
+            ``generator``
+        generator: a StellarGraph node generator, with a ``flow`` method that takes node IDs as
+            its first argument
+        node_ids (iterable): the IDs of the nodes to embed, in the order of the exported rows
+        directory (str): the directory to write to, which is created if it doesn't exist
+        chunk_size (int): the number of nodes to compute and write at a time
+        format (str): how the embeddings are stored: ``"npy"`` writes a single memory-mapped
+            ``embeddings.npy`` file containing every node, and ``"shards"`` writes a separate
+            ``embeddings_NNNNNN.npy`` file for each chunk.
+        resume (bool): if True, continue an existing export in ``directory`` created with the same
+            nodes, ``chunk_size`` and ``format``; if False, start from scratch.
+        flow_kwargs (dict, optional): additional keyword arguments for ``generator.flow``
+
+    Returns:
+        The manifest of the export, as a dict, with the shape and dtype of the embeddings, the
+        chunks that have been written, and throughput metrics: ``"chunk_seconds"`` (the time taken
+        for each chunk), and ``"nodes_per_second"`` (overall).
+    """
+    require_integer_in_range(chunk_size, "chunk_size", min_val=1)
+    if format not in _FORMATS:
+        raise ValueError(
+            f"format: expected one of {sorted(_FORMATS)}, found {format!r}"
+        )
+
+    node_ids = pd.Index(node_ids)
+    num_nodes = len(node_ids)
+    num_chunks = -(-num_nodes // chunk_size)
+    flow_kwargs = {} if flow_kwargs is None else flow_kwargs
+
+    os.makedirs(directory, exist_ok=True)
+
+    settings = {
+        "version": _EXPORT_VERSION,
+        "num_nodes": num_nodes,
+        "chunk_size": chunk_size,
+        "format": format,
+        "nodes_fingerprint": _nodes_fingerprint(node_ids),
+    }
+
+    manifest = _read_manifest(directory) if resume else None
+    if manifest is not None:
+        mismatched = [
+            name for name, value in settings.items() if manifest.get(name) != value
+        ]
+        if mismatched:
+            raise ValueError(
+                f"directory: expected an export with the same settings to resume, found an export with different values for: {', '.join(mismatched)}. Use a new directory, or resume=False to overwrite it"
+            )
+    else:
+        manifest = dict(
+            settings,
+            shape=None,
+            dtype=None,
+            completed_chunks=[],
+            chunk_seconds={},
+            nodes_per_second=None,
+        )
+        _write_manifest(directory, manifest)
+
+    completed = set(manifest["completed_chunks"])
+    output = None
+
+    for chunk in range(num_chunks):
+        if chunk in completed:
+            continue
+
+        start_time = time.perf_counter()
+        start = chunk * chunk_size
+        chunk_ids = node_ids[start : start + chunk_size]
+
+        embeddings = _predict_chunk(model, generator.flow(chunk_ids, **flow_kwargs))
+        if len(embeddings) != len(chunk_ids):
+            raise ValueError(
+                f"model: expected one embedding for each of the {len(chunk_ids)} nodes in the chunk, found {len(embeddings)}"
+            )
+
+        if manifest["shape"] is None:
+            manifest["shape"] = [num_nodes, *embeddings.shape[1:]]
+            manifest["dtype"] = embeddings.dtype.str
+
+        if format == "npy":
+            if output is None:
+                output = np.lib.format.open_memmap(
+                    _embeddings_path(directory),
+                    mode="r+" if completed else "w+",
+                    dtype=np.dtype(manifest["dtype"]),
+                    shape=tuple(manifest["shape"]),
+                )
+            output[start : start + chunk_size] = embeddings
+            output.flush()
+        else:
+            path = _shard_path(directory, chunk)
+            np.save(path + ".partial.npy", embeddings.astype(manifest["dtype"]))
+            os.replace(path + ".partial.npy", path)
+
+        # the chunk is only recorded once it is safely on disk
+        completed.add(chunk)
+        manifest["completed_chunks"] = sorted(completed)
+        manifest["chunk_seconds"][str(chunk)] = time.perf_counter() - start_time
+        total_seconds = sum(manifest["chunk_seconds"].values())
+        manifest["nodes_per_second"] = (
+            min(len(completed) * chunk_size, num_nodes) / total_seconds
+            if total_seconds > 0
+            else None
+        )
+        _write_manifest(directory, manifest)
+
+    del output
+    return manifest
+
+
+def load_exported_embeddings(directory):
+    """
+    Load the embeddings written by :func:`export_embeddings`, memory-mapped, so that they don't
+    need to fit into memory.
+
+    Args:
+        directory (str): the directory of the export
+
+    Returns:
+        For an export with ``format="npy"``, an array with one row per node. For
+        ``format="shards"``, a list of arrays, one for each chunk, in order.
+    """
+    manifest = _read_manifest(directory)
+    if manifest is None:
+        raise ValueError(
+            f"directory: expected an export created by export_embeddings, found no {_MANIFEST} in {directory!r}"
+        )
+
+    num_chunks = -(-manifest["num_nodes"] // manifest["chunk_size"])
+    if len(manifest["completed_chunks"]) != num_chunks:
+        raise ValueError(
+            f"directory: expected a complete export, found {len(manifest['completed_chunks'])} of {num_chunks} chunks written; call export_embeddings again to finish it"
+        )
+
+    if manifest["format"] == "npy":
+        if manifest["shape"] is None:
+            # no nodes, so nothing was written
+            return np.empty((0, 0))
+        return np.load(_embeddings_path(directory), mmap_mode="r")
+
+    return [
+        np.load(_shard_path(directory, chunk), mmap_mode="r")
+        for chunk in range(num_chunks)
+    ]
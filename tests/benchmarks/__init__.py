@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Benchmarks of graph construction and queries, walkers and generators, on synthetic power-law graphs
+with 10⁴ to 10⁷ edges (see ``tests/test_utils/benchmark_graphs.py``).
+
+Each operation has a time benchmark and a peak memory benchmark (``..._peak``, using
+``tests/test_utils/alloc.py``), and operations that create a long-lived object also have a size
+benchmark (``..._size``). The size of the graph is stored in the ``extra_info`` of each result.
+
+Only the 10⁴ graphs are used by default. To run all sizes, and save machine-readable results to
+compare later runs against, for instance::
+
+    STELLARGRAPH_BENCHMARK_MAX_EDGES=10000000 py.test tests/benchmarks --benchmark-json=results.json
+    py.test tests/benchmarks --benchmark-autosave
+    py.test tests/benchmarks --benchmark-compare --benchmark-compare-fail=mean:10%
+"""
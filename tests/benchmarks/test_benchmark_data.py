@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from stellargraph.data import (
+    BiasedRandomWalk,
+    DirectedBreadthFirstNeighbours,
+    EdgeSplitter,
+    SampledBreadthFirstWalk,
+    SampledHeterogeneousBreadthFirstWalk,
+    TemporalRandomWalk,
+    UniformRandomMetaPathWalk,
+    UniformRandomWalk,
+)
+from ..test_utils.alloc import peak, allocation_benchmark
+from ..test_utils.benchmark_graphs import (
+    benchmark_sizes,
+    power_law_graph,
+    record_graph_info,
+)
+
+SIZES = benchmark_sizes()
+NUM_ROOTS = 500
+WALKERS = [
+    "uniform",
+    "biased",
+    "metapath",
+    "breadth_first",
+    "heterogeneous_breadth_first",
+    "directed_breadth_first",
+    "temporal",
+]
+
+
+def _walker_graph(name, num_edges):
+    if name in ("metapath", "heterogeneous_breadth_first"):
+        return power_law_graph(num_edges, num_node_types=3, num_edge_types=3)
+    if name == "directed_breadth_first":
+        return power_law_graph(num_edges, is_directed=True)
+    if name in ("biased", "temporal"):
+        return power_law_graph(num_edges, temporal=True)
+    return power_law_graph(num_edges)
+
+
+def _walk_function(name, graph, roots):
+    # each walker does a similar amount of work, independent of the size of the graph
+    if name == "uniform":
+        walker = UniformRandomWalk(graph, n=2, length=10, seed=0)
+        return lambda: walker.run(roots)
+    if name == "biased":
+        walker = BiasedRandomWalk(
+            graph, n=2, length=10, p=0.5, q=2.0, weighted=True, seed=0
+        )
+        return lambda: walker.run(roots)
+    if name == "metapath":
+        walker = UniformRandomMetaPathWalk(
+            graph,
+            n=2,
+            length=10,
+            metapaths=[["n0", "n1", "n0"], ["n1", "n2", "n1"], ["n2", "n0", "n2"]],
+            seed=0,
+        )
+        return lambda: walker.run(roots)
+    if name == "breadth_first":
+        walker = SampledBreadthFirstWalk(graph, seed=0)
+        return lambda: walker.run(roots, n_size=[10, 5], n=2)
+    if name == "heterogeneous_breadth_first":
+        # this samples for every edge type out of each node type, so it's smaller to compensate
+        walker = SampledHeterogeneousBreadthFirstWalk(graph, seed=0)
+        return lambda: walker.run(roots, n_size=[3, 2], n=1)
+    if name == "directed_breadth_first":
+        walker = DirectedBreadthFirstNeighbours(graph, seed=0)
+        return lambda: walker.run(roots, in_size=[5, 2], out_size=[5, 2], n=2)
+    if name == "temporal":
+        walker = TemporalRandomWalk(
+            graph, cw_size=3, max_walk_length=10, p_walk_success_threshold=0, seed=0
+        )
+        return lambda: walker.run(num_cw=2 * NUM_ROOTS)
+
+    raise ValueError(f"unknown walker: {name}")
+
+
+def _run_walker(benchmark, benchmarker, num_edges, name):
+    graph = _walker_graph(name, num_edges)
+    record_graph_info(benchmark, graph)
+    rs = np.random.RandomState(0)
+    roots = list(rs.choice(graph.nodes(), size=NUM_ROOTS))
+
+    f = _walk_function(name, graph, roots)
+    # the graph's adjacency lists are created lazily on first use, which isn't what's being measured
+    f()
+    benchmarker(f)
+
+
+@pytest.mark.benchmark(group="walkers (time)")
+@pytest.mark.parametrize("name", WALKERS)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_walker(benchmark, num_edges, name):
+    _run_walker(benchmark, benchmark, num_edges, name)
+
+
+@pytest.mark.benchmark(group="walkers (peak)", timer=peak)
+@pytest.mark.parametrize("name", WALKERS)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_walker_peak(benchmark, allocation_benchmark, num_edges, name):
+    _run_walker(benchmark, allocation_benchmark, num_edges, name)
+
+
+def _run_edge_splitter(benchmark, benchmarker, num_edges, method):
+    graph = power_law_graph(num_edges, num_node_types=3, num_edge_types=3)
+    record_graph_info(benchmark, graph)
+
+    def f():
+        return EdgeSplitter(graph).train_test_split(p=0.1, method=method, seed=0)
+
+    benchmarker(f)
+
+
+@pytest.mark.benchmark(group="EdgeSplitter (time)")
+@pytest.mark.parametrize("method", ["global", "local"])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_edge_splitter(benchmark, num_edges, method):
+    _run_edge_splitter(benchmark, benchmark, num_edges, method)
+
+
+@pytest.mark.benchmark(group="EdgeSplitter (peak)", timer=peak)
+@pytest.mark.parametrize("method", ["global", "local"])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_edge_splitter_peak(
+    benchmark, allocation_benchmark, num_edges, method
+):
+    _run_edge_splitter(benchmark, allocation_benchmark, num_edges, method)
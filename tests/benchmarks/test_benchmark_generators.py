@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from stellargraph.mapper import (
+    ClusterNodeGenerator,
+    GraphSAGENodeGenerator,
+    HinSAGENodeGenerator,
+)
+from ..test_utils.alloc import peak, allocation_benchmark
+from ..test_utils.benchmark_graphs import (
+    benchmark_sizes,
+    power_law_graph,
+    record_graph_info,
+)
+
+SIZES = benchmark_sizes()
+BATCH_SIZE = 64
+NUM_BATCHES = 10
+GENERATORS = ["graphsage", "hinsage", "cluster_gcn"]
+
+
+def _sequence(name, num_edges):
+    rs = np.random.RandomState(0)
+
+    if name == "hinsage":
+        graph = power_law_graph(
+            num_edges, num_node_types=3, num_edge_types=3, feature_size=16
+        )
+        nodes = rs.choice(graph.nodes(node_type="n0"), size=BATCH_SIZE * NUM_BATCHES)
+        generator = HinSAGENodeGenerator(
+            graph, BATCH_SIZE, num_samples=[3, 2], head_node_type="n0", seed=0
+        )
+        return graph, generator.flow(nodes)
+
+    graph = power_law_graph(num_edges, feature_size=16)
+    nodes = rs.choice(graph.nodes(), size=BATCH_SIZE * NUM_BATCHES)
+
+    if name == "graphsage":
+        generator = GraphSAGENodeGenerator(
+            graph, BATCH_SIZE, num_samples=[10, 5], seed=0
+        )
+        return graph, generator.flow(nodes)
+
+    if name == "cluster_gcn":
+        # clusters of about BATCH_SIZE nodes, with NUM_BATCHES batches of 'q' clusters each (the
+        # number of clusters must be divisible by 'q')
+        q = max(graph.number_of_nodes() // (BATCH_SIZE * NUM_BATCHES), 1)
+        generator = ClusterNodeGenerator(graph, clusters=q * NUM_BATCHES, q=q)
+        return graph, generator.flow(graph.nodes())
+
+    raise ValueError(f"unknown generator: {name}")
+
+
+def _run_batches(benchmark, benchmarker, num_edges, name):
+    graph, sequence = _sequence(name, num_edges)
+    record_graph_info(benchmark, graph)
+    num_batches = min(len(sequence), NUM_BATCHES)
+
+    def f():
+        for i in range(num_batches):
+            sequence[i]
+
+    # the graph's adjacency lists are created lazily on first use, which isn't what's being measured
+    f()
+    benchmarker(f)
+
+
+@pytest.mark.benchmark(group="generator batches (time)")
+@pytest.mark.parametrize("name", GENERATORS)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_batches(benchmark, num_edges, name):
+    _run_batches(benchmark, benchmark, num_edges, name)
+
+
+@pytest.mark.benchmark(group="generator batches (peak)", timer=peak)
+@pytest.mark.parametrize("name", GENERATORS)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_batches_peak(benchmark, allocation_benchmark, num_edges, name):
+    _run_batches(benchmark, allocation_benchmark, num_edges, name)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stellargraph import StellarGraph
+from ..test_utils.alloc import snapshot, peak, allocation_benchmark
+from ..test_utils.benchmark_graphs import (
+    benchmark_sizes,
+    power_law_graph,
+    power_law_graph_data,
+    record_graph_info,
+)
+
+SIZES = benchmark_sizes()
+# (num_node_types, num_edge_types)
+TYPES = [(1, 1), (3, 5)]
+# StellarGraph.from_arrays only supports a single node type
+ARRAY_TYPES = [(1, 1), (1, 5)]
+
+
+def _run_creation(benchmark, benchmarker, num_edges, types, from_arrays=False):
+    num_node_types, num_edge_types = types
+    nodes, edges = power_law_graph_data(
+        num_edges, num_node_types, num_edge_types, feature_size=16
+    )
+
+    if from_arrays:
+        # the single node type has IDs 0, 1, ..., in order
+        features = nodes["n0"].values
+        sources = edges["source"].to_numpy()
+        targets = edges["target"].to_numpy()
+        edge_types = edges["label"].array
+
+        def f():
+            return StellarGraph.from_arrays(
+                sources, targets, edge_types=edge_types, node_features=features
+            )
+
+    else:
+
+        def f():
+            return StellarGraph(nodes, edges, edge_type_column="label")
+
+    record_graph_info(benchmark, f())
+    benchmarker(f)
+
+
+@pytest.mark.benchmark(group="StellarGraph creation (time)")
+@pytest.mark.parametrize("types", TYPES)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_creation(benchmark, num_edges, types):
+    _run_creation(benchmark, benchmark, num_edges, types)
+
+
+@pytest.mark.benchmark(group="StellarGraph creation (size)", timer=snapshot)
+@pytest.mark.parametrize("types", TYPES)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_creation_size(benchmark, allocation_benchmark, num_edges, types):
+    _run_creation(benchmark, allocation_benchmark, num_edges, types)
+
+
+@pytest.mark.benchmark(group="StellarGraph creation (peak)", timer=peak)
+@pytest.mark.parametrize("types", TYPES)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_creation_peak(benchmark, allocation_benchmark, num_edges, types):
+    _run_creation(benchmark, allocation_benchmark, num_edges, types)
+
+
+@pytest.mark.benchmark(group="StellarGraph creation (time)")
+@pytest.mark.parametrize("types", ARRAY_TYPES)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_creation_from_arrays(benchmark, num_edges, types):
+    _run_creation(benchmark, benchmark, num_edges, types, from_arrays=True)
+
+
+@pytest.mark.benchmark(group="StellarGraph creation (peak)", timer=peak)
+@pytest.mark.parametrize("types", ARRAY_TYPES)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_creation_from_arrays_peak(
+    benchmark, allocation_benchmark, num_edges, types
+):
+    _run_creation(benchmark, allocation_benchmark, num_edges, types, from_arrays=True)
+
+
+def _run_creation_from_csv(benchmark, benchmarker, tmpdir, num_edges, streaming):
+    _, edges = power_law_graph_data(num_edges, num_edge_types=5)
+    # string IDs, as is typical for files
+    edges["source"] = "n" + edges["source"].astype(str)
+    edges["target"] = "n" + edges["target"].astype(str)
+    path = str(tmpdir.join("edges.csv"))
+    edges.to_csv(path, index=False)
+
+    if streaming:
+
+        def f():
+            return StellarGraph.from_files(
+                path, edge_type_column="label", chunk_size=max(num_edges // 10, 1)
+            )
+
+    else:
+
+        def f():
+            return StellarGraph(edges=pd.read_csv(path), edge_type_column="label")
+
+    record_graph_info(benchmark, f())
+    benchmarker(f)
+
+
+@pytest.mark.benchmark(group="StellarGraph creation from CSV (time)")
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_creation_from_csv(benchmark, tmpdir, num_edges, streaming):
+    _run_creation_from_csv(benchmark, benchmark, tmpdir, num_edges, streaming)
+
+
+@pytest.mark.benchmark(group="StellarGraph creation from CSV (peak)", timer=peak)
+@pytest.mark.parametrize("streaming", [False, True])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_creation_from_csv_peak(
+    benchmark, allocation_benchmark, tmpdir, num_edges, streaming
+):
+    _run_creation_from_csv(
+        benchmark, allocation_benchmark, tmpdir, num_edges, streaming
+    )
+
+
+def _run_neighbor_arrays(benchmark, benchmarker, num_edges, use_ilocs):
+    graph = power_law_graph(num_edges)
+    record_graph_info(benchmark, graph)
+    # a fixed number of queries, so that times are comparable between sizes
+    ilocs = np.random.RandomState(0).randint(graph.number_of_nodes(), size=1000)
+    nodes = ilocs if use_ilocs else graph.node_ilocs_to_ids(ilocs)
+
+    # the adjacency lists are created lazily on first use, which isn't what's being measured
+    graph.neighbor_arrays(nodes[0], use_ilocs=use_ilocs)
+
+    def f():
+        for node in nodes:
+            graph.neighbor_arrays(node, use_ilocs=use_ilocs)
+
+    benchmarker(f)
+
+
+@pytest.mark.benchmark(group="StellarGraph neighbor_arrays (time)")
+@pytest.mark.parametrize("use_ilocs", [False, True])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_neighbor_arrays(benchmark, num_edges, use_ilocs):
+    _run_neighbor_arrays(benchmark, benchmark, num_edges, use_ilocs)
+
+
+@pytest.mark.benchmark(group="StellarGraph neighbor_arrays (peak)", timer=peak)
+@pytest.mark.parametrize("use_ilocs", [False, True])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_neighbor_arrays_peak(
+    benchmark, allocation_benchmark, num_edges, use_ilocs
+):
+    _run_neighbor_arrays(benchmark, allocation_benchmark, num_edges, use_ilocs)
+
+
+def _run_to_adjacency_matrix(benchmark, benchmarker, num_edges, weighted):
+    graph = power_law_graph(num_edges, temporal=True)
+    record_graph_info(benchmark, graph)
+
+    def f():
+        return graph.to_adjacency_matrix(weighted=weighted)
+
+    benchmarker(f)
+
+
+@pytest.mark.benchmark(group="StellarGraph to_adjacency_matrix (time)")
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_to_adjacency_matrix(benchmark, num_edges, weighted):
+    _run_to_adjacency_matrix(benchmark, benchmark, num_edges, weighted)
+
+
+@pytest.mark.benchmark(group="StellarGraph to_adjacency_matrix (size)", timer=snapshot)
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_to_adjacency_matrix_size(
+    benchmark, allocation_benchmark, num_edges, weighted
+):
+    _run_to_adjacency_matrix(benchmark, allocation_benchmark, num_edges, weighted)
+
+
+@pytest.mark.benchmark(group="StellarGraph to_adjacency_matrix (peak)", timer=peak)
+@pytest.mark.parametrize("weighted", [False, True])
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_to_adjacency_matrix_peak(
+    benchmark, allocation_benchmark, num_edges, weighted
+):
+    _run_to_adjacency_matrix(benchmark, allocation_benchmark, num_edges, weighted)
+
+
+def _run_subgraph(benchmark, benchmarker, num_edges, types):
+    num_node_types, num_edge_types = types
+    graph = power_law_graph(
+        num_edges,
+        num_node_types=num_node_types,
+        num_edge_types=num_edge_types,
+        feature_size=16,
+    )
+    record_graph_info(benchmark, graph)
+    # a 10% sample of the nodes
+    rs = np.random.RandomState(0)
+    nodes = rs.choice(graph.nodes(), size=graph.number_of_nodes() // 10, replace=False)
+
+    def f():
+        return graph.subgraph(nodes)
+
+    benchmarker(f)
+
+
+@pytest.mark.benchmark(group="StellarGraph subgraph (time)")
+@pytest.mark.parametrize("types", TYPES)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_subgraph(benchmark, num_edges, types):
+    _run_subgraph(benchmark, benchmark, num_edges, types)
+
+
+@pytest.mark.benchmark(group="StellarGraph subgraph (size)", timer=snapshot)
+@pytest.mark.parametrize("types", TYPES)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_subgraph_size(benchmark, allocation_benchmark, num_edges, types):
+    _run_subgraph(benchmark, allocation_benchmark, num_edges, types)
+
+
+@pytest.mark.benchmark(group="StellarGraph subgraph (peak)", timer=peak)
+@pytest.mark.parametrize("types", TYPES)
+@pytest.mark.parametrize("num_edges", SIZES)
+def test_benchmark_subgraph_peak(benchmark, allocation_benchmark, num_edges, types):
+    _run_subgraph(benchmark, allocation_benchmark, num_edges, types)
@@ -16,7 +16,8 @@
 
 import pytest
 import numpy as np
-from stellargraph.core.element_data import ExternalIdIndex
+import pandas as pd
+from stellargraph.core.element_data import ExternalIdIndex, NodeData
 
 
 @pytest.mark.parametrize(
@@ -42,6 +43,45 @@ def test_external_id_index_to_iloc(count, expected_missing):
     assert idx.to_iloc(["A"]) == expected_missing
 
 
+@pytest.mark.parametrize("ids", [pd.RangeIndex(5), np.arange(5), [1, 0, 2, 3, 4]])
+def test_external_id_index_integers(ids):
+    idx = ExternalIdIndex(ids)
+    expected = list(ids)
+
+    np.testing.assert_array_equal(idx.to_iloc(expected), range(5))
+    np.testing.assert_array_equal(
+        idx.to_iloc([3, 5, -1]), [expected.index(3), 255, 255]
+    )
+    np.testing.assert_array_equal(idx.to_iloc(["a"]), [255])
+    np.testing.assert_array_equal(
+        idx.to_iloc(np.array([4], dtype=np.uint64)), [expected.index(4)]
+    )
+    np.testing.assert_array_equal(idx.from_iloc([4, 0]), [expected[4], expected[0]])
+    assert idx.from_iloc(1) == expected[1]
+    np.testing.assert_array_equal(idx.from_iloc(-1), expected[-1])
+    np.testing.assert_array_equal(
+        idx.from_iloc(np.array([True, False, False, False, True])),
+        [expected[0], expected[4]],
+    )
+    assert 4 in idx.pandas_index
+    assert idx.contains_external(0)
+    assert not idx.contains_external(5)
+
+    with pytest.raises(KeyError, match="5"):
+        idx.to_iloc([0, 5], strict=True)
+
+
+def test_external_id_index_verify_unique():
+    with pytest.raises(
+        ValueError,
+        match="expected IDs to appear once, found some that appeared more: 1",
+    ):
+        ExternalIdIndex([0, 1, 1])
+
+    # the caller promises that they're unique
+    ExternalIdIndex([0, 1, 1], verify_unique=False)
+
+
 def test_benchmark_external_id_index_from_iloc(benchmark):
     N = 1000
     SIZE = 100
@@ -52,3 +92,33 @@ def test_benchmark_external_id_index_from_iloc(benchmark):
         idx.from_iloc(x)
 
     benchmark(f)
+
+
+@pytest.mark.parametrize("memmap", [False, True])
+def test_element_data_features_memmap(tmpdir, memmap):
+    values = np.arange(30, dtype=np.float32).reshape(10, 3)
+    if memmap:
+        path = str(tmpdir.join("features.npy"))
+        np.save(path, values)
+        features = np.load(path, mmap_mode="r")
+        assert isinstance(features, np.memmap)
+    else:
+        features = values
+
+    nodes = NodeData(list("abcdefghij"), [("x", features[:4]), ("y", features[4:])])
+
+    # features of the whole type aren't copied
+    assert np.shares_memory(nodes.features_of_type("x"), features)
+
+    # unsorted and duplicated ilocs
+    ilocs = np.array([9, 4, 7, 4, 5])
+    gathered = nodes.features("y", ilocs)
+    assert type(gathered) is np.ndarray
+    np.testing.assert_array_equal(gathered, values[ilocs])
+
+    np.testing.assert_array_equal(
+        nodes.features("x", np.array([], dtype=int)), values[:0]
+    )
+
+    with pytest.raises(ValueError, match="unknown IDs"):
+        nodes.features("x", np.array([5]))
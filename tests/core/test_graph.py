@@ -19,8 +19,9 @@ import numpy as np
 import pandas as pd
 import pytest
 import random
+import scipy.sparse as sps
 from stellargraph.core.graph import *
-from stellargraph.core.indexed_array import IndexedArray
+from stellargraph.core.indexed_array import IndexedArray, QuantizedIndexedArray
 from stellargraph.core.experimental import ExperimentalWarning
 from ..test_utils.alloc import snapshot, peak, allocation_benchmark
 from ..test_utils.graphs import (
@@ -264,6 +265,110 @@ def test_graph_constructor_internal():
             StellarGraph(orig._nodes, orig._edges, **{param: object()})
 
 
+@pytest.mark.parametrize("is_directed", [False, True])
+@pytest.mark.parametrize("types_kind", [None, "categorical", "numpy", "sorted"])
+def test_from_arrays(is_directed, types_kind):
+    sources = np.array([0, 1, 2, 3, 4, 0])
+    targets = np.array([1, 2, 3, 4, 0, 0])
+    weights = np.array([1.0, 2.0, 3.0, 4.0, 5.0, 6.0])
+    types = np.array(["b", "a", "b", "a", "b", "c"])
+    if types_kind == "sorted":
+        types = np.sort(types)
+    edges = pd.DataFrame(
+        {"source": sources, "target": targets, "weight": weights, "label": types}
+    )
+
+    if types_kind is None:
+        edge_types = None
+        edges = edges.drop(columns="label")
+    elif types_kind == "categorical":
+        # an unused category shouldn't appear as a type
+        edge_types = pd.Categorical(types, categories=["c", "z", "b", "a"])
+    else:
+        edge_types = types
+
+    features = np.arange(10, dtype=np.float32).reshape(5, 2)
+    g = StellarGraph.from_arrays(
+        sources,
+        targets,
+        weights=weights,
+        edge_types=edge_types,
+        node_features=features,
+        is_directed=is_directed,
+    )
+
+    cls = StellarDiGraph if is_directed else StellarGraph
+    expected = cls(
+        pd.DataFrame(features, index=range(5)),
+        edges,
+        edge_type_column=None if types_kind is None else "label",
+    )
+
+    assert isinstance(g, cls)
+    assert g.is_directed() == is_directed
+    assert list(g.nodes()) == [0, 1, 2, 3, 4]
+    assert list(g.edge_types) == list(expected.edge_types)
+    edges, weights = g.edges(include_edge_type=True, include_edge_weight=True)
+    expected_edges, expected_weights = expected.edges(
+        include_edge_type=True, include_edge_weight=True
+    )
+    assert edges == expected_edges
+    np.testing.assert_array_equal(weights, expected_weights)
+    np.testing.assert_array_equal(g.node_features([4, 0]), features[[4, 0]])
+    assert g.node_degrees() == expected.node_degrees()
+    for node in range(5):
+        assert g.neighbors(node, include_edge_weight=True) == expected.neighbors(
+            node, include_edge_weight=True
+        )
+
+    np.testing.assert_array_equal(g.node_ids_to_ilocs([3, 0]), [3, 0])
+    with pytest.raises(KeyError, match="5"):
+        g.node_ids_to_ilocs([5])
+
+
+def test_from_arrays_defaults():
+    g = StellarGraph.from_arrays(pd.Series([0, 3]), [3, 2])
+    assert list(g.nodes()) == [0, 1, 2, 3]
+    edges, weights = g.edges(include_edge_type=True, include_edge_weight=True)
+    assert edges == [(0, 3, "default"), (3, 2, "default")]
+    np.testing.assert_array_equal(weights, [1.0, 1.0])
+    assert g.node_feature_sizes() == {"default": 0}
+
+    g = StellarGraph.from_arrays([0], [1], number_of_nodes=10)
+    assert g.number_of_nodes() == 10
+
+    g = StellarGraph.from_arrays(np.array([], dtype=int), np.array([], dtype=int))
+    assert g.number_of_nodes() == 0
+    assert g.number_of_edges() == 0
+
+
+def test_from_arrays_invalid():
+    with pytest.raises(TypeError, match="sources: expected integer node IDs"):
+        StellarGraph.from_arrays(["a"], [0])
+
+    with pytest.raises(ValueError, match="targets: expected the same length"):
+        StellarGraph.from_arrays([0, 1], [0])
+
+    with pytest.raises(ValueError, match=r"expected node IDs in the range \[0, 2\)"):
+        StellarGraph.from_arrays([0, 1], [0, 2], number_of_nodes=2)
+
+    with pytest.raises(ValueError, match=r"expected node IDs in the range"):
+        StellarGraph.from_arrays([0, -1], [0, 1])
+
+    with pytest.raises(
+        ValueError, match="type_info: expected features for each of the 3"
+    ):
+        StellarGraph.from_arrays(
+            [0], [1], node_features=np.zeros((2, 4)), number_of_nodes=3
+        )
+
+    with pytest.raises(TypeError, match="weights: expected a numeric array"):
+        StellarGraph.from_arrays([0], [1], weights=["x"])
+
+    with pytest.raises(ValueError, match="edge_types: expected every element"):
+        StellarGraph.from_arrays([0], [1], edge_types=pd.Categorical([None]))
+
+
 @pytest.fixture(params=["IndexedArray", "NumPy"])
 def rowframe_convert(request):
     return IndexedArray if request.param == "IndexedArray" else (lambda arr: arr)
@@ -561,6 +666,83 @@ def test_node_features_node_type_inference():
         many_types.node_features()
 
 
+def test_node_features_memmap(tmpdir):
+    path = str(tmpdir.join("features.npy"))
+    values = np.arange(12, dtype=np.float32).reshape(4, 3)
+    np.save(path, values)
+    features = np.load(path, mmap_mode="r")
+
+    edges = pd.DataFrame({"source": ["a", "b"], "target": ["c", "d"]})
+    sg = StellarGraph(IndexedArray(features, index=list("abcd")), edges)
+
+    # the features of the whole type aren't read into memory
+    assert isinstance(sg.node_features(), np.memmap)
+
+    subset = sg.node_features(["d", "a", "d"])
+    assert type(subset) is np.ndarray
+    np.testing.assert_array_equal(subset, values[[3, 0, 3]])
+
+    with_missing = sg.node_features(["c", None])
+    np.testing.assert_array_equal(with_missing, [values[2], [0, 0, 0]])
+
+
+@pytest.mark.parametrize("storage_dtype", [np.float16, np.uint8])
+def test_node_features_quantized(storage_dtype):
+    values = np.random.rand(4, 3).astype(np.float32)
+    if storage_dtype == np.float16:
+        features = QuantizedIndexedArray(values.astype(np.float16), index=list("abcd"))
+        tolerance = 1e-3
+    else:
+        features = QuantizedIndexedArray.quantize(values, index=list("abcd"))
+        tolerance = 1 / 255
+
+    edges = pd.DataFrame({"source": ["a", "b"], "target": ["c", "d"]})
+    sg = StellarGraph({"n": features}, edges)
+
+    assert sg.node_feature_sizes() == {"n": 3}
+    assert "float32 vector, length 3" in sg.info()
+
+    subset = sg.node_features(["d", "a"])
+    assert subset.dtype == np.float32
+    np.testing.assert_allclose(subset, values[[3, 0]], atol=tolerance)
+
+    np.testing.assert_allclose(sg.node_features(), values, atol=tolerance)
+
+
+@pytest.mark.parametrize("wrap", [False, True])
+def test_node_features_sparse(wrap):
+    values = sps.random(4, 3, density=0.5, format="csr", dtype=np.float32)
+    nodes = IndexedArray(values) if wrap else values
+    edges = pd.DataFrame({"source": [0, 1], "target": [2, 3]})
+    sg = StellarGraph(nodes, edges)
+
+    assert sg.node_feature_sizes() == {"default": 3}
+
+    # features are densified by default
+    all_features = sg.node_features()
+    assert isinstance(all_features, np.ndarray)
+    np.testing.assert_array_equal(all_features, values.toarray())
+
+    subset = sg.node_features([3, 0, None])
+    assert isinstance(subset, np.ndarray)
+    expected_subset = [*values[[3, 0]].toarray(), [0, 0, 0]]
+    np.testing.assert_array_equal(subset, expected_subset)
+
+    # but stay sparse when requested
+    all_features = sg.node_features(sparse=True)
+    assert sps.isspmatrix_csr(all_features)
+    np.testing.assert_array_equal(all_features.toarray(), values.toarray())
+
+    subset = sg.node_features([3, 0, None], sparse=True)
+    assert sps.isspmatrix_csr(subset)
+    np.testing.assert_array_equal(subset.toarray(), expected_subset)
+
+
+def test_node_features_sparse_stored_densely():
+    sg = example_graph(feature_size=3)
+    np.testing.assert_array_equal(sg.node_features(sparse=True), sg.node_features())
+
+
 def test_node_features_missing_id():
     sg = example_graph(feature_size=6)
     with pytest.raises(KeyError, match=r"\[1000, 2000\]"):
@@ -16,8 +16,9 @@
 
 import numpy as np
 import pytest
+import scipy.sparse as sps
 
-from stellargraph import IndexedArray
+from stellargraph import IndexedArray, QuantizedIndexedArray
 
 
 def test_indexed_array_empty():
@@ -51,6 +52,22 @@ def test_indexed_array_non_empty():
     assert frame.values is values
 
 
+def test_indexed_array_sparse():
+    values = sps.random(5, 3, density=0.4, format="coo")
+    frame = IndexedArray(values, index=list("abcde"))
+    assert sps.isspmatrix_csr(frame.values)
+    np.testing.assert_array_equal(frame.values.toarray(), values.toarray())
+
+    # CSR input isn't copied
+    csr = values.tocsr()
+    assert IndexedArray(csr).values is csr
+
+    with pytest.raises(
+        TypeError, match="values: expected a NumPy array for the compact"
+    ):
+        QuantizedIndexedArray(csr)
+
+
 def test_indexed_array_invalid():
     values = np.random.rand(3, 4, 5)
 
@@ -80,3 +97,50 @@ def test_indexed_array_invalid():
         ValueError, match="values: expected the index length 2 .* found 3 rows"
     ):
         IndexedArray(values, index=range(0, 3, 2))
+
+
+def test_quantized_indexed_array_float16():
+    values = np.random.rand(5, 3).astype(np.float16)
+    frame = QuantizedIndexedArray(values, index=list("abcde"))
+    assert frame.values is values
+    assert frame.scale is None
+    assert frame.offset is None
+
+    decoded = frame.decode(values[[3, 1]])
+    assert decoded.dtype == np.float32
+    np.testing.assert_array_equal(decoded, values[[3, 1]].astype(np.float32))
+
+
+@pytest.mark.parametrize("storage_dtype", [np.uint8, np.int8, np.int16])
+def test_quantized_indexed_array_quantize(storage_dtype):
+    values = np.random.normal(size=(100, 4, 2)).astype(np.float32)
+    # a constant column is represented exactly
+    values[:, 1, :] = 1.5
+
+    frame = QuantizedIndexedArray.quantize(values, storage_dtype=storage_dtype)
+    assert frame.index == range(100)
+    assert frame.values.dtype == storage_dtype
+    assert frame.scale.shape == frame.offset.shape == (4, 2)
+
+    info = np.iinfo(storage_dtype)
+    max_error = (values.max(axis=0) - values.min(axis=0)) / (
+        float(info.max) - float(info.min)
+    )
+
+    decoded = frame.decode(frame.values)
+    assert decoded.dtype == np.float32
+    assert (np.abs(decoded - values) <= max_error / 2 + 1e-6).all()
+    np.testing.assert_array_equal(decoded[:, 1, :], 1.5)
+
+
+def test_quantized_indexed_array_invalid():
+    with pytest.raises(TypeError, match="dtype: expected a floating point type"):
+        QuantizedIndexedArray(np.zeros((3, 2), dtype=np.uint8), dtype=np.int32)
+
+    with pytest.raises(
+        ValueError, match=r"scale: .* element \(2,\), found shape \(3,\)"
+    ):
+        QuantizedIndexedArray(np.zeros((3, 2), dtype=np.uint8), scale=[1, 2, 3])
+
+    with pytest.raises(TypeError, match="storage_dtype: expected an integer type"):
+        QuantizedIndexedArray.quantize(np.zeros((3, 2)), storage_dtype=np.float16)
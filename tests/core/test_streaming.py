@@ -0,0 +1,233 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from stellargraph import StellarGraph, StellarDiGraph
+from stellargraph.core import streaming
+from stellargraph.core.streaming import _GrowableArray
+
+
+def _edges():
+    return pd.DataFrame(
+        {
+            "source": ["a", "b", "c", "d", "a", "e", "c"],
+            "target": ["b", "c", "d", "a", "c", "a", "e"],
+            "weight": [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0],
+            "label": ["x", "y", "x", "y", "z", "x", "y"],
+        }
+    )
+
+
+def _nodes():
+    return pd.DataFrame(
+        {"f0": [0, 1, 2, 3, 4], "f1": [5, 6, 7, 8, 9]}, index=list("abcde")
+    )
+
+
+def _chunks(df, size):
+    return (df.iloc[start : start + size] for start in range(0, len(df), size))
+
+
+def _assert_graphs_equal(graph, expected):
+    assert type(graph) == type(expected)
+    assert set(graph.nodes()) == set(expected.nodes())
+    assert graph.node_types == expected.node_types
+    for node_type in expected.node_types:
+        nodes = expected.nodes(node_type=node_type)
+        np.testing.assert_array_equal(
+            graph.node_features(nodes), expected.node_features(nodes)
+        )
+
+    assert list(graph.edge_types) == list(expected.edge_types)
+    edges, weights = graph.edges(include_edge_type=True, include_edge_weight=True)
+    expected_edges, expected_weights = expected.edges(
+        include_edge_type=True, include_edge_weight=True
+    )
+    assert sorted(zip(edges, weights)) == sorted(zip(expected_edges, expected_weights))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 100])
+@pytest.mark.parametrize("with_nodes", [False, True])
+@pytest.mark.parametrize("is_directed", [False, True])
+def test_from_csv_chunks(chunk_size, with_nodes, is_directed):
+    nodes = _nodes() if with_nodes else None
+    graph = StellarGraph.from_csv_chunks(
+        _chunks(_edges(), chunk_size),
+        None if nodes is None else _chunks(nodes, chunk_size),
+        edge_type_column="label",
+        is_directed=is_directed,
+    )
+
+    cls = StellarDiGraph if is_directed else StellarGraph
+    expected = cls(
+        pd.DataFrame(index=list("abcde")) if nodes is None else nodes,
+        _edges(),
+        edge_type_column="label",
+    )
+    _assert_graphs_equal(graph, expected)
+
+    if not with_nodes:
+        # inferred in order of first appearance
+        assert list(graph.nodes()) == ["a", "b", "c", "d", "e"]
+
+
+def test_from_csv_chunks_consolidation(monkeypatch):
+    # consolidate the inferred node IDs after (almost) every chunk
+    monkeypatch.setattr(streaming._IncrementalIdIndex, "MIN_PENDING", 0)
+
+    edges = _edges()
+    graph = StellarGraph.from_csv_chunks(_chunks(edges, 1), edge_type_column="label")
+    assert list(graph.nodes()) == ["a", "b", "c", "d", "e"]
+    _assert_graphs_equal(
+        graph,
+        StellarGraph(
+            pd.DataFrame(index=list("abcde")), edges, edge_type_column="label"
+        ),
+    )
+
+
+def test_from_csv_chunks_defaults():
+    # a single DataFrame works too, and some chunks have weights but others don't
+    edges = _edges().drop(columns="label")
+    chunks = [edges.iloc[:2].drop(columns="weight"), edges.iloc[2:]]
+
+    graph = StellarGraph.from_csv_chunks(chunks, _nodes().iloc[:, :0])
+
+    expected_edges = edges.copy()
+    expected_edges.loc[:1, "weight"] = 1.0
+    _assert_graphs_equal(graph, StellarGraph(_nodes().iloc[:, :0], expected_edges))
+
+    empty = StellarGraph.from_csv_chunks([])
+    assert empty.number_of_nodes() == 0
+    assert empty.number_of_edges() == 0
+
+
+def test_from_csv_chunks_node_types():
+    nodes = _nodes()
+    node_chunks = {
+        "t0": _chunks(nodes.iloc[:2], 1),
+        "t1": [nodes.iloc[2:].drop(columns="f1")],
+    }
+    graph = StellarGraph.from_csv_chunks(_chunks(_edges(), 2), node_chunks)
+
+    expected = StellarGraph(
+        {"t0": nodes.iloc[:2], "t1": nodes.iloc[2:].drop(columns="f1")},
+        _edges().drop(columns="label"),
+    )
+    _assert_graphs_equal(graph, expected)
+
+
+def test_from_csv_chunks_invalid():
+    with pytest.raises(ValueError, match="found some missing: 'e'"):
+        StellarGraph.from_csv_chunks(_chunks(_edges(), 2), _nodes().iloc[:4])
+
+    with pytest.raises(
+        ValueError, match="edges: expected 'source', 'target', 'label' columns"
+    ):
+        StellarGraph.from_csv_chunks(
+            _edges().drop(columns="target"), edge_type_column="label"
+        )
+
+    with pytest.raises(
+        TypeError, match="expected weight column 'weight' to be numeric"
+    ):
+        StellarGraph.from_csv_chunks(_edges().assign(weight="x"))
+
+    with pytest.raises(
+        ValueError, match="expected every chunk to have 2 feature columns"
+    ):
+        StellarGraph.from_csv_chunks(
+            _edges(), [_nodes().iloc[:2], _nodes().iloc[2:].drop(columns="f1")]
+        )
+
+    with pytest.raises(ValueError, match="expected IDs to appear once"):
+        StellarGraph.from_csv_chunks(_edges(), [_nodes(), _nodes()])
+
+
+@pytest.mark.parametrize("processes", [None, 2])
+def test_from_files(tmpdir, processes):
+    edges = _edges()
+    edge_paths = []
+    for i, (start, stop) in enumerate([(0, 3), (3, 5), (5, 7)]):
+        path = str(tmpdir.join(f"edges-{i}.csv"))
+        edges.iloc[start:stop].to_csv(path, index=False, sep="\t")
+        edge_paths.append(path)
+
+    node_path = str(tmpdir.join("nodes.csv"))
+    _nodes().rename_axis("node_id").reset_index().to_csv(
+        node_path, index=False, sep="\t"
+    )
+
+    graph = StellarGraph.from_files(
+        edge_paths,
+        node_path,
+        node_id_column="node_id",
+        edge_type_column="label",
+        chunk_size=2,
+        processes=processes,
+        read_kwargs={"sep": "\t"},
+    )
+    _assert_graphs_equal(graph, StellarGraph(_nodes(), edges, edge_type_column="label"))
+
+    # nodes inferred from the edges
+    graph = StellarGraph.from_files(
+        edge_paths, edge_type_column="label", read_kwargs={"sep": "\t"}
+    )
+    assert list(graph.nodes()) == ["a", "b", "c", "d", "e"]
+    assert graph.number_of_edges() == len(edges)
+
+
+def test_from_files_invalid(tmpdir):
+    with pytest.raises(ValueError, match="chunk_size: expected integer >= 1, found 0"):
+        StellarGraph.from_files("edges.csv", chunk_size=0)
+
+    with pytest.raises(ValueError, match="processes: expected integer >= 1, found 0"):
+        StellarGraph.from_files("edges.csv", processes=0)
+
+
+def test_from_files_parquet(tmpdir):
+    pytest.importorskip("pyarrow")
+    path = str(tmpdir.join("edges.parquet"))
+    _edges().to_parquet(path)
+
+    graph = StellarGraph.from_files(path, edge_type_column="label", chunk_size=2)
+    _assert_graphs_equal(
+        graph,
+        StellarGraph(
+            pd.DataFrame(index=list("abcde")), _edges(), edge_type_column="label"
+        ),
+    )
+
+
+def test_growable_array():
+    array = _GrowableArray(inner_shape=(2,))
+    assert len(array) == 0
+
+    chunks = [np.arange(2 * n).reshape(n, 2) for n in [0, 5, 3000, 1]]
+    for chunk in chunks:
+        array.append(chunk)
+
+    # an array that can't be cast safely promotes the dtype
+    array.append(np.array([[0.5, 1.5]]))
+
+    result = array.finish()
+    assert result.dtype == np.float64
+    np.testing.assert_array_equal(result, np.concatenate(chunks + [[[0.5, 1.5]]]))
+
+    np.testing.assert_array_equal(_GrowableArray(np.uint8).finish(), [])
@@ -21,6 +21,7 @@ Utils tests:
 """
 import pytest
 import numpy as np
+import scipy.sparse as sps
 
 from stellargraph.core.utils import *
 from ..test_utils import flaky_xfail_mark
@@ -262,3 +263,33 @@ def test_GCN_Aadj_feats_op(example_graph):
     assert Aadj_power_2.shape == Aadj_.get_shape()
     # and the same values.
     assert pytest.approx(Aadj_power_2) == Aadj_.todense()
+
+
+@pytest.mark.parametrize("weighted", [False, True])
+def test_PPNP_Aadj_feats_op_approximate(weighted):
+    graph = example_graph_random(n_nodes=50, n_edges=150)
+    Aadj = graph.to_adjacency_matrix()
+    if weighted:
+        Aadj.data = np.random.uniform(0.5, 2.0, size=Aadj.nnz)
+
+    _, exact = PPNP_Aadj_feats_op(features=None, A=Aadj)
+
+    errors = []
+    for epsilon in [1e-2, 1e-4, 1e-7]:
+        _, approx = PPNP_Aadj_feats_op(features=None, A=Aadj, epsilon=epsilon)
+        assert sps.isspmatrix_csr(approx)
+        errors.append(np.abs(approx.toarray() - exact).max())
+
+    assert errors[0] > errors[1] > errors[2]
+    assert errors[2] < 1e-5
+
+    _, top = PPNP_Aadj_feats_op(features=None, A=Aadj, epsilon=1e-4, top_k=3)
+    assert np.diff(top.indptr).max() <= 3
+    # the largest element of each row is kept
+    np.testing.assert_array_equal(top.argmax(axis=1), exact.argmax(axis=1)[:, None])
+
+    with pytest.raises(ValueError, match="epsilon: expected a positive number"):
+        PPNP_Aadj_feats_op(features=None, A=Aadj, epsilon=0)
+
+    with pytest.raises(ValueError, match="top_k: expected a positive integer"):
+        PPNP_Aadj_feats_op(features=None, A=Aadj, epsilon=1e-4, top_k=0)
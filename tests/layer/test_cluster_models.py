@@ -15,7 +15,11 @@
 # limitations under the License.
 
 from stellargraph.layer import APPNP, GAT, GCN
-from stellargraph.mapper import ClusterNodeGenerator
+from stellargraph.mapper import (
+    ClusterNodeGenerator,
+    FullBatchNodeGenerator,
+    GraphSAINTNodeGenerator,
+)
 import tensorflow as tf
 import numpy as np
 from ..test_utils.graphs import example_graph_random
@@ -51,3 +55,62 @@ def test_fullbatch_cluster_models(model_type):
     predictions = embedding_model.predict(gen)
 
     assert predictions.shape == (len(nodes), 1)
+
+
+@pytest.mark.parametrize("model_type", [GAT, GCN])
+def test_graphsaint_models(model_type):
+    G = example_graph_random(n_nodes=50)
+    method = "self_loops" if model_type is GAT else "gcn"
+    generator = GraphSAINTNodeGenerator(G, batch_size=8, method=method)
+    nodes = G.nodes()[:40]
+    gen = generator.flow(nodes, targets=np.ones(len(nodes)), shuffle=True)
+
+    gnn = model_type(
+        generator=generator,
+        layer_sizes=[16, 16, 1],
+        activations=["relu", "relu", "relu"],
+    )
+
+    model = tf.keras.Model(*gnn.in_out_tensors())
+    model.compile(optimizer="adam", loss="binary_crossentropy")
+    history = model.fit(gen, validation_data=gen, epochs=2)
+    results = model.evaluate(gen)
+
+    x_in, x_out = gnn.in_out_tensors()
+    x_out_flat = tf.squeeze(x_out, 0)
+    embedding_model = tf.keras.Model(inputs=x_in, outputs=x_out_flat)
+    predictions = embedding_model.predict(generator.flow(nodes))
+
+    assert predictions.shape == (len(nodes), 1)
+
+
+@pytest.mark.parametrize(
+    "model_type,method,full_batch_method",
+    [(GAT, "self_loops", "gat"), (GCN, "gcn", "gcn")],
+)
+def test_graphsaint_models_whole_graph(model_type, method, full_batch_method):
+    # a "subgraph" consisting of the whole graph is equivalent to full-batch training
+    G = example_graph_random(n_nodes=20, n_edges=50)
+    nodes = G.nodes()
+
+    generator = GraphSAINTNodeGenerator(
+        G, batch_size=len(nodes), walk_length=0, method=method
+    )
+    gnn = model_type(generator=generator, layer_sizes=[4, 2], activations=None)
+    model = tf.keras.Model(*gnn.in_out_tensors())
+
+    full_batch = FullBatchNodeGenerator(G, method=full_batch_method)
+    full_batch_gnn = model_type(
+        generator=full_batch, layer_sizes=[4, 2], activations=None
+    )
+    full_batch_model = tf.keras.Model(*full_batch_gnn.in_out_tensors())
+    full_batch_model.set_weights(model.get_weights())
+
+    [features, out_indices, *adj], _ = generator.flow(nodes)[0]
+    assert features.shape[1] == len(nodes)
+    predictions = model.predict_on_batch([features, out_indices, *adj])
+
+    inputs, _ = full_batch.flow(nodes)[0]
+    expected = full_batch_model.predict_on_batch(inputs)
+
+    np.testing.assert_allclose(predictions, expected, rtol=1e-5, atol=1e-6)
@@ -197,6 +197,50 @@ def test_GCN_apply_sparse():
     assert preds_1 == pytest.approx(preds_2)
 
 
+@pytest.mark.parametrize("sparse", [False, True])
+def test_GCN_apply_sparse_features(sparse):
+    G, features = create_graph_features()
+
+    def predictions(sparse_features, weights=None):
+        generator = FullBatchNodeGenerator(
+            G, sparse=sparse, method="gcn", sparse_features=sparse_features
+        )
+        gcnModel = GCN([2, 3], generator, activations=["relu", "linear"])
+        x_in, x_out = gcnModel.in_out_tensors()
+        assert len(x_in) == (4 if sparse else 3) + sparse_features
+
+        model = keras.Model(inputs=x_in, outputs=x_out)
+        if weights is not None:
+            model.set_weights(weights)
+
+        inputs, _ = generator.flow(["a", "b", "c"])[0]
+        return model.predict_on_batch(inputs), model.get_weights()
+
+    dense_preds, weights = predictions(sparse_features=False)
+    sparse_preds, _ = predictions(sparse_features=True, weights=weights)
+
+    assert sparse_preds.shape == (1, 3, 3)
+    np.testing.assert_allclose(sparse_preds, dense_preds, rtol=1e-5, atol=1e-6)
+
+
+def test_GCN_sparse_features_dropout():
+    G, features = create_graph_features()
+    generator = FullBatchNodeGenerator(G, sparse=True, sparse_features=True)
+
+    # a single layer, so the only dropout is on the input features
+    gcnModel = GCN([3], generator, activations=["linear"], dropout=0.9)
+    x_in, x_out = gcnModel.in_out_tensors()
+    model = keras.Model(inputs=x_in, outputs=x_out)
+
+    inputs, _ = generator.flow(["a", "b", "c"])[0]
+    inference = model(inputs, training=False).numpy()
+    np.testing.assert_array_equal(model(inputs, training=False).numpy(), inference)
+
+    tf.random.set_seed(0)
+    training = model(inputs, training=True).numpy()
+    assert not np.allclose(training, inference)
+
+
 def test_GCN_linkmodel_apply_dense():
     G, features = create_graph_features()
     adj = G.to_adjacency_matrix().toarray()[None, :, :]
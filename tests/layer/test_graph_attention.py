@@ -621,6 +621,60 @@ class Test_GAT:
 
         test_utils.model_save_load(tmpdir, gat)
 
+    def test_sparse_features(self):
+        graph = example_graph(feature_size=self.F_in)
+
+        def predictions(sparse_features, weights=None):
+            gen = FullBatchNodeGenerator(
+                graph,
+                sparse=self.sparse,
+                method=self.method,
+                sparse_features=sparse_features,
+            )
+            gat = GAT(
+                layer_sizes=self.layer_sizes,
+                activations=self.activations,
+                attn_heads=self.attn_heads,
+                generator=gen,
+            )
+            x_in, x_out = gat.in_out_tensors()
+            model = keras.Model(inputs=x_in, outputs=x_out)
+            if weights is not None:
+                model.set_weights(weights)
+
+            inputs, _ = gen.flow(graph.nodes())[0]
+            return model.predict_on_batch(inputs), model.get_weights()
+
+        dense_preds, weights = predictions(sparse_features=False)
+        sparse_preds, _ = predictions(sparse_features=True, weights=weights)
+
+        np.testing.assert_allclose(sparse_preds, dense_preds, rtol=1e-5, atol=1e-6)
+
+    def test_sparse_features_dropout(self):
+        graph = example_graph(feature_size=self.F_in)
+        gen = FullBatchNodeGenerator(
+            graph, sparse=self.sparse, method=self.method, sparse_features=True
+        )
+        # a single layer, so the only dropout is on the input features
+        gat = GAT(
+            layer_sizes=[4],
+            activations=["linear"],
+            attn_heads=1,
+            generator=gen,
+            in_dropout=0.9,
+            attn_dropout=0.0,
+        )
+        x_in, x_out = gat.in_out_tensors()
+        model = keras.Model(inputs=x_in, outputs=x_out)
+
+        inputs, _ = gen.flow(graph.nodes())[0]
+        inference = model(inputs, training=False).numpy()
+        np.testing.assert_array_equal(model(inputs, training=False).numpy(), inference)
+
+        tf.random.set_seed(0)
+        training = model(inputs, training=True).numpy()
+        assert not np.allclose(training, inference)
+
 
 def TestGATsparse(Test_GAT):
     sparse = True
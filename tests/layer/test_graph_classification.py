@@ -17,7 +17,7 @@
 import numpy as np
 import tensorflow as tf
 from stellargraph.layer.graph_classification import *
-from stellargraph.layer import SortPooling
+from stellargraph.layer import SortPooling, SegmentAveragePooling
 from stellargraph.mapper import PaddedGraphGenerator, FullBatchNodeGenerator
 import pytest
 from ..test_utils.graphs import example_graph_random
@@ -228,3 +228,41 @@ def test_save_load(tmpdir):
         layer_sizes=layer_sizes, activations=activations, generator=generator
     )
     test_utils.model_save_load(tmpdir, model)
+
+
+@pytest.mark.parametrize("model_type", ["gcn", "dgcnn"])
+def test_sparse_matches_padded(model_type):
+    sparse_generator = PaddedGraphGenerator(graphs=graphs, sparse=True)
+
+    def make_model(gen):
+        if model_type == "gcn":
+            gc_model = GCNSupervisedGraphClassification(
+                layer_sizes=[5, 3], activations=["relu", "relu"], generator=gen
+            )
+        else:
+            gc_model = DeepGraphCNN(
+                layer_sizes=[5, 3], activations=["relu", "tanh"], k=4, generator=gen
+            )
+        return gc_model, tf.keras.Model(*gc_model.in_out_tensors())
+
+    padded_gc_model, padded_model = make_model(generator)
+    sparse_gc_model, sparse_model = make_model(sparse_generator)
+
+    assert sparse_gc_model.use_sparse
+    if model_type == "gcn":
+        assert isinstance(sparse_gc_model.pooling, SegmentAveragePooling)
+    assert len(sparse_model.inputs) == 4
+
+    sparse_model.set_weights(padded_model.get_weights())
+
+    padded_seq = generator.flow(graphs=[0, 1, 2], batch_size=2)
+    sparse_seq = sparse_generator.flow(graphs=[0, 1, 2], batch_size=2)
+    assert len(padded_seq) == len(sparse_seq) == 2
+
+    for (padded_inputs, _), (sparse_inputs, _) in zip(padded_seq, sparse_seq):
+        np.testing.assert_allclose(
+            sparse_model.predict_on_batch(sparse_inputs),
+            padded_model.predict_on_batch(padded_inputs),
+            rtol=1e-5,
+            atol=1e-6,
+        )
@@ -34,7 +34,8 @@ from stellargraph.layer.knowledge_graph import (
     RotatE,
     RotE,
     RotH,
-    _ranks_from_score_columns,
+    _KnownEdgesIndex,
+    _RankCounts,
 )
 
 from .. import test_utils
@@ -294,6 +295,144 @@ def test_rote_roth(knowledge_graph, model_class):
     np.testing.assert_array_equal(prediction, prediction2)
 
 
+def _rote_roth_broadcast_scoring(scoring, all_n_embs, s_embs, r_embs, o_embs):
+    # the same as bulk_scoring, but calling the layer itself, so every vector is broadcast to
+    # num_nodes × batch × dimension
+    e_all, b_all = [e[:, None, :] for e in all_n_embs]
+    s_embs, r_embs, o_embs = [
+        [e[None, ...] for e in embs] for embs in [s_embs, r_embs, o_embs]
+    ]
+
+    mod_o_pred = scoring([*s_embs, *r_embs, e_all, b_all])
+    mod_s_pred = scoring([e_all, b_all, *r_embs, *o_embs])
+    return mod_o_pred.numpy(), mod_s_pred.numpy()
+
+
+@pytest.mark.parametrize("model_class", [RotE, RotH])
+def test_rote_roth_bulk_scoring(knowledge_graph, model_class):
+    gen = KGTripleGenerator(knowledge_graph, 3)
+    init = initializers.RandomUniform(-0.5, 0.5)
+    rot_model = model_class(gen, 6, embeddings_initializer=init)
+    Model(*rot_model.in_out_tensors())
+
+    node_embs, edge_type_embs = rot_model.embedding_arrays()
+    s = np.array([0, 1, 2, 3, 3])
+    r = np.array([0, 1, 2, 3, 0])
+    o = np.array([1, 1, 0, 2, 3])
+
+    args = (
+        node_embs,
+        [e[s] for e in node_embs],
+        [e[r] for e in edge_type_embs],
+        [e[o] for e in node_embs],
+    )
+    mod_o_pred, mod_s_pred = rot_model._scoring.bulk_scoring(args[0], None, *args[1:])
+    expected_o, expected_s = _rote_roth_broadcast_scoring(rot_model._scoring, *args)
+
+    assert mod_o_pred.shape == mod_s_pred.shape == (4, 5)
+    np.testing.assert_allclose(mod_o_pred, expected_o, rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(mod_s_pred, expected_s, rtol=1e-4, atol=1e-5)
+
+
+@pytest.mark.parametrize("model_maker", [ComplEx, DistMult, RotatE, RotH, RotE])
+def test_elementwise_and_object_scoring(knowledge_graph, model_maker):
+    gen = KGTripleGenerator(knowledge_graph, 3)
+    sg_model = model_maker(gen, embedding_dimension=6)
+    Model(*sg_model.in_out_tensors())
+
+    node_embs, edge_type_embs = sg_model.embedding_arrays()
+    extra_data = sg_model._scoring.bulk_scoring_data(node_embs, edge_type_embs)
+    s = np.array([0, 1, 2, 3, 3])
+    r = np.array([0, 1, 2, 3, 0])
+    o = np.array([1, 1, 0, 2, 3])
+
+    s_embs = [e[s] for e in node_embs]
+    r_embs = [e[r] for e in edge_type_embs]
+    o_embs = [e[o] for e in node_embs]
+
+    scores = sg_model._scoring.elementwise_scoring(extra_data, s_embs, r_embs, o_embs)
+
+    # the true edges are the diagonals of the bulk scores against the true nodes
+    mod_o_pred, _ = sg_model._scoring.bulk_scoring(
+        o_embs, extra_data, s_embs, r_embs, o_embs
+    )
+    _, mod_s_pred = sg_model._scoring.bulk_scoring(
+        s_embs, extra_data, s_embs, r_embs, o_embs
+    )
+
+    assert scores.shape == (5,)
+    np.testing.assert_allclose(scores, np.diag(mod_o_pred), rtol=1e-4, atol=1e-5)
+    np.testing.assert_allclose(scores, np.diag(mod_s_pred), rtol=1e-4, atol=1e-5)
+
+    # the modified-object scores can be computed alone
+    np.testing.assert_allclose(
+        sg_model._scoring.bulk_object_scoring(node_embs, extra_data, s_embs, r_embs),
+        sg_model._scoring.bulk_scoring(node_embs, extra_data, s_embs, r_embs, o_embs)[
+            0
+        ],
+        rtol=1e-4,
+        atol=1e-5,
+    )
+
+    # the default implementations (via bulk_scoring) agree too
+    np.testing.assert_allclose(
+        KGScore.bulk_object_scoring(
+            sg_model._scoring, node_embs, extra_data, s_embs, r_embs
+        ),
+        sg_model._scoring.bulk_object_scoring(node_embs, extra_data, s_embs, r_embs),
+        rtol=1e-4,
+        atol=1e-5,
+    )
+    np.testing.assert_allclose(
+        scores,
+        KGScore.elementwise_scoring(
+            sg_model._scoring, extra_data, s_embs, r_embs, o_embs
+        ),
+        rtol=1e-4,
+        atol=1e-5,
+    )
+
+
+@pytest.mark.benchmark(group="RotH/RotE bulk scoring")
+@pytest.mark.parametrize("model_class", [RotE, RotH])
+@pytest.mark.parametrize("fused", [False, True])
+def test_benchmark_rote_roth_bulk_scoring(benchmark, model_class, fused):
+    # the size of FB15k-237, with one 4096 chunk of nodes, as used by rank_edges_against_all_nodes
+    num_nodes = 14541
+    num_edge_types = 237
+    chunk_size = 4096
+    batch_size = 64
+    dim = 32
+
+    nodes = pd.DataFrame(index=range(num_nodes))
+    edges = {
+        str(i): pd.DataFrame({"source": [i], "target": [i + 1]}, index=[i])
+        for i in range(num_edge_types)
+    }
+    gen = KGTripleGenerator(StellarDiGraph(nodes, edges), batch_size)
+    rot_model = model_class(gen, dim)
+    Model(*rot_model.in_out_tensors())
+
+    node_embs, edge_type_embs = rot_model.embedding_arrays()
+    rs = np.random.RandomState(0)
+    s = rs.randint(num_nodes, size=batch_size)
+    r = rs.randint(num_edge_types, size=batch_size)
+    o = rs.randint(num_nodes, size=batch_size)
+    chunk = [e[:chunk_size] for e in node_embs]
+    s_embs = [e[s] for e in node_embs]
+    r_embs = [e[r] for e in edge_type_embs]
+    o_embs = [e[o] for e in node_embs]
+
+    def f():
+        if fused:
+            return rot_model._scoring.bulk_scoring(chunk, None, s_embs, r_embs, o_embs)
+        return _rote_roth_broadcast_scoring(
+            rot_model._scoring, chunk, s_embs, r_embs, o_embs
+        )
+
+    benchmark(f)
+
+
 @pytest.mark.parametrize(
     "model_maker",
     [
@@ -429,18 +568,16 @@ def test_tie_breaking(tie_breaking):
 
     copies = 100
 
-    rankings = [
-        _ranks_from_score_columns(
-            pred_scores,
-            true_modified_node_ilocs=np.array([1, 2, 3]),
-            unmodified_node_ilocs=np.array([0, 1, 2]),
-            true_rel_ilocs=np.array([0, 0, 0]),
-            modified_object=True,
-            known_edges_graph=known_edges_graph,
-            tie_breaking=tie_breaking,
-        )
-        for _ in range(copies)
-    ]
+    true_modified_node_ilocs = np.array([1, 2, 3])
+    known = _KnownEdgesIndex(known_edges_graph, modified_object=True)
+    counts = _RankCounts(
+        pred_scores[true_modified_node_ilocs, range(3)],
+        true_modified_node_ilocs,
+        *known.pairs(np.array([0, 1, 2]), np.array([0, 0, 0])),
+    )
+    counts.update(0, pred_scores)
+
+    rankings = [counts.ranks(tie_breaking) for _ in range(copies)]
 
     all_rankings = np.array(rankings)
     assert all_rankings.shape == (copies, 2, 3)
@@ -502,6 +639,111 @@ def test_embedding_validation(knowledge_graph):
     KGModel(gen, X(([e, e], [e, e, e])), 2, **kwargs)
 
 
+@pytest.mark.parametrize("model_maker", [ComplEx, DistMult, RotatE, RotH, RotE])
+def test_rank_edges_chunks_threads(knowledge_graph, model_maker):
+    gen = KGTripleGenerator(knowledge_graph, 3)
+    sg_model = model_maker(gen, embedding_dimension=6)
+    # build the embedding layers
+    Model(*sg_model.in_out_tensors())
+
+    sources, targets, rels, _ = knowledge_graph.edge_arrays(include_edge_type=True)
+    edges = pd.DataFrame({"source": sources, "label": rels, "target": targets})
+
+    def ranks(**kwargs):
+        return sg_model.rank_edges_against_all_nodes(
+            gen.flow(edges), knowledge_graph, tie_breaking="top", **kwargs
+        )
+
+    expected_raw, expected_filtered = ranks(
+        chunk_size=knowledge_graph.number_of_nodes()
+    )
+    assert np.all(expected_filtered <= expected_raw)
+
+    for chunk_size, num_threads in [(1, 1), (2, 1), (3, 4), (100, 2)]:
+        raw, filtered = ranks(chunk_size=chunk_size, num_threads=num_threads)
+        np.testing.assert_array_equal(raw, expected_raw)
+        np.testing.assert_array_equal(filtered, expected_filtered)
+
+    with pytest.raises(ValueError, match="chunk_size: expected.*found 0"):
+        ranks(chunk_size=0)
+
+    with pytest.raises(ValueError, match="num_threads: expected.*found 0"):
+        ranks(num_threads=0)
+
+
+@pytest.mark.parametrize("model_maker", [ComplEx, DistMult, RotatE, RotH, RotE])
+def test_predict_top_k(knowledge_graph, model_maker):
+    gen = KGTripleGenerator(knowledge_graph, 3)
+    sg_model = model_maker(gen, embedding_dimension=6)
+    Model(*sg_model.in_out_tensors())
+
+    num_nodes = knowledge_graph.number_of_nodes()
+    subjects = np.array([0, 1, 2, 3, 0, 3])
+    rels = np.array([0, 1, 2, 0, 3, 1])
+
+    # the expected scores, computed in one go
+    node_embs, edge_type_embs = sg_model.embedding_arrays()
+    ss = [e[subjects] for e in node_embs]
+    rs = [e[rels] for e in edge_type_embs]
+    all_scores, _ = sg_model._scoring.bulk_scoring(
+        node_embs,
+        sg_model._scoring.bulk_scoring_data(node_embs, edge_type_embs),
+        ss,
+        rs,
+        ss,
+    )
+    all_scores = all_scores.T
+    expected_order = np.argsort(-all_scores, axis=1, kind="stable")
+
+    k = 3
+    for chunk_size, batch_size in [(1, 1), (2, 4), (100, 100)]:
+        objects, scores, latency = sg_model.predict_top_k(
+            subjects,
+            rels,
+            k,
+            use_ilocs=True,
+            chunk_size=chunk_size,
+            batch_size=batch_size,
+            return_latency=True,
+        )
+        np.testing.assert_array_equal(objects, expected_order[:, :k])
+        np.testing.assert_allclose(
+            scores, np.take_along_axis(all_scores, objects, axis=1), atol=1e-6
+        )
+        assert latency.shape == (len(subjects),)
+        assert np.all(latency >= 0)
+
+    # IDs, and more results than nodes
+    subject_ids = knowledge_graph.node_ilocs_to_ids(subjects)
+    rel_names = np.array(knowledge_graph.edge_types)[rels]
+    objects, scores = sg_model.predict_top_k(subject_ids, rel_names, 100)
+    assert objects.shape == scores.shape == (len(subjects), num_nodes)
+    np.testing.assert_array_equal(
+        objects,
+        knowledge_graph.node_ilocs_to_ids(expected_order.ravel()).reshape(
+            objects.shape
+        ),
+    )
+
+    # excluding known edges
+    objects, scores = sg_model.predict_top_k(
+        subjects, rels, num_nodes, exclude_known=knowledge_graph, use_ilocs=True
+    )
+    for s, r, objs, scs in zip(subjects, rels, objects, scores):
+        known = knowledge_graph.out_nodes(s, edge_types=[r], use_ilocs=True)
+        unknown = np.setdiff1d(np.arange(num_nodes), known)
+        np.testing.assert_array_equal(np.sort(objs[: len(unknown)]), unknown)
+        assert np.all(np.isneginf(scs[len(unknown) :]))
+
+    with pytest.raises(ValueError, match="k: expected.*found 0"):
+        sg_model.predict_top_k(subjects, rels, 0, use_ilocs=True)
+
+    with pytest.raises(
+        ValueError, match="expected one-dimensional iterables of the same length"
+    ):
+        sg_model.predict_top_k(subjects, rels[:2], 1, use_ilocs=True)
+
+
 @pytest.mark.parametrize("model_maker", [ComplEx, DistMult, RotatE, RotH, RotE])
 def test_save_load(tmpdir, knowledge_graph, model_maker):
     gen = KGTripleGenerator(knowledge_graph, 3)
@@ -221,3 +221,33 @@ def test_deprecated_model_functions():
         generator=generator, layer_sizes=[4], activations=["relu"]
     )
     _deprecated_test(sg_model)
+
+
+def test_squeezedsparseconversion_unknown_shape():
+    N = 10
+    x_t = keras.Input(batch_shape=(1, None, 1), dtype="float32")
+    A_ind = keras.Input(batch_shape=(1, None, 2), dtype="int64")
+    A_val = keras.Input(batch_shape=(1, None), dtype="float32")
+
+    A_mat = SqueezedSparseConversion(shape=(None, None), dtype=A_val.dtype)(
+        [A_ind, A_val]
+    )
+
+    x_out = keras.layers.Lambda(
+        lambda xin: K.expand_dims(K.dot(xin[0], K.squeeze(xin[1], 0)), 0)
+    )([A_mat, x_t])
+
+    model = keras.Model(inputs=[x_t, A_ind, A_val], outputs=x_out)
+
+    for n in [N, N + 3]:
+        x = np.random.randn(1, n, 1)
+        A = sps.random(n, n, density=0.3, format="coo") + sps.eye(n)
+        A = A.tocoo()
+        A_indices = np.column_stack([A.row, A.col])
+
+        z = model.predict_on_batch(
+            [x, np.expand_dims(A_indices, 0), np.expand_dims(A.data, 0)]
+        )
+        np.testing.assert_allclose(
+            z.squeeze(), A.dot(x.squeeze()), atol=1e-6, rtol=1e-5
+        )
@@ -84,3 +84,27 @@ def test_PPNP_save_load(tmpdir):
     generator = FullBatchNodeGenerator(G, sparse=False)
     ppnp = PPNP([2, 3], generator, ["relu", "relu"])
     test_utils.model_save_load(tmpdir, ppnp)
+
+
+def test_PPNP_apply_sparse_approximate():
+    G, features = create_graph_features()
+    adj = G.to_adjacency_matrix()
+    _, exact = PPNP_Aadj_feats_op(features, adj)
+
+    generator = FullBatchNodeGenerator(G, sparse=True, method="ppnp", ppnp_epsilon=1e-8)
+    np.testing.assert_allclose(generator.Aadj.toarray(), exact, atol=1e-6)
+
+    ppnp = PPNP([2], generator=generator, activations=["relu"])
+    x_in, x_out = ppnp.in_out_tensors()
+    model = keras.Model(inputs=x_in, outputs=x_out)
+
+    preds_sparse = model.predict_on_batch(generator.flow(["a", "b"])[0][0])
+
+    dense_generator = FullBatchNodeGenerator(G, sparse=False, method="ppnp")
+    dense_ppnp = PPNP([2], generator=dense_generator, activations=["relu"])
+    x_in, x_out = dense_ppnp.in_out_tensors()
+    dense_model = keras.Model(inputs=x_in, outputs=x_out)
+    dense_model.set_weights(model.get_weights())
+
+    preds_dense = dense_model.predict_on_batch(dense_generator.flow(["a", "b"])[0][0])
+    np.testing.assert_allclose(preds_sparse, preds_dense, rtol=1e-5, atol=1e-6)
@@ -15,7 +15,7 @@
 # limitations under the License.
 import pytest
 import numpy as np
-from stellargraph.layer.sort_pooling import SortPooling
+from stellargraph.layer.sort_pooling import SortPooling, SegmentAveragePooling
 
 
 def test_sorting_padding():
@@ -130,3 +130,43 @@ def test_invalid_k():
 
     with pytest.raises(ValueError, match="k: expected integer >= 1, found 0"):
         SortPooling(k=0)
+
+
+@pytest.mark.parametrize("k", [1, 2, 3, 4])
+@pytest.mark.parametrize("flatten_output", [False, True])
+def test_segments_match_mask(k, flatten_output):
+    # two graphs with 3 and 2 nodes: padded (with a mask), and as a disjoint union (with segments)
+    padded = np.array(
+        [[[3, 4, 0], [1, 2, 2], [5, 0, 1]], [[1, 1, -1], [2, 0, 3], [0, 0, 0]]],
+        dtype=np.float32,
+    )
+    mask = np.array([[True, True, True], [True, True, False]])
+    union = padded[mask][np.newaxis]
+    segment_ids = np.array([[0, 0, 0, 1, 1]])
+
+    layer = SortPooling(k=k, flatten_output=flatten_output)
+    expected = layer(padded, mask=mask)
+    actual = layer(union, segment_ids=segment_ids)
+
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_mask_or_segments():
+    data = np.zeros((1, 3, 2))
+    layer = SortPooling(k=2)
+
+    with pytest.raises(ValueError, match="exactly one of 'mask' and 'segment_ids'"):
+        layer(data)
+
+    with pytest.raises(ValueError, match="exactly one of 'mask' and 'segment_ids'"):
+        layer(data, mask=np.ones((1, 3), dtype=bool), segment_ids=np.zeros((1, 3)))
+
+
+def test_segment_average_pooling():
+    data = np.array([[[1, 2], [3, 4], [5, 6], [7, 8], [9, 10]]], dtype=np.float32)
+    segment_ids = np.array([[0, 0, 1, 2, 2]])
+
+    layer = SegmentAveragePooling()
+    data_out = layer(data, segment_ids=segment_ids)
+
+    np.testing.assert_array_equal(data_out, [[2, 3], [5, 6], [8, 9]])
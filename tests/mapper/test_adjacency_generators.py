@@ -16,11 +16,13 @@
 
 from stellargraph.core.utils import normalize_adj
 from stellargraph.mapper.adjacency_generators import AdjacencyPowerGenerator
+from stellargraph import StellarGraph
 from ..test_utils.graphs import barbell
 import tensorflow as tf
 
 
 import numpy as np
+import pandas as pd
 import pytest
 
 
@@ -116,3 +118,59 @@ def test_partial_powers(barbell, num_powers, weighted):
             np.testing.assert_allclose(
                 partial_powers[:, j, :], actual_powers[j][i, :], rtol=1e-5, atol=1e-8
             )
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_partial_powers_batched(barbell, tmp_path, use_cache):
+    num_powers = 3
+    Aadj = normalize_adj(barbell.to_adjacency_matrix(), symmetric=False).todense()
+    actual_powers = np.stack(
+        [np.asarray(Aadj ** (j + 1)) for j in range(num_powers)], axis=1
+    )
+
+    generator = AdjacencyPowerGenerator(barbell, num_powers=num_powers)
+    cache_path = str(tmp_path / "powers") if use_cache else None
+    dataset = generator.flow(batch_size=4, cache_path=cache_path)
+
+    num_nodes = barbell.number_of_nodes()
+    num_batches = -(-num_nodes // 4)
+    # two epochs, so that the second one is read from the cache, if enabled
+    batches = list(dataset.take(2 * num_batches))
+    for epoch in range(2):
+        epoch_batches = batches[epoch * num_batches : (epoch + 1) * num_batches]
+        rows = np.concatenate([x[0].numpy() for x, _ in epoch_batches])
+        powers = np.concatenate([x[1].numpy() for x, _ in epoch_batches])
+        adj_rows = np.concatenate([y.numpy() for _, y in epoch_batches])
+
+        np.testing.assert_array_equal(rows, np.arange(num_nodes))
+        np.testing.assert_allclose(powers, actual_powers, rtol=1e-5, atol=1e-8)
+        np.testing.assert_allclose(
+            adj_rows[:, 0, :], barbell.to_adjacency_matrix().todense()
+        )
+
+
+def test_flow_cache_is_sparse(tmp_path):
+    # a long path graph has sparse adjacency powers, so the cache should be far smaller than the
+    # dense powers
+    num_nodes = 200
+    graph = StellarGraph(
+        nodes=pd.DataFrame(index=range(num_nodes)),
+        edges=pd.DataFrame(
+            {"source": range(num_nodes - 1), "target": range(1, num_nodes)}
+        ),
+    )
+    num_powers = 4
+    generator = AdjacencyPowerGenerator(graph, num_powers=num_powers)
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    dataset = generator.flow(batch_size=50, cache_path=str(cache_dir / "powers"))
+
+    # the cache is only written when the first epoch is finished, so read into the second
+    num_batches = num_nodes // 50
+    batches = list(dataset.take(num_batches + 1))
+    assert all(isinstance(x[1], tf.Tensor) for x, _ in batches)
+    np.testing.assert_array_equal(batches[-1][0][1], batches[0][0][1])
+
+    cache_size = sum(f.stat().st_size for f in cache_dir.iterdir())
+    dense_size = num_nodes * num_powers * num_nodes * 4
+    assert cache_size < dense_size / 10
@@ -236,3 +236,77 @@ def test_ClusterNodeSequence_cluster_without_targets():
     generator = ClusterNodeGenerator(G, clusters=2, q=1)
     seq = generator.flow(node_ids=["a"], targets=[0])
     _ = list(seq)
+
+
+@pytest.mark.parametrize("q", [1, 2])
+@pytest.mark.parametrize("weighted", [False, True])
+def test_ClusterNodeSequence_batch_matches_subgraph(q, weighted):
+    G = example_graph_random(feature_size=4, n_nodes=30, n_edges=100)
+    nodes = list(G.nodes())
+    clusters = [nodes[i::6] for i in range(6)]
+    node_ids = nodes[::2]
+    targets = np.arange(len(node_ids))[:, None]
+
+    seq = ClusterNodeSequence(
+        G,
+        clusters,
+        targets=targets,
+        node_ids=node_ids,
+        q=q,
+        weighted=weighted,
+        normalize_adj=False,
+    )
+
+    for (features, target_indices, adj), batch_targets in seq:
+        # the nodes in the batch can be recovered from their (unique) features
+        batch_ilocs = [
+            np.flatnonzero((G.node_features(nodes) == f).all(axis=1))[0]
+            for f in features[0]
+        ]
+        batch_nodes = [nodes[i] for i in batch_ilocs]
+
+        expected_adj = G.to_adjacency_matrix(batch_nodes, weighted=weighted)
+        np.testing.assert_array_equal(adj[0], expected_adj.toarray())
+
+        expected_targets = [node_ids.index(batch_nodes[i]) for i in target_indices[0]]
+        np.testing.assert_array_equal(batch_targets[0, :, 0], expected_targets)
+        assert {batch_nodes[i] for i in target_indices[0]} == set(
+            batch_nodes
+        ).intersection(node_ids)
+
+    assert sorted(seq.node_order) == sorted(node_ids)
+
+
+def test_ClusterNodeGenerator_method_invalid():
+    G = create_stellargraph()
+
+    with pytest.raises(ValueError, match="method must be 'random' or 'partition'"):
+        ClusterNodeGenerator(G, clusters=2, method="metis")
+
+
+def test_ClusterNodeGenerator_partition(capsys):
+    # a 10 x 10 grid: a good partition keeps most edges within clusters
+    ids = np.arange(100).reshape(10, 10)
+    edges = pd.DataFrame(
+        {
+            "source": np.concatenate([ids[:, :-1].ravel(), ids[:-1, :].ravel()]),
+            "target": np.concatenate([ids[:, 1:].ravel(), ids[1:, :].ravel()]),
+        }
+    )
+    G = StellarGraph(pd.DataFrame(np.ones((100, 2)), index=ids.ravel()), edges)
+
+    generator = ClusterNodeGenerator(G, clusters=4, q=2, method="partition")
+    assert capsys.readouterr().out == ""
+
+    assert len(generator.clusters) == 4
+    assert [len(c) for c in generator.clusters] == [25, 25, 25, 25]
+    assert sorted(n for c in generator.clusters for n in c) == list(range(100))
+
+    cluster_of = {n: i for i, c in enumerate(generator.clusters) for n in c}
+    cut = sum(cluster_of[s] != cluster_of[t] for s, t in G.edges())
+    assert cut <= 0.25 * len(edges)
+
+    seq = generator.flow(G.nodes())
+    assert len(seq) == 2
+    _ = list(seq)
+    assert sorted(seq.node_order) == list(range(100))
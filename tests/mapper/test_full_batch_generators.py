@@ -20,6 +20,7 @@ Full-batch Generator Tests
 
 """
 from stellargraph.core.graph import *
+from stellargraph.core.indexed_array import IndexedArray
 from stellargraph.mapper import (
     FullBatchGenerator,
     FullBatchLinkGenerator,
@@ -91,6 +92,7 @@ class Test_FullBatchNodeGenerator:
         method="none",
         k=1,
         teleport_probability=0.1,
+        ppnp_epsilon=None,
     ):
         generator = FullBatchNodeGenerator(
             G,
@@ -98,6 +100,7 @@ class Test_FullBatchNodeGenerator:
             method=method,
             k=k,
             teleport_probability=teleport_probability,
+            ppnp_epsilon=ppnp_epsilon,
         )
         n_nodes = G.number_of_nodes()
 
@@ -287,6 +290,17 @@ class Test_FullBatchNodeGenerator:
 
         assert ppnp_sparse_failed
 
+        A_sparse, _, _ = self.generator_flow(
+            self.G,
+            node_ids,
+            None,
+            sparse=True,
+            method="ppnp",
+            teleport_probability=0.1,
+            ppnp_epsilon=1e-8,
+        )
+        np.testing.assert_allclose(A_sparse, Appnp, atol=1e-6)
+
     def test_weighted(self):
         G = example_graph(feature_size=2, edge_weights=True)
 
@@ -296,6 +310,38 @@ class Test_FullBatchNodeGenerator:
             [[0, 0.1, 0, 20.0], [0.1, 0, 1.0, 1.3], [0, 1.0, 0, 0], [20.0, 1.3, 0, 0]],
         )
 
+    @pytest.mark.parametrize("sparse", [False, True])
+    @pytest.mark.parametrize("stored_sparse", [False, True])
+    def test_sparse_features(self, sparse, stored_sparse):
+        features = np.random.binomial(1, 0.3, size=(self.N, self.n_feat)).astype(
+            np.float32
+        )
+        nodes = IndexedArray(
+            sps.csr_matrix(features) if stored_sparse else features,
+            index=self.G.nodes(),
+        )
+        edges = pd.DataFrame(self.G.edges(), columns=["source", "target"])
+        G = StellarGraph(nodes, edges)
+
+        # dense by default, even if stored sparsely
+        generator = FullBatchNodeGenerator(G, sparse=sparse)
+        assert isinstance(generator.features, np.ndarray)
+        np.testing.assert_array_equal(generator.features, features)
+
+        generator = FullBatchNodeGenerator(G, sparse=sparse, sparse_features=True)
+        assert sps.isspmatrix_csr(generator.features)
+
+        [X_ind, X_val, tind, *_], _ = generator.flow(G.nodes()[:3])[0]
+        assert X_ind.dtype == np.int64
+        X = sps.coo_matrix(
+            (X_val[0], (X_ind[0, :, 0], X_ind[0, :, 1])), shape=features.shape
+        )
+        np.testing.assert_array_equal(X.toarray(), features)
+        np.testing.assert_array_equal(tind, [[0, 1, 2]])
+
+        with pytest.raises(ValueError, match="sparse_features: corrupting"):
+            generator.default_corrupt_input_index_groups()
+
 
 class Test_FullBatchLinkGenerator:
     """
@@ -313,6 +359,11 @@ class Test_FullBatchLinkGenerator:
         assert generator.Aadj.shape == (self.N, self.N)
         assert generator.features.shape == (self.N, self.n_feat)
 
+    def test_default_corrupt_input_index_groups(self):
+        # links have no default corruption, unlike nodes
+        generator = FullBatchLinkGenerator(self.G)
+        assert generator.default_corrupt_input_index_groups() is None
+
     def test_generator_constructor_wrong_G_type(self):
         with pytest.raises(TypeError):
             generator = FullBatchLinkGenerator(nx.Graph())
@@ -334,6 +385,7 @@ class Test_FullBatchLinkGenerator:
         method="none",
         k=1,
         teleport_probability=0.1,
+        ppnp_epsilon=None,
     ):
         generator = FullBatchLinkGenerator(
             G,
@@ -341,6 +393,7 @@ class Test_FullBatchLinkGenerator:
             method=method,
             k=k,
             teleport_probability=teleport_probability,
+            ppnp_epsilon=ppnp_epsilon,
         )
         n_nodes = G.number_of_nodes()
 
@@ -499,3 +552,14 @@ class Test_FullBatchLinkGenerator:
             ppnp_sparse_failed = True
 
         assert ppnp_sparse_failed
+
+        A_sparse, _, _ = self.generator_flow(
+            self.G,
+            link_ids,
+            None,
+            sparse=True,
+            method="ppnp",
+            teleport_probability=0.1,
+            ppnp_epsilon=1e-8,
+        )
+        np.testing.assert_allclose(A_sparse, Appnp, atol=1e-6)
@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pandas as pd
+import pytest
+import scipy.sparse as sps
+
+from stellargraph import StellarGraph
+
+from stellargraph.core.utils import normalize_adj
+from stellargraph.mapper import GraphSAINTNodeGenerator
+from ..test_utils.graphs import example_graph_random
+
+
+def _adjacency(adj_indices, adj_values, n):
+    return sps.coo_matrix(
+        (adj_values[0], (adj_indices[0, :, 0], adj_indices[0, :, 1])), shape=(n, n)
+    ).toarray()
+
+
+def test_GraphSAINTNodeGenerator_init():
+    G = example_graph_random()
+
+    with pytest.raises(TypeError, match="G: expected a StellarGraph"):
+        GraphSAINTNodeGenerator(G.to_networkx(), batch_size=2)
+
+    with pytest.raises(ValueError, match="batch_size: expected integer"):
+        GraphSAINTNodeGenerator(G, batch_size=0)
+
+    with pytest.raises(ValueError, match="walk_length: expected integer"):
+        GraphSAINTNodeGenerator(G, batch_size=2, walk_length=-1)
+
+    with pytest.raises(ValueError, match="presampling_epochs: expected integer"):
+        GraphSAINTNodeGenerator(G, batch_size=2, presampling_epochs=-1)
+
+    with pytest.raises(ValueError, match="method: expected 'gcn' or 'self_loops'"):
+        GraphSAINTNodeGenerator(G, batch_size=2, method="ppnp")
+
+    generator = GraphSAINTNodeGenerator(G, batch_size=2)
+    assert generator.num_batch_dims() == 2
+    assert generator.use_sparse
+    assert generator.features.shape == (1, 4)
+
+
+@pytest.mark.parametrize("method", ["gcn", "self_loops"])
+def test_GraphSAINTNodeSequence(method):
+    G = example_graph_random(feature_size=4, n_nodes=40, n_edges=100)
+    all_features = G.node_features()
+    # the subgraphs are normalised using the whole graph
+    adj = G.to_adjacency_matrix().toarray()
+    np.fill_diagonal(adj, 1)
+    if method == "gcn":
+        adj = normalize_adj(sps.csr_matrix(adj)).toarray()
+
+    nodes = list(G.nodes())[:25]
+    targets = np.arange(25)[:, None]
+    generator = GraphSAINTNodeGenerator(
+        G,
+        batch_size=10,
+        walk_length=3,
+        num_walks=2,
+        method=method,
+        presampling_epochs=0,
+        seed=42,
+    )
+    seq = generator.flow(nodes, targets)
+    assert len(seq) == 3
+
+    for i, batch in enumerate(seq):
+        [features, out_indices, adj_indices, adj_values], batch_targets = batch
+        n = features.shape[1]
+        roots = G.node_ids_to_ilocs(nodes[10 * i : 10 * (i + 1)])
+
+        # the features identify the sampled nodes, which include the target nodes
+        sampled = np.array(
+            [np.flatnonzero((all_features == f).all(axis=1))[0] for f in features[0]]
+        )
+        np.testing.assert_array_equal(sampled[out_indices[0]], roots)
+        np.testing.assert_array_equal(batch_targets[0], targets[10 * i : 10 * (i + 1)])
+
+        expected = adj[np.ix_(sampled, sampled)]
+        np.testing.assert_allclose(
+            _adjacency(adj_indices, adj_values, n), expected, rtol=1e-6
+        )
+
+        # the walks sample more than the targets (with overwhelming probability)
+        assert n > len(roots)
+
+
+def test_GraphSAINTNodeSequence_shuffle():
+    G = example_graph_random(feature_size=4, n_nodes=40, n_edges=100)
+    nodes = list(G.nodes())
+    targets = np.arange(40)[:, None]
+
+    generator = GraphSAINTNodeGenerator(G, batch_size=16, walk_length=0, seed=1)
+    seq = generator.flow(nodes, targets, shuffle=True)
+
+    seen = []
+    for [features, out_indices, *_], batch_targets in seq:
+        # no walks: just the target nodes
+        assert features.shape[1] == batch_targets.shape[1]
+        seen.extend(batch_targets[0, :, 0])
+
+    assert sorted(seen) == list(range(40))
+    assert seen != list(range(40))
+
+
+def _mean_aggregation(seq, num_nodes, epochs):
+    # the average of the subgraph adjacency matrices (in terms of the whole graph), for each node
+    # over the subgraphs in which it was sampled
+    total = np.zeros((num_nodes, num_nodes))
+    counts = np.zeros(num_nodes)
+    for _ in range(epochs):
+        for [features, _, adj_indices, adj_values], _ in seq:
+            # the features identify the sampled nodes
+            sampled = features[0, :, 0].astype(int)
+            n = len(sampled)
+            total[np.ix_(sampled, sampled)] += _adjacency(adj_indices, adj_values, n)
+            counts[sampled] += 1
+        seq.on_epoch_end()
+
+    return total / counts[:, None]
+
+
+def test_GraphSAINTNodeSequence_normalization():
+    G = example_graph_random(feature_size=1, n_nodes=20, n_edges=40, n_isolates=0)
+    # use the features to identify the nodes
+    G = StellarGraph(
+        nodes=np.arange(G.number_of_nodes())[:, None],
+        edges=pd.DataFrame(G.edges(), columns=["source", "target"]),
+    )
+    adj = G.to_adjacency_matrix()
+    expected = normalize_adj(adj + sps.diags(1 - adj.diagonal())).toarray()
+
+    def mean_aggregation(presampling_epochs):
+        generator = GraphSAINTNodeGenerator(
+            G,
+            batch_size=2,
+            walk_length=1,
+            presampling_epochs=presampling_epochs,
+            seed=0,
+        )
+        seq = generator.flow(G.nodes(), shuffle=True)
+        return _mean_aggregation(seq, G.number_of_nodes(), epochs=200)
+
+    # the aggregator normalisation makes the aggregation unbiased...
+    np.testing.assert_allclose(mean_aggregation(200), expected, atol=0.1)
+
+    # ... unlike the sampled subgraphs alone, which miss some of the neighbours of each node
+    unnormalized = mean_aggregation(0)
+    assert (unnormalized <= expected + 1e-6).all()
+    assert np.abs(unnormalized - expected).max() > 0.15
+
+
+def test_GraphSAINTNodeSequence_deterministic():
+    G = example_graph_random(feature_size=4, n_nodes=40, n_edges=100)
+
+    def batches(order):
+        generator = GraphSAINTNodeGenerator(G, batch_size=8, walk_length=2, seed=123)
+        seq = generator.flow(G.nodes())
+        # batches are the same, whatever order they're computed in (e.g. in parallel)
+        return {i: seq[i] for i in order}
+
+    forward = batches(range(5))
+    backward = batches(reversed(range(5)))
+    for i in range(5):
+        (forward_inputs, _), (backward_inputs, _) = forward[i], backward[i]
+        for forward_array, backward_array in zip(forward_inputs, backward_inputs):
+            np.testing.assert_array_equal(forward_array, backward_array)
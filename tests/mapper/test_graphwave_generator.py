@@ -22,6 +22,7 @@ from stellargraph.mapper.graphwave_generator import (
 
 from ..test_utils.graphs import barbell
 import numpy as np
+import pandas as pd
 import pytest
 import scipy.sparse as sps
 import tensorflow as tf
@@ -55,6 +56,22 @@ def test_bad_init(barbell):
     with pytest.raises(ValueError, match="degree: expected.*found 0"):
         generator = GraphWaveGenerator(barbell, scales=(0.1, 2, 3, 4), degree=0)
 
+    with pytest.raises(ValueError, match="max_eig_method: expected.*found 'foo'"):
+        generator = GraphWaveGenerator(barbell, max_eig_method="foo")
+
+    directed = StellarDiGraph(
+        nodes=pd.DataFrame(index=["a", "b", "c"]),
+        edges=pd.DataFrame({"source": ["a", "b"], "target": ["b", "c"]}),
+    )
+    with pytest.raises(
+        ValueError, match="max_eig_method: expected.*directed graph.*found 'lanczos'"
+    ):
+        generator = GraphWaveGenerator(directed, max_eig_method="lanczos")
+
+    # the other methods work with directed graphs
+    GraphWaveGenerator(directed, max_eig_method="eigs")
+    GraphWaveGenerator(directed, max_eig_method="gershgorin")
+
 
 def test_bad_flow(barbell):
     generator = GraphWaveGenerator(barbell, scales=(0.1, 2, 3, 4), degree=10)
@@ -82,6 +99,9 @@ def test_bad_flow(barbell):
             barbell.nodes(), sample_points, batch_size=1, num_parallel_calls=0
         )
 
+    with pytest.raises(ValueError, match="block_size: expected.*found 0"):
+        generator.flow(barbell.nodes(), sample_points, batch_size=1, block_size=0)
+
 
 @pytest.mark.parametrize("shuffle", [False, True])
 def test_flow_shuffle(barbell, shuffle):
@@ -230,14 +250,18 @@ def test_flow_node_ids(barbell):
     assert all(a == b for a, b in zip(expected_targets, actual_targets))
 
 
-def test_chebyshev(barbell):
+@pytest.mark.parametrize("max_eig_method", ["eigs", "lanczos", "gershgorin"])
+@pytest.mark.parametrize("block_size", [1, 3, 64])
+def test_chebyshev(barbell, max_eig_method, block_size):
     """
     This test checks that the Chebyshev approximation accurately calculates the wavelets. It calculates
     the wavelets exactly using eigenvalues and compares this to the Chebyshev approximation.
     """
     scales = (1, 5, 10)
     sample_points = np.linspace(0, 100, 50).astype(np.float32)
-    generator = GraphWaveGenerator(barbell, scales=scales, degree=50,)
+    generator = GraphWaveGenerator(
+        barbell, scales=scales, degree=50, max_eig_method=max_eig_method
+    )
 
     # calculate wavelets exactly using eigenvalues
     adj = np.asarray(barbell.to_adjacency_matrix().todense()).astype(np.float32)
@@ -265,8 +289,44 @@ def test_chebyshev(barbell):
         sample_points=sample_points,
         batch_size=1,
         repeat=False,
+        block_size=block_size,
     )
     actual_embeddings = _epoch_as_matrix(actual_dataset)
 
     # compare exactly calculated wavelets to chebyshev
     np.testing.assert_allclose(actual_embeddings, expected_embeddings, rtol=1e-2)
+
+
+def test_max_eig_bounds(barbell):
+    exact = GraphWaveGenerator(barbell, max_eig_method="eigs").max_eig
+    lanczos = GraphWaveGenerator(barbell, max_eig_method="lanczos").max_eig
+    gershgorin = GraphWaveGenerator(barbell, max_eig_method="gershgorin").max_eig
+
+    assert exact <= lanczos <= exact * 1.02
+    assert exact <= gershgorin
+
+
+def test_flow_cache_path(barbell, tmp_path):
+    generator = GraphWaveGenerator(barbell, scales=(0.1, 2, 3, 4), degree=10)
+    sample_points = np.linspace(0, 100, 25)
+
+    in_memory = _epoch_as_matrix(
+        generator.flow(barbell.nodes(), sample_points, batch_size=4)
+    )
+
+    cache_path = str(tmp_path / "embeddings")
+    cached_dataset = generator.flow(
+        barbell.nodes(), sample_points, batch_size=4, cache_path=cache_path
+    )
+    first = _epoch_as_matrix(cached_dataset)
+    assert any(tmp_path.iterdir())
+
+    # a new dataset reads the embeddings from the cache files
+    second = _epoch_as_matrix(
+        generator.flow(
+            barbell.nodes(), sample_points, batch_size=4, cache_path=cache_path
+        )
+    )
+
+    np.testing.assert_allclose(first, in_memory, rtol=1e-6)
+    np.testing.assert_array_equal(first, second)
@@ -19,7 +19,12 @@ import pytest
 import pandas as pd
 import numpy as np
 
-from stellargraph.mapper.knowledge_graph import KGTripleGenerator, KGTripleSequence
+from stellargraph.mapper.knowledge_graph import (
+    KGTripleGenerator,
+    KGTripleSequence,
+    _bernoulli_source_probabilities,
+    _triple_keys,
+)
 
 from .. import test_utils
 from ..test_utils.graphs import knowledge_graph
@@ -118,6 +123,12 @@ def test_kg_triple_generator_errors(knowledge_graph):
         # case-sensitive
         gen.flow(triple_df(), sample_strategy="UNIFORM")
 
+    with pytest.raises(
+        ValueError,
+        match="corruption: expected one of 'uniform', 'bernoulli', found 'bern'",
+    ):
+        gen.flow(triple_df(), corruption="bern")
+
 
 @pytest.mark.parametrize("negative_samples", [None, 1, 10])
 def test_kg_triple_sequence_batches(negative_samples):
@@ -234,3 +245,75 @@ def test_kg_triple_sequence_seed_shuffle_negative_samples():
     seq1 = mk(1)
     seq2 = mk(2)
     assert not all(run(seq1, seq2) for _ in range(20))
+
+
+def test_kg_triple_generator_filtered(knowledge_graph):
+    gen = KGTripleGenerator(knowledge_graph, 3)
+    edges = triple_df(("a", "W", "b"), ("c", "X", "a"), ("d", "Y", "c"))
+
+    seq = gen.flow(
+        edges, negative_samples=20, filtered=True, corruption="bernoulli", seed=1
+    )
+    check_sequence_output(seq[0], 3, 20, knowledge_graph.number_of_nodes())
+
+    sources, targets, rels, _ = knowledge_graph.edge_arrays(
+        include_edge_type=True, use_ilocs=True
+    )
+    known = set(zip(sources, rels, targets)) | set(
+        zip(seq.source_ilocs, seq.rel_ilocs, seq.target_ilocs)
+    )
+    (s, r, o), _ = seq[0]
+    negatives = set(zip(s[3:], r[3:], o[3:]))
+    assert not (negatives & known)
+
+
+def test_kg_triple_sequence_filtered():
+    num_nodes = 5
+    num_rels = 2
+    # every triple with relation 0 and source 0 is known, except (0, 0, 4)
+    known_s = np.array([0, 0, 0, 0, 1, 2])
+    known_r = np.array([0, 0, 0, 0, 1, 1])
+    known_o = np.array([0, 1, 2, 3, 0, 0])
+    known_keys = np.unique(_triple_keys(known_s, known_r, known_o, num_nodes, num_rels))
+
+    seq = KGTripleSequence(
+        max_node_iloc=num_nodes,
+        max_rel_iloc=num_rels,
+        source_ilocs=[0, 1],
+        rel_ilocs=[0, 1],
+        target_ilocs=[1, 0],
+        batch_size=2,
+        shuffle=False,
+        negative_samples=50,
+        sample_strategy="uniform",
+        seed=123,
+        known_triples=known_keys,
+        # only replace the target of relation 0, and the source of relation 1
+        source_probabilities=np.array([0.0, 1.0]),
+    )
+
+    (s, r, o), targets = seq[0]
+    check_sequence_output(((s, r, o), targets), 2, 50, num_nodes)
+
+    neg_s, neg_r, neg_o = s[2:], r[2:], o[2:]
+    known = set(zip(known_s, known_r, known_o))
+    assert not (set(zip(neg_s, neg_r, neg_o)) & known)
+
+    rel_0 = neg_r == 0
+    np.testing.assert_array_equal(neg_s[rel_0], 0)
+    # the only unknown target
+    np.testing.assert_array_equal(neg_o[rel_0], 4)
+
+    np.testing.assert_array_equal(neg_o[~rel_0], 0)
+    assert set(neg_s[~rel_0]) <= {0, 3, 4}
+
+
+def test_bernoulli_source_probabilities():
+    # relation 0: one-to-many (1 source, 3 targets); relation 1: many-to-one (2 sources, 1
+    # target); relation 2: one-to-one; relation 3: unused
+    sources = [0, 0, 0, 1, 2, 3]
+    rels = [0, 0, 0, 1, 1, 2]
+    targets = [1, 2, 3, 0, 0, 4]
+
+    probs = _bernoulli_source_probabilities(sources, rels, targets, 5, 4)
+    np.testing.assert_allclose(probs, [3 / 4, 1 / 3, 1 / 2, 1 / 2])
@@ -20,7 +20,9 @@ from stellargraph.mapper.padded_graph_generator import (
 )
 
 import numpy as np
+import pandas as pd
 import pytest
+import scipy.sparse as sps
 from ..test_utils.graphs import example_graph_random, example_graph, example_hin_1
 
 graphs = [
@@ -337,3 +339,114 @@ def test_generator_pairs(use_targets, use_ilocs):
         np.testing.assert_array_equal(targets_1, [56])
     else:
         assert targets_1 is None
+
+
+def test_generator_flow_bucket_by_size():
+    sizes = [7, 2, 5, 3, 7, 2, 6, 4, 3]
+    bucket_graphs = [example_graph_random(feature_size=4, n_nodes=n) for n in sizes]
+    generator = PaddedGraphGenerator(graphs=bucket_graphs)
+
+    targets = np.arange(len(sizes))
+
+    # bucketing reorders the graphs, which would silently misalign predictions
+    with pytest.raises(ValueError, match="bucket_by_size: expected 'shuffle=True'"):
+        generator.flow(range(len(sizes)), batch_size=3, bucket_by_size=True)
+
+    seq = generator.flow(
+        range(len(sizes)),
+        targets=targets,
+        batch_size=3,
+        shuffle=True,
+        seed=0,
+        bucket_by_size=True,
+    )
+
+    for _ in range(3):
+        seen_targets = []
+        max_sizes = []
+        for i in range(len(seq)):
+            [features, mask, adj], batch_targets = seq[i]
+            # the targets and graphs stay aligned
+            np.testing.assert_array_equal(
+                mask.sum(axis=1), [sizes[t] for t in batch_targets]
+            )
+            seen_targets.extend(batch_targets)
+            max_sizes.append(features.shape[1])
+
+        assert sorted(seen_targets) == list(targets)
+        # sorted by size, the batches need padding to 3, 5 and 7 nodes (in some order)
+        assert sorted(max_sizes) == [3, 5, 7]
+
+        seq.on_epoch_end()
+
+
+def test_generator_flow_padded_values():
+    generator = PaddedGraphGenerator(graphs=graphs)
+    seq = generator.flow(graphs=[2, 0], batch_size=2)
+
+    # compute twice, to check the cached arrays aren't modified
+    for _ in range(2):
+        [features, mask, adj], _ = seq[0]
+
+        assert features.shape == (2, 6, 4)
+        for index, graph_iloc in enumerate([2, 0]):
+            n = graphs[graph_iloc].number_of_nodes()
+            np.testing.assert_array_equal(
+                features[index, :n], graphs[graph_iloc].node_features()
+            )
+            np.testing.assert_array_equal(features[index, n:], 0)
+            np.testing.assert_array_equal(
+                adj[index, :n, :n], seq.normalized_adjs[graph_iloc].toarray()
+            )
+            np.testing.assert_array_equal(adj[index, n:], 0)
+            np.testing.assert_array_equal(adj[index, :, n:], 0)
+            np.testing.assert_array_equal(mask[index], _mask(n, 6))
+
+
+def test_generator_flow_sparse():
+    generator = PaddedGraphGenerator(graphs=graphs, sparse=True)
+    seq = generator.flow(graphs=[2, 0, 1], targets=[1, 2, 3], batch_size=2)
+
+    assert len(seq) == 2
+
+    [features, segment_ids, indices, values], targets = seq[0]
+    assert features.shape == (1, 3 + 6, 4)
+    np.testing.assert_array_equal(
+        features[0], np.vstack([graphs[2].node_features(), graphs[0].node_features()])
+    )
+    np.testing.assert_array_equal(segment_ids, [[0, 0, 0, 1, 1, 1, 1, 1, 1]])
+    np.testing.assert_array_equal(targets, [1, 2])
+
+    assert indices.shape[:2] == values.shape
+    adj = sps.coo_matrix((values[0], (indices[0, :, 0], indices[0, :, 1]))).toarray()
+    expected = sps.block_diag(
+        [seq.normalized_adjs[2], seq.normalized_adjs[0]]
+    ).toarray()
+    np.testing.assert_array_equal(adj, expected)
+
+    [features, segment_ids, indices, values], targets = seq[1]
+    assert features.shape == (1, 5, 4)
+    np.testing.assert_array_equal(segment_ids, [[0, 0, 0, 0, 0]])
+    np.testing.assert_array_equal(targets, [3])
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_generator_flow_sparse_features(sparse):
+    # features stored sparsely in the graphs are densified for the batches
+    dense_features = [np.eye(3, 4), np.ones((2, 4))]
+    sparse_graphs = [
+        StellarGraph(
+            sps.csr_matrix(features), pd.DataFrame({"source": [0], "target": [1]}),
+        )
+        for features in dense_features
+    ]
+
+    generator = PaddedGraphGenerator(graphs=sparse_graphs, sparse=sparse)
+    [features, *_], _ = generator.flow([1, 0], batch_size=2)[0]
+
+    if sparse:
+        expected = np.vstack([dense_features[1], dense_features[0]])
+    else:
+        expected = [np.vstack([dense_features[1], np.zeros((1, 4))]), dense_features[0]]
+
+    np.testing.assert_array_equal(features, [expected] if sparse else expected)
@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+
+import numpy as np
+import pytest
+
+from stellargraph.core.utils import GCN_Aadj_feats_op
+from tensorflow.keras import Model
+from tensorflow.keras.layers import Concatenate, Dense, Input
+
+from stellargraph.mapper import (
+    FullBatchNodeGenerator,
+    PropagatedFeatureNodeGenerator,
+    propagate_features,
+)
+from ..test_utils.graphs import example_graph_random
+
+
+def _expected_hops(G, k):
+    features = G.node_features()
+    _, A = GCN_Aadj_feats_op(features, G.to_adjacency_matrix(), method="gcn")
+    hops = [features]
+    for _ in range(k):
+        hops.append(A @ hops[-1])
+    return hops
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 64])
+def test_propagate_features(block_size):
+    G = example_graph_random(feature_size=5, n_nodes=20, n_edges=40)
+    hops = propagate_features(G, 3, block_size=block_size)
+
+    assert len(hops) == 4
+    for actual, expected in zip(hops, _expected_hops(G, 3)):
+        np.testing.assert_allclose(actual, expected, rtol=1e-6)
+
+
+def test_propagate_features_cache(tmpdir):
+    G = example_graph_random(feature_size=5, n_nodes=20, n_edges=40)
+    expected = _expected_hops(G, 4)
+
+    hops = propagate_features(G, 2, cache_dir=str(tmpdir))
+    (directory,) = tmpdir.listdir()
+    assert sorted(os.listdir(directory)) == ["hop_0.npy", "hop_1.npy", "hop_2.npy"]
+    assert all(isinstance(hop, np.memmap) for hop in hops)
+
+    # loading the saved powers, and only computing the new ones
+    hops = propagate_features(G, 4, cache_dir=str(tmpdir))
+    assert len(tmpdir.listdir()) == 1
+    assert len(os.listdir(directory)) == 5
+    for actual, exp in zip(hops, expected):
+        np.testing.assert_allclose(actual, exp, rtol=1e-6)
+
+    hops = propagate_features(G, 1, cache_dir=str(tmpdir))
+    assert len(hops) == 2
+
+    # a different normalisation or graph has a different key
+    propagate_features(G, 1, weighted=True, cache_dir=str(tmpdir))
+    assert len(tmpdir.listdir()) == 2
+
+    other = example_graph_random(feature_size=5, n_nodes=20, n_edges=40)
+    propagate_features(other, 1, cache_dir=str(tmpdir))
+    assert len(tmpdir.listdir()) == 3
+
+
+def test_propagate_features_invalid():
+    G = example_graph_random(feature_size=5, node_types=2)
+    with pytest.raises(ValueError, match="G: expected a graph with a single node type"):
+        propagate_features(G, 2)
+
+    G = example_graph_random(feature_size=5)
+    with pytest.raises(ValueError, match="k: expected integer"):
+        propagate_features(G, -1)
+
+
+def test_full_batch_generator_sgc_cache(tmpdir):
+    G = example_graph_random(feature_size=5, n_nodes=20, n_edges=40)
+
+    generator = FullBatchNodeGenerator(G, method="sgc", k=2)
+    cached = FullBatchNodeGenerator(G, method="sgc", k=2, sgc_cache_dir=str(tmpdir))
+
+    np.testing.assert_array_equal(cached.Aadj.toarray(), np.eye(20))
+    np.testing.assert_allclose(
+        cached.features, generator.Aadj @ generator.features, rtol=1e-6
+    )
+
+    # k is validated with and without the cache
+    for cache_dir in [None, str(tmpdir)]:
+        with pytest.raises(ValueError, match="k: expected.*found 0"):
+            FullBatchNodeGenerator(G, method="sgc", k=0, sgc_cache_dir=cache_dir)
+
+
+@pytest.mark.parametrize("use_cache", [False, True])
+def test_propagated_feature_node_generator(tmpdir, use_cache):
+    G = example_graph_random(feature_size=5, n_nodes=20, n_edges=40)
+    expected = _expected_hops(G, 2)
+
+    generator = PropagatedFeatureNodeGenerator(
+        G, k=2, batch_size=3, cache_dir=str(tmpdir) if use_cache else None
+    )
+    assert generator.num_batch_dims() == 1
+
+    nodes = list(G.nodes())[::2]
+    ilocs = G.node_ids_to_ilocs(nodes)
+    targets = np.arange(len(nodes))[:, None]
+    seq = generator.flow(nodes, targets)
+    assert len(seq) == 4
+
+    for i, (batch_features, batch_targets) in enumerate(seq):
+        batch_ilocs = ilocs[3 * i : 3 * (i + 1)]
+        assert len(batch_features) == 3
+        for actual, exp in zip(batch_features, expected):
+            assert type(actual) == np.ndarray
+            np.testing.assert_allclose(actual, exp[batch_ilocs], rtol=1e-6)
+        np.testing.assert_array_equal(batch_targets, targets[3 * i : 3 * (i + 1)])
+
+    shuffled = generator.flow(ilocs, targets, shuffle=True, use_ilocs=True)
+    for batch_features, batch_targets in shuffled:
+        rows = ilocs[batch_targets[:, 0]]
+        np.testing.assert_allclose(batch_features[1], expected[1][rows], rtol=1e-6)
+
+
+def test_propagated_feature_node_generator_model():
+    G = example_graph_random(feature_size=5, n_nodes=20, n_edges=40)
+    generator = PropagatedFeatureNodeGenerator(G, k=2, batch_size=4)
+
+    x_inp = [Input(shape=(5,)) for _ in range(generator.k + 1)]
+    x_out = Dense(2)(Concatenate()([Dense(3)(x) for x in x_inp]))
+    model = Model(inputs=x_inp, outputs=x_out)
+    model.compile(optimizer="adam", loss="mse")
+
+    nodes = list(G.nodes())
+    model.fit(generator.flow(nodes, np.zeros((20, 2)), shuffle=True), epochs=1)
+    batch_features, _ = generator.flow(nodes)[0]
+    assert model.predict_on_batch(batch_features).shape == (4, 2)
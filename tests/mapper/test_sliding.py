@@ -16,6 +16,7 @@
 
 import numpy as np
 import pytest
+import scipy.sparse as sps
 
 from stellargraph import StellarGraph
 from stellargraph.mapper import (
@@ -193,3 +194,36 @@ def test_sliding_sequence_subslice():
 
     seq = gen.flow(four, target_distance=2)
     _check_sequence(seq, [([several(1, 3)], [single(4)])])
+
+
+def test_sliding_sequence_batches_are_copies():
+    g = _graph((3, 8, 2))
+    features = g.node_features()
+    original = features.copy()
+
+    gen = SlidingFeaturesNodeGenerator(g, window_size=3, batch_size=4)
+    seq = gen.flow(slice(1, None), target_distance=2)
+
+    [batch_feats], batch_targets = seq[0]
+    assert batch_feats.flags.c_contiguous and batch_feats.flags.writeable
+    assert batch_targets.flags.c_contiguous and batch_targets.flags.writeable
+
+    # modifying a batch doesn't affect the graph, or later batches
+    batch_feats[:] = -1
+    batch_targets[:] = -1
+    np.testing.assert_array_equal(g.node_features(), original)
+
+    [batch_feats], batch_targets = seq[0]
+    np.testing.assert_array_equal(batch_feats[1], original[:, 2:5])
+    np.testing.assert_array_equal(batch_targets[1], original[:, 6])
+
+
+def test_sliding_generator_sparse_features():
+    # features stored sparsely in the graph are densified
+    features = np.arange(2 * 5).reshape(2, 5)
+    g = StellarGraph(nodes=sps.csr_matrix(features))
+
+    gen = SlidingFeaturesNodeGenerator(g, window_size=2, batch_size=4)
+    [batch], targets = gen.flow(slice(None), target_distance=1)[0]
+    np.testing.assert_array_equal(batch, [features[:, i : i + 2] for i in range(3)])
+    np.testing.assert_array_equal(targets, [features[:, i + 2] for i in range(3)])
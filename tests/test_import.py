@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import subprocess
+import sys
+
+import pytest
+
+import stellargraph as sg
+
+
+def _run_python(code):
+    # a fresh interpreter is required, because the test process has already imported everything
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_import_does_not_load_tensorflow():
+    _run_python(
+        """
+import sys
+import stellargraph
+from stellargraph import StellarGraph, StellarDiGraph, IndexedArray, GraphSchema
+from stellargraph.data import UniformRandomWalk, EdgeSplitter
+
+assert "tensorflow" not in sys.modules, "importing stellargraph loaded tensorflow"
+"""
+    )
+
+
+def test_lazy_submodules():
+    from stellargraph import layer
+
+    assert sg.layer is layer
+    assert sg.mapper.FullBatchNodeGenerator is not None
+
+    for name in sg.__all__:
+        assert name in dir(sg)
+        assert getattr(sg, name) is not None
+
+    with pytest.raises(AttributeError, match="has no attribute 'not_a_module'"):
+        sg.not_a_module
+
+
+def test_custom_keras_layers():
+    layers = sg.custom_keras_layers
+    assert layers["GraphConvolution"] is sg.layer.GraphConvolution
+    assert layers["LinkEmbedding"].__name__ == "LinkEmbedding"
+    # computed once
+    assert sg.custom_keras_layers is layers
+
+
+def test_top_level_deprecated():
+    with pytest.warns(DeprecationWarning, match="stellargraph.ensemble.Ensemble"):
+        with pytest.raises(TypeError):
+            sg.Ensemble()
+
+
+@pytest.mark.benchmark(group="import")
+def test_benchmark_import(benchmark):
+    benchmark.pedantic(
+        _run_python, args=("import stellargraph",), rounds=3, warmup_rounds=0
+    )
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+import tensorflow as tf
+
+from stellargraph import profiling
+from stellargraph.data import UniformRandomWalk
+from stellargraph.mapper import GraphSAGELinkGenerator, GraphSAGENodeGenerator
+from .test_utils.graphs import example_graph_random
+
+
+@pytest.fixture(autouse=True)
+def clean_profiling():
+    profiling.disable()
+    profiling.reset()
+    yield
+    profiling.disable()
+    profiling.reset()
+
+
+def test_disabled():
+    graph = example_graph_random(feature_size=4)
+    GraphSAGENodeGenerator(graph, 2, [2]).flow(graph.nodes())[0]
+    UniformRandomWalk(graph, n=1, length=3).run(graph.nodes())
+
+    assert not profiling.is_enabled()
+    assert profiling.summary() == {}
+
+
+def test_generators_and_walkers():
+    graph = example_graph_random(feature_size=4, n_nodes=20)
+    node_seq = GraphSAGENodeGenerator(graph, 5, [2, 2]).flow(graph.nodes())
+    link_seq = GraphSAGELinkGenerator(graph, 5, [2]).flow(graph.edges())
+    walker = UniformRandomWalk(graph, n=1, length=3)
+
+    with profiling.profile():
+        assert profiling.is_enabled()
+        batches = [node_seq[i] for i in range(len(node_seq))]
+        link_seq[0]
+        walker.run(graph.nodes())
+
+    assert not profiling.is_enabled()
+
+    stats = profiling.summary()
+    assert stats["NodeSequence.__getitem__"]["calls"] == len(node_seq)
+    assert stats["LinkSequence.__getitem__"]["calls"] == 1
+    assert stats["UniformRandomWalk.run"]["calls"] == 1
+
+    sample = stats["GraphSAGENodeGenerator.sample_features"]
+    assert sample["calls"] == len(node_seq)
+    assert sample["bytes"] == sum(
+        features.nbytes for batch_feats, _ in batches for features in batch_feats
+    )
+    assert stats["GraphSAGELinkGenerator.sample_features"]["bytes"] > 0
+
+    assert stats["extract_element_features"]["calls"] > 0
+    assert stats["extract_element_features"]["bytes"] > 0
+    assert stats["StellarGraph.node_ids_to_ilocs"]["calls"] > 0
+
+    for stage in stats.values():
+        assert set(stage) == {
+            "calls",
+            "total_seconds",
+            "mean_seconds",
+            "p50_seconds",
+            "p99_seconds",
+            "max_seconds",
+            "bytes",
+        }
+        assert 0 <= stage["p50_seconds"] <= stage["p99_seconds"] <= stage["max_seconds"]
+        assert stage["total_seconds"] >= stage["max_seconds"]
+
+    # stats accumulate without a reset
+    with profiling.profile(reset_stats=False):
+        walker.run(graph.nodes())
+    assert profiling.summary()["UniformRandomWalk.run"]["calls"] == 2
+
+
+def test_instrument_and_timed():
+    @profiling.instrument(stage="custom", count_bytes=True)
+    def f(n):
+        return [np.zeros(n, dtype=np.int8), (np.zeros(n, dtype=np.int8), "not counted")]
+
+    profiling.enable()
+    f(3)
+    f(5)
+    assert profiling.timed(None, len, [1, 2]) == 2
+    assert profiling.timed("explicit", len, [1, 2], count_bytes=True) == 2
+
+    stats = profiling.summary()
+    assert stats["custom"]["calls"] == 2
+    assert stats["custom"]["bytes"] == 16
+    assert stats["len"]["calls"] == 1
+    assert stats["explicit"]["bytes"] == 0
+
+    profiling.reset()
+    assert profiling.summary() == {}
+
+
+def test_reservoir():
+    stage = profiling._Stage()
+    for i in range(3 * profiling._RESERVOIR_SIZE):
+        stage.record(float(i), 0)
+
+    assert len(stage.durations) == profiling._RESERVOIR_SIZE
+    summary = stage.summary()
+    assert summary["calls"] == 3 * profiling._RESERVOIR_SIZE
+    assert summary["max_seconds"] == 3 * profiling._RESERVOIR_SIZE - 1
+    # the median of a uniform sample should be near the true median
+    assert summary["p50_seconds"] == pytest.approx(
+        1.5 * profiling._RESERVOIR_SIZE, rel=0.05
+    )
+
+
+def test_callback():
+    walker = UniformRandomWalk(example_graph_random(), n=1, length=3)
+
+    class Walk(tf.keras.callbacks.Callback):
+        def on_epoch_end(self, epoch, logs=None):
+            for _ in range(epoch + 1):
+                walker.run([1])
+
+    callback = profiling.ProfilingCallback()
+    assert isinstance(callback, tf.keras.callbacks.Callback)
+
+    model = tf.keras.Sequential([tf.keras.layers.Dense(1, input_shape=(2,))])
+    model.compile(loss="mse")
+    # the profiling callback needs to summarise after the walking callback
+    model.fit(
+        np.zeros((4, 2)), np.zeros(4), epochs=3, verbose=0, callbacks=[Walk(), callback]
+    )
+
+    assert [epoch["UniformRandomWalk.run"]["calls"] for epoch in callback.history] == [
+        1,
+        2,
+        3,
+    ]
+    assert not profiling.is_enabled()
+
+    accumulating = profiling.ProfilingCallback(reset_each_epoch=False)
+    model.fit(
+        np.zeros((4, 2)),
+        np.zeros(4),
+        epochs=2,
+        verbose=0,
+        callbacks=[Walk(), accumulating],
+    )
+    assert [
+        epoch["UniformRandomWalk.run"]["calls"] for epoch in accumulating.history
+    ] == [1, 3]
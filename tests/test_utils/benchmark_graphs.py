@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Synthetic graphs for benchmarks, with power-law degree distributions, optional node and edge
+types, and optional temporal edge weights, at sizes from 10⁴ to 10⁷ edges.
+"""
+
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+from stellargraph import IndexedArray, StellarDiGraph, StellarGraph
+
+# by default, only the smallest size runs (including on CI), because larger sizes take a long time
+# to generate and benchmark; set this environment variable to run larger ones, e.g. 10000000
+MAX_EDGES_VARIABLE = "STELLARGRAPH_BENCHMARK_MAX_EDGES"
+ALL_SIZES = [10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7]
+
+
+def benchmark_sizes():
+    """
+    The numbers of edges to benchmark with, limited by the ``STELLARGRAPH_BENCHMARK_MAX_EDGES``
+    environment variable (default 10⁴).
+    """
+    max_edges = int(os.environ.get(MAX_EDGES_VARIABLE, ALL_SIZES[0]))
+    return [size for size in ALL_SIZES if size <= max_edges]
+
+
+def _power_law_endpoints(rs, num_nodes, num_edges, exponent):
+    # Chung-Lu style: each endpoint is chosen with probability proportional to a weight that
+    # follows a power law, so that the expected degrees do too
+    weights = np.arange(1, num_nodes + 1) ** (-1 / (exponent - 1))
+    cumulative = np.cumsum(weights)
+    cumulative /= cumulative[-1]
+    ilocs = np.searchsorted(cumulative, rs.random_sample(2 * num_edges))
+    # shuffle the node ilocs, so the high degree nodes aren't all at the start
+    permutation = rs.permutation(num_nodes)
+    return permutation[ilocs[:num_edges]], permutation[ilocs[num_edges:]]
+
+
+def power_law_graph_data(
+    num_edges,
+    num_node_types=1,
+    num_edge_types=1,
+    feature_size=None,
+    temporal=False,
+    average_degree=10,
+    exponent=2.5,
+    seed=0,
+):
+    """
+    Create the node and edge data for a random graph with ``num_edges`` edges and a power-law
+    degree distribution.
+
+    Args:
+        num_edges (int): the number of edges
+        num_node_types (int): the number of node types, named ``n0``, ``n1``, ...
+        num_edge_types (int): the number of edge types, named ``e0``, ``e1``, ...
+        feature_size (int, optional): if specified, the number of features for every node
+        temporal (bool): if True, each edge has a weight that is a timestamp in ``[0, 10⁶)``,
+            suitable for temporal walks; otherwise the weights are all 1
+        average_degree (int): the average degree, which determines the number of nodes
+        exponent (float): the exponent of the power-law degree distribution
+        seed (int): the random seed
+
+    Returns:
+        A tuple ``(nodes, edges)`` to pass to the :class:`.StellarGraph` constructor, with
+        ``edge_type_column="label"``.
+    """
+    rs = np.random.RandomState(seed)
+    num_nodes = max(2 * num_edges // average_degree, 2)
+
+    node_types = np.arange(num_nodes) % num_node_types
+    features = rs.random_sample((num_nodes, feature_size or 0)).astype(np.float32)
+    nodes = {
+        f"n{t}": IndexedArray(
+            features[node_types == t], index=np.flatnonzero(node_types == t)
+        )
+        for t in range(num_node_types)
+    }
+
+    sources, targets = _power_law_endpoints(rs, num_nodes, num_edges, exponent)
+    edges = pd.DataFrame(
+        {
+            "source": sources,
+            "target": targets,
+            "label": pd.Categorical.from_codes(
+                rs.randint(num_edge_types, size=num_edges),
+                [f"e{t}" for t in range(num_edge_types)],
+            ),
+        }
+    )
+    if temporal:
+        edges["weight"] = rs.uniform(0, 10 ** 6, size=num_edges)
+
+    return nodes, edges
+
+
+@functools.lru_cache(maxsize=4)
+def power_law_graph(num_edges, is_directed=False, **kwargs):
+    """
+    Create a random :class:`.StellarGraph` with ``num_edges`` edges and a power-law degree
+    distribution; see :func:`power_law_graph_data` for the other arguments.
+
+    The graphs are cached, because they're immutable and are expensive to create at large sizes.
+    """
+    nodes, edges = power_law_graph_data(num_edges, **kwargs)
+    cls = StellarDiGraph if is_directed else StellarGraph
+    return cls(nodes, edges, edge_type_column="label")
+
+
+def record_graph_info(benchmark, graph):
+    """
+    Store the size of ``graph`` in the ``extra_info`` of ``benchmark``, so that it is saved with the
+    machine-readable results (e.g. ``--benchmark-json``).
+    """
+    benchmark.extra_info.update(
+        num_nodes=graph.number_of_nodes(),
+        num_edges=graph.number_of_edges(),
+        node_types=len(graph.node_types),
+        edge_types=len(graph.edge_types),
+    )
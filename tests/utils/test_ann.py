@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import numpy as np
+import pytest
+
+from stellargraph.utils import IVFIndex
+
+
+def _clustered(num_vectors, dimension, num_clusters=10, seed=0):
+    rs = np.random.RandomState(seed)
+    centres = rs.normal(scale=5, size=(num_clusters, dimension))
+    labels = rs.randint(num_clusters, size=num_vectors)
+    return centres[labels] + rs.normal(size=(num_vectors, dimension))
+
+
+def _brute_force(embeddings, queries, k, metric):
+    if metric == "cosine":
+        embeddings = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+
+    if metric == "euclidean":
+        scores = ((queries[:, None, :] - embeddings[None, :, :]) ** 2).sum(axis=2)
+    else:
+        scores = -(queries @ embeddings.T)
+
+    order = np.argsort(scores, axis=1)[:, :k]
+    scores = np.take_along_axis(scores, order, axis=1)
+    return order, scores if metric == "euclidean" else -scores
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "inner_product", "cosine"])
+def test_ivf_exact(metric):
+    embeddings = _clustered(500, 8)
+    queries = _clustered(30, 8, seed=1)
+    index = IVFIndex(embeddings, num_lists=7, metric=metric, seed=123)
+    assert len(index) == 500
+
+    expected_ids, expected_scores = _brute_force(embeddings, queries, 10, metric)
+
+    # probing every list is an exact search, whatever the batching
+    for batch_size in [1, 7, 100]:
+        ids, scores = index.search(queries, 10, num_probes=7, batch_size=batch_size)
+        np.testing.assert_array_equal(ids, expected_ids)
+        np.testing.assert_allclose(scores, expected_scores, atol=1e-8)
+
+    # a single query
+    ids, scores = index.search(queries[0], 10, num_probes=100)
+    np.testing.assert_array_equal(ids, expected_ids[0])
+    np.testing.assert_allclose(scores, expected_scores[0], atol=1e-8)
+
+
+def test_ivf_approximate_recall():
+    embeddings = _clustered(2000, 16, num_clusters=20)
+    queries = embeddings[:50] + 0.01
+    index = IVFIndex(embeddings, num_lists=20, seed=123)
+
+    expected_ids, _ = _brute_force(embeddings, queries, 5, "euclidean")
+    ids, _ = index.search(queries, 5, num_probes=3)
+
+    recall = np.mean([len(np.intersect1d(a, b)) / 5 for a, b in zip(ids, expected_ids)])
+    assert recall > 0.9
+
+
+@pytest.mark.parametrize("metric", ["euclidean", "inner_product"])
+def test_ivf_product_quantization(metric):
+    embeddings = _clustered(2000, 16, num_clusters=20)
+    queries = embeddings[:50]
+    index = IVFIndex(
+        embeddings,
+        num_lists=10,
+        num_subquantizers=8,
+        num_codes=32,
+        metric=metric,
+        seed=123,
+    )
+    assert index._vectors is None
+    assert index._codes.shape == (2000, 8)
+    assert index._codes.dtype == np.uint8
+
+    expected_ids, expected_scores = _brute_force(embeddings, queries, 10, metric)
+    ids, scores = index.search(queries, 10, num_probes=10)
+
+    recall = np.mean(
+        [len(np.intersect1d(a, b)) / 10 for a, b in zip(ids, expected_ids)]
+    )
+    assert recall > 0.5
+
+    # the approximate scores are exact for the quantised vectors
+    positions = np.argsort(index._ids)[ids]
+    lists = np.searchsorted(index._offsets, positions, side="right") - 1
+    codes = index._codes[positions]
+    reconstructed = index.centroids[lists] + np.concatenate(
+        [index._codebooks[m][codes[..., m]] for m in range(8)], axis=-1
+    )
+    if metric == "euclidean":
+        expected = ((queries[:, None, :] - reconstructed) ** 2).sum(axis=2)
+    else:
+        expected = (queries[:, None, :] * reconstructed).sum(axis=2)
+    np.testing.assert_allclose(scores, expected, atol=1e-6)
+
+
+def test_ivf_ids_and_padding():
+    embeddings = _clustered(20, 4)
+    names = np.array([f"n{i}" for i in range(20)])
+    index = IVFIndex(embeddings, ids=names, num_lists=4, seed=0)
+
+    ids, scores = index.search(embeddings[:3], 3, num_probes=4)
+    np.testing.assert_array_equal(ids[:, 0], names[:3])
+    np.testing.assert_allclose(scores[:, 0], 0, atol=1e-8)
+
+    # asking for more neighbours than exist
+    ids, scores = index.search(embeddings[:3], 25, num_probes=4)
+    assert ids.shape == scores.shape == (3, 25)
+    assert all(set(row[:20]) == set(names) for row in ids)
+    assert np.all(ids[:, 20:] == None)
+    assert np.all(np.isposinf(scores[:, 20:]))
+
+    int_index = IVFIndex(embeddings, num_lists=4, metric="inner_product", seed=0)
+    ids, scores = int_index.search(embeddings[:3], 25, num_probes=4)
+    assert np.all(ids[:, 20:] == -1)
+    assert np.all(np.isneginf(scores[:, 20:]))
+
+
+def test_ivf_seed():
+    embeddings = _clustered(300, 4)
+    a = IVFIndex(embeddings, num_lists=5, num_subquantizers=2, num_codes=16, seed=42)
+    b = IVFIndex(embeddings, num_lists=5, num_subquantizers=2, num_codes=16, seed=42)
+    np.testing.assert_array_equal(a.centroids, b.centroids)
+    np.testing.assert_array_equal(a._codes, b._codes)
+
+
+def test_ivf_invalid():
+    embeddings = _clustered(20, 4)
+
+    with pytest.raises(ValueError, match="embeddings: expected a 2D array"):
+        IVFIndex(embeddings[0])
+
+    with pytest.raises(ValueError, match="metric: expected one of"):
+        IVFIndex(embeddings, metric="manhattan")
+
+    with pytest.raises(ValueError, match="num_lists: expected.*found 21"):
+        IVFIndex(embeddings, num_lists=21)
+
+    with pytest.raises(ValueError, match="num_subquantizers: expected a divisor"):
+        IVFIndex(embeddings, num_subquantizers=3)
+
+    with pytest.raises(ValueError, match="ids: expected one ID"):
+        IVFIndex(embeddings, ids=range(3))
+
+    index = IVFIndex(embeddings, num_lists=2)
+    with pytest.raises(
+        ValueError,
+        match=r"queries: expected an array with shape \(number of queries, 4\)",
+    ):
+        index.search(np.zeros((2, 3)), 1)
+
+    with pytest.raises(ValueError, match="k: expected"):
+        index.search(embeddings, 0)
@@ -0,0 +1,153 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright 2020 Data61, CSIRO
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+
+import numpy as np
+import pytest
+from tensorflow.keras import Model
+
+from stellargraph.layer import GCN, GraphSAGE
+from stellargraph.mapper import FullBatchNodeGenerator, GraphSAGENodeGenerator
+from stellargraph.utils import export_embeddings, load_exported_embeddings
+from ..test_utils.graphs import example_graph_random
+
+
+class _FailingModel:
+    """
+    A model that fails after ``num_batches`` batches, to simulate a crash part way through.
+    """
+
+    def __init__(self, model, num_batches):
+        self._model = model
+        self._remaining = num_batches
+
+    def predict_on_batch(self, inputs):
+        if self._remaining == 0:
+            raise RuntimeError("simulated failure")
+        self._remaining -= 1
+        return self._model.predict_on_batch(inputs)
+
+
+def _deterministic_generator(graph):
+    return GraphSAGENodeGenerator(graph, batch_size=4, num_samples=[0, 0])
+
+
+@pytest.mark.parametrize("format", ["npy", "shards"])
+def test_export_embeddings(tmpdir, format):
+    graph = example_graph_random(feature_size=4, n_nodes=23)
+    generator = _deterministic_generator(graph)
+    x_in, x_out = GraphSAGE([3, 5], generator=generator).in_out_tensors()
+    model = Model(x_in, x_out)
+
+    nodes = graph.nodes()
+    sequence = generator.flow(nodes)
+    expected = np.concatenate(
+        [model.predict_on_batch(sequence[i][0]) for i in range(len(sequence))]
+    )
+
+    directory = str(tmpdir.join("export"))
+    manifest = export_embeddings(
+        model, generator, nodes, directory, chunk_size=10, format=format
+    )
+
+    assert manifest["shape"] == [23, 5]
+    assert manifest["completed_chunks"] == [0, 1, 2]
+    assert set(manifest["chunk_seconds"]) == {"0", "1", "2"}
+    assert manifest["nodes_per_second"] > 0
+
+    with open(os.path.join(directory, "manifest.json")) as f:
+        assert json.load(f) == manifest
+
+    loaded = load_exported_embeddings(directory)
+    if format == "shards":
+        assert [len(shard) for shard in loaded] == [10, 10, 3]
+        loaded = np.concatenate(loaded)
+    np.testing.assert_allclose(loaded, expected, rtol=1e-6)
+
+
+@pytest.mark.parametrize("format", ["npy", "shards"])
+def test_export_embeddings_resume(tmpdir, format):
+    graph = example_graph_random(feature_size=4, n_nodes=23)
+    generator = _deterministic_generator(graph)
+    x_in, x_out = GraphSAGE([3, 5], generator=generator).in_out_tensors()
+    model = Model(x_in, x_out)
+    nodes = graph.nodes()
+    directory = str(tmpdir.join("export"))
+
+    # chunks of 8 nodes are 2 batches each, so this fails in the middle of the second chunk
+    with pytest.raises(RuntimeError, match="simulated failure"):
+        export_embeddings(
+            _FailingModel(model, 3), generator, nodes, directory, 8, format=format
+        )
+
+    with pytest.raises(ValueError, match="found 1 of 3 chunks written"):
+        load_exported_embeddings(directory)
+
+    # resuming only computes the two missing chunks (with 4 batches)
+    manifest = export_embeddings(
+        _FailingModel(model, 4), generator, nodes, directory, 8, format=format
+    )
+    assert manifest["completed_chunks"] == [0, 1, 2]
+
+    expected = export_embeddings(
+        model, generator, nodes, str(tmpdir.join("expected")), 8, format=format
+    )
+    loaded = load_exported_embeddings(directory)
+    expected = load_exported_embeddings(str(tmpdir.join("expected")))
+    if format == "shards":
+        loaded = np.concatenate(loaded)
+        expected = np.concatenate(expected)
+    np.testing.assert_array_equal(loaded, expected)
+
+    # different settings can't be resumed...
+    with pytest.raises(
+        ValueError, match="different values for: num_nodes, nodes_fingerprint"
+    ):
+        export_embeddings(model, generator, nodes[:5], directory, 8, format=format)
+
+    # ... but can overwrite
+    manifest = export_embeddings(
+        model, generator, nodes[:5], directory, 8, format=format, resume=False
+    )
+    assert manifest["shape"] == [5, 5]
+
+
+def test_export_embeddings_full_batch(tmpdir):
+    graph = example_graph_random(feature_size=4, n_nodes=23)
+    generator = FullBatchNodeGenerator(graph)
+    gcn = GCN([5], generator=generator, activations=["relu"])
+    x_in, x_out = gcn.in_out_tensors()
+    model = Model(x_in, x_out)
+
+    nodes = graph.nodes()
+    expected = model.predict_on_batch(generator.flow(nodes)[0][0])[0]
+
+    directory = str(tmpdir.join("export"))
+    export_embeddings(model, generator, nodes, directory, chunk_size=10)
+    np.testing.assert_allclose(load_exported_embeddings(directory), expected, rtol=1e-6)
+
+
+def test_export_embeddings_invalid(tmpdir):
+    with pytest.raises(ValueError, match="chunk_size: expected"):
+        export_embeddings(None, None, [], str(tmpdir), chunk_size=0)
+
+    with pytest.raises(ValueError, match="format: expected one of"):
+        export_embeddings(None, None, [], str(tmpdir), format="hdf5")
+
+    with pytest.raises(ValueError, match="no manifest.json"):
+        load_exported_embeddings(str(tmpdir))